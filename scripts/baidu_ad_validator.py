@@ -5,12 +5,31 @@
 
 import os
 import time
+import asyncio
+import queue
 import random
-import pandas as pd
+import threading
+import itertools
+import uuid
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterable
 import logging
+from urllib.parse import quote
+
+from result_cache import KeywordResultCache
+from run_journal import JsonlJournal, read_journal
+from network_policy import ResourcePolicy, SCREENSHOT_RESOURCE_TYPES
+from baidu_http_engine import BaiduHttpEngine
+from domain_filter import DomainMatcher, extract_domain, load_domain_list
+from result_writer import write_results
+from keyword_source import KeywordSource
+from proxy_pool import ProxyPool, load_proxy_list, normalize_proxy
+from rate_controller import AdaptiveRateController
+from run_metrics import RunMetrics
+from process_stats import marked_tree_rss, format_mb, warn_if_unavailable
+from browser_watchdog import BrowserWatchdog, marker_arg
+from progress_events import ProgressReporter, add_progress_arguments, reporter_from_args
 
 # 配置日志
 logging.basicConfig(
@@ -23,11 +42,107 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# 注入页面的 JavaScript，用于隐藏自动化特征
+STEALTH_INIT_SCRIPT = """
+    // 隐藏 webdriver 特征
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    
+    // 覆盖 plugins 和 languages
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['zh-CN', 'zh', 'en']
+    });
+    
+    // 覆盖 permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+    
+    // 覆盖 chrome 对象
+    window.chrome = {
+        runtime: {}
+    };
+"""
+
+# 搜索结果页就绪判断：结果容器已挂载，且结果数量和 DOM 在 quietMs 内不再变化
+# 由 page.wait_for_function 轮询调用，状态保存在当前文档的 window 上
+SERP_READY_JS = """
+({ quietMs }) => {
+    const root = document.querySelector('#content_left, .s_main, .results');
+    if (!root) return false;
+    let state = window.__serpReadyState;
+    if (!state || state.root !== root) {
+        state = { root, last: performance.now(), count: -1 };
+        state.observer = new MutationObserver(() => { state.last = performance.now(); });
+        state.observer.observe(root, { childList: true, subtree: true, attributes: true });
+        window.__serpReadyState = state;
+        return false;
+    }
+    const count = root.querySelectorAll('.c-container, .result').length;
+    if (count !== state.count) {
+        state.count = count;
+        state.last = performance.now();
+        return false;
+    }
+    return performance.now() - state.last >= quietMs;
+}
+"""
+
+# 在页面内一次性提取前 10 个搜索结果（标题、链接、位置、是否广告）
+# 所有判断都在浏览器中完成，每个关键词只需一次跨进程调用
+SERP_EXTRACT_JS = """
+() => {
+    const items = Array.from(
+        document.querySelectorAll('#content_left .c-container, #content_left .result')
+    ).slice(0, 10);
+    return items.map((item, index) => {
+        const text = item.innerText || '';
+        const titleElem = item.querySelector('h3 a, .t a, a[href]');
+        const linkElem = item.querySelector('a[href]');
+        return {
+            position: index + 1,
+            is_ad: text.includes('广告') || text.includes('推广'),
+            title: titleElem ? (titleElem.innerText || '').trim() : '',
+            link: linkElem ? (linkElem.getAttribute('href') || '') : ''
+        };
+    });
+}
+"""
+
+
+# 需要过滤的平台域名列表
+# 注意：只需要主域名，子域名会自动匹配（如 item.jd.com 会匹配 jd.com）
+DEFAULT_FILTERED_DOMAINS = [
+    'jd.com', 'jd.hk',                    # 京东
+    '1688.com', 'alibaba.com', 'alibaba.com.cn',  # 阿里巴巴/1688
+    'b2b.baidu.com', 'aicaigou.com',      # 爱采购
+    'zhihu.com',                          # 知乎
+    'tmall.com', 'tmall.hk'               # 天猫
+]
+
+
 class BaiduAdValidator:
     """百度广告验证器"""
     
     def __init__(self, headless: bool = False, screenshot_dir: str = "scripts/screenshots", 
-                 proxy: Optional[str] = None, mobile: bool = False, proxy_list: Optional[List[str]] = None):
+                 proxy: Optional[str] = None, mobile: bool = False, proxy_list: Optional[List[str]] = None,
+                 cache: Optional[KeywordResultCache] = None, journal: Optional[JsonlJournal] = None,
+                 resource_policy: Optional[ResourcePolicy] = None,
+                 pace_range: Tuple[float, float] = (2.0, 5.0), ready_timeout_ms: int = 20000,
+                 quiet_ms: int = 500, http_first: bool = False,
+                 filtered_domains: Optional[List[str]] = None, proxy_pool: Optional[ProxyPool] = None,
+                 proxy_rotate_every: int = 0, rate_controller: Optional[AdaptiveRateController] = None,
+                 metrics: Optional[RunMetrics] = None, base_url: Optional[str] = None,
+                 recycle_every: int = 0, recycle_rss_mb: float = 0, hang_timeout: float = 0,
+                 memory_log_seconds: float = 60, progress: Optional[ProgressReporter] = None):
         """
         初始化验证器
         
@@ -36,7 +151,25 @@ class BaiduAdValidator:
             screenshot_dir: 截图保存目录
             proxy: 代理服务器地址（格式：http://host:port 或 socks5://host:port）
             mobile: 是否使用移动端模式
-            proxy_list: 代理IP列表（从文件读取，自动轮换）
+            proxy_list: 代理IP列表（从文件读取，由代理池按健康度分配）
+            cache: 关键词结果缓存（可选，命中时跳过浏览器搜索）
+            journal: 运行日志（可选，每完成一个关键词追加一条记录，用于断点续跑）
+            resource_policy: 请求拦截策略（可选，拦截图片/字体/埋点等非必要请求）
+            pace_range: 两次搜索之间的请求间隔（秒）：(下限, 初始值)，未指定 rate_controller 时使用
+            ready_timeout_ms: 等待搜索结果页就绪的超时上限（毫秒）
+            quiet_ms: 结果页 DOM 保持不变多久视为渲染完成（毫秒）
+            http_first: 是否优先使用 HTTP 快速通道（遇到验证码或解析失败时回退到浏览器）
+            filtered_domains: 需要过滤的平台域名（默认 DEFAULT_FILTERED_DOMAINS）
+            proxy_pool: 代理池（可选，默认由 proxy_list 创建；按健康度为每个上下文分配代理）
+            proxy_rotate_every: 每个上下文最多验证多少个关键词后换代理（0 表示只在代理熔断时更换）
+            rate_controller: 请求节奏控制器（可选，默认按 pace_range 创建；响应正常时提速，遇到验证码时降速）
+            metrics: 运行指标（可选，记录各阶段耗时和回退/错误次数）
+            base_url: 替代百度首页的站点地址（可选，如本地 SERP 桩服务，用于离线测量吞吐量）
+            recycle_every: 每个上下文最多验证多少个关键词后关闭重建（0 表示不按数量回收）
+            recycle_rss_mb: 单个浏览器（含渲染进程）的常驻内存超过多少 MB 时重启浏览器（0 表示不检查）
+            hang_timeout: 单个关键词超过多少秒视为浏览器挂起，由看门狗结束并重启浏览器（0 表示不监视）
+            memory_log_seconds: 每个浏览器记录一次内存占用的间隔（秒，0 表示不记录）
+            progress: 结构化进度输出（可选，每完成一个关键词输出一个 keyword 事件）
         """
         self.headless = headless
         self.screenshot_dir = Path(screenshot_dir)
@@ -44,7 +177,25 @@ class BaiduAdValidator:
         self.mobile = mobile
         self.proxy = proxy
         self.proxy_list = proxy_list or []
-        self.proxy_index = 0  # 当前使用的代理索引
+        self.proxy_pool = proxy_pool or (ProxyPool(self.proxy_list) if self.proxy_list else None)
+        self.proxy_rotate_every = proxy_rotate_every
+        self.rate_controller = rate_controller or AdaptiveRateController(
+            min_interval=pace_range[0], initial_interval=pace_range[1]
+        )
+        self.metrics = metrics or RunMetrics()
+        self.progress = progress or ProgressReporter()
+        self.cache = cache
+        self.journal = journal
+        self.resource_policy = resource_policy
+        self.pace_range = pace_range
+        self.ready_timeout_ms = ready_timeout_ms
+        self.quiet_ms = quiet_ms
+        self.mode = 'mobile' if mobile else 'pc'  # 缓存键中的模式
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.recycle_every = recycle_every
+        self.recycle_rss_mb = recycle_rss_mb
+        self.hang_timeout = hang_timeout
+        self.memory_log_seconds = memory_log_seconds
         
         # 根据模式选择 User-Agent
         if mobile:
@@ -64,44 +215,106 @@ class BaiduAdValidator:
             self.viewport = {'width': 1920, 'height': 1080}
             self.is_mobile = False
         
-        # 需要过滤的平台域名列表
-        # 注意：只需要主域名，子域名会自动匹配（如 item.jd.com 会匹配 jd.com）
-        self.filtered_domains = [
-            'jd.com', 'jd.hk',                    # 京东
-            '1688.com', 'alibaba.com', 'alibaba.com.cn',  # 阿里巴巴/1688
-            'b2b.baidu.com', 'aicaigou.com',      # 爱采购
-            'zhihu.com',                          # 知乎
-            'tmall.com', 'tmall.hk'               # 天猫
-        ]
+        # 需要过滤的平台域名（预先编译成集合，按链接域名的各级后缀查找）
+        self.filtered_domains = list(filtered_domains or DEFAULT_FILTERED_DOMAINS)
+        self.domain_matcher = DomainMatcher(self.filtered_domains)
+        
+        # HTTP 快速通道（与浏览器使用相同的 User-Agent；配置了代理池时每个请求从代理池分配代理）
+        self.http_engine = None
+        if http_first:
+            self.http_engine = BaiduHttpEngine(
+                self.user_agent,
+                mobile=mobile,
+                proxy=None if self.proxy_pool else proxy,
+                base_url=self.base_url
+            )
     
     def get_current_proxy(self) -> Optional[Dict[str, str]]:
         """
-        获取当前使用的代理配置
+        获取浏览器启动时使用的代理配置
+        
+        代理池模式下返回占位代理（Chromium 需要在启动时声明代理，才能为每个上下文单独设置），
+        实际代理由 _open_page() 按上下文分配
         
         Returns:
             代理配置字典，格式：{'server': 'http://host:port'} 或 None
         """
-        proxy_to_use = None
-        
-        # 优先使用代理列表（轮换）
-        if self.proxy_list:
-            if self.proxy_index < len(self.proxy_list):
-                proxy_to_use = self.proxy_list[self.proxy_index]
-                # 下次使用下一个代理（轮换）
-                self.proxy_index = (self.proxy_index + 1) % len(self.proxy_list)
-                logger.info(f"使用代理: {proxy_to_use} (索引: {self.proxy_index - 1 if self.proxy_index > 0 else len(self.proxy_list) - 1}/{len(self.proxy_list)})")
-        # 其次使用单个代理
-        elif self.proxy:
-            proxy_to_use = self.proxy
-        
-        if proxy_to_use:
-            # 确保代理格式正确
-            if not proxy_to_use.startswith(('http://', 'https://', 'socks5://')):
-                proxy_to_use = 'http://' + proxy_to_use
-            return {'server': proxy_to_use}
-        
+        if self.proxy_pool:
+            return {'server': 'http://per-context'}
+        if self.proxy:
+            return {'server': normalize_proxy(self.proxy)}
         return None
     
+    def report_outcome(self, server: Optional[str], result: Dict, elapsed: float):
+        """
+        将搜索结果上报给节奏控制器和代理池（命中缓存时没有请求，不上报；
+        HTTP 快速通道的结果不经过上下文代理，由 try_http_engine() 上报给实际使用的代理），并按引擎记录单个关键词的耗时
+        
+        Args:
+            server: 上下文使用的代理
+            result: 验证结果字典
+            elapsed: 耗时（秒）
+        """
+        engine = result.get("engine") or "playwright"
+        self.metrics.observe(f"keyword_{engine}", elapsed)
+        if engine == "cache":
+            return
+        success = result.get("has_ads") in ("Yes", "No")
+        captcha = bool(result.get("captcha"))
+        if captcha:
+            self.metrics.increment("captcha")
+        self.rate_controller.record(self.rate_key(server), ok=success, pushback=captcha)
+        if self.proxy_pool and server and engine != "http":
+            self.proxy_pool.report(server, success=success, latency=elapsed, captcha=captcha)
+    
+    def needs_new_proxy(self, server: Optional[str], uses: int) -> bool:
+        """
+        判断上下文是否需要换代理（代理已熔断，或达到 proxy_rotate_every）
+        
+        Args:
+            server: 上下文使用的代理
+            uses: 该上下文已验证的关键词数量
+            
+        Returns:
+            True 表示需要关闭上下文并重新分配代理
+        """
+        if not self.proxy_pool or not server:
+            return False
+        if self.proxy_rotate_every and uses >= self.proxy_rotate_every:
+            return True
+        return not self.proxy_pool.is_available(server)
+    
+    def needs_recycle(self, server: Optional[str], uses: int) -> bool:
+        """
+        判断上下文是否需要关闭重建（需要换代理，或已验证 recycle_every 个关键词）
+        
+        Args:
+            server: 上下文使用的代理
+            uses: 该上下文已验证的关键词数量
+            
+        Returns:
+            True 表示需要关闭上下文并重新创建
+        """
+        if self.needs_new_proxy(server, uses):
+            return True
+        if self.recycle_every and uses >= self.recycle_every:
+            self.metrics.increment("context_recycle")
+            return True
+        return False
+    
+    def is_captcha_page(self, page: Page) -> bool:
+        """
+        判断页面是否被重定向到百度安全验证
+        
+        Args:
+            page: Playwright Page 对象
+            
+        Returns:
+            True 表示遇到验证码
+        """
+        url = page.url or ""
+        return 'wappass.baidu.com' in url or 'captcha' in url
+    
     def wait_random(self, min_seconds: float = 2.0, max_seconds: float = 5.0):
         """
         随机等待，模拟真人操作
@@ -113,9 +326,26 @@ class BaiduAdValidator:
         wait_time = random.uniform(min_seconds, max_seconds)
         time.sleep(wait_time)
     
+    def rate_key(self, proxy_server: Optional[str] = None) -> str:
+        """
+        节奏控制的站点标识（使用代理时按代理区分，每个出口 IP 单独控制速率）
+        
+        Args:
+            proxy_server: 上下文使用的代理
+            
+        Returns:
+            站点标识
+        """
+        host = self.home_url.split('://', 1)[1]
+        return f"{host} via {proxy_server}" if proxy_server else host
+    
+    def pace(self, proxy_server: Optional[str] = None):
+        """两次搜索之间的礼貌等待（由节奏控制器决定间隔，与页面就绪等待分开配置）"""
+        self.rate_controller.wait(self.rate_key(proxy_server))
+    
     def extract_domain(self, url: str) -> str:
         """
-        从 URL 中提取域名（支持百度跳转链接）
+        从 URL 中提取域名（支持百度跳转链接，结果有 LRU 缓存）
         
         Args:
             url: 完整的 URL 字符串
@@ -123,79 +353,72 @@ class BaiduAdValidator:
         Returns:
             域名（如：jd.com）
         """
-        try:
-            from urllib.parse import urlparse, parse_qs, unquote
-            real_url = url
-            
-            # 处理百度跳转链接 (https://www.baidu.com/link?url=xxx)
-            if 'link?url=' in url or '/link?url=' in url:
-                try:
-                    parsed = urlparse(url)
-                    query_params = parse_qs(parsed.query)
-                    if 'url' in query_params:
-                        # 获取真实链接（可能需要URL解码）
-                        real_url = unquote(query_params['url'][0])
-                    elif 'url=' in url:
-                        # 备用方法：直接从字符串中提取
-                        parts = url.split('url=')
-                        if len(parts) > 1:
-                            real_url = unquote(parts[1].split('&')[0])
-                except Exception:
-                    # 如果解析失败，尝试简单字符串提取
-                    if 'url=' in url:
-                        try:
-                            real_url = unquote(url.split('url=')[1].split('&')[0])
-                        except:
-                            pass
-            
-            # 解析真实URL的域名
-            parsed = urlparse(real_url)
-            domain = parsed.netloc.lower()
-            
-            # 移除 www. 前缀
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            # 处理端口号（如 jd.com:443）
-            if ':' in domain:
-                domain = domain.split(':')[0]
-            
-            return domain
-        except Exception as e:
-            logger.debug(f"提取域名失败: {url} - {str(e)}")
-            return ""
+        return extract_domain(url)
     
     def is_filtered_platform(self, url: str) -> bool:
         """
         判断链接是否来自需要过滤的平台
         
+        支持精确匹配和子域名匹配（如 item.jd.com 匹配 jd.com），
+        域名提取失败时退回到 URL 字符串匹配
+        
         Args:
             url: 广告链接
             
         Returns:
             True 如果是需要过滤的平台，False 否则
         """
-        domain = self.extract_domain(url)
-        if not domain:
-            # 如果提取域名失败，尝试直接从 URL 中检查（备用方案）
-            url_lower = url.lower()
-            for filtered in self.filtered_domains:
-                if filtered in url_lower:
-                    logger.debug(f"通过URL字符串匹配过滤: {filtered} in {url}")
-                    return True
-            return False
+        matched = self.domain_matcher.match_url(url)
+        if matched:
+            logger.debug(f"匹配过滤域名: {url} -> {matched}")
+            return True
+        return False
+    
+    def search_url_for(self, keyword: str) -> str:
+        """
+        生成关键词的搜索结果页 URL（根据模式选择 PC 端或移动端）
         
-        # 检查是否匹配任何过滤域名
-        # 支持精确匹配和子域名匹配（如 item.jd.com 匹配 jd.com）
-        for filtered in self.filtered_domains:
-            if domain == filtered:
-                logger.debug(f"精确匹配过滤域名: {domain} == {filtered}")
-                return True
-            elif domain.endswith('.' + filtered):
-                logger.debug(f"子域名匹配过滤域名: {domain} ends with .{filtered}")
-                return True
+        Args:
+            keyword: 关键词
+            
+        Returns:
+            搜索结果页 URL
+        """
+        return f"{self.home_url}/s?wd={quote(keyword)}"
+    
+    @property
+    def home_url(self) -> str:
+        """百度首页地址（根据模式选择 PC 端或移动端；指定 base_url 时使用 base_url）"""
+        if self.base_url:
+            return self.base_url
+        return "https://m.baidu.com" if self.is_mobile else "https://www.baidu.com"
+    
+    def wait_for_serp_ready(self, page: Page, keyword: str) -> bool:
+        """
+        等待搜索结果页就绪（条件等待，代替固定延时）
         
-        return False
+        先等待结果容器挂载，再等待结果数量稳定且 DOM 在 quiet_ms 内没有变化；
+        每一步都有超时上限，DOM 一直变化时超时后直接继续。
+        
+        Args:
+            page: Playwright Page 对象
+            keyword: 当前关键词（用于日志）
+            
+        Returns:
+            结果容器是否出现
+        """
+        try:
+            page.wait_for_selector("#content_left, .s_main, .result", state="attached",
+                                   timeout=self.ready_timeout_ms)
+        except PlaywrightTimeoutError:
+            return False
+        
+        try:
+            page.wait_for_function(SERP_READY_JS, arg={'quietMs': self.quiet_ms},
+                                   timeout=self.ready_timeout_ms, polling=100)
+        except PlaywrightTimeoutError:
+            logger.debug(f"结果页 DOM 持续变化，超时后继续: {keyword}")
+        return True
     
     def search_keyword(self, page: Page, keyword: str, use_direct_url: bool = False) -> bool:
         """
@@ -212,26 +435,14 @@ class BaiduAdValidator:
         try:
             if use_direct_url:
                 # 方法2: 直接使用 URL 参数搜索（更稳定，避免交互问题）
-                from urllib.parse import quote
-                encoded_keyword = quote(keyword)
-                # 根据模式选择百度搜索URL
-                if self.is_mobile:
-                    search_url = f"https://m.baidu.com/s?wd={encoded_keyword}"
-                else:
-                    search_url = f"https://www.baidu.com/s?wd={encoded_keyword}"
-                page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
-                page.wait_for_timeout(2000)
+                self.metrics.increment("direct_url_fallback")
+                with self.metrics.timer("goto"):
+                    page.goto(self.search_url_for(keyword), timeout=30000, wait_until="domcontentloaded")
             else:
                 # 方法1: 通过首页搜索框搜索（更接近真实用户行为）
                 # 访问百度首页（根据模式选择PC端或移动端）
-                if self.is_mobile:
-                    baidu_url = "https://m.baidu.com"
-                else:
-                    baidu_url = "https://www.baidu.com"
-                page.goto(baidu_url, timeout=30000, wait_until="domcontentloaded")
-                
-                # 等待页面加载
-                page.wait_for_timeout(2000)
+                with self.metrics.timer("goto"):
+                    page.goto(self.home_url, timeout=30000, wait_until="domcontentloaded")
                 
                 # 尝试定位搜索框（优先检查可见性）
                 try:
@@ -244,16 +455,15 @@ class BaiduAdValidator:
                     return self.search_keyword(page, keyword, use_direct_url=True)
                 
                 # 如果搜索框可见，正常输入和搜索
+                typing_started = time.perf_counter()
                 try:
                     # 模拟鼠标移动到搜索框
                     box = search_input.bounding_box()
                     if box:
                         page.mouse.move(box['x'] + box['width']/2, box['y'] + box['height']/2)
-                        page.wait_for_timeout(200)
                     
                     # 点击搜索框使其获得焦点
                     search_input.click(timeout=2000)
-                    page.wait_for_timeout(300)  # 增加等待时间，让页面响应
                 except:
                     pass
                 
@@ -262,22 +472,30 @@ class BaiduAdValidator:
                     # Playwright 的 type 方法（注意：需要先聚焦元素）
                     search_input.focus()
                     page.keyboard.type(keyword, delay=random.randint(50, 150))  # 模拟打字延迟
-                    page.wait_for_timeout(300)
                 except:
                     # 如果 type 失败，回退到 fill
                     try:
                         search_input.fill(keyword)
-                        page.wait_for_timeout(300)
                     except:
                         # 如果 fill 也失败，使用 JavaScript 直接设置值
-                        page.evaluate(f"""
-                            const input = document.querySelector('#kw');
-                            if (input) {{
-                                input.value = '{keyword}';
-                                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            }}
-                        """)
-                        page.wait_for_timeout(300)
+                        page.evaluate("""
+                            (value) => {
+                                const input = document.querySelector('#kw');
+                                if (input) {
+                                    input.value = value;
+                                    input.dispatchEvent(new Event('input', { bubbles: true }));
+                                }
+                            }
+                        """, keyword)
+                
+                # 等待输入框的值与关键词一致（代替固定等待）
+                try:
+                    page.wait_for_function(
+                        "(value) => { const input = document.querySelector('#kw'); return !!input && input.value === value; }",
+                        arg=keyword, timeout=2000, polling=50
+                    )
+                except PlaywrightTimeoutError:
+                    logger.debug(f"输入框内容未确认，继续提交: {keyword}")
                 
                 # 点击搜索按钮或按回车
                 search_button = page.query_selector("#su")
@@ -287,7 +505,6 @@ class BaiduAdValidator:
                         box = search_button.bounding_box()
                         if box:
                             page.mouse.move(box['x'] + box['width']/2, box['y'] + box['height']/2)
-                            page.wait_for_timeout(200)
                         
                         search_button.click()
                     except:
@@ -295,23 +512,18 @@ class BaiduAdValidator:
                         search_input.press("Enter")
                 else:
                     search_input.press("Enter")
+                self.metrics.observe_since("type", typing_started)
             
-            # 等待搜索结果页加载
-            try:
-                # 等待搜索结果容器出现
-                page.wait_for_selector("#content_left, .s_main, .result", timeout=20000)
-            except PlaywrightTimeoutError:
+            # 等待搜索结果页就绪
+            with self.metrics.timer("wait_results"):
+                ready = self.wait_for_serp_ready(page, keyword)
+            if not ready:
                 # 如果容器未出现，检查 URL 是否已跳转
-                page.wait_for_timeout(3000)
-                if "baidu.com/s" not in page.url and not use_direct_url:
+                if not use_direct_url:
                     logger.warning(f"搜索结果页加载异常，尝试直接 URL 方式: {keyword}")
                     return self.search_keyword(page, keyword, use_direct_url=True)
-                elif not is_search_page:
-                    logger.error(f"搜索结果页加载失败: {keyword}")
-                    return False
-            
-            # 额外等待，确保广告标签渲染完成
-            page.wait_for_timeout(2000)
+                logger.error(f"搜索结果页加载失败: {keyword}")
+                return False
             
             return True
             
@@ -330,10 +542,66 @@ class BaiduAdValidator:
                 return self.search_keyword(page, keyword, use_direct_url=True)
             return False
     
+    def collect_ads(self, serp_items: List[Dict]) -> List[Dict[str, str]]:
+        """
+        从页面提取的搜索结果中筛选广告（过滤平台广告，最多保留3个）
+        
+        Args:
+            serp_items: SERP_EXTRACT_JS 返回的结果列表
+            
+        Returns:
+            广告信息列表，格式: [{"title": "广告标题", "link": "广告链接"}, ...]
+        """
+        ad_info_list = []
+        for item in serp_items:
+            if not item.get('is_ad'):
+                continue
+            
+            title = (item.get('title') or '').strip()
+            link = item.get('link') or ''
+            
+            # 处理相对链接
+            if link.startswith('/'):
+                link = f"https://www.baidu.com{link}"
+            
+            # 注意：百度跳转链接会在 is_filtered_platform() 中自动解析和处理
+            if not (title and link):
+                continue
+            
+            # 检查是否需要过滤该平台
+            if self.is_filtered_platform(link):
+                logger.info(f"过滤平台广告: {title[:30]}... - {link[:80]}")
+                continue
+            
+            ad_info_list.append({
+                "title": title,
+                "link": link
+            })
+            if len(ad_info_list) >= 3:  # 只取前3个
+                break
+        
+        return ad_info_list
+    
+    def screenshot_path_for(self, keyword: str) -> Path:
+        """
+        生成关键词对应的截图路径（移除文件名中的特殊字符）
+        
+        Args:
+            keyword: 关键词
+            
+        Returns:
+            截图文件路径
+        """
+        safe_filename = "".join(c for c in keyword if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        return self.screenshot_dir / f"{safe_filename}.png"
+    
     def detect_ads(self, page: Page, keyword: str) -> Tuple[bool, List[Dict[str, str]]]:
         """
         检测搜索结果中的广告
         
+        通过 SERP_EXTRACT_JS 在页面内一次性完成结果分类，
+        Python 端只负责平台过滤和截图。
+        
         Args:
             page: Playwright Page 对象
             keyword: 当前搜索的关键词（用于截图文件名）
@@ -342,76 +610,24 @@ class BaiduAdValidator:
             (是否有广告, 广告信息列表)
             广告信息格式: [{"title": "广告标题", "link": "广告链接"}, ...]
         """
-        has_ads = False
         ad_info_list = []
         
         try:
-            # 方法1: 查找包含"广告"文本的元素
-            # 百度的广告通常有一个包含"广告"的 span 或标签
-            ad_labels = page.query_selector_all('span:has-text("广告"), .ad-label, .ad-text, [class*="ad"] span:has-text("广告")')
-            
-            # 方法2: 查找带有特定 class 的广告结果容器
-            # 百度广告结果通常有特定的 class，如 "c-container" 且包含 "广告" 标识
-            ad_containers = page.query_selector_all('.c-container')
-            
-            # 更精确的方法：查找结果项，检查其内部是否包含"广告"标识
-            result_items = page.query_selector_all('#content_left .c-container, #content_left .result')
-            
-            found_ad_count = 0
-            for item in result_items[:10]:  # 只检查前10个结果
-                try:
-                    # 获取整个结果项的文本内容
-                    item_text = item.inner_text()
-                    
-                    # 检查是否包含"广告"标识
-                    if "广告" in item_text or "推广" in item_text:
-                        # 提取广告标题和链接
-                        title_elem = item.query_selector('h3 a, .t a, a[href]')
-                        link_elem = item.query_selector('a[href]')
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.inner_text().strip()
-                            link = link_elem.get_attribute('href') or ""
-                            
-                            # 处理相对链接
-                            if link.startswith('/'):
-                                link = f"https://www.baidu.com{link}"
-                            
-                            # 注意：百度跳转链接会在 is_filtered_platform() 中自动解析和处理
-                            
-                            if title and link:
-                                # 检查是否需要过滤该平台
-                                if self.is_filtered_platform(link):
-                                    logger.info(f"过滤平台广告: {title[:30]}... - {link[:80]}")
-                                    continue  # 跳过该广告
-                                
-                                ad_info_list.append({
-                                    "title": title,
-                                    "link": link
-                                })
-                                found_ad_count += 1
-                                
-                                if found_ad_count >= 3:  # 只取前3个
-                                    break
-                                    
-                except Exception as e:
-                    # 某个结果项解析失败，继续下一个
-                    continue
-            
-            has_ads = len(ad_info_list) > 0
+            with self.metrics.timer("extract"):
+                serp_items = page.evaluate(SERP_EXTRACT_JS)
+            ad_info_list = self.collect_ads(serp_items)
             
             # 如果有广告，保存截图
-            if has_ads:
+            if ad_info_list:
                 try:
-                    # 清理文件名（移除特殊字符）
-                    safe_filename = "".join(c for c in keyword if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    screenshot_path = self.screenshot_dir / f"{safe_filename}.png"
-                    
-                    # 滚动到页面顶部，确保截图完整
-                    page.evaluate("window.scrollTo(0, 0)")
-                    page.wait_for_timeout(500)
+                    screenshot_path = self.screenshot_path_for(keyword)
                     
-                    page.screenshot(path=str(screenshot_path), full_page=False)
+                    with self.metrics.timer("screenshot"):
+                        # 滚动到页面顶部，确保截图完整
+                        page.evaluate("window.scrollTo(0, 0)")
+                        page.wait_for_timeout(500)
+                        
+                        page.screenshot(path=str(screenshot_path), full_page=False)
                     logger.info(f"已保存截图: {screenshot_path}")
                 except Exception as e:
                     logger.warning(f"截图保存失败: {keyword} - {str(e)}")
@@ -419,7 +635,7 @@ class BaiduAdValidator:
         except Exception as e:
             logger.error(f"检测广告时出错: {keyword} - {str(e)}")
         
-        return has_ads, ad_info_list
+        return len(ad_info_list) > 0, ad_info_list
     
     def validate_keyword(self, page: Page, keyword: str, index: int, total: int) -> Dict:
         """
@@ -436,348 +652,905 @@ class BaiduAdValidator:
         """
         logger.info(f"[{index}/{total}] 搜索: {keyword}")
         
+        # 优先读取缓存（有效期内直接返回，不打开搜索页）
+        cached_result = self.get_cached_result(keyword)
+        if cached_result is not None:
+            logger.info(f"[{index}/{total}] ⚡ {keyword} -> 命中缓存: {cached_result['has_ads']}")
+            return cached_result
+        
+        # HTTP 快速通道（失败时继续走浏览器）
+        http_result = self.try_http_engine(keyword, index, total)
+        if http_result is not None:
+            return http_result
+        
         # 搜索关键词
-        search_success = self.search_keyword(page, keyword)
+        with self.metrics.timer("search"):
+            search_success = self.search_keyword(page, keyword)
         
         if not search_success:
+            self.metrics.increment("search_failed")
             return {
                 "keyword": keyword,
                 "has_ads": "Error",
-                "ad_info_list": []
+                "ad_info_list": [],
+                "captcha": self.is_captcha_page(page)
             }
         
-        # 随机等待，模拟真人操作
-        self.wait_random(2, 5)
-        
         # 检测广告
-        has_ads, ad_info_list = self.detect_ads(page, keyword)
+        with self.metrics.timer("detect"):
+            has_ads, ad_info_list = self.detect_ads(page, keyword)
+        
+        # 浏览器拿到的 Cookies 同步给 HTTP 快速通道，降低后续请求触发验证码的概率
+        if self.http_engine:
+            try:
+                self.http_engine.load_cookies(page.context.cookies())
+            except Exception:
+                pass
         
+        return self.build_result(keyword, ad_info_list, index, total, engine="playwright")
+    
+    def build_result(self, keyword: str, ad_info_list: List[Dict[str, str]], index: int, total: int,
+                     engine: str) -> Dict:
+        """
+        根据过滤后的广告列表生成验证结果并写入缓存
+        
+        Args:
+            keyword: 关键词
+            ad_info_list: collect_ads() 返回的广告信息列表
+            index: 当前索引（从1开始）
+            total: 总数量
+            engine: 提供结果的引擎（'http' / 'playwright'）
+            
+        Returns:
+            验证结果字典
+        """
         # 格式化结果 - 使用列表格式，后续会分开列显示
         # 注意：如果所有广告都被过滤掉（ad_info_list为空），则标记为"No"
-        if has_ads and len(ad_info_list) > 0:
+        if ad_info_list:
             logger.info(f"[{index}/{total}] ✓ {keyword} -> 发现广告！({len(ad_info_list)}个)")
-            # 保存为列表格式，方便后续分开列显示
-            return {
+            result = {
                 "keyword": keyword,
                 "has_ads": "Yes",
-                "ad_info_list": ad_info_list  # 保存为列表
+                "ad_info_list": ad_info_list,  # 保存为列表
+                "engine": engine
             }
         else:
-            if has_ads and len(ad_info_list) == 0:
-                logger.info(f"[{index}/{total}] ✗ {keyword} -> 广告已过滤（全部为平台广告）")
-            else:
-                logger.info(f"[{index}/{total}] ✗ {keyword} -> 无广告")
-            return {
+            logger.info(f"[{index}/{total}] ✗ {keyword} -> 无广告")
+            result = {
                 "keyword": keyword,
                 "has_ads": "No",
-                "ad_info_list": []  # 空列表
+                "ad_info_list": [],  # 空列表
+                "engine": engine
             }
+        
+        self.store_result(result)
+        return result
     
-    def validate_batch(self, keywords: List[str]) -> List[Dict]:
+    def try_http_engine(self, keyword: str, index: int, total: int) -> Optional[Dict]:
         """
-        批量验证关键词
+        通过 HTTP 快速通道验证关键词（未启用或需要回退时返回 None）
+        
+        HTTP 通道不打开浏览器，因此不会保存广告截图。
+        配置了代理池时每个请求单独分配代理，并把结果（成功/失败/验证码）上报给代理池，
+        页面已返回但无法解析时不计入代理的健康度。
         
         Args:
-            keywords: 关键词列表
+            keyword: 关键词
+            index: 当前索引（从1开始）
+            total: 总数量
             
         Returns:
-            验证结果列表
+            验证结果字典，或 None（由调用方改用浏览器）
         """
-        results = []
-        total = len(keywords)
+        if not self.http_engine:
+            return None
         
-        with sync_playwright() as p:
-            # 获取当前使用的代理
-            current_proxy = self.get_current_proxy()
-            
-            # 启动浏览器（增强反反爬配置）
-            browser = p.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',  # 隐藏自动化特征
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process'
-                ],
-                proxy=current_proxy  # 设置代理
-            )
+        server = self.proxy_pool.acquire() if self.proxy_pool else self.http_engine.proxy
+        started = time.perf_counter()
+        try:
+            with self.metrics.timer("http_fetch"):
+                serp_items, outcome = self.http_engine.fetch(keyword, server)
+        finally:
+            if self.proxy_pool:
+                self.proxy_pool.release(server)
+        if self.proxy_pool and outcome in ('served', 'failed', 'captcha'):
+            self.proxy_pool.report(server, success=outcome == 'served',
+                                   latency=time.perf_counter() - started, captcha=outcome == 'captcha')
+        if serp_items is None:
+            self.metrics.increment("http_fallback")
+            logger.info(f"[{index}/{total}] HTTP 快速通道不可用，改用浏览器: {keyword}")
+            return None
+        
+        return self.build_result(keyword, self.collect_ads(serp_items), index, total, engine="http")
+    
+    def get_cached_result(self, keyword: str) -> Optional[Dict]:
+        """
+        读取关键词的缓存结果（未配置缓存时返回 None）
+        
+        Args:
+            keyword: 关键词
             
-            # 创建新页面（增强反反爬配置）
-            context_options = {
-                'user_agent': self.user_agent,
-                'viewport': self.viewport,
-                'locale': 'zh-CN',
-                'timezone_id': 'Asia/Shanghai',
-                'permissions': ['geolocation'],
-                'geolocation': {'latitude': 39.9042, 'longitude': 116.4074},  # 北京坐标
-                'color_scheme': 'light'
-            }
+        Returns:
+            带 engine='cache' 标记的验证结果字典，或 None
+        """
+        if not self.cache:
+            return None
+        
+        cached = self.cache.get(keyword, self.mode)
+        if cached is None:
+            return None
+        
+        return {
+            "keyword": keyword,
+            "has_ads": cached["has_ads"],
+            "ad_info_list": cached["ad_info_list"],
+            "engine": "cache"
+        }
+    
+    def store_result(self, result: Dict):
+        """
+        将验证结果写入缓存（错误结果不缓存）
+        
+        Args:
+            result: 验证结果字典
+        """
+        if self.cache and result.get("has_ads") in ("Yes", "No"):
+            self.cache.put(result["keyword"], self.mode, result["has_ads"], result.get("ad_info_list", []))
+    
+    def record_result(self, result: Dict, elapsed: Optional[float] = None):
+        """
+        将关键词的最终结果追加到运行日志（未配置日志时忽略），计入运行指标并输出进度事件
+        
+        Args:
+            result: 验证结果字典
+            elapsed: 该关键词的耗时（秒，可选）
+        """
+        has_ads = result.get('has_ads', 'Error')
+        self.metrics.increment(f"result_{str(has_ads).lower()}")
+        self.progress.advance(
+            'keyword', group=self.mode, label=has_ads,
+            keyword=result.get("keyword"),
+            mode=self.mode,
+            has_ads=has_ads,
+            engine=result.get("engine", "playwright"),
+            seconds=round(elapsed, 3) if elapsed is not None else None,
+            ads=result.get("ad_info_list", [])
+        )
+        if not self.journal:
+            return
+        try:
+            self.journal.append({
+                "keyword": result["keyword"],
+                "mode": self.mode,
+                "has_ads": result.get("has_ads", "Error"),
+                "ad_info_list": result.get("ad_info_list", []),
+                "engine": result.get("engine", "playwright"),
+                "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+            })
+        except Exception as e:
+            logger.warning(f"写入运行日志失败: {result.get('keyword')} - {str(e)}")
+    
+    def _launch_browser(self, playwright, proxy: Optional[Dict[str, str]] = None,
+                        marker: Optional[str] = None):
+        """
+        启动浏览器（增强反反爬配置）
+        
+        Args:
+            playwright: Playwright 实例
+            proxy: 代理配置（get_current_proxy() 的返回值）
+            marker: 浏览器实例标记（写入启动参数，用于统计内存和结束挂起的浏览器）
             
-            # 移动端额外配置
-            if self.is_mobile:
-                context_options['is_mobile'] = True
-                context_options['has_touch'] = True
-                context_options['device_scale_factor'] = 3
-                context_options['screen'] = self.viewport
-            
-            context = browser.new_context(**context_options)
-            
-            # 注入 JavaScript 来隐藏自动化特征
-            context.add_init_script("""
-                // 隐藏 webdriver 特征
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // 覆盖 plugins 和 languages
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['zh-CN', 'zh', 'en']
-                });
-                
-                // 覆盖 permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-                
-                // 覆盖 chrome 对象
-                window.chrome = {
-                    runtime: {}
-                };
-            """)
+        Returns:
+            Browser 对象
+        """
+        return playwright.chromium.launch(
+            headless=self.headless,
+            args=self._launch_args(marker),
+            proxy=proxy  # 设置代理
+        )
+    
+    def _launch_args(self, marker: Optional[str] = None) -> List[str]:
+        """
+        浏览器启动参数
+        
+        Args:
+            marker: 浏览器实例标记
+            
+        Returns:
+            启动参数列表
+        """
+        args = [
+            '--disable-blink-features=AutomationControlled',  # 隐藏自动化特征
+            '--disable-dev-shm-usage',
+            '--no-sandbox',
+            '--disable-setuid-sandbox',
+            '--disable-web-security',
+            '--disable-features=IsolateOrigins,site-per-process'
+        ]
+        if marker:
+            args.append(marker_arg(marker))
+        return args
+    
+    def _context_options(self) -> Dict:
+        """
+        构建浏览器上下文配置（PC/移动端）
+        
+        Returns:
+            browser.new_context() 的参数字典
+        """
+        context_options = {
+            'user_agent': self.user_agent,
+            'viewport': self.viewport,
+            'locale': 'zh-CN',
+            'timezone_id': 'Asia/Shanghai',
+            'permissions': ['geolocation'],
+            'geolocation': {'latitude': 39.9042, 'longitude': 116.4074},  # 北京坐标
+            'color_scheme': 'light'
+        }
+        
+        # 移动端额外配置
+        if self.is_mobile:
+            context_options['is_mobile'] = True
+            context_options['has_touch'] = True
+            context_options['device_scale_factor'] = 3
+            context_options['screen'] = self.viewport
+        
+        return context_options
+    
+    def _new_page(self, browser, proxy: Optional[Dict[str, str]] = None) -> Page:
+        """
+        创建新的上下文和页面（增强反反爬配置）
+        
+        Args:
+            browser: Browser 对象
+            proxy: 上下文级代理（代理池模式下每个上下文独立代理）
             
-            page = context.new_page()
+        Returns:
+            Page 对象
+        """
+        context_options = self._context_options()
+        if proxy:
+            context_options['proxy'] = proxy
+        context = browser.new_context(**context_options)
+        
+        # 注入 JavaScript 来隐藏自动化特征
+        context.add_init_script(STEALTH_INIT_SCRIPT)
+        
+        page = context.new_page()
+        
+        # 拦截非必要资源（图片、字体、统计埋点等）
+        if self.resource_policy:
+            self.resource_policy.install(context, page)
+        
+        return page
+    
+    def _open_page(self, browser) -> Tuple[Page, Optional[str]]:
+        """
+        从代理池分配代理并创建页面（未配置代理池时使用浏览器级代理）
+        
+        Args:
+            browser: Browser 对象
             
+        Returns:
+            (Page 对象, 分配的代理地址)
+        """
+        server = self.proxy_pool.acquire() if self.proxy_pool else None
+        if server:
+            logger.info(f"使用代理: {server}")
+        try:
+            return self._new_page(browser, ProxyPool.to_playwright(server)), server
+        except Exception:
+            if self.proxy_pool:
+                self.proxy_pool.release(server)
+            raise
+    
+    def _close_page(self, page: Page, server: Optional[str]):
+        """
+        关闭页面所在的上下文并归还代理
+        
+        Args:
+            page: Page 对象
+            server: _open_page() 分配的代理地址
+        """
+        try:
+            page.context.close()
+        except Exception:
+            pass
+        if self.proxy_pool:
+            self.proxy_pool.release(server)
+    
+    def validate_batch(self, keywords: Iterable[str], workers: int = 1, max_retries: int = 1,
+                       total: Optional[int] = None) -> List[Dict]:
+        """
+        批量验证关键词
+        
+        Args:
+            keywords: 关键词列表或按需读取的关键词迭代器（读取过程中即开始验证）
+            workers: 并发工作者数量（>1 时启用浏览器池，每个工作者独立浏览器和代理）
+            max_retries: 出错关键词换其他工作者重试的最大次数（仅并发模式）
+            total: 关键词总数（用于进度显示；迭代器输入时为估算值）
+            
+        Returns:
+            验证结果列表（与输入顺序一致）
+        """
+        if total is None and hasattr(keywords, '__len__'):
+            total = len(keywords)
+        total = total or 0
+        
+        if workers > 1 and total != 1:
+            return self._validate_batch_parallel(keywords, min(workers, total) if total else workers,
+                                                 max_retries, total)
+        
+        results = []
+        keyword_iter = iter(keywords)
+        next_keyword = next(keyword_iter, None)
+        watchdog = BrowserWatchdog(self.hang_timeout).start() if self.hang_timeout else None
+        
+        with sync_playwright() as p:
+            session = BrowserSession(self, p, "browser")
             try:
-                for index, keyword in enumerate(keywords, 1):
-                    try:
-                        result = self.validate_keyword(page, keyword, index, total)
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(f"处理关键词时出错: {keyword} - {str(e)}")
-                        results.append({
-                            "keyword": keyword,
-                            "has_ads": "Error",
-                            "ad_info_list": []
-                        })
+                session.launch()
+                index = 0
+                while next_keyword is not None:
+                    keyword = next_keyword
+                    next_keyword = next(keyword_iter, None)
+                    index += 1
+                    # 估算的总数偏小时按已处理数量显示
+                    total = max(total, index)
                     
-                    # 每次搜索后随机等待（最后一次不需要）
-                    if index < total:
-                        self.wait_random(2, 5)
+                    # 浏览器挂起时重启浏览器，重试一次
+                    for attempt in range(2):
+                        started = time.perf_counter()
+                        result, hung = self._validate_watched(session, watchdog, keyword, index, total)
+                        if not hung:
+                            break
+                        session.restart("页面无响应")
+                        if attempt == 0:
+                            logger.warning(f"浏览器挂起，已重启，重新验证: {keyword}")
+                    results.append(result)
+                    self.record_result(result, time.perf_counter() - started)
+                    
+                    # 上报节奏控制器和代理健康度，按需换代理、回收上下文或重启浏览器
+                    self.report_outcome(session.proxy_server, result, time.perf_counter() - started)
+                    session.after_keyword(has_next=next_keyword is not None)
+                    
+                    # 每次搜索后随机等待（最后一次和命中缓存时不需要）
+                    if next_keyword is not None and result.get("engine") != "cache":
+                        self.pace(session.proxy_server)
                         
             finally:
-                browser.close()
+                session.close()
+                if watchdog:
+                    watchdog.stop()
         
         return results
+    
+    def _validate_watched(self, session: "BrowserSession", watchdog: Optional[BrowserWatchdog],
+                          keyword: str, index: int, total: int) -> Tuple[Dict, bool]:
+        """
+        在会话页面上验证关键词（配置了看门狗时监视挂起）
+        
+        Args:
+            session: 浏览器会话
+            watchdog: 看门狗（可选）
+            keyword: 关键词
+            index: 当前索引（从1开始）
+            total: 总数量
+            
+        Returns:
+            (验证结果字典, 浏览器是否挂起或崩溃)
+        """
+        if watchdog:
+            watchdog.begin(session.name, session.marker, keyword)
+        try:
+            result = self.validate_keyword(session.page, keyword, index, total)
+        except Exception as e:
+            logger.error(f"[{session.name}] 处理关键词时出错: {keyword} - {str(e)}")
+            result = {
+                "keyword": keyword,
+                "has_ads": "Error",
+                "ad_info_list": []
+            }
+        finally:
+            killed = watchdog.end(session.name) if watchdog else False
+        
+        hung = killed or not session.is_alive()
+        if hung:
+            self.metrics.increment("browser_hang")
+        return result, hung
+    
+    def _validate_batch_parallel(self, keywords: Iterable[str], workers: int, max_retries: int,
+                                 total: int = 0) -> List[Dict]:
+        """
+        并发批量验证（浏览器池模式）
+        
+        每个工作者在独立线程中运行自己的 Playwright 实例和浏览器，
+        并从代理池中分配独立代理（代理熔断时工作者自动换代理）。关键词由主线程边读取边放入共享队列
+        （队列保持少量积压），出错的关键词会放回队列，交给尚未尝试过的工作者重试。
+        
+        Args:
+            keywords: 关键词列表或迭代器
+            workers: 工作者数量
+            max_retries: 出错关键词的最大重试次数
+            total: 关键词总数（用于进度显示，可以是估算值）
+            
+        Returns:
+            验证结果列表（与输入顺序一致）
+        """
+        submitted: List[str] = []
+        results: Dict[int, Dict] = {}
+        # 队列元素: (索引, 关键词, 已尝试过的工作者集合)
+        task_queue = queue.Queue()
+        
+        lock = threading.Lock()
+        stop_event = threading.Event()
+        alive_workers = set(range(workers))
+        remaining = [0]
+        feeding_done = [False]
+        hung_indexes = set()  # 浏览器挂起过的关键词（只重新排队一次）
+        watchdog = BrowserWatchdog(self.hang_timeout).start() if self.hang_timeout else None
+        
+        def finish(index: int, result: Dict, elapsed: Optional[float] = None):
+            self.record_result(result, elapsed)
+            with lock:
+                results[index] = result
+                remaining[0] -= 1
+                if feeding_done[0] and remaining[0] <= 0:
+                    stop_event.set()
+        
+        def progress_total() -> int:
+            return max(total, len(submitted))
+        
+        def has_untried_worker(tried: frozenset) -> bool:
+            with lock:
+                return any(w not in tried for w in alive_workers)
+        
+        def first_hang(index: int) -> bool:
+            with lock:
+                if index in hung_indexes:
+                    return False
+                hung_indexes.add(index)
+                return True
+        
+        def worker(worker_id: int):
+            in_flight = None  # 当前处理中的任务（工作者异常退出时放回队列）
+            try:
+                with sync_playwright() as p:
+                    session = BrowserSession(self, p, f"worker-{worker_id}")
+                    try:
+                        session.launch()
+                        while not stop_event.is_set():
+                            try:
+                                index, keyword, tried = task_queue.get(timeout=0.5)
+                            except queue.Empty:
+                                continue
+                            in_flight = (index, keyword, tried)
+                            
+                            # 该关键词已在本工作者上失败过，优先让给其他工作者
+                            if worker_id in tried and has_untried_worker(tried):
+                                task_queue.put((index, keyword, tried))
+                                in_flight = None
+                                time.sleep(0.2)
+                                continue
+                            
+                            started = time.perf_counter()
+                            result, hung = self._validate_watched(session, watchdog, keyword, index + 1,
+                                                                  progress_total())
+                            
+                            # 浏览器挂起或崩溃：重启浏览器，关键词重新排队一次
+                            if hung:
+                                if first_hang(index):
+                                    logger.warning(f"[worker-{worker_id}] 浏览器挂起，关键词重新排队: {keyword}")
+                                    task_queue.put((index, keyword, tried))
+                                else:
+                                    self.report_outcome(session.proxy_server, result, time.perf_counter() - started)
+                                    finish(index, result, time.perf_counter() - started)
+                                in_flight = None
+                                session.restart("页面无响应")
+                                continue
+                            
+                            self.report_outcome(session.proxy_server, result, time.perf_counter() - started)
+                            
+                            tried = tried | {worker_id}
+                            if result.get("has_ads") == "Error" and len(tried) <= max_retries and has_untried_worker(tried):
+                                logger.info(f"[worker-{worker_id}] 关键词出错，交给其他工作者重试: {keyword}")
+                                self.metrics.increment("retry")
+                                task_queue.put((index, keyword, tried))
+                            else:
+                                finish(index, result, time.perf_counter() - started)
+                            in_flight = None
+                            
+                            # 按需换代理、回收上下文或重启浏览器
+                            session.after_keyword(has_next=not stop_event.is_set())
+                            
+                            # 每次搜索后随机等待（命中缓存时不需要）
+                            if not stop_event.is_set() and result.get("engine") != "cache":
+                                self.pace(session.proxy_server)
+                    finally:
+                        session.close()
+            except Exception as e:
+                logger.error(f"[worker-{worker_id}] 工作者异常退出: {str(e)}")
+            finally:
+                with lock:
+                    alive_workers.discard(worker_id)
+                if in_flight is not None:
+                    task_queue.put(in_flight)
+        
+        threads = []
+        for worker_id in range(workers):
+            thread = threading.Thread(target=worker, args=(worker_id,),
+                                      name=f"baidu-worker-{worker_id}", daemon=True)
+            threads.append(thread)
+        
+        logger.info(f"启动 {workers} 个并发工作者...")
+        for thread in threads:
+            thread.start()
+        
+        def workers_exited() -> bool:
+            with lock:
+                if not alive_workers:
+                    logger.error("所有工作者均已退出，剩余关键词标记为错误")
+                    return True
+            return False
+        
+        try:
+            # 边读取边派发，队列积压超过工作者数量的两倍时暂停读取
+            for keyword in keywords:
+                while task_queue.qsize() >= workers * 2 and not stop_event.is_set():
+                    time.sleep(0.1)
+                    if workers_exited():
+                        stop_event.set()
+                if stop_event.is_set():
+                    break
+                with lock:
+                    remaining[0] += 1
+                    submitted.append(keyword)
+                    task_queue.put((len(submitted) - 1, keyword, frozenset()))
+            
+            with lock:
+                feeding_done[0] = True
+                if remaining[0] <= 0:
+                    stop_event.set()
+            
+            while not stop_event.wait(1.0):
+                if workers_exited():
+                    break
+        except KeyboardInterrupt:
+            stop_event.set()
+            raise
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join(timeout=30)
+            if watchdog:
+                watchdog.stop()
+        
+        return [
+            results.get(index) or {
+                "keyword": keyword,
+                "has_ads": "Error",
+                "ad_info_list": []
+            }
+            for index, keyword in enumerate(submitted)
+        ]
 
 
-def load_keywords_from_excel(file_path: str = "keywords.xlsx", column_name: str = "Keyword") -> List[str]:
+class BrowserSession:
+    """
+    一个工作者使用的浏览器和页面
+    每个关键词之后按需回收上下文（换代理或达到 recycle_every）或重启浏览器（内存超过 recycle_rss_mb），
+    并定期记录浏览器的内存占用
     """
-    从 Excel 文件加载关键词
     
-    Args:
-        file_path: Excel 文件路径
-        column_name: 关键词列名
+    def __init__(self, validator: BaiduAdValidator, playwright, name: str):
+        """
+        初始化浏览器会话（不启动浏览器，调用 launch() 启动）
         
-    Returns:
-        关键词列表
-    """
-    try:
-        df = pd.read_excel(file_path)
+        Args:
+            validator: 验证器
+            playwright: Playwright 实例
+            name: 工作者名称（用于日志和看门狗）
+        """
+        self.validator = validator
+        self.playwright = playwright
+        self.name = name
+        self.browser = None
+        self.page: Optional[Page] = None
+        self.proxy_server: Optional[str] = None
+        self.marker: Optional[str] = None
+        self.uses = 0                # 当前上下文已验证的关键词数量
+        self.browser_uses = 0        # 当前浏览器已验证的关键词数量
+        self.restarts = 0
+        self.last_memory_log = 0.0
+    
+    def launch(self):
+        """启动浏览器并创建页面"""
+        self.marker = uuid.uuid4().hex[:12]
+        self.browser = self.validator._launch_browser(self.playwright, self.validator.get_current_proxy(),
+                                                      marker=self.marker)
+        self.browser_uses = 0
+        self.last_memory_log = time.monotonic()
+        self.open_page()
+    
+    def open_page(self):
+        """创建新的上下文和页面（从代理池分配代理）"""
+        self.page, self.proxy_server = self.validator._open_page(self.browser)
+        self.uses = 0
+    
+    def close_page(self):
+        """关闭当前上下文并归还代理"""
+        if self.page is not None:
+            self.validator._close_page(self.page, self.proxy_server)
+        elif self.validator.proxy_pool:
+            self.validator.proxy_pool.release(self.proxy_server)
+        self.page = None
+        self.proxy_server = None
+    
+    def close(self):
+        """关闭浏览器"""
+        self.close_page()
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+    
+    def restart(self, reason: str):
+        """
+        重启浏览器
+        
+        Args:
+            reason: 重启原因（写入日志）
+        """
+        before = self.rss()
+        self.close()
+        self.restarts += 1
+        self.launch()
+        logger.warning(f"[{self.name}] 已重启浏览器（{reason}），内存 {format_mb(before)} -> {format_mb(self.rss())}")
+    
+    def is_alive(self) -> bool:
+        """浏览器是否仍然连接"""
+        try:
+            return self.browser is not None and self.browser.is_connected()
+        except Exception:
+            return False
+    
+    def rss(self) -> Optional[int]:
+        """浏览器主进程及其渲染进程的常驻内存（字节）"""
+        return marked_tree_rss(marker_arg(self.marker)) if self.marker else None
+    
+    def after_keyword(self, has_next: bool = True):
+        """
+        每验证一个关键词后调用：记录内存，按需重启浏览器或回收上下文
+        
+        Args:
+            has_next: 是否还有下一个关键词（没有时只记录，不回收）
+        """
+        validator = self.validator
+        self.uses += 1
+        self.browser_uses += 1
         
-        if column_name not in df.columns:
-            raise ValueError(f"Excel 文件中未找到列 '{column_name}'。可用列: {list(df.columns)}")
+        now = time.monotonic()
+        log_due = validator.memory_log_seconds and now - self.last_memory_log >= validator.memory_log_seconds
+        rss = self.rss() if (validator.recycle_rss_mb or log_due) else None
+        if log_due:
+            self.last_memory_log = now
+            logger.info(f"[{self.name}] 浏览器内存: {format_mb(rss)}"
+                        f"（本浏览器已验证 {self.browser_uses} 个关键词，上下文 {self.uses} 个）")
         
-        # 去除空值和重复
-        keywords = df[column_name].dropna().drop_duplicates().tolist()
+        if not has_next:
+            return
+        
+        if validator.recycle_rss_mb and rss is not None and rss > validator.recycle_rss_mb * 1024 * 1024:
+            validator.metrics.increment("browser_recycle_memory")
+            self.restart(f"内存 {format_mb(rss)} 超过 {validator.recycle_rss_mb:g} MB")
+            return
+        
+        if validator.needs_recycle(self.proxy_server, self.uses):
+            self.close_page()
+            self.open_page()
+
+
+def load_journal_results(journal_path: str, mode: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    从运行日志读取每个关键词的最新结果
+    
+    Args:
+        journal_path: 运行日志文件路径
+        mode: 只读取该模式（'pc' / 'mobile'）的记录，None 表示不区分模式
         
-        # 转换为字符串并去除空白
-        keywords = [str(k).strip() for k in keywords if str(k).strip()]
+    Returns:
+        {关键词: 验证结果字典}（同一关键词以最后一条记录为准）
+    """
+    results = {}
+    for record in read_journal(journal_path):
+        keyword = record.get("keyword")
+        if keyword is None:
+            continue
+        if mode and record.get("mode", mode) != mode:
+            continue
+        results[keyword] = {
+            "keyword": keyword,
+            "has_ads": record.get("has_ads", "Error"),
+            "ad_info_list": record.get("ad_info_list", []),
+            "engine": record.get("engine", "")
+        }
+    return results
+
+
+def load_completed_keywords(journal_path: str, modes: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    从运行日志读取已完成（结果为 Yes / No）的关键词，断点续跑时跳过
+    
+    Args:
+        journal_path: 运行日志文件路径
+        modes: 双模式时的模式列表（如 ['pc', 'mobile']），None 表示单模式
         
-        logger.info(f"成功加载 {len(keywords)} 个关键词")
-        return keywords
+    Returns:
+        {关键词: 验证结果字典}（双模式时只包含所有模式都已完成的关键词，结果取第一个模式）
+    """
+    completed = None
+    for mode in (modes or [None]):
+        mode_completed = {
+            keyword: result for keyword, result in load_journal_results(journal_path, mode).items()
+            if result["has_ads"] in ("Yes", "No")
+        }
+        # 双模式时两种模式都完成才跳过
+        completed = mode_completed if completed is None else {
+            keyword: result for keyword, result in completed.items() if keyword in mode_completed
+        }
+    return completed
+
+
+def load_keywords_from_excel(file_path: str = "keywords.xlsx", column_name: str = "Keyword",
+                             canonicalize: bool = True) -> List[str]:
+    """
+    从 Excel 文件加载关键词（一次性读取全部；大文件请直接使用 KeywordSource 按块读取）
+    
+    Args:
+        file_path: 输入文件路径（.xlsx / .csv / .parquet）
+        column_name: 关键词列名
+        canonicalize: 是否规范化关键词（全角/半角、大小写、空格和标点不同的写法合并为一个）
         
+    Returns:
+        关键词列表（去除空值、首尾空白和重复）
+    """
+    try:
+        return list(KeywordSource(file_path, column_name, canonicalize=canonicalize))
     except FileNotFoundError:
-        logger.error(f"文件未找到: {file_path}")
         raise
     except Exception as e:
-        logger.error(f"读取 Excel 文件时出错: {str(e)}")
+        logger.error(f"读取关键词文件时出错: {str(e)}")
         raise
 
 
-def save_results_to_excel(original_file: str, results: List[Dict], output_file: str = "keywords_validated.xlsx"):
+def save_results_to_excel(original_file: str, results: List[Dict], output_file: str = "keywords_validated.xlsx",
+                          column_name: str = "Keyword", canonicalize: bool = True,
+                          modes: Optional[List[str]] = None):
     """
-    保存验证结果到 Excel 文件
-    将每个广告的标题和链接分开列显示，方便查看和点击
+    保存验证结果（逐行拼接到原始表格后写出，单次写入）
+    将每个广告的标题和链接分开列显示；Excel 输出的链接列直接写成可点击的超链接，
+    输出文件扩展名为 .csv / .parquet 时跳过 Excel
     
     Args:
         original_file: 原始 Excel 文件路径
         results: 验证结果列表（包含 ad_info_list）
         output_file: 输出文件路径
+        column_name: 关键词列名（按该列拼接结果）
+        canonicalize: 是否按规范化后的关键词拼接（同一关键词的所有写法变体都写入结果）
+        modes: 多模式验证时的模式列表（每个关键词一行，Has_Ads_PC / Has_Ads_Mobile 等列）
     """
     try:
-        # 读取原始数据
-        original_df = pd.read_excel(original_file)
-        
-        # 处理结果数据：将广告信息分开列
-        processed_results = []
-        for result in results:
-            processed_result = {
-                "keyword": result.get("keyword", ""),
-                "Has_Ads": result.get("has_ads", "No")
-            }
-            
-            # 处理广告列表，最多3个广告
-            ad_info_list = result.get("ad_info_list", [])
-            
-            # 为每个广告创建独立的列（Ad_Title_1, Ad_Link_1, Ad_Title_2, Ad_Link_2, Ad_Title_3, Ad_Link_3）
-            for i in range(1, 4):  # 最多3个广告
-                if i <= len(ad_info_list):
-                    ad = ad_info_list[i - 1]
-                    processed_result[f"Ad_Title_{i}"] = ad.get("title", "")
-                    processed_result[f"Ad_Link_{i}"] = ad.get("link", "")
-                else:
-                    processed_result[f"Ad_Title_{i}"] = ""
-                    processed_result[f"Ad_Link_{i}"] = ""
-            
-            processed_results.append(processed_result)
-        
-        # 创建结果 DataFrame
-        results_df = pd.DataFrame(processed_results)
-        
-        # 将结果合并到原始数据
-        # 使用关键词作为匹配键
-        merged_df = original_df.merge(
-            results_df,
-            left_on="Keyword",
-            right_on="keyword",
-            how="left"
-        )
-        
-        # 清理列名（删除重复的 keyword 列）
-        if 'keyword' in merged_df.columns and 'Keyword' in merged_df.columns:
-            merged_df = merged_df.drop(columns=['keyword'])
-        
-        # 使用 openpyxl 引擎，支持超链接
-        from openpyxl import load_workbook
-        from openpyxl.styles import Font
-        
-        # 先保存为 Excel
-        merged_df.to_excel(output_file, index=False, engine='openpyxl')
-        
-        # 读取工作簿，为链接列添加超链接格式
-        wb = load_workbook(output_file)
-        ws = wb.active
-        
-        # 找到所有 Ad_Link_ 列
-        header_row = 1
-        link_columns = {}
-        for col_idx, cell in enumerate(ws[header_row], start=1):
-            if cell.value and isinstance(cell.value, str) and cell.value.startswith("Ad_Link_"):
-                link_columns[cell.value] = col_idx
-        
-        # 为链接单元格添加超链接和蓝色字体
-        link_font = Font(color="0563C1", underline="single")
-        for row_idx in range(2, ws.max_row + 1):
-            for col_name, col_idx in link_columns.items():
-                cell = ws.cell(row=row_idx, column=col_idx)
-                if cell.value and str(cell.value).strip():
-                    url = str(cell.value).strip()
-                    # 添加超链接
-                    cell.hyperlink = url
-                    cell.font = link_font
-                    # 将链接文本改为更友好的格式（可选：显示为"点击查看"）
-                    # cell.value = "点击查看"  # 如果想隐藏URL，取消注释这行
-        
-        wb.save(output_file)
-        logger.info(f"结果已保存到: {output_file}（链接已格式化为可点击的超链接）")
+        rows = write_results(original_file, results, output_file, column_name, canonicalize, modes)
+        logger.info(f"结果已保存到: {output_file}（{rows} 行）")
         
     except Exception as e:
         logger.error(f"保存结果时出错: {str(e)}")
-        # 如果合并失败，直接保存结果（不带超链接格式）
+        # 如果拼接失败，直接保存结果（不带原始表格的其他列）
         try:
-            processed_results = []
-            for result in results:
-                processed_result = {
-                    "keyword": result.get("keyword", ""),
-                    "Has_Ads": result.get("has_ads", "No")
-                }
-                ad_info_list = result.get("ad_info_list", [])
-                for i in range(1, 4):
-                    if i <= len(ad_info_list):
-                        ad = ad_info_list[i - 1]
-                        processed_result[f"Ad_Title_{i}"] = ad.get("title", "")
-                        processed_result[f"Ad_Link_{i}"] = ad.get("link", "")
-                    else:
-                        processed_result[f"Ad_Title_{i}"] = ""
-                        processed_result[f"Ad_Link_{i}"] = ""
-                processed_results.append(processed_result)
-            
-            results_df = pd.DataFrame(processed_results)
-            results_df.to_excel(output_file, index=False)
+            write_results(None, results, output_file, modes=modes)
             logger.info(f"已保存简化结果到: {output_file}")
         except Exception as e2:
             logger.error(f"保存简化结果也失败: {str(e2)}")
 
 
-def load_proxy_list(file_path: str) -> List[str]:
-    """
-    从文件加载代理列表（每行一个代理地址）
-    
-    Args:
-        file_path: 代理列表文件路径
-        
-    Returns:
-        代理地址列表
-    """
-    proxies = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):  # 忽略空行和注释
-                    proxies.append(line)
-        logger.info(f"成功加载 {len(proxies)} 个代理地址")
-    except FileNotFoundError:
-        logger.error(f"代理列表文件未找到: {file_path}")
-    except Exception as e:
-        logger.error(f"读取代理列表文件时出错: {str(e)}")
-    
-    return proxies
-
-
 def main():
     """主函数"""
     import argparse
     
     parser = argparse.ArgumentParser(description='百度竞价关键词商业价值验证工具')
-    parser.add_argument('--input', '-i', default='keywords.xlsx', help='输入 Excel 文件路径 (默认: keywords.xlsx)')
-    parser.add_argument('--output', '-o', default='keywords_validated.xlsx', help='输出 Excel 文件路径 (默认: keywords_validated.xlsx)')
+    parser.add_argument('--input', '-i', default='keywords.xlsx', help='输入文件路径，支持 .xlsx / .csv / .parquet (默认: keywords.xlsx)')
+    parser.add_argument('--output', '-o', default='keywords_validated.xlsx',
+                        help='输出文件路径，扩展名决定格式: .xlsx / .csv / .parquet（需要 pyarrow）(默认: keywords_validated.xlsx)')
     parser.add_argument('--column', '-c', default='Keyword', help='关键词列名 (默认: Keyword)')
+    parser.add_argument('--no-canonicalize', action='store_true',
+                        help='不规范化关键词（默认全角/半角、大小写、多余空格和中英文标点不同的写法只验证一次）')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='每次从输入文件读取的关键词数量 (默认: 1000)')
     parser.add_argument('--headless', action='store_true', help='无头模式运行（不显示浏览器窗口）')
     parser.add_argument('--screenshots', '-s', default='scripts/screenshots', help='截图保存目录 (默认: scripts/screenshots)')
+    parser.add_argument('--mobile', action='store_true', help='移动端模式（模拟手机访问）')
+    parser.add_argument('--modes',
+                        help='验证模式，逗号分隔: pc / mobile / pc,mobile。同时指定两种模式时共用一个浏览器，'
+                             '每个关键词在 PC 和移动端并发验证，结果输出为 Has_Ads_PC / Has_Ads_Mobile 列（使用 async 引擎）')
+    parser.add_argument('--proxy', help='代理服务器地址（格式：http://host:port 或 socks5://host:port）')
+    parser.add_argument('--proxy-list', help='代理列表文件路径（每行一个代理地址，按健康度分配，失败的代理自动冷却）')
+    parser.add_argument('--proxy-cooldown', type=float, default=300, help='代理熔断后的首次冷却秒数，之后每次翻倍 (默认: 300)')
+    parser.add_argument('--proxy-rotate-every', type=int, default=0, help='每个代理最多连续验证多少个关键词，0 表示只在熔断时更换 (默认: 0)')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='并发工作者数量，每个工作者独立浏览器和代理 (默认: 1)')
+    parser.add_argument('--max-retries', type=int, default=1, help='出错关键词换其他工作者重试的次数 (默认: 1)')
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync',
+                        help='浏览器驱动引擎: sync(同步，可配合 --workers) / async(单进程异步并发) (默认: sync)')
+    parser.add_argument('--concurrency', type=int, default=8, help='async 引擎同时在途的搜索数量 (默认: 8)')
+    parser.add_argument('--cache-file', default='temp/baidu_ad_cache.sqlite3', help='结果缓存文件路径 (默认: temp/baidu_ad_cache.sqlite3)')
+    parser.add_argument('--cache-ttl', type=float, default=0, help='缓存有效期（小时），0 表示不使用缓存 (默认: 0)')
+    parser.add_argument('--refresh', action='store_true', help='忽略已有缓存重新验证（结果仍写入缓存）')
+    parser.add_argument('--journal', help='运行日志路径，每完成一个关键词追加一条记录 (默认: <输出文件>.journal.jsonl)')
+    parser.add_argument('--resume', action='store_true', help='断点续跑：跳过运行日志中已完成的关键词')
+    parser.add_argument('--no-block-resources', action='store_true', help='不拦截图片/字体/视频/统计埋点等非必要请求')
+    parser.add_argument('--pace-min', type=float, default=2.0, help='两次搜索之间的最小间隔秒数（响应正常时逐步提速到该值）(默认: 2)')
+    parser.add_argument('--pace-max', type=float, default=5.0, help='两次搜索之间的初始间隔秒数 (默认: 5)')
+    parser.add_argument('--pace-ceiling', type=float, default=60.0, help='遇到验证码后降速的间隔上限秒数 (默认: 60)')
+    parser.add_argument('--ready-timeout', type=float, default=20.0, help='等待搜索结果页就绪的超时上限（秒）(默认: 20)')
+    parser.add_argument('--quiet-ms', type=int, default=500, help='结果页 DOM 保持不变多少毫秒视为渲染完成 (默认: 500)')
+    parser.add_argument('--screenshot-resources', action='store_true', help='放行截图需要的图片和字体（其余资源仍拦截）')
+    parser.add_argument('--block-baseline-every', type=int, default=20,
+                        help='每多少次页面加载做一次不拦截的对照采样，用于实测拦截节省的加载时间和流量，0 表示不采样 (默认: 20)')
+    parser.add_argument('--filtered-domains-file',
+                        help='追加需要过滤的平台域名（每行一个，子域名自动匹配，# 开头为注释）')
+    parser.add_argument('--http-first', action='store_true',
+                        help='优先用 HTTP 请求解析搜索结果页，遇到验证码或解析失败时回退到浏览器（HTTP 结果不保存截图）')
+    parser.add_argument('--recycle-every', type=int, default=100,
+                        help='每个浏览器上下文最多验证多少个关键词后关闭重建，0 表示不按数量回收 (默认: 100)')
+    parser.add_argument('--recycle-rss-mb', type=float, default=1500,
+                        help='单个浏览器（含渲染进程）内存超过多少 MB 时重启浏览器，0 表示不检查 (默认: 1500)')
+    parser.add_argument('--hang-timeout', type=float, default=180,
+                        help='单个关键词超过多少秒视为浏览器挂起，结束并重启浏览器后重新排队，0 表示不监视 (默认: 180)')
+    parser.add_argument('--memory-log-interval', type=float, default=60,
+                        help='记录浏览器内存占用的间隔秒数，0 表示不记录 (默认: 60)')
+    parser.add_argument('--base-url', help='替代百度首页的站点地址（如 serp_stub_server.py 启动的本地桩服务）')
+    parser.add_argument('--metrics-dir',
+                        help='运行指标输出目录：各阶段耗时 p50/p95/p99 和回退/错误次数，写入 JSON 摘要和 Prometheus textfile')
+    parser.add_argument('--metrics-interval', type=float, default=30.0, help='运行期间导出运行指标的间隔秒数 (默认: 30)')
+    add_progress_arguments(parser)
     
     args = parser.parse_args()
     
+    # 验证模式：只指定一种时等同于 --mobile 开关，两种时为双模式
+    modes = None
+    if args.modes:
+        requested = [m.strip().lower() for m in args.modes.split(',') if m.strip()]
+        unknown = [m for m in requested if m not in ('pc', 'mobile')]
+        if unknown or not requested:
+            parser.error(f"--modes 只支持 pc 和 mobile: {args.modes}")
+        requested = list(dict.fromkeys(requested))
+        if len(requested) == 1:
+            args.mobile = requested[0] == 'mobile'
+        else:
+            from baidu_ad_validator_dual import DUAL_MODES
+            modes = list(DUAL_MODES)
+    
     logger.info("=" * 60)
     logger.info("百度竞价关键词商业价值验证工具")
     logger.info("=" * 60)
+    warn_if_unavailable(args.recycle_rss_mb, args.hang_timeout)
+    
+    journal_path = args.journal or f"{args.output}.journal.jsonl"
+    journal = None
+    
+    # 运行指标（指定输出目录时运行期间定期导出，结束时再导出一次）
+    metrics = RunMetrics()
+    if args.metrics_dir:
+        metrics.start_periodic_export(args.metrics_dir, args.metrics_interval)
+    
+    # 结构化进度事件（--progress-format jsonl 时写到 --progress-fd）
+    progress = reporter_from_args(args)
+    run_started = time.perf_counter()
     
     try:
-        # 加载关键词
-        keywords = load_keywords_from_excel(args.input, args.column)
-        
-        if not keywords:
-            logger.error("未找到有效关键词，程序退出")
-            return
+        # 关键词按块读取（边读取边验证）
+        source = KeywordSource(args.input, args.column, chunk_size=args.chunk_size,
+                               canonicalize=not args.no_canonicalize)
         
         # 加载代理列表（如果指定了文件）
         proxy_list = None
@@ -786,44 +1559,203 @@ def main():
             if not proxy_list:
                 logger.warning("代理列表为空，将不使用代理")
         
+        # 运行日志（断点续跑时跳过已完成的关键词，错误结果会重新验证）
+        completed = {}
+        if args.resume:
+            completed = load_completed_keywords(journal_path, modes)
+            logger.info(f"从运行日志恢复: {journal_path}（已完成 {len(completed)} 个关键词）")
+        journal = JsonlJournal(journal_path, resume=args.resume)
+        pending_keywords = (k for chunk in source.iter_chunks() for k in chunk if k not in completed)
+        
+        # 预读第一个待验证关键词（同时检查输入文件和关键词列）
+        first_keyword = next(pending_keywords, None)
+        if first_keyword is None and not source.keywords:
+            logger.error("未找到有效关键词，程序退出")
+            progress.emit('error', message="未找到有效关键词")
+            return
+        estimated_total = max(0, (source.estimate_total() or 0) - len(completed))
+        progress.total = estimated_total
+        progress.emit('start', total=estimated_total, resumed=len(completed),
+                      modes=modes or ['mobile' if args.mobile else 'pc'], input=args.input, output=args.output)
+        
+        # 结果缓存（指定有效期时启用）
+        cache = None
+        if args.cache_ttl > 0:
+            cache = KeywordResultCache(args.cache_file, ttl_seconds=args.cache_ttl * 3600, refresh=args.refresh)
+            logger.info(f"使用结果缓存: {args.cache_file}（有效期 {args.cache_ttl:g} 小时{'，强制刷新' if args.refresh else ''}）")
+        
+        # 请求拦截策略（默认开启，节省代理带宽）
+        resource_policy = None
+        if not args.no_block_resources:
+            resource_policy = ResourcePolicy(
+                allow_types=SCREENSHOT_RESOURCE_TYPES if args.screenshot_resources else None,
+                baseline_every=args.block_baseline_every
+            )
+        
+        # 代理池（按健康度分配，失败或频繁验证码的代理自动冷却）
+        proxy_pool = ProxyPool(proxy_list, cooldown_seconds=args.proxy_cooldown) if proxy_list else None
+        
+        # 过滤域名列表（默认列表 + 配置文件）
+        filtered_domains = list(DEFAULT_FILTERED_DOMAINS)
+        if args.filtered_domains_file:
+            extra_domains = load_domain_list(args.filtered_domains_file)
+            filtered_domains.extend(extra_domains)
+            logger.info(f"从 {args.filtered_domains_file} 追加 {len(extra_domains)} 个过滤域名")
+        
+        # 请求节奏控制（AIMD：响应正常时提速，遇到验证码时成倍降速）
+        rate_controller = AdaptiveRateController(
+            min_interval=args.pace_min,
+            initial_interval=max(args.pace_min, args.pace_max),
+            max_interval=max(args.pace_min, args.pace_max, args.pace_ceiling)
+        )
+        
         # 创建验证器
-        validator = BaiduAdValidator(
+        validator_options = dict(
             headless=args.headless,
             screenshot_dir=args.screenshots,
             proxy=args.proxy,
             mobile=args.mobile,
-            proxy_list=proxy_list
+            proxy_list=proxy_list,
+            cache=cache,
+            journal=journal,
+            resource_policy=resource_policy,
+            pace_range=(args.pace_min, max(args.pace_min, args.pace_max)),
+            ready_timeout_ms=int(args.ready_timeout * 1000),
+            quiet_ms=args.quiet_ms,
+            http_first=args.http_first,
+            filtered_domains=filtered_domains,
+            proxy_pool=proxy_pool,
+            proxy_rotate_every=args.proxy_rotate_every,
+            rate_controller=rate_controller,
+            metrics=metrics,
+            base_url=args.base_url,
+            recycle_every=args.recycle_every,
+            recycle_rss_mb=args.recycle_rss_mb,
+            hang_timeout=args.hang_timeout,
+            memory_log_seconds=args.memory_log_interval,
+            progress=progress
         )
+        if modes:
+            from baidu_ad_validator_dual import DualModeValidator
+            validator = DualModeValidator(concurrency=args.concurrency, **validator_options)
+            validators = list(validator.validators.values())
+        elif args.engine == 'async':
+            from baidu_ad_validator_async import AsyncBaiduAdValidator
+            validator = AsyncBaiduAdValidator(concurrency=args.concurrency, **validator_options)
+            validators = [validator]
+        else:
+            validator = BaiduAdValidator(**validator_options)
+            validators = [validator]
         
-        if args.mobile:
+        if modes:
+            logger.info("双模式验证：PC + 移动端（共用一个浏览器，每个关键词两种模式并发）")
+        elif args.mobile:
             logger.info("使用移动端模式（模拟手机访问）")
         if args.proxy or proxy_list:
-            logger.info(f"使用代理: {args.proxy or f'{len(proxy_list)}个代理轮换'}")
+            logger.info(f"使用代理: {args.proxy or f'代理池 {len(proxy_pool)} 个代理'}")
+        if not modes and args.engine == 'sync' and args.workers > 1:
+            logger.info(f"并发模式: {args.workers} 个工作者")
+        if args.http_first:
+            logger.info("HTTP 快速通道已启用（验证码或解析失败时回退到浏览器）")
         
         # 批量验证
-        logger.info(f"开始验证 {len(keywords)} 个关键词...")
-        results = validator.validate_batch(keywords)
+        if first_keyword is None:
+            logger.info("所有关键词均已完成，直接生成结果文件")
+        else:
+            logger.info(f"开始验证关键词（预计约 {estimated_total} 个）...")
+            pending_keywords = itertools.chain([first_keyword], pending_keywords)
+            if modes or args.engine == 'async':
+                asyncio.run(validator.validate_batch(pending_keywords, total=estimated_total))
+            else:
+                validator.validate_batch(pending_keywords, workers=args.workers, max_retries=args.max_retries,
+                                         total=estimated_total)
+        journal.close()
+        
+        # 从运行日志构建最终结果（包含之前运行中已完成的关键词）
+        mode_results = {}
+        for mode in (modes or [None]):
+            journal_results = load_journal_results(journal_path, mode)
+            mode_results[mode] = [
+                journal_results.get(keyword, {"keyword": keyword, "has_ads": "Error", "ad_info_list": []})
+                for keyword in source.keywords
+            ]
+        if modes:
+            # 每个关键词合并为一行
+            results = [
+                {"keyword": keyword, "modes": {mode: mode_results[mode][i] for mode in modes}}
+                for i, keyword in enumerate(source.keywords)
+            ]
+        else:
+            results = mode_results[None]
         
         # 保存结果
-        save_results_to_excel(args.input, results, args.output)
+        progress.phase('save', 'start', output=args.output)
+        save_results_to_excel(args.input, results, args.output, args.column, canonicalize=source.canonicalize,
+                              modes=modes)
+        progress.phase('save', 'end', output=args.output, keywords=len(source.keywords))
         
         # 统计结果
-        yes_count = sum(1 for r in results if r.get('has_ads') == 'Yes')
-        no_count = sum(1 for r in results if r.get('has_ads') == 'No')
-        error_count = sum(1 for r in results if r.get('has_ads') == 'Error')
-        
         logger.info("=" * 60)
         logger.info("验证完成！")
-        logger.info(f"总计: {len(results)} 个关键词")
-        logger.info(f"有广告: {yes_count} 个")
-        logger.info(f"无广告: {no_count} 个")
-        logger.info(f"错误: {error_count} 个")
+        logger.info(f"总计: {len(source.keywords)} 个关键词")
+        mode_counts = {}
+        for mode, mode_list in mode_results.items():
+            prefix = f"[{'PC' if mode == 'pc' else '移动端'}] " if mode else ""
+            yes_count = sum(1 for r in mode_list if r.get('has_ads') == 'Yes')
+            no_count = sum(1 for r in mode_list if r.get('has_ads') == 'No')
+            error_count = sum(1 for r in mode_list if r.get('has_ads') == 'Error')
+            logger.info(f"{prefix}有广告: {yes_count} 个")
+            logger.info(f"{prefix}无广告: {no_count} 个")
+            logger.info(f"{prefix}错误: {error_count} 个")
+            mode_counts[mode or ('mobile' if args.mobile else 'pc')] = {
+                'Yes': yes_count, 'No': no_count, 'Error': error_count
+            }
+        progress.emit('done', keywords=len(source.keywords), counts=mode_counts, output=args.output,
+                      searches_saved=source.searches_saved, seconds=round(time.perf_counter() - run_started, 3))
+        if source.searches_saved:
+            logger.info(f"去重节省搜索: {source.searches_saved} 次（输入 {source.rows} 行，"
+                        f"其中写法不同的变体 {source.variants} 行，结果已写回每一行）")
+            metrics.increment("searches_saved", source.searches_saved)
+        engine_counts = {}
+        for mode_list in mode_results.values():
+            for r in mode_list:
+                if r.get('engine'):
+                    engine_counts[r['engine']] = engine_counts.get(r['engine'], 0) + 1
+        if engine_counts:
+            logger.info("结果来源: " + ', '.join(f"{k}={v}" for k, v in sorted(engine_counts.items())))
+        for v in validators:
+            if v.http_engine:
+                stats = v.http_engine.stats
+                logger.info(f"HTTP 快速通道（{v.mode}）: 成功 {stats['served']} 次，验证码回退 {stats['captcha']} 次，"
+                            f"其他回退 {stats['failed']} 次")
+                v.http_engine.close()
+        if resource_policy:
+            resource_policy.log_summary()
+        if proxy_pool:
+            proxy_pool.log_summary()
+        rate_controller.log_summary()
+        metrics.log_summary()
+        if cache:
+            logger.info(f"缓存命中率: {cache.hits}/{cache.hits + cache.misses} ({cache.hit_rate:.1%})")
+            cache.close()
         logger.info("=" * 60)
         
     except KeyboardInterrupt:
         logger.info("\n用户中断，程序退出")
+        progress.emit('error', message="用户中断", interrupted=True)
+        if journal:
+            logger.info(f"已完成的进度保存在 {journal_path}，使用 --resume 可以继续")
     except Exception as e:
         logger.error(f"程序执行出错: {str(e)}", exc_info=True)
+        progress.emit('error', message=str(e))
+    finally:
+        progress.close()
+        if journal:
+            journal.close()
+        if args.metrics_dir:
+            metrics.stop_periodic_export()
+            metrics.export(args.metrics_dir)
+            logger.info(f"运行指标已导出到: {args.metrics_dir}")
 
 
 if __name__ == "__main__":
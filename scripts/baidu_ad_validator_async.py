@@ -0,0 +1,504 @@
+"""
+百度竞价关键词商业价值验证工具（asyncio 版本）
+基于 playwright.async_api，在单个进程内并发驱动多个页面，
+通过信号量限制同时在途的搜索数量
+"""
+
+import time
+import uuid
+import asyncio
+import random
+import logging
+from typing import List, Dict, Optional, Tuple, Iterable
+
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+
+from baidu_ad_validator import BaiduAdValidator, SERP_EXTRACT_JS, SERP_READY_JS, STEALTH_INIT_SCRIPT
+from proxy_pool import ProxyPool
+from process_stats import marked_tree_rss, format_mb
+from browser_watchdog import marker_arg
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaiduAdValidator(BaiduAdValidator):
+    """百度广告验证器（异步并发版本）"""
+
+    def __init__(self, *args, concurrency: int = 8, **kwargs):
+        """
+        初始化验证器
+
+        Args:
+            concurrency: 同时在途的搜索数量上限（信号量大小）
+            其余参数同 BaiduAdValidator
+        """
+        super().__init__(*args, **kwargs)
+        self.concurrency = max(1, concurrency)
+
+    async def wait_random(self, min_seconds: float = 2.0, max_seconds: float = 5.0):
+        """
+        随机等待（异步，不阻塞其他页面）
+
+        Args:
+            min_seconds: 最小等待时间（秒）
+            max_seconds: 最大等待时间（秒）
+        """
+        await asyncio.sleep(random.uniform(min_seconds, max_seconds))
+
+    async def _launch_browser(self, playwright, proxy: Optional[Dict[str, str]] = None,
+                              marker: Optional[str] = None):
+        """
+        启动浏览器（增强反反爬配置）
+
+        Args:
+            playwright: Playwright 实例
+            proxy: 代理配置（get_current_proxy() 的返回值）
+            marker: 浏览器实例标记（用于统计内存）
+
+        Returns:
+            Browser 对象
+        """
+        return await playwright.chromium.launch(
+            headless=self.headless,
+            args=self._launch_args(marker),
+            proxy=proxy
+        )
+
+    async def _validate_with_timeout(self, page: Page, keyword: str, index: int, total: int) -> Dict:
+        """
+        验证单个关键词（配置了 hang_timeout 时超时抛出 asyncio.TimeoutError）
+        """
+        if not self.hang_timeout:
+            return await self.validate_keyword(page, keyword, index, total)
+        return await asyncio.wait_for(self.validate_keyword(page, keyword, index, total), self.hang_timeout)
+
+    async def _new_page(self, browser, proxy: Optional[Dict[str, str]] = None) -> Page:
+        """
+        创建新的上下文和页面
+
+        Args:
+            browser: Browser 对象
+            proxy: 上下文级代理（代理列表模式下每个上下文独立代理）
+
+        Returns:
+            Page 对象
+        """
+        context_options = self._context_options()
+        if proxy:
+            context_options['proxy'] = proxy
+        context = await browser.new_context(**context_options)
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
+        page = await context.new_page()
+        if self.resource_policy:
+            await self.resource_policy.install_async(context, page)
+        return page
+
+    async def _open_page(self, browser) -> Tuple[Page, Optional[str]]:
+        """
+        从代理池分配代理并创建页面（行为同 BaiduAdValidator._open_page）
+
+        Returns:
+            (Page 对象, 分配的代理地址)
+        """
+        server = self.proxy_pool.acquire() if self.proxy_pool else None
+        try:
+            return await self._new_page(browser, ProxyPool.to_playwright(server)), server
+        except Exception:
+            if self.proxy_pool:
+                self.proxy_pool.release(server)
+            raise
+
+    async def _close_page(self, page: Page, server: Optional[str]):
+        """关闭页面所在的上下文并归还代理"""
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+        if self.proxy_pool:
+            self.proxy_pool.release(server)
+
+    async def pace(self, proxy_server: Optional[str] = None):
+        """两次搜索之间的礼貌等待（异步，由节奏控制器决定间隔）"""
+        await self.rate_controller.wait_async(self.rate_key(proxy_server))
+
+    async def wait_for_serp_ready(self, page: Page, keyword: str) -> bool:
+        """
+        等待搜索结果页就绪（行为同 BaiduAdValidator.wait_for_serp_ready）
+
+        Args:
+            page: Playwright Page 对象
+            keyword: 当前关键词（用于日志）
+
+        Returns:
+            结果容器是否出现
+        """
+        try:
+            await page.wait_for_selector("#content_left, .s_main, .result", state="attached",
+                                         timeout=self.ready_timeout_ms)
+        except PlaywrightTimeoutError:
+            return False
+
+        try:
+            await page.wait_for_function(SERP_READY_JS, arg={'quietMs': self.quiet_ms},
+                                         timeout=self.ready_timeout_ms, polling=100)
+        except PlaywrightTimeoutError:
+            logger.debug(f"结果页 DOM 持续变化，超时后继续: {keyword}")
+        return True
+
+    async def search_keyword(self, page: Page, keyword: str, use_direct_url: bool = False) -> bool:
+        """
+        在百度搜索关键词（行为同 BaiduAdValidator.search_keyword）
+
+        Args:
+            page: Playwright Page 对象
+            keyword: 要搜索的关键词
+            use_direct_url: 是否直接使用 URL 参数搜索（备选方案）
+
+        Returns:
+            是否成功加载搜索结果页
+        """
+        try:
+            if use_direct_url:
+                self.metrics.increment("direct_url_fallback")
+                with self.metrics.timer("goto"):
+                    await page.goto(self.search_url_for(keyword), timeout=30000, wait_until="domcontentloaded")
+            else:
+                with self.metrics.timer("goto"):
+                    await page.goto(self.home_url, timeout=30000, wait_until="domcontentloaded")
+
+                try:
+                    search_input = await page.wait_for_selector("#kw", state="visible", timeout=5000)
+                except PlaywrightTimeoutError:
+                    logger.info(f"搜索框不可见，改用直接 URL 方式: {keyword}")
+                    return await self.search_keyword(page, keyword, use_direct_url=True)
+
+                typing_started = time.perf_counter()
+                try:
+                    box = await search_input.bounding_box()
+                    if box:
+                        await page.mouse.move(box['x'] + box['width']/2, box['y'] + box['height']/2)
+                    await search_input.click(timeout=2000)
+                except Exception:
+                    pass
+
+                try:
+                    await search_input.focus()
+                    await page.keyboard.type(keyword, delay=random.randint(50, 150))
+                except Exception:
+                    try:
+                        await search_input.fill(keyword)
+                    except Exception:
+                        await page.evaluate("""
+                            (value) => {
+                                const input = document.querySelector('#kw');
+                                if (input) {
+                                    input.value = value;
+                                    input.dispatchEvent(new Event('input', { bubbles: true }));
+                                }
+                            }
+                        """, keyword)
+
+                # 等待输入框的值与关键词一致（代替固定等待）
+                try:
+                    await page.wait_for_function(
+                        "(value) => { const input = document.querySelector('#kw'); return !!input && input.value === value; }",
+                        arg=keyword, timeout=2000, polling=50
+                    )
+                except PlaywrightTimeoutError:
+                    logger.debug(f"输入框内容未确认，继续提交: {keyword}")
+
+                search_button = await page.query_selector("#su")
+                if search_button:
+                    try:
+                        box = await search_button.bounding_box()
+                        if box:
+                            await page.mouse.move(box['x'] + box['width']/2, box['y'] + box['height']/2)
+                        await search_button.click()
+                    except Exception:
+                        await search_input.press("Enter")
+                else:
+                    await search_input.press("Enter")
+                self.metrics.observe_since("type", typing_started)
+
+            # 等待搜索结果页就绪
+            with self.metrics.timer("wait_results"):
+                ready = await self.wait_for_serp_ready(page, keyword)
+            if not ready:
+                if not use_direct_url:
+                    logger.warning(f"搜索结果页加载异常，尝试直接 URL 方式: {keyword}")
+                    return await self.search_keyword(page, keyword, use_direct_url=True)
+                logger.error(f"搜索结果页加载失败: {keyword}")
+                return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"搜索异常: {keyword} - {str(e)}")
+            if not use_direct_url:
+                logger.info(f"尝试使用直接 URL 方式重试: {keyword}")
+                return await self.search_keyword(page, keyword, use_direct_url=True)
+            return False
+
+    async def detect_ads(self, page: Page, keyword: str) -> Tuple[bool, List[Dict[str, str]]]:
+        """
+        检测搜索结果中的广告（行为同 BaiduAdValidator.detect_ads）
+
+        Args:
+            page: Playwright Page 对象
+            keyword: 当前搜索的关键词（用于截图文件名）
+
+        Returns:
+            (是否有广告, 广告信息列表)
+        """
+        ad_info_list = []
+
+        try:
+            with self.metrics.timer("extract"):
+                serp_items = await page.evaluate(SERP_EXTRACT_JS)
+            ad_info_list = self.collect_ads(serp_items)
+
+            if ad_info_list:
+                try:
+                    screenshot_path = self.screenshot_path_for(keyword)
+                    with self.metrics.timer("screenshot"):
+                        await page.evaluate("window.scrollTo(0, 0)")
+                        await page.wait_for_timeout(500)
+                        await page.screenshot(path=str(screenshot_path), full_page=False)
+                    logger.info(f"已保存截图: {screenshot_path}")
+                except Exception as e:
+                    logger.warning(f"截图保存失败: {keyword} - {str(e)}")
+
+        except Exception as e:
+            logger.error(f"检测广告时出错: {keyword} - {str(e)}")
+
+        return len(ad_info_list) > 0, ad_info_list
+
+    async def validate_keyword(self, page: Page, keyword: str, index: int, total: int) -> Dict:
+        """
+        验证单个关键词
+
+        Args:
+            page: Playwright Page 对象
+            keyword: 关键词
+            index: 当前索引（从1开始）
+            total: 总数量
+
+        Returns:
+            验证结果字典
+        """
+        logger.info(f"[{index}/{total}] 搜索: {keyword}")
+
+        cached_result = self.get_cached_result(keyword)
+        if cached_result is not None:
+            logger.info(f"[{index}/{total}] ⚡ {keyword} -> 命中缓存: {cached_result['has_ads']}")
+            return cached_result
+
+        # HTTP 快速通道是阻塞调用，放到线程池执行
+        if self.http_engine:
+            http_result = await asyncio.to_thread(self.try_http_engine, keyword, index, total)
+            if http_result is not None:
+                return http_result
+
+        with self.metrics.timer("search"):
+            search_success = await self.search_keyword(page, keyword)
+
+        if not search_success:
+            self.metrics.increment("search_failed")
+            return {
+                "keyword": keyword,
+                "has_ads": "Error",
+                "ad_info_list": [],
+                "captcha": self.is_captcha_page(page)
+            }
+
+        with self.metrics.timer("detect"):
+            has_ads, ad_info_list = await self.detect_ads(page, keyword)
+
+        if self.http_engine:
+            try:
+                self.http_engine.load_cookies(await page.context.cookies())
+            except Exception:
+                pass
+
+        return self.build_result(keyword, ad_info_list, index, total, engine="playwright")
+
+    async def validate_batch(self, keywords: Iterable[str], total: Optional[int] = None) -> List[Dict]:
+        """
+        批量验证关键词（单进程并发）
+
+        所有页面共享一个浏览器；每个页面拥有独立上下文，
+        配置了代理池时每个上下文单独分配代理，代理熔断后关闭该上下文并重新分配。
+        上下文达到 recycle_every 时关闭重建；浏览器内存超过 recycle_rss_mb 时不再分配新的关键词，
+        等在途的关键词完成后关闭所有页面并重启浏览器（行为同 BrowserSession.restart）；
+        关键词超过 hang_timeout 时关闭该上下文，换新页面重试一次。
+        关键词按需读取：拿到信号量后才读取下一个，迭代器输入不会被一次性读完。
+
+        Args:
+            keywords: 关键词列表或迭代器
+            total: 关键词总数（用于进度显示；迭代器输入时为估算值）
+
+        Returns:
+            验证结果列表（与输入顺序一致）
+        """
+        if total is None and hasattr(keywords, '__len__'):
+            total = len(keywords)
+        total = total or 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # 空闲页面: (页面, 代理地址, 已验证的关键词数量)
+        idle_pages: List[Tuple[Page, Optional[str], int]] = []
+
+        # 共享浏览器的状态: 浏览器、实例标记、在途关键词数量、是否等待重启
+        state = {'browser': None, 'marker': None, 'in_flight': 0, 'restart': False}
+        # 浏览器可用（等待重启时清除，新的关键词在此等待）
+        ready = asyncio.Event()
+        ready.set()
+        # 内存检查状态: [上次检查时间, 上次检查结果]
+        memory_state = [time.monotonic(), None]
+
+        async def browser_over_memory() -> bool:
+            """定期检查浏览器内存（最多每 5 秒一次），超过 recycle_rss_mb 时返回 True"""
+            if not (self.recycle_rss_mb or self.memory_log_seconds):
+                return False
+            now = time.monotonic()
+            if self.memory_log_seconds and now - memory_state[0] >= self.memory_log_seconds:
+                memory_state[0] = now
+                memory_state[1] = await asyncio.to_thread(marked_tree_rss, marker_arg(state['marker']))
+                logger.info(f"浏览器内存: {format_mb(memory_state[1])}（空闲页面 {len(idle_pages)} 个）")
+            elif self.recycle_rss_mb and now - memory_state[0] >= 5:
+                memory_state[0] = now
+                memory_state[1] = await asyncio.to_thread(marked_tree_rss, marker_arg(state['marker']))
+            rss = memory_state[1]
+            return bool(self.recycle_rss_mb) and rss is not None and rss > self.recycle_rss_mb * 1024 * 1024
+
+        def release_idle_pages() -> List[Tuple[Page, Optional[str], int]]:
+            """取出所有空闲页面（调用方负责关闭）"""
+            pages = list(idle_pages)
+            idle_pages.clear()
+            return pages
+
+        async with async_playwright() as p:
+
+            async def launch_browser():
+                state['marker'] = uuid.uuid4().hex[:12]
+                state['browser'] = await self._launch_browser(p, self.get_current_proxy(), marker=state['marker'])
+                memory_state[:] = [time.monotonic(), None]
+
+            async def restart_browser():
+                """关闭所有空闲页面和浏览器后重新启动（在途关键词全部完成后由最后一个调用）"""
+                before = memory_state[1]
+                try:
+                    for idle_page, idle_server, _ in release_idle_pages():
+                        await self._close_page(idle_page, idle_server)
+                    try:
+                        await state['browser'].close()
+                    except Exception:
+                        pass
+                    self.metrics.increment("browser_recycle_memory")
+                    await launch_browser()
+                    rss = await asyncio.to_thread(marked_tree_rss, marker_arg(state['marker']))
+                    logger.warning(f"已重启浏览器（内存超过 {self.recycle_rss_mb:g} MB），"
+                                   f"内存 {format_mb(before)} -> {format_mb(rss)}")
+                finally:
+                    state['restart'] = False
+                    ready.set()
+
+            await launch_browser()
+
+            async def run_one(index: int, keyword: str) -> Dict:
+                # 浏览器等待重启时不分配新的关键词
+                await ready.wait()
+                state['in_flight'] += 1
+                browser = state['browser']
+                try:
+                    if idle_pages:
+                        page, server, uses = idle_pages.pop()
+                    else:
+                        try:
+                            page, server = await self._open_page(browser)
+                        except Exception as e:
+                            # 创建上下文失败只影响当前关键词（_open_page 已归还代理）
+                            logger.error(f"创建页面失败: {keyword} - {str(e)}")
+                            result = {"keyword": keyword, "has_ads": "Error", "ad_info_list": []}
+                            self.record_result(result)
+                            return result
+                        uses = 0
+                    for attempt in range(2):
+                        started = time.perf_counter()
+                        try:
+                            result = await self._validate_with_timeout(page, keyword, index, max(total, index))
+                            break
+                        except asyncio.TimeoutError:
+                            # 页面挂起：关闭该上下文，换新页面重试一次
+                            self.metrics.increment("browser_hang")
+                            logger.warning(f"关键词处理超过 {self.hang_timeout:g} 秒，关闭页面"
+                                           f"{'并重试' if attempt == 0 else ''}: {keyword}")
+                            try:
+                                await asyncio.wait_for(self._close_page(page, server), 10)
+                            except Exception:
+                                if self.proxy_pool:
+                                    self.proxy_pool.release(server)
+                            result = {
+                                "keyword": keyword,
+                                "has_ads": "Error",
+                                "ad_info_list": []
+                            }
+                            try:
+                                page, server = await self._open_page(browser)
+                            except Exception as e:
+                                logger.error(f"重新创建页面失败: {keyword} - {str(e)}")
+                                page = None
+                                break
+                            uses = 0
+                        except Exception as e:
+                            logger.error(f"处理关键词时出错: {keyword} - {str(e)}")
+                            result = {
+                                "keyword": keyword,
+                                "has_ads": "Error",
+                                "ad_info_list": []
+                            }
+                            break
+                    elapsed = time.perf_counter() - started
+                    self.record_result(result, elapsed)
+                    if page is None:
+                        # 挂起后没能重新创建页面：代理已随旧页面归还
+                        return result
+                    self.report_outcome(server, result, elapsed)
+                    # 同一页面两次搜索之间等待（命中缓存时不需要）
+                    if result.get("engine") != "cache":
+                        await self.pace(server)
+                    if state['restart'] or await browser_over_memory():
+                        # 内存超限：当前浏览器的页面不再复用，在途关键词完成后重启浏览器
+                        if not state['restart']:
+                            state['restart'] = True
+                            ready.clear()
+                            logger.info(f"浏览器内存超过 {self.recycle_rss_mb:g} MB，"
+                                        f"等待 {state['in_flight'] - 1} 个在途关键词完成后重启")
+                        await self._close_page(page, server)
+                    elif self.needs_recycle(server, uses + 1):
+                        await self._close_page(page, server)
+                    else:
+                        idle_pages.append((page, server, uses + 1))
+                    return result
+                finally:
+                    state['in_flight'] -= 1
+                    try:
+                        if state['restart'] and state['in_flight'] == 0:
+                            await restart_browser()
+                    finally:
+                        semaphore.release()
+
+            tasks = []
+            try:
+                logger.info(f"异步模式: 最多 {self.concurrency} 个搜索同时进行")
+                for index, keyword in enumerate(keywords, 1):
+                    await semaphore.acquire()
+                    tasks.append(asyncio.ensure_future(run_one(index, keyword)))
+                return list(await asyncio.gather(*tasks))
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if self.proxy_pool:
+                    for _, server, _ in release_idle_pages():
+                        self.proxy_pool.release(server)
+                if state['browser'] is not None:
+                    await state['browser'].close()
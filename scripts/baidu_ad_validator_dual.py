@@ -0,0 +1,172 @@
+"""
+百度竞价关键词商业价值验证工具（PC + 移动端双模式）
+一个浏览器内为 PC 和移动端分别创建上下文（各自的 User-Agent、视口、is_mobile 和触屏配置），
+每个关键词在两种模式下并发搜索，结果合并为一行（Has_Ads_PC / Has_Ads_Mobile）
+"""
+
+import time
+import uuid
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Iterable
+
+from playwright.async_api import async_playwright, Page
+
+from baidu_ad_validator_async import AsyncBaiduAdValidator
+from proxy_pool import ProxyPool
+from rate_controller import AdaptiveRateController
+from run_metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+
+# 双模式验证的模式顺序（决定输出列的顺序）
+DUAL_MODES = ('pc', 'mobile')
+
+
+class DualModeValidator:
+    """PC + 移动端双模式验证器（共享浏览器、缓存、运行日志、代理池、节奏控制和运行指标）"""
+
+    def __init__(self, concurrency: int = 4, **options):
+        """
+        初始化验证器
+
+        Args:
+            concurrency: 同时在途的关键词数量上限（每个关键词占用 PC 和移动端各一个页面）
+            options: 其余参数同 BaiduAdValidator（mobile 参数被忽略；截图按模式保存到子目录）
+        """
+        options.pop('mobile', None)
+        self.concurrency = max(1, concurrency)
+
+        # 两种模式共用的组件只创建一次
+        if options.get('proxy_pool') is None and options.get('proxy_list'):
+            options['proxy_pool'] = ProxyPool(options['proxy_list'])
+        if options.get('rate_controller') is None:
+            pace_range = options.get('pace_range', (2.0, 5.0))
+            options['rate_controller'] = AdaptiveRateController(min_interval=pace_range[0],
+                                                                initial_interval=pace_range[1])
+        if options.get('metrics') is None:
+            options['metrics'] = RunMetrics()
+
+        screenshot_dir = Path(options.pop('screenshot_dir', 'scripts/screenshots'))
+        screenshot_dir.mkdir(parents=True, exist_ok=True)
+
+        self.validators: Dict[str, AsyncBaiduAdValidator] = {
+            mode: AsyncBaiduAdValidator(
+                mobile=(mode == 'mobile'),
+                concurrency=self.concurrency,
+                screenshot_dir=str(screenshot_dir / mode),
+                **options
+            )
+            for mode in DUAL_MODES
+        }
+        self.proxy_pool = options['proxy_pool']
+        self.rate_controller = options['rate_controller']
+        self.metrics = options['metrics']
+
+    async def _run_mode(self, mode: str, browser, idle_pages: List[Tuple[Page, Optional[str], int]],
+                        keyword: str, index: int, total: int) -> Dict:
+        """
+        在一种模式下验证关键词（复用该模式的空闲页面）
+
+        Args:
+            mode: 'pc' / 'mobile'
+            browser: 共享的 Browser 对象
+            idle_pages: 该模式的空闲页面 [(页面, 代理地址, 已验证的关键词数量)]
+            keyword: 关键词
+            index: 当前索引（从1开始）
+            total: 总数量
+
+        Returns:
+            该模式的验证结果字典
+        """
+        validator = self.validators[mode]
+        if idle_pages:
+            page, server, uses = idle_pages.pop()
+        else:
+            try:
+                page, server = await validator._open_page(browser)
+            except Exception as e:
+                # 创建上下文失败只影响当前关键词（_open_page 已归还代理）
+                logger.error(f"[{mode}] 创建页面失败: {keyword} - {str(e)}")
+                result = {"keyword": keyword, "has_ads": "Error", "ad_info_list": []}
+                validator.record_result(result)
+                return result
+            uses = 0
+
+        broken = False
+        started = time.perf_counter()
+        try:
+            result = await validator._validate_with_timeout(page, keyword, index, total)
+        except asyncio.CancelledError:
+            # 任务被取消（如服务模式下取消作业）：页面状态未知，关闭上下文后继续向上取消
+            await validator._close_page(page, server)
+            raise
+        except asyncio.TimeoutError:
+            self.metrics.increment("browser_hang")
+            logger.warning(f"[{mode}] 关键词处理超过 {validator.hang_timeout:g} 秒，关闭页面: {keyword}")
+            broken = True
+            result = {"keyword": keyword, "has_ads": "Error", "ad_info_list": []}
+        except Exception as e:
+            logger.error(f"[{mode}] 处理关键词时出错: {keyword} - {str(e)}")
+            result = {"keyword": keyword, "has_ads": "Error", "ad_info_list": []}
+
+        elapsed = time.perf_counter() - started
+        validator.record_result(result, elapsed)
+        validator.report_outcome(server, result, elapsed)
+        # 同一页面两次搜索之间等待（命中缓存时不需要）
+        if result.get("engine") != "cache":
+            await validator.pace(server)
+        if broken or validator.needs_recycle(server, uses + 1):
+            await validator._close_page(page, server)
+        else:
+            idle_pages.append((page, server, uses + 1))
+        return result
+
+    async def validate_batch(self, keywords: Iterable[str], total: Optional[int] = None) -> List[Dict]:
+        """
+        批量验证关键词（每个关键词两种模式并发）
+
+        Args:
+            keywords: 关键词列表或迭代器
+            total: 关键词总数（用于进度显示；迭代器输入时为估算值）
+
+        Returns:
+            合并结果列表（与输入顺序一致），格式: [{"keyword": ..., "modes": {"pc": 结果, "mobile": 结果}}, ...]
+        """
+        if total is None and hasattr(keywords, '__len__'):
+            total = len(keywords)
+        total = total or 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        idle_pages: Dict[str, List[Tuple[Page, Optional[str], int]]] = {mode: [] for mode in DUAL_MODES}
+        primary = self.validators[DUAL_MODES[0]]
+
+        async with async_playwright() as p:
+            browser = await primary._launch_browser(p, primary.get_current_proxy(), marker=uuid.uuid4().hex[:12])
+
+            async def run_one(index: int, keyword: str) -> Dict:
+                try:
+                    mode_results = await asyncio.gather(*(
+                        self._run_mode(mode, browser, idle_pages[mode], keyword, index, max(total, index))
+                        for mode in DUAL_MODES
+                    ))
+                    return {"keyword": keyword, "modes": dict(zip(DUAL_MODES, mode_results))}
+                finally:
+                    semaphore.release()
+
+            tasks = []
+            try:
+                logger.info(f"双模式验证: PC + 移动端，最多 {self.concurrency} 个关键词同时进行")
+                for index, keyword in enumerate(keywords, 1):
+                    await semaphore.acquire()
+                    tasks.append(asyncio.ensure_future(run_one(index, keyword)))
+                return list(await asyncio.gather(*tasks))
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if self.proxy_pool:
+                    for pages in idle_pages.values():
+                        for _, server, _ in pages:
+                            self.proxy_pool.release(server)
+                await browser.close()
@@ -0,0 +1,379 @@
+"""
+百度搜索结果页 HTTP 快速通道
+不启动浏览器，直接用保持连接的 HTTP 客户端请求搜索结果页，
+再用 HTML 解析器按与 SERP_EXTRACT_JS 相同的规则提取结果；
+遇到验证码、非 200 响应或解析失败时返回 None，由调用方回退到 Playwright
+"""
+
+import re
+import gzip
+import zlib
+import queue
+import base64
+import threading
+import http.client
+import logging
+from http.cookies import SimpleCookie
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit, unquote
+
+logger = logging.getLogger(__name__)
+
+
+# 验证码/安全验证页面的特征
+CAPTCHA_MARKERS = ('wappass.baidu.com', '百度安全验证', 'captcha', '网络不给力，请稍后重试')
+
+# 不会有结束标签的 HTML 元素
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+
+class SerpHtmlParser(HTMLParser):
+    """
+    搜索结果页解析器
+    规则与 SERP_EXTRACT_JS 一致：#content_left 内 class 含 c-container 或 result 的元素，
+    按文档顺序取前 max_items 个；标题取第一个匹配 'h3 a, .t a, a[href]' 的链接文本，
+    链接取第一个 a[href] 的 href
+    """
+
+    def __init__(self, max_items: int = 10):
+        super().__init__(convert_charrefs=True)
+        self.max_items = max_items
+        self.found_container = False
+        self._items: List[Dict] = []
+        self._stack: List[Dict] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+
+        attr_map = dict(attrs)
+        classes = set((attr_map.get('class') or '').split())
+        entry = {'tag': tag}
+
+        in_container = any(e.get('container') for e in self._stack)
+        if attr_map.get('id') == 'content_left':
+            entry['container'] = True
+            self.found_container = True
+        elif in_container and classes & {'c-container', 'result'} and len(self._items) < self.max_items:
+            item = {'text': [], 'title_parts': None, 'link': None}
+            self._items.append(item)
+            entry['item'] = item
+
+        if tag == 'h3' or 't' in classes:
+            entry['title_ctx'] = True
+        if tag in ('script', 'style', 'noscript'):
+            entry['skip'] = True
+
+        if tag == 'a':
+            has_href = 'href' in attr_map
+            in_title_ctx = any(e.get('title_ctx') for e in self._stack)
+            for open_item in self._open_items():
+                if open_item['link'] is None and has_href:
+                    open_item['link'] = attr_map.get('href') or ''
+                if open_item['title_parts'] is None and (has_href or in_title_ctx):
+                    open_item['title_parts'] = []
+                    entry.setdefault('capturing', []).append(open_item)
+
+        self._stack.append(entry)
+
+    def handle_endtag(self, tag):
+        # 容错：弹出到最近的同名标签（未闭合的子标签一并弹出）
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth]['tag'] == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data):
+        if any(e.get('skip') for e in self._stack):
+            return
+        for entry in self._stack:
+            if 'item' in entry:
+                entry['item']['text'].append(data)
+            for capturing_item in entry.get('capturing', ()):
+                capturing_item['title_parts'].append(data)
+
+    def _open_items(self) -> List[Dict]:
+        return [e['item'] for e in self._stack if 'item' in e]
+
+    @property
+    def items(self) -> List[Dict]:
+        """
+        解析结果（结构与 SERP_EXTRACT_JS 返回值相同）
+
+        Returns:
+            [{"position", "is_ad", "title", "link"}, ...]
+        """
+        results = []
+        for position, item in enumerate(self._items, 1):
+            text = ''.join(item['text'])
+            title = re.sub(r'\s+', ' ', ''.join(item['title_parts'] or [])).strip()
+            results.append({
+                'position': position,
+                'is_ad': '广告' in text or '推广' in text,
+                'title': title,
+                'link': item['link'] or '',
+            })
+        return results
+
+
+class BaiduHttpEngine:
+    """百度搜索结果页 HTTP 客户端（保持连接的连接池，线程安全）"""
+
+    def __init__(self, user_agent: str, mobile: bool = False, proxy: Optional[str] = None,
+                 timeout: float = 15.0, pool_size: int = 8, base_url: Optional[str] = None):
+        """
+        初始化 HTTP 客户端
+
+        Args:
+            user_agent: 请求使用的 User-Agent（与验证器一致）
+            mobile: 是否请求移动端搜索页（m.baidu.com）
+            proxy: HTTP 代理（http://[user:pass@]host:port，不支持 socks5）
+            timeout: 单次请求超时（秒）
+            pool_size: 每个代理保留的空闲连接数
+            base_url: 替代百度的站点地址（如本地桩服务 http://127.0.0.1:8765，不经过代理）
+        """
+        self.user_agent = user_agent
+        self.host = 'm.baidu.com' if mobile else 'www.baidu.com'
+        self.port = 443
+        self.secure = True
+        if base_url:
+            base = urlsplit(base_url)
+            self.host = base.hostname
+            self.secure = base.scheme == 'https'
+            self.port = base.port or (443 if self.secure else 80)
+            proxy = None
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.base_url = base_url
+        # 按代理分别保留空闲连接（键为代理地址，None 表示直连）
+        self._pools: Dict[Optional[str], "queue.LifoQueue[http.client.HTTPConnection]"] = {}
+        self._tunnels: Dict[str, Optional[Tuple[str, int, Dict[str, str]]]] = {}
+        self._cookies = SimpleCookie()
+        self._lock = threading.Lock()
+        self.stats = {'served': 0, 'captcha': 0, 'failed': 0}
+
+        self.proxy = proxy
+        self.enabled = True
+        if proxy and self._tunnel(proxy) is None:
+            logger.warning("HTTP 快速通道不支持 socks5 代理，所有关键词将使用浏览器")
+            self.enabled = False
+
+    def _tunnel(self, proxy: str) -> Optional[Tuple[str, int, Dict[str, str]]]:
+        """
+        解析代理地址（结果按代理缓存）
+
+        Args:
+            proxy: 代理地址（http://[user:pass@]host:port）
+
+        Returns:
+            (代理主机, 端口, CONNECT 请求头)；socks5 代理返回 None
+        """
+        with self._lock:
+            if proxy in self._tunnels:
+                return self._tunnels[proxy]
+
+        url = proxy if proxy.startswith(('http://', 'https://', 'socks5://')) else 'http://' + proxy
+        parts = urlsplit(url)
+        tunnel = None
+        if parts.scheme != 'socks5':
+            tunnel_headers = {}
+            if parts.username:
+                credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+                tunnel_headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode()).decode()
+            tunnel = (parts.hostname, parts.port or 80, tunnel_headers)
+
+        with self._lock:
+            self._tunnels[proxy] = tunnel
+        return tunnel
+
+    def _idle_pool(self, proxy: Optional[str]) -> "queue.LifoQueue[http.client.HTTPConnection]":
+        with self._lock:
+            pool = self._pools.get(proxy)
+            if pool is None:
+                pool = self._pools[proxy] = queue.LifoQueue(maxsize=self.pool_size)
+            return pool
+
+    def load_cookies(self, cookies: List[Dict]):
+        """
+        从浏览器上下文同步 Cookies（context.cookies() 的返回值）
+
+        Args:
+            cookies: Playwright Cookie 列表
+        """
+        with self._lock:
+            for cookie in cookies:
+                domain = cookie.get('domain', '')
+                if domain.lstrip('.').endswith('baidu.com'):
+                    self._cookies[cookie['name']] = cookie['value']
+
+    def _new_connection(self, proxy: Optional[str] = None) -> http.client.HTTPConnection:
+        tunnel = self._tunnel(proxy) if proxy else None
+        if tunnel:
+            proxy_host, proxy_port, tunnel_headers = tunnel
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=self.timeout)
+            conn.set_tunnel(self.host, self.port, headers=tunnel_headers)
+            return conn
+        if not self.secure:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        with self._lock:
+            if self._cookies:
+                headers['Cookie'] = '; '.join(f"{k}={m.value}" for k, m in self._cookies.items())
+        return headers
+
+    def _request(self, path: str, proxy: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        发送 GET 请求（复用同一代理的空闲连接，连接失效时用新连接重试一次）
+
+        Args:
+            path: 请求路径
+            proxy: 经过的代理（None 表示直连）
+
+        Returns:
+            (状态码, 响应头, 解压后的响应体)
+        """
+        pool = self._idle_pool(proxy)
+        for attempt in range(2):
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection(proxy)
+
+            try:
+                conn.request('GET', path, headers=self._headers())
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            headers = {k.lower(): v for k, v in response.getheaders()}
+            for set_cookie in response.headers.get_all('Set-Cookie') or []:
+                with self._lock:
+                    self._cookies.load(set_cookie.split(';', 1)[0])
+
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+
+            encoding = headers.get('content-encoding', '')
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                body = zlib.decompress(body)
+            return response.status, headers, body
+
+        raise http.client.HTTPException("连接失效")
+
+    def fetch_serp_items(self, keyword: str) -> Optional[List[Dict]]:
+        """
+        请求搜索结果页并解析结果（经过初始化时指定的代理）
+
+        Args:
+            keyword: 关键词
+
+        Returns:
+            结果列表（结构与 SERP_EXTRACT_JS 相同）；需要回退到浏览器时返回 None
+        """
+        items, _ = self.fetch(keyword, self.proxy)
+        return items
+
+    def fetch(self, keyword: str, proxy: Optional[str] = None) -> Tuple[Optional[List[Dict]], str]:
+        """
+        经指定代理请求搜索结果页并解析结果（代理池按请求分配代理时使用）
+
+        Args:
+            keyword: 关键词
+            proxy: 经过的代理（None 表示直连；使用 base_url 时忽略）
+
+        Returns:
+            (结果列表或 None, 结果类型)，结果类型为：
+            served（成功）/ captcha（验证码）/ failed（请求失败或非 200 响应）/
+            unparsed（页面已返回但无法解析）/ skipped（未请求：通道未启用或代理不支持）
+        """
+        if not self.enabled:
+            return None, 'skipped'
+        if self.base_url:
+            proxy = None
+        if proxy and self._tunnel(proxy) is None:
+            return None, 'skipped'
+
+        try:
+            status, headers, body = self._request(f"/s?wd={quote(keyword)}", proxy)
+        except (OSError, EOFError, http.client.HTTPException, zlib.error) as e:
+            # EOFError: 代理在没有 Content-Length 的响应中途断开，gzip 响应体被截断
+            logger.debug(f"HTTP 请求失败: {keyword} - {str(e)}")
+            self._count('failed')
+            return None, 'failed'
+
+        if status in (301, 302, 303, 307, 308):
+            location = headers.get('location', '')
+            if any(marker in location for marker in CAPTCHA_MARKERS):
+                logger.info(f"HTTP 快速通道遇到验证码跳转: {keyword}")
+                self._count('captcha')
+                return None, 'captcha'
+            self._count('failed')
+            return None, 'failed'
+
+        if status != 200:
+            self._count('failed')
+            return None, 'failed'
+
+        html = body.decode('utf-8', errors='replace')
+        if any(marker in html[:20000] for marker in CAPTCHA_MARKERS[:2]):
+            logger.info(f"HTTP 快速通道遇到安全验证页: {keyword}")
+            self._count('captcha')
+            return None, 'captcha'
+
+        parser = SerpHtmlParser()
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception as e:
+            logger.debug(f"解析搜索结果页失败: {keyword} - {str(e)}")
+            self._count('failed')
+            return None, 'unparsed'
+
+        if not parser.found_container:
+            self._count('failed')
+            return None, 'unparsed'
+
+        self._count('served')
+        return parser.items, 'served'
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
@@ -0,0 +1,144 @@
+"""
+detect_ads 提取方式基准测试
+对比逐元素查询（旧实现：每个结果多次跨进程调用）与单次 page.evaluate 提取的耗时
+
+用法：
+    python scripts/bench_detect_ads.py --html saved_serp.html --rounds 50
+    python scripts/bench_detect_ads.py            # 不指定 --html 时使用内置的模拟 SERP
+"""
+
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import List, Dict, Tuple
+
+from playwright.sync_api import sync_playwright, Page
+
+from baidu_ad_validator import SERP_EXTRACT_JS
+
+
+def build_sample_serp(results: int = 10, ads: int = 3) -> str:
+    """
+    生成模拟的百度 PC 端搜索结果页（前 ads 个为广告）
+
+    Args:
+        results: 结果总数
+        ads: 其中的广告数量
+
+    Returns:
+        HTML 字符串
+    """
+    items = []
+    for i in range(results):
+        label = '<span class="ec-tuiguang">广告</span>' if i < ads else ''
+        items.append(f"""
+        <div class="result c-container" id="{i + 1}">
+            <h3 class="t"><a href="https://www.baidu.com/link?url=item{i}">结果标题 {i + 1}</a></h3>
+            <div class="c-abstract">这是第 {i + 1} 条结果的摘要内容，用于模拟真实页面的文本量。</div>
+            <div class="c-showurl">example{i}.com {label}</div>
+        </div>""")
+    return f"<html><body><div id='content_left'>{''.join(items)}</div></body></html>"
+
+
+def legacy_extract(page: Page) -> Tuple[List[Dict[str, str]], int]:
+    """
+    旧实现：query_selector_all + 每个结果项多次 inner_text/query_selector/get_attribute
+
+    Returns:
+        (广告列表, 跨进程调用次数)
+    """
+    calls = 0
+    page.query_selector_all('span:has-text("广告"), .ad-label, .ad-text, [class*="ad"] span:has-text("广告")')
+    page.query_selector_all('.c-container')
+    result_items = page.query_selector_all('#content_left .c-container, #content_left .result')
+    calls += 3
+
+    ads = []
+    for item in result_items[:10]:
+        item_text = item.inner_text()
+        calls += 1
+        if "广告" in item_text or "推广" in item_text:
+            title_elem = item.query_selector('h3 a, .t a, a[href]')
+            link_elem = item.query_selector('a[href]')
+            calls += 2
+            if title_elem and link_elem:
+                title = title_elem.inner_text().strip()
+                link = link_elem.get_attribute('href') or ""
+                calls += 2
+                ads.append({"title": title, "link": link})
+                if len(ads) >= 3:
+                    break
+    return ads, calls
+
+
+def evaluate_extract(page: Page) -> Tuple[List[Dict[str, str]], int]:
+    """
+    新实现：一次 page.evaluate 返回所有结果的分类
+
+    Returns:
+        (广告列表, 跨进程调用次数)
+    """
+    items = page.evaluate(SERP_EXTRACT_JS)
+    ads = [{"title": item['title'], "link": item['link']} for item in items if item['is_ad']][:3]
+    return ads, 1
+
+
+def run_benchmark(html: str, rounds: int, headless: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    在同一页面上分别运行两种提取方式
+
+    Args:
+        html: SERP 页面 HTML
+        rounds: 每种方式的运行次数
+        headless: 是否无头模式
+
+    Returns:
+        {方式: {"mean_ms", "p95_ms", "calls", "ads"}}
+    """
+    report = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            page = browser.new_page()
+            page.set_content(html)
+            for name, extractor in (("legacy", legacy_extract), ("evaluate", evaluate_extract)):
+                extractor(page)  # 预热
+                durations = []
+                ads, calls = [], 0
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    ads, calls = extractor(page)
+                    durations.append((time.perf_counter() - start) * 1000)
+                durations.sort()
+                report[name] = {
+                    "mean_ms": statistics.mean(durations),
+                    "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                    "calls": calls,
+                    "ads": len(ads),
+                }
+        finally:
+            browser.close()
+    return report
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='detect_ads 提取方式基准测试')
+    parser.add_argument('--html', help='已保存的百度搜索结果页 HTML 文件（默认使用内置模拟页面）')
+    parser.add_argument('--rounds', type=int, default=30, help='每种方式的运行次数 (默认: 30)')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    args = parser.parse_args()
+
+    html = Path(args.html).read_text(encoding='utf-8') if args.html else build_sample_serp()
+    report = run_benchmark(html, args.rounds, headless=not args.headed)
+
+    print(f"{'方式':<10}{'平均(ms)':>12}{'P95(ms)':>12}{'调用次数':>10}{'广告数':>8}")
+    for name, stats in report.items():
+        print(f"{name:<10}{stats['mean_ms']:>12.2f}{stats['p95_ms']:>12.2f}{stats['calls']:>10}{stats['ads']:>8}")
+    if report["evaluate"]["mean_ms"] > 0:
+        print(f"加速比: {report['legacy']['mean_ms'] / report['evaluate']['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
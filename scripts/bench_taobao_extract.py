@@ -0,0 +1,235 @@
+"""
+淘宝商品提取方式基准测试
+对比逐元素查询（旧实现：每个商品逐个尝试标题/价格/销量/店铺选择器，每次都是一次跨进程调用）
+与单次 page.evaluate 提取（PRODUCT_EXTRACT_JS）的每页耗时
+
+用法：
+    python scripts/bench_taobao_extract.py --html saved_search_page.html --rounds 10
+    python scripts/bench_taobao_extract.py            # 不指定 --html 时使用内置的模拟搜索结果页（48 个商品）
+"""
+
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import List, Dict, Tuple
+
+from playwright.sync_api import sync_playwright, Page
+
+from taobao_miner import (
+    PRODUCT_EXTRACT_JS, MAX_PRODUCTS_PER_PAGE,
+    parse_product_item, parse_price, parse_sales, parse_shop_type, normalize_product_url,
+)
+
+# 旧实现按顺序尝试的选择器（与 PRODUCT_EXTRACT_JS 一致）
+PRIORITY_SELECTORS = ['.items .item', '.items .item[data-category="auctions"]', '.item[data-category="auctions"]',
+                      '[data-category="auctions"]', '.m-itemlist .items .item']
+TITLE_SELECTORS = ['.title a', '.title', 'a[title]', '.J_ClickStat', 'a.J_ClickStat', '.item-title', '.item-title a',
+                   '[class*="title"] a', '[class*="Title"] a', 'a[href*="item"]', '.pic-link', 'a.pic-link']
+PRICE_SELECTORS = ['.price strong', '.price', '.price .price-num', '.item-price', '[class*="price"]',
+                   '[class*="Price"]', '.g-price', '.price-box']
+SALES_SELECTORS = ['.deal-cnt', '.sales', '[class*="deal"]', '[class*="Deal"]', '.item-sales',
+                   '[class*="sales"]', '[class*="Sales"]']
+SHOP_SELECTORS = ['.shop a', '.shop', '.nick']
+
+
+def build_sample_page(items: int = MAX_PRODUCTS_PER_PAGE) -> str:
+    """
+    生成模拟的淘宝搜索结果页（奇数位为天猫商品，部分商品没有销量元素，需要从全文匹配）
+
+    Args:
+        items: 商品数量
+
+    Returns:
+        HTML 字符串
+    """
+    cards = []
+    for i in range(items):
+        host = 'detail.tmall.com' if i % 2 else 'item.taobao.com'
+        sales = f'<div class="deal-cnt">{(i + 1) * 37}人付款</div>' if i % 5 else ''
+        cards.append(f"""
+        <div class="item" data-category="auctions">
+            <div class="pic"><a class="pic-link" href="//{host}/item.htm?id={10000 + i}">
+                <img alt="模拟商品标题 {i + 1} 秋冬新款加厚保暖"></a></div>
+            <div class="price g_price"><span>¥</span><strong>{19.9 + i:.2f}</strong></div>
+            {sales}
+            <div class="row title"><a href="//{host}/item.htm?id={10000 + i}">模拟商品标题 {i + 1} 秋冬新款加厚保暖</a></div>
+            <div class="shop"><a href="//shop{i}.taobao.com"><span>模拟店铺{i + 1}</span></a></div>
+            <div class="location">浙江 杭州 月销 {i * 3}</div>
+        </div>""")
+    return f"<html><body><div class='m-itemlist'><div class='items'>{''.join(cards)}</div></div></body></html>"
+
+
+def legacy_extract(page: Page) -> Tuple[List[Dict], int]:
+    """
+    旧实现：query_selector_all 找到商品后，每个商品逐个尝试选择器并读取属性和文本
+
+    Returns:
+        (商品列表, 跨进程调用次数)
+    """
+    calls = 0
+    elements = []
+    for sel in PRIORITY_SELECTORS:
+        elements = page.query_selector_all(sel)
+        calls += 1
+        if elements:
+            break
+
+    products = []
+    for item in elements[:MAX_PRODUCTS_PER_PAGE]:
+        calls += 2  # 判断是否为链接（旧实现调用两次 tag_name）
+        item.evaluate("el => el.tagName")
+        item.evaluate("el => el.tagName")
+
+        title, link = None, None
+        for sel in TITLE_SELECTORS:
+            elem = item.query_selector(sel)
+            calls += 1
+            if not elem:
+                continue
+            title = elem.get_attribute('title')
+            calls += 1
+            if not title:
+                title = elem.get_attribute('alt')
+                calls += 1
+            if not title:
+                title = elem.inner_text().strip()
+                calls += 1
+            if title and len(title) > 5:
+                link = elem.get_attribute('href')
+                calls += 1
+                break
+        if not title:
+            continue
+
+        price_texts = []
+        for sel in PRICE_SELECTORS:
+            elem = item.query_selector(sel)
+            calls += 1
+            if elem:
+                price_texts.append(elem.inner_text().strip())
+                calls += 1
+                if parse_price(price_texts[-1:]) is not None:
+                    break
+        full_text = ''
+        price = parse_price(price_texts)
+        if price is None:
+            full_text = item.inner_text()
+            calls += 1
+            price = parse_price([], full_text)
+
+        sales_texts = []
+        for sel in SALES_SELECTORS:
+            elem = item.query_selector(sel)
+            calls += 1
+            if elem:
+                sales_texts.append(elem.inner_text().strip())
+                calls += 1
+                if parse_sales(sales_texts[-1:]):
+                    break
+        sales = parse_sales(sales_texts)
+        if sales is None:
+            full_text = full_text or item.inner_text()
+            calls += 1
+            sales = parse_sales([], full_text)
+
+        shop_name = None
+        for sel in SHOP_SELECTORS:
+            elem = item.query_selector(sel)
+            calls += 1
+            if elem:
+                shop_name = elem.inner_text().strip()
+                calls += 1
+                if shop_name:
+                    break
+
+        detail_url = normalize_product_url(link)
+        badge_text = None
+        if parse_shop_type(detail_url, None) is None:
+            badge = item.query_selector('.shop-badge, .shop-type, [class*="tmall"]')
+            calls += 1
+            if badge:
+                badge_text = badge.inner_text().strip()
+                calls += 1
+
+        products.append({
+            'title': title.strip(),
+            'detail_url': detail_url,
+            'price': price,
+            'sales': sales,
+            'shop_name': shop_name,
+            'shop_type': parse_shop_type(detail_url, badge_text),
+        })
+    return products, calls
+
+
+def evaluate_extract(page: Page) -> Tuple[List[Dict], int]:
+    """
+    新实现：一次 page.evaluate 返回所有商品的原始字段，Python 端只做解析
+
+    Returns:
+        (商品列表, 跨进程调用次数)
+    """
+    extracted = page.evaluate(PRODUCT_EXTRACT_JS, MAX_PRODUCTS_PER_PAGE)
+    products = [product for product in map(parse_product_item, extracted['items']) if product]
+    return products, 1
+
+
+def run_benchmark(html: str, rounds: int, headless: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    在同一页面上分别运行两种提取方式
+
+    Args:
+        html: 搜索结果页 HTML
+        rounds: 每种方式的运行次数
+        headless: 是否无头模式
+
+    Returns:
+        {方式: {"mean_ms", "p95_ms", "calls", "products"}}
+    """
+    report = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            page = browser.new_page()
+            page.set_content(html)
+            for name, extractor in (("legacy", legacy_extract), ("evaluate", evaluate_extract)):
+                extractor(page)  # 预热
+                durations = []
+                products, calls = [], 0
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    products, calls = extractor(page)
+                    durations.append((time.perf_counter() - start) * 1000)
+                durations.sort()
+                report[name] = {
+                    "mean_ms": statistics.mean(durations),
+                    "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                    "calls": calls,
+                    "products": len(products),
+                }
+        finally:
+            browser.close()
+    return report
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='淘宝商品提取方式基准测试')
+    parser.add_argument('--html', help='已保存的淘宝搜索结果页 HTML 文件（默认使用内置模拟页面）')
+    parser.add_argument('--rounds', type=int, default=10, help='每种方式的运行次数 (默认: 10)')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    args = parser.parse_args()
+
+    html = Path(args.html).read_text(encoding='utf-8') if args.html else build_sample_page()
+    report = run_benchmark(html, args.rounds, headless=not args.headed)
+
+    print(f"{'方式':<10}{'每页平均(ms)':>14}{'P95(ms)':>12}{'调用次数':>10}{'商品数':>8}")
+    for name, stats in report.items():
+        print(f"{name:<10}{stats['mean_ms']:>14.2f}{stats['p95_ms']:>12.2f}{stats['calls']:>10}{stats['products']:>8}")
+    if report["evaluate"]["mean_ms"] > 0:
+        print(f"加速比: {report['legacy']['mean_ms'] / report['evaluate']['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+验证器吞吐量基准测试（离线）
+启动本地 SERP 桩服务（serp_stub_server.py），用 base_url 把 BaiduAdValidator 指向桩服务，
+在不同并发度下测量 关键词/秒、每个工作者的内存占用，以及与预期结果的一致率
+
+请求节奏控制器的间隔设为 0，测得的是验证器自身（浏览器 + 解析）的处理能力
+
+用法：
+    python scripts/bench_validator_throughput.py --levels 1,2,4,8,16,32 --keywords 200
+    python scripts/bench_validator_throughput.py --engine async --levels 4,8,16,32 --mobile --json bench.json
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+import logging
+from typing import List, Dict, Optional
+
+from baidu_ad_validator import BaiduAdValidator
+from rate_controller import AdaptiveRateController
+from run_metrics import RunMetrics
+from process_stats import process_tree_rss
+from serp_stub_server import SerpStubServer, SCENARIOS, expected_label
+
+logger = logging.getLogger(__name__)
+
+
+# 默认的场景比例
+DEFAULT_MIX = "ads=40,no_ads=30,platform_ads=20,captcha=5,slow=5"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    解析场景比例（如 "ads=40,no_ads=30"）
+
+    Args:
+        mix: 逗号分隔的 场景=权重
+
+    Returns:
+        {场景: 权重}
+    """
+    weights = {}
+    for part in mix.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"未知场景: {name}（可选: {', '.join(SCENARIOS)}）")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def build_keywords(count: int, weights: Dict[str, float], seed: int = 42) -> List[str]:
+    """
+    按场景比例生成关键词（"<场景> <序号>"，桩服务按第一个词返回对应样本）
+
+    Args:
+        count: 关键词数量
+        weights: 场景权重
+        seed: 随机种子（固定后每次生成相同的关键词）
+
+    Returns:
+        关键词列表
+    """
+    rng = random.Random(seed)
+    names = list(weights)
+    chosen = rng.choices(names, weights=[weights[n] for n in names], k=count)
+    return [f"{name} {i + 1}" for i, name in enumerate(chosen)]
+
+
+class MemorySampler:
+    """后台采样进程树（本进程 + 浏览器子进程）的常驻内存峰值"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        rss = process_tree_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def __enter__(self):
+        def run():
+            while not self._stop.wait(self.interval):
+                self._sample()
+
+        self._sample()
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._sample()
+
+
+def run_level(base_url: str, keywords: List[str], level: int, engine: str, mobile: bool,
+              ready_timeout: float, max_retries: int, screenshot_dir: str) -> Dict:
+    """
+    在一个并发度下验证全部关键词
+
+    Args:
+        base_url: 桩服务地址
+        keywords: 关键词列表
+        level: 并发度（sync 为工作者数量，async 为同时在途的搜索数量）
+        engine: 'sync' / 'async'
+        mobile: 是否移动端模式
+        ready_timeout: 等待结果页就绪的超时（秒）
+        max_retries: 出错关键词的重试次数（仅 sync）
+        screenshot_dir: 截图目录
+
+    Returns:
+        本轮统计
+    """
+    metrics = RunMetrics()
+    options = dict(
+        headless=True,
+        screenshot_dir=screenshot_dir,
+        mobile=mobile,
+        ready_timeout_ms=int(ready_timeout * 1000),
+        rate_controller=AdaptiveRateController(min_interval=0, initial_interval=0, jitter=0,
+                                               log_every_seconds=0),
+        metrics=metrics,
+        base_url=base_url,
+    )
+
+    baseline = process_tree_rss()
+    with MemorySampler() as sampler:
+        started = time.perf_counter()
+        if engine == 'async':
+            from baidu_ad_validator_async import AsyncBaiduAdValidator
+            validator = AsyncBaiduAdValidator(concurrency=level, **options)
+            results = asyncio.run(validator.validate_batch(keywords, total=len(keywords)))
+        else:
+            validator = BaiduAdValidator(**options)
+            results = validator.validate_batch(keywords, workers=level, max_retries=max_retries,
+                                               total=len(keywords))
+        elapsed = time.perf_counter() - started
+
+    correct = sum(1 for r in results if r.get('has_ads') == expected_label(r.get('keyword', '')))
+    mismatches = [
+        (r.get('keyword'), expected_label(r.get('keyword', '')), r.get('has_ads'))
+        for r in results if r.get('has_ads') != expected_label(r.get('keyword', ''))
+    ]
+    peak_extra = (sampler.peak - baseline) if sampler.peak is not None and baseline is not None else None
+    keyword_latency = metrics.summary()['phases'].get('keyword_playwright', {})
+    return {
+        'level': level,
+        'engine': engine,
+        'keywords': len(results),
+        'elapsed_seconds': elapsed,
+        'keywords_per_second': len(results) / elapsed if elapsed > 0 else 0.0,
+        'peak_rss_mb': sampler.peak / 1024 / 1024 if sampler.peak is not None else None,
+        'rss_per_worker_mb': peak_extra / level / 1024 / 1024 if peak_extra is not None else None,
+        'accuracy': correct / len(results) if results else 0.0,
+        'mismatches': mismatches[:20],
+        'keyword_p50': keyword_latency.get('p50'),
+        'keyword_p95': keyword_latency.get('p95'),
+        'metrics': metrics.summary(),
+    }
+
+
+def print_report(rows: List[Dict]):
+    """输出汇总表"""
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    print(f"{'并发':>6}{'关键词':>8}{'耗时(s)':>10}{'词/秒':>8}{'峰值内存(MB)':>14}{'每工作者(MB)':>14}"
+          f"{'一致率':>8}{'P50(s)':>8}{'P95(s)':>8}")
+    for row in rows:
+        print(f"{row['level']:>6}{row['keywords']:>8}{row['elapsed_seconds']:>10.1f}"
+              f"{row['keywords_per_second']:>8.2f}{fmt(row['peak_rss_mb'], '>14.0f')}"
+              f"{fmt(row['rss_per_worker_mb'], '>14.0f')}{row['accuracy']:>8.1%}"
+              f"{fmt(row['keyword_p50'], '>8.2f')}{fmt(row['keyword_p95'], '>8.2f')}")
+    for row in rows:
+        for keyword, expected, actual in row['mismatches']:
+            print(f"  [并发 {row['level']}] 结果不一致: {keyword} 预期 {expected}，实际 {actual}")
+
+
+def parse_levels(levels: str) -> List[int]:
+    return [int(level) for level in levels.split(',') if level.strip()]
+
+
+def main():
+    """主函数"""
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='验证器吞吐量基准测试（本地 SERP 桩服务）')
+    parser.add_argument('--levels', default='1,2,4,8,16,32', help='并发度列表 (默认: 1,2,4,8,16,32)')
+    parser.add_argument('--keywords', type=int, default=200, help='每个并发度验证的关键词数量 (默认: 200)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'场景比例 (默认: {DEFAULT_MIX})')
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync', help='验证器引擎 (默认: sync)')
+    parser.add_argument('--mobile', action='store_true', help='移动端模式')
+    parser.add_argument('--latency-ms', type=float, default=50, help='桩服务的基础响应延迟毫秒数 (默认: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='桩服务的延迟抖动毫秒数 (默认: 20)')
+    parser.add_argument('--slow-ms', type=float, default=3000, help='slow 场景额外延迟毫秒数 (默认: 3000)')
+    parser.add_argument('--ready-timeout', type=float, default=3.0, help='等待结果页就绪的超时秒数 (默认: 3)')
+    parser.add_argument('--max-retries', type=int, default=1, help='出错关键词的重试次数 (默认: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='关键词生成的随机种子 (默认: 42)')
+    parser.add_argument('--json', help='把完整结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    keywords = build_keywords(args.keywords, parse_mix(args.mix), seed=args.seed)
+    stub = SerpStubServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_ms=args.slow_ms).start()
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_screenshots_") as screenshot_dir:
+            for level in parse_levels(args.levels):
+                print(f"并发 {level}: 验证 {len(keywords)} 个关键词...", flush=True)
+                rows.append(run_level(stub.base_url, keywords, level, args.engine, args.mobile,
+                                      args.ready_timeout, args.max_retries, screenshot_dir))
+    finally:
+        stub.stop()
+
+    print_report(rows)
+    print(f"桩服务请求: {stub.stats}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'levels': rows, 'stub': stub.stats}, f, ensure_ascii=False, indent=2)
+        print(f"完整结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+浏览器看门狗
+记录每个工作者当前关键词的开始时间，超过挂起超时仍未结束时强制结束该工作者的浏览器进程
+（按启动参数中的标记查找），被阻塞的 Playwright 调用随之失败，工作者重启浏览器并重新排队该关键词
+"""
+
+import time
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+from process_stats import find_pids, kill_pids
+
+logger = logging.getLogger(__name__)
+
+
+# 浏览器启动参数中的标记前缀（Chromium 会忽略不认识的开关）
+MARKER_SWITCH = '--niche-miner-instance='
+
+
+def marker_arg(marker: str) -> str:
+    """
+    生成带标记的启动参数
+
+    Args:
+        marker: 浏览器实例标记
+
+    Returns:
+        启动参数字符串
+    """
+    return f"{MARKER_SWITCH}{marker}"
+
+
+class BrowserWatchdog:
+    """挂起检测（线程安全，一个看门狗线程监视所有工作者）"""
+
+    def __init__(self, hang_timeout: float, check_interval: float = 1.0):
+        """
+        初始化看门狗
+
+        Args:
+            hang_timeout: 单个关键词超过多少秒视为浏览器挂起
+            check_interval: 检查间隔（秒）
+        """
+        self.hang_timeout = hang_timeout
+        self.check_interval = check_interval
+        self.kills = 0
+        self._lock = threading.Lock()
+        # 工作者名称 -> (浏览器标记, 开始时间, 关键词)
+        self._slots: Dict[str, Tuple[str, float, str]] = {}
+        self._fired: Dict[str, bool] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BrowserWatchdog":
+        """启动看门狗线程"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="browser-watchdog", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """停止看门狗线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def begin(self, name: str, marker: Optional[str], keyword: str):
+        """
+        工作者开始处理关键词
+
+        Args:
+            name: 工作者名称
+            marker: 工作者浏览器的标记
+            keyword: 关键词
+        """
+        if not marker:
+            return
+        with self._lock:
+            self._slots[name] = (marker, time.monotonic(), keyword)
+            self._fired[name] = False
+
+    def end(self, name: str) -> bool:
+        """
+        工作者结束处理关键词
+
+        Args:
+            name: 工作者名称
+
+        Returns:
+            True 表示处理期间浏览器因挂起被看门狗结束（调用方需要重启浏览器并重新排队该关键词）
+        """
+        with self._lock:
+            self._slots.pop(name, None)
+            return self._fired.pop(name, False)
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            now = time.monotonic()
+            with self._lock:
+                overdue = [
+                    (name, marker, keyword)
+                    for name, (marker, started, keyword) in self._slots.items()
+                    if now - started > self.hang_timeout and not self._fired.get(name)
+                ]
+                for name, _, _ in overdue:
+                    self._fired[name] = True
+
+            for name, marker, keyword in overdue:
+                pids = find_pids(marker_arg(marker))
+                if not pids:
+                    logger.warning(f"[{name}] 关键词处理超过 {self.hang_timeout:.0f} 秒，但未找到浏览器进程: {keyword}")
+                    continue
+                killed = kill_pids(pids)
+                with self._lock:
+                    self.kills += killed
+                logger.warning(f"[{name}] 关键词处理超过 {self.hang_timeout:.0f} 秒，"
+                               f"已结束挂起的浏览器（进程 {pids}）: {keyword}")
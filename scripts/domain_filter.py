@@ -0,0 +1,154 @@
+"""
+广告链接域名过滤
+过滤列表预先编译成集合，按链接主机名的各级后缀查找（与列表长度无关，只与域名层级数有关）；
+百度跳转链接的解析结果做 LRU 缓存
+"""
+
+import logging
+from functools import lru_cache
+from typing import List, Iterable, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def resolve_baidu_link(url: str) -> str:
+    """
+    解析百度跳转链接中的真实链接（https://www.baidu.com/link?url=xxx）
+
+    Args:
+        url: 广告链接
+
+    Returns:
+        真实链接；不是跳转链接或无法解析时原样返回
+    """
+    if 'link?url=' not in url:
+        return url
+    try:
+        query_params = parse_qs(urlparse(url).query)
+        if 'url' in query_params:
+            # 获取真实链接（可能需要URL解码）
+            return unquote(query_params['url'][0])
+    except Exception:
+        pass
+    # 备用方法：直接从字符串中提取
+    try:
+        return unquote(url.split('url=')[1].split('&')[0])
+    except Exception:
+        return url
+
+
+@lru_cache(maxsize=4096)
+def extract_domain(url: str) -> str:
+    """
+    从 URL 中提取域名（支持百度跳转链接，去掉 www. 前缀和端口号）
+
+    Args:
+        url: 完整的 URL 字符串
+
+    Returns:
+        域名（如：jd.com），提取失败时返回空字符串
+    """
+    try:
+        domain = (urlparse(resolve_baidu_link(url)).hostname or '').lower()
+    except Exception as e:
+        logger.debug(f"提取域名失败: {url} - {str(e)}")
+        return ""
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def normalize_domain(entry: str) -> str:
+    """
+    规范化过滤列表中的一项（转小写，去掉协议、通配符前缀、www. 和路径）
+
+    Args:
+        entry: 原始条目（如 "*.JD.com"、"https://www.tmall.com/"）
+
+    Returns:
+        规范化后的域名，无效条目返回空字符串
+    """
+    entry = entry.strip().lower()
+    if '://' in entry:
+        entry = entry.split('://', 1)[1]
+    entry = entry.split('/', 1)[0].split(':', 1)[0]
+    entry = entry.lstrip('*').lstrip('.')
+    if entry.startswith('www.'):
+        entry = entry[4:]
+    return entry
+
+
+class DomainMatcher:
+    """过滤域名匹配器（精确匹配和子域名匹配，如 item.jd.com 匹配 jd.com）"""
+
+    def __init__(self, domains: Iterable[str]):
+        """
+        编译过滤域名列表
+
+        Args:
+            domains: 过滤域名（只需主域名，子域名自动匹配）
+        """
+        self.domains = frozenset(d for d in (normalize_domain(x) for x in domains) if d)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def match_domain(self, domain: str) -> Optional[str]:
+        """
+        查找域名命中的过滤项（依次检查 a.b.c、b.c、c）
+
+        Args:
+            domain: 已提取的域名
+
+        Returns:
+            命中的过滤项，未命中返回 None
+        """
+        labels = domain.split('.')
+        for i in range(len(labels)):
+            suffix = '.'.join(labels[i:])
+            if suffix in self.domains:
+                return suffix
+        return None
+
+    def match_url(self, url: str) -> Optional[str]:
+        """
+        查找链接命中的过滤项
+
+        域名提取失败时退回到在 URL 字符串中查找过滤项（逐项扫描，仅在异常链接上发生）
+
+        Args:
+            url: 广告链接
+
+        Returns:
+            命中的过滤项，未命中返回 None
+        """
+        domain = extract_domain(url)
+        if domain:
+            return self.match_domain(domain)
+
+        url_lower = url.lower()
+        for filtered in self.domains:
+            if filtered in url_lower:
+                return filtered
+        return None
+
+
+def load_domain_list(file_path: str) -> List[str]:
+    """
+    从文件加载过滤域名列表（每行一个域名，# 开头为注释）
+
+    Args:
+        file_path: 域名列表文件路径
+
+    Returns:
+        域名列表
+    """
+    domains = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                domains.append(line)
+    return domains
@@ -0,0 +1,253 @@
+"""
+关键词输入读取
+逐行读取 xlsx（openpyxl 只读模式）、csv 和 parquet（pyarrow 分批读取），
+按块产出去重后的关键词，验证可以在大文件读完之前就开始；
+全角/半角、大小写、多余空格和中英文标点不同的写法规范化为同一个关键词，只验证一次
+"""
+
+import os
+import re
+import csv
+import unicodedata
+import logging
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 每块产出的关键词数量
+DEFAULT_CHUNK_SIZE = 1000
+
+# NFKC 不处理的中文标点，折叠为对应的半角标点
+PUNCTUATION_FOLD = str.maketrans({
+    '，': ',', '、': ',', '。': '.', '；': ';', '：': ':',
+    '“': '"', '”': '"', '「': '"', '」': '"', '『': '"', '』': '"',
+    '‘': "'", '’': "'",
+    '《': '<', '》': '>', '〈': '<', '〉': '>',
+    '【': '[', '】': ']', '〔': '(', '〕': ')', '〖': '[', '〗': ']',
+    '—': '-', '–': '-', '－': '-', '〜': '~', '・': '·',
+})
+
+# 标点两侧的空格不影响搜索结果
+_SPACE_AROUND_PUNCT = re.compile(r'\s*([,.;:!?()\[\]<>"\'~·/|-])\s*')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonicalize_keyword(value) -> str:
+    """
+    关键词规范化：NFKC（全角转半角）、去除零宽等格式字符、中文标点折叠为半角、
+    转小写、合并连续空白并去掉标点两侧的空格
+
+    例如 "ＩＰｈｏｎｅ  手机壳，防摔" 和 "iphone 手机壳,防摔" 规范化后相同
+
+    Args:
+        value: 原始关键词（非字符串按 str() 转换）
+
+    Returns:
+        规范化后的关键词（空值返回空字符串）
+    """
+    if value is None:
+        return ''
+    text = unicodedata.normalize('NFKC', str(value))
+    text = ''.join(ch for ch in text if unicodedata.category(ch) != 'Cf')
+    text = text.translate(PUNCTUATION_FOLD).lower()
+    text = _WHITESPACE.sub(' ', text).strip()
+    return _SPACE_AROUND_PUNCT.sub(r'\1', text)
+
+
+def keyword_key(value, canonicalize: bool = True) -> str:
+    """
+    关键词的匹配键（输入行与验证结果按该键对应）
+
+    Args:
+        value: 关键词
+        canonicalize: 是否规范化（False 时只去除首尾空白）
+
+    Returns:
+        匹配键
+    """
+    if canonicalize:
+        return canonicalize_keyword(value)
+    return '' if value is None else str(value).strip()
+
+
+def _suffix(file_path: str) -> str:
+    return Path(file_path).suffix.lower()
+
+
+def iter_table_rows(file_path: str, columns: Optional[List[str]] = None,
+                    batch_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List]:
+    """
+    逐行读取表格（第一行为表头）
+
+    Args:
+        file_path: 文件路径（.xlsx / .csv / .parquet）
+        columns: 只读取这些列（仅 parquet 有效，其他格式读取整行）
+        batch_size: parquet 每批读取的行数
+
+    Yields:
+        行值列表
+    """
+    suffix = _suffix(file_path)
+
+    if suffix == '.csv':
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.reader(f):
+                yield row
+        return
+
+    if suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("读取 Parquet 需要安装 pyarrow: pip install pyarrow")
+        parquet_file = pq.ParquetFile(file_path)
+        names = columns or parquet_file.schema_arrow.names
+        yield list(names)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=names):
+            column_values = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+            for row in zip(*column_values):
+                yield list(row)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        wb.close()
+
+
+def estimate_row_count(file_path: str) -> Optional[int]:
+    """
+    估算数据行数（不读取整个文件，用于进度显示）
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        估算的数据行数（不含表头），无法估算时返回 None
+    """
+    suffix = _suffix(file_path)
+    try:
+        if suffix == '.parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(file_path).metadata.num_rows
+
+        if suffix == '.csv':
+            # 按前 64KB 的平均行长度估算
+            size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                head = f.read(64 * 1024)
+            lines = head.count(b'\n')
+            if not lines:
+                return 0
+            return max(0, int(size / (len(head) / lines)) - 1)
+
+        from openpyxl import load_workbook
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            max_row = wb.active.max_row
+        finally:
+            wb.close()
+        return max(0, max_row - 1) if max_row else None
+    except Exception as e:
+        logger.debug(f"估算行数失败: {file_path} - {str(e)}")
+        return None
+
+
+class KeywordSource:
+    """关键词输入（按块读取并去重，读取过的关键词按首次出现的顺序保留在 keywords 中）"""
+
+    def __init__(self, file_path: str, column_name: str = "Keyword", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 canonicalize: bool = True):
+        """
+        初始化关键词输入
+
+        Args:
+            file_path: 输入文件路径（.xlsx / .csv / .parquet）
+            column_name: 关键词列名
+            chunk_size: 每块的关键词数量
+            canonicalize: 是否规范化关键词（写法不同但搜索结果相同的变体只验证一次）
+        """
+        self.file_path = file_path
+        self.column_name = column_name
+        self.chunk_size = max(1, chunk_size)
+        self.canonicalize = canonicalize
+        # 有序去重集合（dict 的键），读取完成后即为全部关键词（规范化后的形式）
+        self.keywords: Dict[str, None] = {}
+        self.rows = 0            # 非空关键词行数
+        self.duplicates = 0      # 与之前的行重复、不需要再次搜索的行数
+        self.variants = 0        # 其中原文不同、规范化后相同的行数
+        self._raw_seen = set()
+
+    @property
+    def searches_saved(self) -> int:
+        """去重（含规范化合并）节省的搜索次数"""
+        return self.duplicates
+
+    def iter_chunks(self) -> Iterator[List[str]]:
+        """
+        按块读取关键词（去除空值、首尾空白和重复）
+
+        Yields:
+            关键词列表（每块最多 chunk_size 个）
+        """
+        if not Path(self.file_path).exists():
+            logger.error(f"文件未找到: {self.file_path}")
+            raise FileNotFoundError(self.file_path)
+
+        rows = iter_table_rows(self.file_path, columns=[self.column_name], batch_size=self.chunk_size)
+        header = next(rows, None) or []
+        if self.column_name not in header:
+            rows.close()
+            raise ValueError(f"文件中未找到列 '{self.column_name}'。可用列: {header}")
+        key_index = header.index(self.column_name)
+
+        chunk = []
+        for row in rows:
+            value = row[key_index] if key_index < len(row) else None
+            if value is None:
+                continue
+            raw = str(value).strip()
+            keyword = keyword_key(raw, self.canonicalize)
+            if not keyword:
+                continue
+            self.rows += 1
+            if keyword in self.keywords:
+                self.duplicates += 1
+                if self.canonicalize and raw not in self._raw_seen:
+                    self.variants += 1
+                    self._raw_seen.add(raw)
+                continue
+            self.keywords[keyword] = None
+            if self.canonicalize:
+                self._raw_seen.add(raw)
+            chunk.append(keyword)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+        if self.canonicalize:
+            logger.info(f"成功加载 {len(self.keywords)} 个关键词（{self.rows} 行，去除重复 {self.duplicates} 个，"
+                        f"其中写法不同的变体 {self.variants} 个）")
+        else:
+            logger.info(f"成功加载 {len(self.keywords)} 个关键词（去除重复 {self.duplicates} 个）")
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def estimate_total(self) -> Optional[int]:
+        """
+        估算关键词数量（按数据行数估算，未扣除空值和重复）
+
+        Returns:
+            估算数量，无法估算时返回 None
+        """
+        return estimate_row_count(self.file_path)
@@ -0,0 +1,270 @@
+"""
+网络资源拦截策略
+通过 context.route 拦截图片、字体、视频和统计埋点等非必要请求，节省代理带宽并加快页面加载
+百度广告验证和淘宝挖掘共用
+"""
+
+import re
+import time
+import threading
+import logging
+from typing import List, Dict, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+# 默认拦截的资源类型（Playwright request.resource_type）
+DEFAULT_BLOCKED_TYPES = {'image', 'media', 'font'}
+
+# 截图需要的资源类型（截图模式下放行，保证截图完整）
+SCREENSHOT_RESOURCE_TYPES = {'image', 'font'}
+
+# 默认拦截的 URL 模式（统计和埋点请求，不影响页面内容）
+DEFAULT_DENY_PATTERNS = [
+    r'://hm\.baidu\.com/',           # 百度统计
+    r'://hmma\.baidu\.com/',
+    r'://sestat\.baidu\.com/',       # 百度搜索统计
+    r'://sp\d\.baidu\.com/.*/w\.gif',
+    r'://[a-z0-9.-]*\.mmstat\.com/',  # 阿里系统计（log.mmstat.com / gm.mmstat.com）
+    r'://[a-z0-9.-]*\.google-analytics\.com/',
+    r'://[a-z0-9.-]*\.doubleclick\.net/',
+]
+
+# 被拦截请求的经验体积（字节），没有对照采样时用于粗略估算节省的带宽
+ESTIMATED_BYTES_BY_TYPE = {
+    'image': 30 * 1024,
+    'media': 500 * 1024,
+    'font': 60 * 1024,
+}
+ESTIMATED_BYTES_DEFAULT = 2 * 1024
+
+
+class ResourcePolicy:
+    """
+    请求拦截策略（按资源类型和 URL 模式放行/拦截，线程安全的统计）
+
+    设置 baseline_every 时每 N 次页面加载有一次不拦截（对照采样），
+    用对照加载和拦截加载的平均耗时、平均下载量之差得出实测的节省量
+    """
+
+    def __init__(self, blocked_types: Optional[Iterable[str]] = None,
+                 deny_patterns: Optional[List[str]] = None,
+                 allow_patterns: Optional[List[str]] = None,
+                 allow_types: Optional[Iterable[str]] = None,
+                 baseline_every: int = 0):
+        """
+        初始化拦截策略
+
+        Args:
+            blocked_types: 拦截的资源类型（默认 image/media/font）
+            deny_patterns: 额外拦截的 URL 正则（默认拦截统计埋点）
+            allow_patterns: 始终放行的 URL 正则（优先级最高）
+            allow_types: 本次运行强制放行的资源类型（例如截图时放行 image/font）
+            baseline_every: 每多少次页面加载做一次不拦截的对照采样（0 表示不采样）
+        """
+        blocked = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_types = blocked - set(allow_types or [])
+        self.baseline_every = max(0, baseline_every)
+        self.deny_patterns = [re.compile(p) for p in (DEFAULT_DENY_PATTERNS if deny_patterns is None else deny_patterns)]
+        self.allow_patterns = [re.compile(p) for p in (allow_patterns or [])]
+
+        self._lock = threading.Lock()
+        self.blocked_by_type: Dict[str, int] = {}
+        self.allowed_requests = 0
+        self.estimated_bytes_saved = 0
+        self._navigations = 0
+        # 页面当前这次加载是否为对照采样（按页面记录，子资源请求据此决定是否拦截）
+        self._baseline_pages = set()
+        # 按加载类型（blocked / baseline）统计：加载次数、加载耗时合计、下载字节合计
+        self.page_loads = {'blocked': 0, 'baseline': 0}
+        self.page_load_ms_total = {'blocked': 0.0, 'baseline': 0.0}
+        self.bytes_downloaded = {'blocked': 0, 'baseline': 0}
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        判断请求是否需要拦截
+
+        Args:
+            resource_type: 资源类型（document/script/image/...）
+            url: 请求 URL
+
+        Returns:
+            True 表示拦截
+        """
+        if resource_type == 'document':
+            return False
+        if any(p.search(url) for p in self.allow_patterns):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return any(p.search(url) for p in self.deny_patterns)
+
+    def _record_block(self, resource_type: str):
+        with self._lock:
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(resource_type, ESTIMATED_BYTES_DEFAULT)
+
+    def _in_baseline(self, request) -> bool:
+        """请求所属页面当前是否在做对照采样"""
+        if not self._baseline_pages:
+            return False
+        try:
+            return request.frame.page in self._baseline_pages
+        except Exception:
+            return False
+
+    def _handle_route(self, route):
+        request = route.request
+        if not self._in_baseline(request) and self.should_block(request.resource_type, request.url):
+            self._record_block(request.resource_type)
+            route.abort()
+        else:
+            with self._lock:
+                self.allowed_requests += 1
+            route.continue_()
+
+    async def _handle_route_async(self, route):
+        request = route.request
+        if not self._in_baseline(request) and self.should_block(request.resource_type, request.url):
+            self._record_block(request.resource_type)
+            await route.abort()
+        else:
+            with self._lock:
+                self.allowed_requests += 1
+            await route.continue_()
+
+    def _record_bytes(self, page, sizes: Dict):
+        """按请求实际传输的响应头和响应体大小累计下载字节（计入页面当前的加载类型）"""
+        size = max(0, sizes.get('responseBodySize', 0)) + max(0, sizes.get('responseHeadersSize', 0))
+        kind = 'baseline' if page in self._baseline_pages else 'blocked'
+        with self._lock:
+            self.bytes_downloaded[kind] += size
+
+    def _track_page(self, page, async_api: bool = False):
+        """记录每次主文档加载的耗时（导航请求发出到 load 事件）和下载字节数，并按 baseline_every 选出对照采样"""
+        started = {}
+
+        def on_request(request):
+            if not (request.is_navigation_request() and request.frame == page.main_frame):
+                return
+            started['at'] = time.perf_counter()
+            with self._lock:
+                self._navigations += 1
+                baseline = bool(self.baseline_every) and self._navigations % self.baseline_every == 0
+                if baseline:
+                    self._baseline_pages.add(page)
+                else:
+                    self._baseline_pages.discard(page)
+
+        def on_load(_):
+            start = started.pop('at', None)
+            if start is not None:
+                kind = 'baseline' if page in self._baseline_pages else 'blocked'
+                with self._lock:
+                    self.page_loads[kind] += 1
+                    self.page_load_ms_total[kind] += (time.perf_counter() - start) * 1000
+
+        def on_close(_):
+            with self._lock:
+                self._baseline_pages.discard(page)
+
+        def on_finished(request):
+            try:
+                self._record_bytes(page, request.sizes())
+            except Exception as e:
+                logger.debug(f"读取请求大小失败: {str(e)[:100]}")
+
+        async def on_finished_async(request):
+            try:
+                self._record_bytes(page, await request.sizes())
+            except Exception as e:
+                logger.debug(f"读取请求大小失败: {str(e)[:100]}")
+
+        page.on("request", on_request)
+        page.on("load", on_load)
+        page.on("close", on_close)
+        page.on("requestfinished", on_finished_async if async_api else on_finished)
+
+    def install(self, context, page=None):
+        """
+        为浏览器上下文安装拦截规则（同步 API）
+
+        Args:
+            context: BrowserContext 对象
+            page: 需要统计加载耗时的页面（可选）
+        """
+        context.route("**/*", self._handle_route)
+        if page is not None:
+            self._track_page(page)
+
+    async def install_async(self, context, page=None):
+        """
+        为浏览器上下文安装拦截规则（异步 API）
+
+        Args:
+            context: BrowserContext 对象
+            page: 需要统计加载耗时的页面（可选）
+        """
+        await context.route("**/*", self._handle_route_async)
+        if page is not None:
+            self._track_page(page, async_api=True)
+
+    def summary(self) -> Dict:
+        """
+        本次运行的拦截统计
+
+        Returns:
+            统计字典（blocked_requests / blocked_by_type / allowed_requests / bytes_downloaded /
+            page_loads / avg_page_load_ms / avg_page_bytes（拦截时的每次加载），
+            baseline_loads / baseline_avg_page_load_ms / baseline_avg_page_bytes（对照采样），
+            load_ms_saved_per_page / bytes_saved_per_page / bytes_saved（有对照采样时为实测差值，否则为 None），
+            estimated_bytes_saved（按经验体积的粗略估算））
+        """
+        with self._lock:
+            loads = dict(self.page_loads)
+            load_ms = dict(self.page_load_ms_total)
+            downloaded = dict(self.bytes_downloaded)
+            stats = {
+                'blocked_requests': sum(self.blocked_by_type.values()),
+                'blocked_by_type': dict(self.blocked_by_type),
+                'allowed_requests': self.allowed_requests,
+                'bytes_downloaded': sum(downloaded.values()),
+                'estimated_bytes_saved': self.estimated_bytes_saved,
+            }
+        avg_ms = {kind: load_ms[kind] / loads[kind] if loads[kind] else 0.0 for kind in loads}
+        avg_bytes = {kind: downloaded[kind] / loads[kind] if loads[kind] else 0.0 for kind in loads}
+        measured = loads['blocked'] > 0 and loads['baseline'] > 0
+        stats.update({
+            'page_loads': loads['blocked'],
+            'avg_page_load_ms': avg_ms['blocked'],
+            'avg_page_bytes': avg_bytes['blocked'],
+            'baseline_loads': loads['baseline'],
+            'baseline_avg_page_load_ms': avg_ms['baseline'],
+            'baseline_avg_page_bytes': avg_bytes['baseline'],
+            'load_ms_saved_per_page': avg_ms['baseline'] - avg_ms['blocked'] if measured else None,
+            'bytes_saved_per_page': avg_bytes['baseline'] - avg_bytes['blocked'] if measured else None,
+            'bytes_saved': (avg_bytes['baseline'] - avg_bytes['blocked']) * loads['blocked'] if measured else None,
+        })
+        return stats
+
+    def log_summary(self):
+        """输出本次运行的拦截统计"""
+        stats = self.summary()
+        by_type = ', '.join(f"{k}={v}" for k, v in sorted(stats['blocked_by_type'].items())) or '无'
+        logger.info(f"资源拦截: 拦截 {stats['blocked_requests']} 个请求（{by_type}），放行 {stats['allowed_requests']} 个")
+        logger.info(f"带宽: 实际下载 {stats['bytes_downloaded'] / 1024 / 1024:.1f} MB（按响应头和响应体统计）")
+        if stats['load_ms_saved_per_page'] is not None:
+            baseline_ms = stats['baseline_avg_page_load_ms']
+            saved_pct = stats['load_ms_saved_per_page'] / baseline_ms * 100 if baseline_ms else 0.0
+            logger.info(f"页面加载: 拦截 {stats['page_loads']} 次，平均 {stats['avg_page_load_ms']:.0f} ms / "
+                        f"{stats['avg_page_bytes'] / 1024:.0f} KB；对照采样（不拦截）{stats['baseline_loads']} 次，"
+                        f"平均 {baseline_ms:.0f} ms / {stats['baseline_avg_page_bytes'] / 1024:.0f} KB")
+            logger.info(f"节省（实测）: 每页加载快 {stats['load_ms_saved_per_page']:.0f} ms（{saved_pct:.0f}%），"
+                        f"每页少下载 {stats['bytes_saved_per_page'] / 1024:.0f} KB，"
+                        f"合计约 {stats['bytes_saved'] / 1024 / 1024:.1f} MB")
+        else:
+            logger.info(f"带宽: 估算节省约 {stats['estimated_bytes_saved'] / 1024 / 1024:.1f} MB"
+                        f"（按资源类型的经验体积估算，未做对照采样）")
+            if stats['page_loads']:
+                logger.info(f"页面加载: {stats['page_loads']} 次，平均 {stats['avg_page_load_ms']:.0f} ms"
+                            f"（没有对照采样，无法得出节省的加载时间）")
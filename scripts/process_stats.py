@@ -0,0 +1,217 @@
+"""
+进程内存统计
+统计当前进程及其子进程（浏览器、渲染进程等）的常驻内存，按启动参数中的标记查找和结束浏览器进程，
+优先使用 psutil（可选依赖），未安装时在 Linux 上读取 /proc
+"""
+
+import os
+import signal
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def process_stats_available() -> bool:
+    """当前环境能否统计进程内存、按标记查找进程（已安装 psutil，或 Linux 的 /proc 可用）"""
+    try:
+        import psutil  # noqa: F401
+        return True
+    except ImportError:
+        return os.path.isdir('/proc')
+
+
+def warn_if_unavailable(recycle_rss_mb: float = 0, hang_timeout: float = 0) -> bool:
+    """
+    启动时检查内存回收和挂起看门狗依赖的进程统计是否可用，不可用时输出警告（如 Windows 未安装 psutil）
+
+    Args:
+        recycle_rss_mb: 按内存重启浏览器的阈值（0 表示未启用）
+        hang_timeout: 挂起超时秒数（0 表示未启用）
+
+    Returns:
+        进程统计是否可用
+    """
+    available = process_stats_available()
+    if not available and (recycle_rss_mb or hang_timeout):
+        logger.warning("⚠️ 未安装 psutil 且当前平台没有 /proc，无法统计浏览器内存和查找浏览器进程："
+                       "--recycle-rss-mb 不会生效，挂起的浏览器无法被强制结束（安装: pip install psutil）")
+    return available
+
+
+def _proc_children_map() -> Dict[int, List[int]]:
+    """读取 /proc 构建 父进程 -> 子进程 映射"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 进程名可能包含空格和括号，从最后一个 ')' 之后解析
+        fields = stat[stat.rfind(')') + 2:].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    """读取 /proc/<pid>/status 中的 VmRSS（字节），进程已退出时返回 0"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def descendant_pids(pid: Optional[int] = None) -> List[int]:
+    """
+    获取进程的所有子孙进程
+
+    Args:
+        pid: 进程 ID（默认当前进程）
+
+    Returns:
+        子孙进程 ID 列表（不含 pid 本身），无法获取时返回空列表
+    """
+    pid = pid or os.getpid()
+    try:
+        import psutil
+        return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+    except ImportError:
+        pass
+    except Exception:
+        return []
+
+    if not os.path.isdir('/proc'):
+        return []
+    children = _proc_children_map()
+    result, stack = [], list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        result.append(child)
+        stack.extend(children.get(child, []))
+    return result
+
+
+def process_tree_rss(pid: Optional[int] = None) -> Optional[int]:
+    """
+    进程及其所有子孙进程的常驻内存合计
+
+    Args:
+        pid: 进程 ID（默认当前进程）
+
+    Returns:
+        字节数，当前平台无法统计时返回 None
+    """
+    pid = pid or os.getpid()
+    try:
+        import psutil
+        try:
+            root = psutil.Process(pid)
+            total = root.memory_info().rss
+            for child in root.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return None
+    except ImportError:
+        pass
+
+    if not os.path.isdir('/proc'):
+        return None
+    return _proc_rss(pid) + sum(_proc_rss(child) for child in descendant_pids(pid))
+
+
+def _proc_cmdline(pid: int) -> str:
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode('utf-8', errors='replace')
+    except OSError:
+        return ''
+
+
+def find_pids(marker: str) -> List[int]:
+    """
+    查找命令行中包含标记的进程（只返回最上层的进程，不含其中包含同样标记的子进程）
+
+    Args:
+        marker: 启动参数中的标记字符串
+
+    Returns:
+        进程 ID 列表，当前平台无法查找时返回空列表
+    """
+    try:
+        import psutil
+        matched = set()
+        for proc in psutil.process_iter(['pid', 'cmdline']):
+            if marker in ' '.join(proc.info.get('cmdline') or []):
+                matched.add(proc.info['pid'])
+    except ImportError:
+        if not os.path.isdir('/proc'):
+            return []
+        matched = {int(entry) for entry in os.listdir('/proc')
+                   if entry.isdigit() and marker in _proc_cmdline(int(entry))}
+
+    nested = set()
+    for pid in matched:
+        nested.update(p for p in descendant_pids(pid) if p in matched)
+    return sorted(matched - nested)
+
+
+def marked_tree_rss(marker: str) -> Optional[int]:
+    """
+    命令行中包含标记的进程（如某个浏览器的主进程）及其子孙进程的常驻内存合计
+
+    Args:
+        marker: 启动参数中的标记字符串
+
+    Returns:
+        字节数，找不到进程时返回 None
+    """
+    pids = find_pids(marker)
+    if not pids:
+        return None
+    sizes = [process_tree_rss(pid) for pid in pids]
+    return sum(size for size in sizes if size is not None)
+
+
+def kill_pids(pids: List[int]) -> int:
+    """
+    强制结束进程
+
+    Args:
+        pids: 进程 ID 列表
+
+    Returns:
+        成功发送信号的进程数量
+    """
+    killed = 0
+    for pid in pids:
+        try:
+            os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            killed += 1
+        except OSError as e:
+            logger.debug(f"结束进程失败: {pid} - {str(e)}")
+    return killed
+
+
+def format_mb(value: Optional[int]) -> str:
+    """
+    将字节数格式化为 MB
+
+    Args:
+        value: 字节数（None 表示未知）
+
+    Returns:
+        如 "512.3 MB" 或 "未知"
+    """
+    return f"{value / 1024 / 1024:.1f} MB" if value is not None else "未知"
@@ -0,0 +1,151 @@
+"""
+结构化进度事件
+--progress-format jsonl 时把每个关键词、每页和每个阶段的进度以 JSON Lines 写到独立的文件描述符
+（默认 3），调用方（Next.js 接口）直接按行解析，不需要从日志文本中匹配进度
+
+每行一个事件，公共字段：
+    type     事件类型（start / phase / keyword / page / seed / login_status / done / error）
+    seq      事件序号（从 0 开始）
+    ts       Unix 时间戳
+    elapsed  距离进程开始输出事件的秒数
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 支持的进度输出格式（text 表示只输出日志，不输出事件）
+PROGRESS_FORMATS = ('text', 'jsonl')
+
+# 默认的事件文件描述符（0/1/2 之后的第一个，由父进程通过 stdio 的第 4 项提供）
+DEFAULT_PROGRESS_FD = 3
+
+
+class ProgressReporter:
+    """进度事件输出（线程安全；未启用时所有方法都是空操作）"""
+
+    def __init__(self, fmt: str = 'text', fd: int = DEFAULT_PROGRESS_FD):
+        """
+        初始化进度输出
+
+        Args:
+            fmt: 'text'（不输出事件）或 'jsonl'
+            fd: 事件写入的文件描述符
+        """
+        self._lock = threading.Lock()
+        self._stream = None
+        self._seq = 0
+        self._started = time.monotonic()
+        self.total: Optional[int] = None
+        # 分组（如模式、种子词） -> 已完成数量 / 各结果的数量
+        self._completed: Dict[Optional[str], int] = {}
+        self._counts: Dict[Optional[str], Dict[str, int]] = {}
+
+        if fmt != 'jsonl':
+            return
+        try:
+            # 标准输出 / 标准错误不随事件流关闭
+            self._stream = os.fdopen(fd, 'w', encoding='utf-8', buffering=1, closefd=fd > 2)
+        except OSError as e:
+            logger.warning(f"无法打开进度事件文件描述符 {fd}（{str(e)}），不输出进度事件")
+
+    @property
+    def enabled(self) -> bool:
+        return self._stream is not None
+
+    def emit(self, event_type: str, **fields):
+        """
+        输出一个事件
+
+        Args:
+            event_type: 事件类型
+            fields: 事件字段（需要可以 JSON 序列化，无法序列化的值转为字符串）
+        """
+        if self._stream is None:
+            return
+        with self._lock:
+            event = {'type': event_type, 'seq': self._seq, 'ts': round(time.time(), 3),
+                     'elapsed': round(time.monotonic() - self._started, 3)}
+            event.update(fields)
+            self._seq += 1
+            try:
+                self._stream.write(json.dumps(event, ensure_ascii=False, default=str) + '\n')
+                self._stream.flush()
+            except (OSError, ValueError) as e:
+                # 读取端已关闭：停止输出事件，不影响主流程
+                logger.warning(f"进度事件写入失败，停止输出: {str(e)}")
+                self._stream = None
+
+    def phase(self, name: str, status: str = 'start', **fields):
+        """
+        输出阶段事件
+
+        Args:
+            name: 阶段名（如 load / validate / save / login / crawl / filter / insert）
+            status: 'start' / 'end'
+            fields: 其余字段（数量、耗时等）
+        """
+        self.emit('phase', phase=name, status=status, **fields)
+
+    def advance(self, event_type: str, group: Optional[str] = None, label: Optional[str] = None, **fields):
+        """
+        完成一项（关键词、页面等）：累计分组的完成数量和各结果数量后输出事件
+
+        Args:
+            event_type: 事件类型
+            group: 分组（如 'pc' / 'mobile'），各分组分别计数
+            label: 结果分类（如 'Yes' / 'No' / 'Error'）
+            fields: 其余字段
+        """
+        if self._stream is None:
+            return
+        with self._lock:
+            completed = self._completed[group] = self._completed.get(group, 0) + 1
+            counts = self._counts.setdefault(group, {})
+            if label is not None:
+                counts[label] = counts.get(label, 0) + 1
+            counts = dict(counts)
+        total = max(self.total, completed) if self.total is not None else None
+        self.emit(event_type, current=completed, total=total, counts=counts, **fields)
+
+    def close(self):
+        """关闭事件流"""
+        with self._lock:
+            if self._stream is not None:
+                try:
+                    self._stream.close()
+                except OSError:
+                    pass
+                self._stream = None
+
+
+def add_progress_arguments(parser):
+    """
+    添加 --progress-format / --progress-fd 命令行参数
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument('--progress-format', choices=PROGRESS_FORMATS, default='text',
+                        help='进度输出格式：text 只输出日志，jsonl 额外向 --progress-fd 输出结构化事件 (默认: text)')
+    parser.add_argument('--progress-fd', type=int, default=DEFAULT_PROGRESS_FD,
+                        help=f'jsonl 进度事件写入的文件描述符 (默认: {DEFAULT_PROGRESS_FD})')
+
+
+def reporter_from_args(args) -> ProgressReporter:
+    """
+    按命令行参数创建进度输出
+
+    Args:
+        args: 包含 progress_format / progress_fd 的参数对象
+
+    Returns:
+        ProgressReporter
+    """
+    return ProgressReporter(args.progress_format, args.progress_fd)
@@ -0,0 +1,295 @@
+"""
+代理池
+记录每个代理的延迟、成功率和验证码率，按健康度分配代理；
+连续失败或频繁遇到验证码的代理进入冷却（熔断），冷却结束后先分配一次试探，成功才恢复使用
+百度广告验证和淘宝挖掘共用
+"""
+
+import time
+import random
+import threading
+import logging
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 代理状态
+STATE_HEALTHY = 'healthy'      # 正常使用
+STATE_COOLDOWN = 'cooldown'    # 熔断冷却中，不分配
+STATE_PROBING = 'probing'      # 冷却结束，正在试探（只分配给一个使用者）
+
+
+def normalize_proxy(proxy: str) -> str:
+    """
+    补全代理地址的协议前缀（默认 http://）
+
+    Args:
+        proxy: 代理地址
+
+    Returns:
+        带协议前缀的代理地址
+    """
+    proxy = proxy.strip()
+    if not proxy.startswith(('http://', 'https://', 'socks5://')):
+        proxy = 'http://' + proxy
+    return proxy
+
+
+def load_proxy_list(file_path: str) -> List[str]:
+    """
+    从文件加载代理列表（每行一个代理地址）
+
+    Args:
+        file_path: 代理列表文件路径
+
+    Returns:
+        代理地址列表
+    """
+    proxies = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):  # 忽略空行和注释
+                    proxies.append(line)
+        logger.info(f"成功加载 {len(proxies)} 个代理地址")
+    except FileNotFoundError:
+        logger.error(f"代理列表文件未找到: {file_path}")
+    except Exception as e:
+        logger.error(f"读取代理列表文件时出错: {str(e)}")
+
+    return proxies
+
+
+class ProxyStats:
+    """单个代理的健康统计"""
+
+    # 延迟的指数滑动平均系数
+    LATENCY_ALPHA = 0.3
+
+    def __init__(self, server: str):
+        self.server = server
+        self.state = STATE_HEALTHY
+        self.in_use = 0
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.captchas = 0
+        self.consecutive_failures = 0
+        self.consecutive_captchas = 0
+        self.latency_ewma: Optional[float] = None
+        self.trips = 0                 # 连续熔断次数（用于延长冷却时间）
+        self.total_trips = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # 没有样本时按 1 计算，新代理优先被使用
+        return self.successes / self.requests if self.requests else 1.0
+
+    @property
+    def captcha_rate(self) -> float:
+        return self.captchas / self.requests if self.requests else 0.0
+
+    @property
+    def score(self) -> float:
+        """健康分（越高越好）：成功率 ×（1 - 验证码率）÷（1 + 平均延迟秒数）"""
+        latency = self.latency_ewma or 0.0
+        return self.success_rate * (1.0 - self.captcha_rate) / (1.0 + latency)
+
+
+class ProxyPool:
+    """代理池（线程安全，按健康度分配，失败熔断，冷却后试探恢复）"""
+
+    def __init__(self, proxies: List[str], failure_threshold: int = 3, captcha_threshold: int = 2,
+                 cooldown_seconds: float = 300.0, max_cooldown_seconds: float = 1800.0):
+        """
+        初始化代理池
+
+        Args:
+            proxies: 代理地址列表
+            failure_threshold: 连续失败多少次后熔断
+            captcha_threshold: 连续遇到验证码多少次后熔断
+            cooldown_seconds: 首次熔断的冷却时间（秒），之后每次翻倍
+            max_cooldown_seconds: 冷却时间上限（秒）
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.captcha_threshold = max(1, captcha_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._lock = threading.Lock()
+        self._stats: Dict[str, ProxyStats] = {}
+        for proxy in proxies:
+            server = normalize_proxy(proxy)
+            if server not in self._stats:
+                self._stats[server] = ProxyStats(server)
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def _refresh_states(self, now: float):
+        for stats in self._stats.values():
+            if stats.state == STATE_COOLDOWN and now >= stats.cooldown_until:
+                stats.state = STATE_PROBING
+
+    def acquire(self) -> Optional[str]:
+        """
+        分配一个代理（调用方用完后需要 release）
+
+        优先分配冷却结束待试探的代理；否则在正常代理中选择使用者最少、健康分最高的；
+        全部熔断时分配最早结束冷却的代理（不退回到直连）
+
+        Returns:
+            代理地址，代理池为空时返回 None
+        """
+        with self._lock:
+            if not self._stats:
+                return None
+            now = time.time()
+            self._refresh_states(now)
+
+            probing = [s for s in self._stats.values() if s.state == STATE_PROBING and s.in_use == 0]
+            if probing:
+                chosen = probing[0]
+                logger.info(f"代理冷却结束，试探使用: {chosen.server}")
+            else:
+                healthy = [s for s in self._stats.values() if s.state == STATE_HEALTHY]
+                if healthy:
+                    chosen = min(healthy, key=lambda s: (s.in_use, -s.score, random.random()))
+                else:
+                    chosen = min(self._stats.values(), key=lambda s: s.cooldown_until)
+                    logger.warning(f"所有代理均在冷却中，继续使用最早恢复的代理: {chosen.server}")
+
+            chosen.in_use += 1
+            return chosen.server
+
+    def release(self, server: Optional[str]):
+        """
+        归还代理
+
+        Args:
+            server: acquire() 返回的代理地址
+        """
+        if not server:
+            return
+        with self._lock:
+            stats = self._stats.get(server)
+            if stats and stats.in_use > 0:
+                stats.in_use -= 1
+
+    def report(self, server: Optional[str], success: bool, latency: Optional[float] = None,
+               captcha: bool = False):
+        """
+        上报一次请求的结果
+
+        Args:
+            server: 代理地址
+            success: 是否成功
+            latency: 耗时（秒）
+            captcha: 是否遇到验证码
+        """
+        if not server:
+            return
+        with self._lock:
+            stats = self._stats.get(server)
+            if stats is None:
+                return
+
+            stats.requests += 1
+            if latency is not None:
+                if stats.latency_ewma is None:
+                    stats.latency_ewma = latency
+                else:
+                    stats.latency_ewma += ProxyStats.LATENCY_ALPHA * (latency - stats.latency_ewma)
+
+            if captcha:
+                stats.captchas += 1
+                stats.consecutive_captchas += 1
+            else:
+                stats.consecutive_captchas = 0
+
+            if success and not captcha:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                if stats.state == STATE_PROBING:
+                    logger.info(f"代理试探成功，恢复使用: {server}")
+                    stats.state = STATE_HEALTHY
+                    stats.trips = 0
+                return
+
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if (stats.state == STATE_PROBING
+                    or stats.consecutive_failures >= self.failure_threshold
+                    or stats.consecutive_captchas >= self.captcha_threshold):
+                self._trip(stats)
+
+    def _trip(self, stats: ProxyStats):
+        stats.trips += 1
+        stats.total_trips += 1
+        cooldown = min(self.max_cooldown_seconds, self.cooldown_seconds * (2 ** (stats.trips - 1)))
+        stats.state = STATE_COOLDOWN
+        stats.cooldown_until = time.time() + cooldown
+        stats.consecutive_failures = 0
+        stats.consecutive_captchas = 0
+        logger.warning(f"代理熔断，冷却 {cooldown:.0f} 秒: {stats.server}")
+
+    def is_available(self, server: Optional[str]) -> bool:
+        """
+        代理当前是否可以继续使用（未处于冷却中）
+
+        Args:
+            server: 代理地址
+
+        Returns:
+            True 表示可以继续使用
+        """
+        if not server:
+            return True
+        with self._lock:
+            stats = self._stats.get(server)
+            return stats is None or stats.state != STATE_COOLDOWN
+
+    @staticmethod
+    def to_playwright(server: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        转换为 Playwright 的代理配置
+
+        Args:
+            server: 代理地址
+
+        Returns:
+            {'server': ...} 或 None
+        """
+        return {'server': server} if server else None
+
+    def summary(self) -> List[Dict]:
+        """
+        每个代理的统计
+
+        Returns:
+            [{"server", "state", "requests", "success_rate", "captcha_rate", "avg_latency", "trips"}, ...]
+        """
+        with self._lock:
+            return [
+                {
+                    'server': s.server,
+                    'state': s.state,
+                    'requests': s.requests,
+                    'success_rate': s.success_rate,
+                    'captcha_rate': s.captcha_rate,
+                    'avg_latency': s.latency_ewma or 0.0,
+                    'trips': s.total_trips,
+                }
+                for s in self._stats.values()
+            ]
+
+    def log_summary(self):
+        """输出每个代理的统计"""
+        for item in self.summary():
+            if not item['requests'] and not item['trips']:
+                continue
+            logger.info(f"代理 {item['server']}: 请求 {item['requests']} 次，成功率 {item['success_rate']:.0%}，"
+                        f"验证码率 {item['captcha_rate']:.0%}，平均耗时 {item['avg_latency']:.1f}s，"
+                        f"熔断 {item['trips']} 次，状态 {item['state']}")
@@ -0,0 +1,186 @@
+"""
+自适应请求节奏控制
+按目标站点（可附加代理）分别维护请求速率，采用 AIMD 策略：
+响应正常时线性提速，遇到验证码、登录跳转或访问异常时成倍降速，速率限制在下限和上限之间
+百度广告验证和淘宝挖掘共用
+"""
+
+import time
+import random
+import asyncio
+import threading
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 页面出现这些文字时视为站点在限流
+PUSHBACK_MARKERS = ('访问异常', '安全验证', '访问被拒绝', '验证码')
+
+
+class _KeyState:
+    """单个站点的节奏状态"""
+
+    def __init__(self, interval: float):
+        self.interval = interval          # 当前请求间隔（秒）
+        self.next_slot = 0.0              # 下一个请求最早可以发出的时间（time.monotonic）
+        self.recent = deque()             # 最近 60 秒内的请求时间
+        self.clean_streak = 0
+        self.pushbacks = 0
+        self.last_logged = 0.0
+
+
+class AdaptiveRateController:
+    """AIMD 请求节奏控制器（线程安全，同步和异步调用方都可以使用）"""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 60.0,
+                 initial_interval: float = 3.5, increase_per_minute: float = 2.0,
+                 decrease_factor: float = 0.5, jitter: float = 0.3, log_every_seconds: float = 60.0):
+        """
+        初始化节奏控制器
+
+        Args:
+            min_interval: 请求间隔下限（秒，即最快速度）
+            max_interval: 请求间隔上限（秒，即最慢速度）
+            initial_interval: 初始请求间隔（秒）
+            increase_per_minute: 每次正常响应后提高的速率（次/分钟，加性增）
+            decrease_factor: 遇到限流时速率乘以的系数（乘性减，0.5 表示速率减半）
+            jitter: 间隔的随机抖动比例（0.3 表示 ±30%，避免请求节奏过于规律）
+            log_every_seconds: 输出有效速率的间隔（秒）
+        """
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.initial_interval = min(self.max_interval, max(self.min_interval, initial_interval))
+        self.increase_per_minute = increase_per_minute
+        self.decrease_factor = min(max(decrease_factor, 0.01), 1.0)
+        self.jitter = max(0.0, min(jitter, 0.9))
+        self.log_every_seconds = log_every_seconds
+        self._lock = threading.Lock()
+        self._states: Dict[str, _KeyState] = {}
+
+    def _state(self, key: str) -> _KeyState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _KeyState(self.initial_interval)
+        return state
+
+    def _reserve(self, key: str, multiplier: float) -> float:
+        """预约下一个请求时间，返回需要等待的秒数"""
+        with self._lock:
+            state = self._state(key)
+            now = time.monotonic()
+            interval = state.interval * multiplier * random.uniform(1 - self.jitter, 1 + self.jitter)
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + interval
+
+            state.recent.append(slot)
+            while state.recent and state.recent[0] < slot - 60:
+                state.recent.popleft()
+
+            if self.log_every_seconds and now - state.last_logged >= self.log_every_seconds:
+                state.last_logged = now
+                logger.info(f"请求节奏 [{key}]: 有效速率 {len(state.recent)} 次/分钟，"
+                            f"当前间隔 {state.interval:.1f}s，限流 {state.pushbacks} 次")
+            return slot - now
+
+    def wait(self, key: str, multiplier: float = 1.0):
+        """
+        等待到该站点下一个请求的时间（同一站点的并发调用会依次排队）
+
+        Args:
+            key: 站点标识（如 "www.baidu.com"，按代理区分时附加代理地址）
+            multiplier: 本次间隔的倍数（如切换种子词时放慢）
+        """
+        delay = self._reserve(key, multiplier)
+        if delay > 0:
+            logger.debug(f"节奏等待 {delay:.1f} 秒 [{key}]")
+            time.sleep(delay)
+
+    async def wait_async(self, key: str, multiplier: float = 1.0):
+        """
+        wait() 的异步版本（不阻塞事件循环）
+
+        Args:
+            key: 站点标识
+            multiplier: 本次间隔的倍数
+        """
+        delay = self._reserve(key, multiplier)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, key: str, ok: bool = True, pushback: bool = False):
+        """
+        上报一次请求的结果，调整该站点的速率
+
+        Args:
+            key: 站点标识
+            ok: 响应是否正常（普通错误既不提速也不降速）
+            pushback: 是否遇到限流（验证码、登录跳转、访问异常）
+        """
+        with self._lock:
+            state = self._state(key)
+            rate = 60.0 / state.interval if state.interval > 0 else float('inf')
+
+            if pushback:
+                state.pushbacks += 1
+                state.clean_streak = 0
+                new_interval = min(self.max_interval, 60.0 / (rate * self.decrease_factor))
+                logger.warning(f"检测到限流 [{key}]，请求间隔 {state.interval:.1f}s -> {new_interval:.1f}s")
+                state.interval = new_interval
+                # 立即生效：推迟已经预约的下一个请求
+                state.next_slot = max(state.next_slot, time.monotonic() + new_interval)
+            elif ok:
+                state.clean_streak += 1
+                state.interval = max(self.min_interval, 60.0 / (rate + self.increase_per_minute))
+
+    def requests_per_minute(self, key: str) -> int:
+        """
+        最近 60 秒内的请求数
+
+        Args:
+            key: 站点标识
+
+        Returns:
+            请求数
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return 0
+            cutoff = time.monotonic() - 60
+            return sum(1 for t in state.recent if t >= cutoff)
+
+    def current_interval(self, key: str) -> float:
+        """
+        当前请求间隔（秒）
+
+        Args:
+            key: 站点标识
+
+        Returns:
+            间隔秒数
+        """
+        with self._lock:
+            return self._state(key).interval
+
+    def log_summary(self):
+        """输出每个站点的节奏统计"""
+        with self._lock:
+            for key, state in self._states.items():
+                logger.info(f"请求节奏 [{key}]: 最终间隔 {state.interval:.1f}s"
+                            f"（约 {60.0 / state.interval if state.interval else 0:.0f} 次/分钟），限流 {state.pushbacks} 次")
+
+
+def text_has_pushback(text: Optional[str]) -> bool:
+    """
+    判断页面标题或文本是否为限流提示
+
+    Args:
+        text: 页面标题或正文片段
+
+    Returns:
+        True 表示站点在限流
+    """
+    return bool(text) and any(marker in text for marker in PUSHBACK_MARKERS)
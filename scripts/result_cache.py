@@ -0,0 +1,128 @@
+"""
+关键词验证结果缓存
+使用本地 SQLite 文件保存百度广告验证结果，在有效期内重复验证同一关键词时直接返回缓存
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordResultCache:
+    """关键词验证结果缓存（SQLite，线程安全）"""
+
+    def __init__(self, db_path: str = "temp/baidu_ad_cache.sqlite3", ttl_seconds: float = 7 * 24 * 3600,
+                 refresh: bool = False):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 文件路径
+            ttl_seconds: 缓存有效期（秒），超过有效期的记录视为未命中
+            refresh: 是否强制刷新（不读取缓存，但仍写入最新结果）
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_results (
+                keyword TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                has_ads TEXT NOT NULL,
+                ad_info_list TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (keyword, mode)
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_keyword(keyword: str) -> str:
+        """
+        规范化关键词作为缓存键（去除首尾空白、合并连续空白、转小写）
+
+        Args:
+            keyword: 原始关键词
+
+        Returns:
+            规范化后的关键词
+        """
+        return " ".join(str(keyword).split()).lower()
+
+    def get(self, keyword: str, mode: str) -> Optional[Dict]:
+        """
+        读取有效期内的缓存结果
+
+        Args:
+            keyword: 关键词
+            mode: 模式（'pc' 或 'mobile'）
+
+        Returns:
+            {"has_ads": ..., "ad_info_list": [...]} 或 None（未命中/已过期/强制刷新）
+        """
+        if self.refresh:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT has_ads, ad_info_list, checked_at FROM keyword_results WHERE keyword = ? AND mode = ?",
+                (self.normalize_keyword(keyword), mode)
+            ).fetchone()
+
+            if row is None or time.time() - row[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return {
+            "has_ads": row[0],
+            "ad_info_list": json.loads(row[1])
+        }
+
+    def put(self, keyword: str, mode: str, has_ads: str, ad_info_list: List[Dict[str, str]]):
+        """
+        写入（覆盖）缓存结果
+
+        Args:
+            keyword: 关键词
+            mode: 模式（'pc' 或 'mobile'）
+            has_ads: 验证结果（'Yes' / 'No'）
+            ad_info_list: 广告信息列表
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO keyword_results (keyword, mode, has_ads, ad_info_list, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.normalize_keyword(keyword), mode, has_ads,
+                     json.dumps(ad_info_list, ensure_ascii=False), time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"写入缓存失败: {keyword} - {str(e)}")
+
+    @property
+    def hit_rate(self) -> float:
+        """缓存命中率（0-1）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,255 @@
+"""
+验证结果输出
+逐行读取输入表格、按关键词拼接验证结果并逐行写出（不把整张表读入内存，也不需要二次打开输出文件），
+支持 Excel（write-only 模式，链接列直接写成超链接）、CSV 和 Parquet（需要 pyarrow）
+"""
+
+import csv
+import logging
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from keyword_source import iter_table_rows, keyword_key
+
+logger = logging.getLogger(__name__)
+
+
+# 每个关键词最多输出的广告数量
+MAX_ADS = 3
+
+# Parquet 每批写出的行数
+PARQUET_BATCH_ROWS = 10000
+
+# 多模式输出时的列名后缀
+MODE_LABELS = {'pc': 'PC', 'mobile': 'Mobile'}
+
+
+def result_columns(modes: Optional[List[str]] = None) -> List[str]:
+    """
+    验证结果追加的列（Has_Ads, Engine, Ad_Title_1, Ad_Link_1, ...）
+
+    多模式时每列按模式加后缀：Has_Ads_PC, Has_Ads_Mobile, Engine_PC, Engine_Mobile,
+    Ad_Title_1_PC, Ad_Link_1_PC, ..., Ad_Title_1_Mobile, ...
+
+    Args:
+        modes: 模式列表（None 表示单模式）
+
+    Returns:
+        列名列表
+    """
+    if modes:
+        labels = [MODE_LABELS.get(mode, mode) for mode in modes]
+        columns = [f"Has_Ads_{label}" for label in labels] + [f"Engine_{label}" for label in labels]
+        for label in labels:
+            for i in range(1, MAX_ADS + 1):
+                columns += [f"Ad_Title_{i}_{label}", f"Ad_Link_{i}_{label}"]
+        return columns
+
+    columns = ["Has_Ads", "Engine"]
+    for i in range(1, MAX_ADS + 1):
+        columns += [f"Ad_Title_{i}", f"Ad_Link_{i}"]
+    return columns
+
+
+def result_values(result: Optional[Dict], modes: Optional[List[str]] = None) -> List:
+    """
+    将验证结果展开为 result_columns() 对应的值（广告标题和链接分开列）
+
+    Args:
+        result: 验证结果字典（None 表示该行没有对应结果，输出空值）；
+                多模式时为 {"keyword": ..., "modes": {模式: 验证结果字典}}
+        modes: 模式列表（None 表示单模式）
+
+    Returns:
+        值列表
+    """
+    if modes:
+        if result is None:
+            return [None] * len(result_columns(modes))
+        by_mode = result.get("modes", {})
+        per_mode = [result_values(by_mode.get(mode, {"has_ads": "Error"})) for mode in modes]
+        return ([values[0] for values in per_mode] + [values[1] for values in per_mode]
+                + [value for values in per_mode for value in values[2:]])
+
+    if result is None:
+        return [None] * len(result_columns())
+    values = [result.get("has_ads", "No"), result.get("engine", "")]
+    ad_info_list = result.get("ad_info_list", [])
+    for i in range(MAX_ADS):
+        if i < len(ad_info_list):
+            values += [ad_info_list[i].get("title", ""), ad_info_list[i].get("link", "")]
+        else:
+            values += ["", ""]
+    return values
+
+
+def iter_output_rows(original_file: Optional[str], results: List[Dict],
+                     column_name: str = "Keyword", canonicalize: bool = True,
+                     modes: Optional[List[str]] = None) -> Iterator[Tuple[List, bool]]:
+    """
+    生成输出行：输入表格的每一行后面拼接该行关键词的验证结果
+
+    输入文件缺少关键词列（或未提供输入文件）时只输出验证结果；
+    规范化时按规范化后的关键词匹配，同一关键词的所有写法变体都拼接同一个结果
+
+    Args:
+        original_file: 原始输入文件路径
+        results: 验证结果列表
+        column_name: 关键词列名
+        canonicalize: 是否按规范化后的关键词匹配（与 KeywordSource 一致）
+        modes: 多模式时的模式列表（结果为合并后的 {"keyword", "modes"}，None 表示单模式）
+
+    Yields:
+        (行值列表, 是否表头)
+    """
+    by_keyword = {keyword_key(r.get("keyword", ""), canonicalize): r for r in results}
+
+    rows = iter_table_rows(original_file) if original_file else iter([])
+    header = next(rows, None)
+    if header is None or column_name not in header:
+        if header is not None:
+            logger.warning(f"输入文件中未找到列 '{column_name}'，只输出验证结果")
+            rows.close()
+        yield ["keyword"] + result_columns(modes), True
+        for result in results:
+            yield [result.get("keyword", "")] + result_values(result, modes), False
+        return
+
+    key_index = header.index(column_name)
+    yield list(header) + result_columns(modes), True
+    for row in rows:
+        row = list(row) + [None] * (len(header) - len(row))
+        key = row[key_index]
+        result = by_keyword.get(keyword_key(key, canonicalize)) if key is not None else None
+        yield row + result_values(result, modes), False
+
+
+def write_xlsx(rows: Iterator[Tuple[List, bool]], output_file: str) -> int:
+    """
+    以 write-only 模式写出 Excel，Ad_Link_ 列写成可点击的超链接
+
+    Returns:
+        写出的数据行数
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    link_font = Font(color="0563C1", underline="single")
+    link_indexes = set()
+    count = 0
+
+    for values, is_header in rows:
+        if is_header:
+            link_indexes = {i for i, name in enumerate(values)
+                            if isinstance(name, str) and name.startswith("Ad_Link_")}
+            ws.append(values)
+            continue
+
+        cells = []
+        for i, value in enumerate(values):
+            if i in link_indexes and value and str(value).strip():
+                cell = WriteOnlyCell(ws, value=value)
+                cell.hyperlink = str(value).strip()
+                cell.font = link_font
+                cells.append(cell)
+            else:
+                cells.append(value)
+        ws.append(cells)
+        count += 1
+
+    wb.save(output_file)
+    return count
+
+
+def write_csv(rows: Iterator[Tuple[List, bool]], output_file: str) -> int:
+    """
+    写出 CSV（UTF-8 带 BOM，Excel 可直接打开）
+
+    Returns:
+        写出的数据行数
+    """
+    count = 0
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        for values, is_header in rows:
+            writer.writerow(["" if v is None else v for v in values])
+            count += 0 if is_header else 1
+    return count
+
+
+def write_parquet(rows: Iterator[Tuple[List, bool]], output_file: str) -> int:
+    """
+    分批写出 Parquet（所有列按字符串保存）
+
+    Returns:
+        写出的数据行数
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("输出 Parquet 需要安装 pyarrow: pip install pyarrow")
+
+    writer = None
+    names: List[str] = []
+    batch: List[List] = []
+    count = 0
+
+    def flush():
+        columns = [pa.array([None if row[i] is None else str(row[i]) for row in batch], type=pa.string())
+                   for i in range(len(names))]
+        writer.write_table(pa.Table.from_arrays(columns, names=names))
+        batch.clear()
+
+    try:
+        for values, is_header in rows:
+            if is_header:
+                names = [str(v) for v in values]
+                schema = pa.schema([(name, pa.string()) for name in names])
+                writer = pq.ParquetWriter(output_file, schema)
+                continue
+            batch.append(values)
+            count += 1
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                flush()
+        if batch:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+WRITERS = {
+    '.xlsx': write_xlsx,
+    '.csv': write_csv,
+    '.parquet': write_parquet,
+}
+
+
+def write_results(original_file: Optional[str], results: List[Dict], output_file: str,
+                  column_name: str = "Keyword", canonicalize: bool = True,
+                  modes: Optional[List[str]] = None) -> int:
+    """
+    写出验证结果（按输出文件扩展名选择格式：.xlsx / .csv / .parquet）
+
+    Args:
+        original_file: 原始输入文件路径（按关键词拼接结果）
+        results: 验证结果列表
+        output_file: 输出文件路径
+        column_name: 关键词列名
+        canonicalize: 是否按规范化后的关键词匹配
+        modes: 多模式时的模式列表（输出 Has_Ads_PC / Has_Ads_Mobile 等列）
+
+    Returns:
+        写出的数据行数
+    """
+    suffix = Path(output_file).suffix.lower()
+    writer = WRITERS.get(suffix)
+    if writer is None:
+        raise ValueError(f"不支持的输出格式: {suffix}（支持 {', '.join(WRITERS)}）")
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    return writer(iter_output_rows(original_file, results, column_name, canonicalize, modes), output_file)
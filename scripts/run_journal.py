@@ -0,0 +1,82 @@
+"""
+运行日志（追加写入的 JSONL 检查点）
+每完成一个任务单元就追加一行并落盘，进程崩溃或被中断后可以从日志恢复进度
+"""
+
+import os
+import json
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlJournal:
+    """追加写入的 JSONL 日志（线程安全，每条记录写入后立即 fsync）"""
+
+    def __init__(self, path: str, resume: bool = True):
+        """
+        打开日志文件
+
+        Args:
+            path: 日志文件路径
+            resume: True 时保留已有记录继续追加；False 时清空重新开始
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def append(self, record: Dict):
+        """
+        追加一条记录并立即落盘
+
+        Args:
+            record: 可 JSON 序列化的字典
+        """
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def read_records(self) -> Iterator[Dict]:
+        """
+        按写入顺序读取所有记录（跳过崩溃时写了一半的行）
+
+        Yields:
+            记录字典
+        """
+        return read_journal(self.path)
+
+    def close(self):
+        """关闭日志文件"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_journal(path) -> Iterator[Dict]:
+    """
+    读取 JSONL 日志文件（文件不存在时不返回任何记录）
+
+    Args:
+        path: 日志文件路径
+
+    Yields:
+        记录字典
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"跳过日志中损坏的记录: {path} 第 {line_no} 行")
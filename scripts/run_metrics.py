@@ -0,0 +1,231 @@
+"""
+运行指标
+按阶段记录耗时（goto / 输入 / 等待结果 / 提取 / 截图 ...）和事件计数（回退、错误 ...），
+输出 p50/p95/p99 统计，导出为 JSON 摘要和 Prometheus textfile（node_exporter textfile collector 格式）
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    计算分位数（线性插值）
+
+    Args:
+        sorted_values: 已排序的样本
+        q: 分位（0-1）
+
+    Returns:
+        分位数，样本为空时返回 0
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _write_atomic(path: Path, content: str):
+    """先写临时文件再替换，避免采集方读到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class RunMetrics:
+    """运行指标收集器（线程安全）"""
+
+    def __init__(self, namespace: str = "baidu_validator"):
+        """
+        初始化指标收集器
+
+        Args:
+            namespace: 导出时的指标名前缀和文件名
+        """
+        self.namespace = namespace
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._export_thread: Optional[threading.Thread] = None
+        self._export_stop = threading.Event()
+
+    def observe(self, phase: str, seconds: float):
+        """
+        记录一次阶段耗时
+
+        Args:
+            phase: 阶段名
+            seconds: 耗时（秒）
+        """
+        with self._lock:
+            self._samples.setdefault(phase, []).append(seconds)
+
+    def observe_since(self, phase: str, started: float):
+        """
+        记录从 started（time.perf_counter()）到现在的阶段耗时
+
+        Args:
+            phase: 阶段名
+            started: 开始时间
+        """
+        self.observe(phase, time.perf_counter() - started)
+
+    @contextmanager
+    def timer(self, phase: str):
+        """
+        计时上下文（异常时同样记录耗时）
+
+        Args:
+            phase: 阶段名
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_since(phase, started)
+
+    def increment(self, event: str, count: int = 1):
+        """
+        事件计数
+
+        Args:
+            event: 事件名
+            count: 增量
+        """
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + count
+
+    def summary(self) -> Dict:
+        """
+        当前统计
+
+        Returns:
+            {"elapsed_seconds", "phases": {阶段: {"count", "sum", "mean", "p50", "p95", "p99", "max"}},
+             "counters": {事件: 次数}}（耗时单位为秒）
+        """
+        with self._lock:
+            samples = {phase: sorted(values) for phase, values in self._samples.items()}
+            counters = dict(self._counters)
+
+        phases = {}
+        for phase, values in sorted(samples.items()):
+            total = sum(values)
+            phases[phase] = {
+                'count': len(values),
+                'sum': total,
+                'mean': total / len(values) if values else 0.0,
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'p99': percentile(values, 0.99),
+                'max': values[-1] if values else 0.0,
+            }
+        return {
+            'namespace': self.namespace,
+            'elapsed_seconds': time.time() - self.started_at,
+            'phases': phases,
+            'counters': dict(sorted(counters.items())),
+        }
+
+    def to_prometheus(self, summary: Optional[Dict] = None) -> str:
+        """
+        转换为 Prometheus 文本格式
+
+        Args:
+            summary: summary() 的返回值（默认重新计算）
+
+        Returns:
+            textfile 内容
+        """
+        summary = summary or self.summary()
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_phase_seconds Per-phase latency of the current run.",
+            f"# TYPE {ns}_phase_seconds summary",
+        ]
+        for phase, stats in summary['phases'].items():
+            for q in QUANTILES:
+                key = f"p{int(q * 100)}"
+                lines.append(f'{ns}_phase_seconds{{phase="{phase}",quantile="{q}"}} {stats[key]:.6f}')
+            lines.append(f'{ns}_phase_seconds_sum{{phase="{phase}"}} {stats["sum"]:.6f}')
+            lines.append(f'{ns}_phase_seconds_count{{phase="{phase}"}} {stats["count"]}')
+
+        lines += [
+            f"# HELP {ns}_events_total Event counts of the current run.",
+            f"# TYPE {ns}_events_total counter",
+        ]
+        for event, count in summary['counters'].items():
+            lines.append(f'{ns}_events_total{{event="{event}"}} {count}')
+
+        lines += [
+            f"# HELP {ns}_run_elapsed_seconds Seconds since the run started.",
+            f"# TYPE {ns}_run_elapsed_seconds gauge",
+            f"{ns}_run_elapsed_seconds {summary['elapsed_seconds']:.3f}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, metrics_dir: str):
+        """
+        导出 JSON 摘要和 Prometheus textfile
+
+        Args:
+            metrics_dir: 输出目录（写入 <namespace>_metrics.json 和 <namespace>.prom）
+        """
+        summary = self.summary()
+        directory = Path(metrics_dir)
+        try:
+            _write_atomic(directory / f"{self.namespace}_metrics.json",
+                          json.dumps(summary, ensure_ascii=False, indent=2))
+            _write_atomic(directory / f"{self.namespace}.prom", self.to_prometheus(summary))
+        except OSError as e:
+            logger.warning(f"导出运行指标失败: {str(e)}")
+
+    def start_periodic_export(self, metrics_dir: str, interval_seconds: float = 30.0):
+        """
+        在后台线程中定期导出
+
+        Args:
+            metrics_dir: 输出目录
+            interval_seconds: 导出间隔（秒）
+        """
+        if self._export_thread is not None:
+            return
+
+        def run():
+            while not self._export_stop.wait(interval_seconds):
+                self.export(metrics_dir)
+
+        self._export_thread = threading.Thread(target=run, name=f"{self.namespace}-metrics", daemon=True)
+        self._export_thread.start()
+
+    def stop_periodic_export(self):
+        """停止后台导出线程"""
+        self._export_stop.set()
+        if self._export_thread is not None:
+            self._export_thread.join(timeout=5)
+            self._export_thread = None
+
+    def log_summary(self):
+        """输出各阶段耗时和事件计数"""
+        summary = self.summary()
+        if summary['phases']:
+            logger.info(f"{'阶段':<20}{'次数':>8}{'P50(s)':>10}{'P95(s)':>10}{'P99(s)':>10}")
+            for phase, stats in summary['phases'].items():
+                logger.info(f"{phase:<20}{stats['count']:>8}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+        if summary['counters']:
+            logger.info("事件计数: " + ', '.join(f"{k}={v}" for k, v in summary['counters'].items()))
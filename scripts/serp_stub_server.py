@@ -0,0 +1,241 @@
+"""
+百度搜索结果页本地桩服务
+按关键词返回录制的 PC / 移动端 SERP 样本（有广告、无广告、只有平台广告、验证码、慢响应），
+用于在不访问百度的情况下测量验证器的吞吐量和正确率
+
+关键词的第一个词决定场景，例如 "ads 12"、"no_ads 3"、"platform_ads 7"、"captcha 1"、"slow 5"；
+不以场景名开头的关键词按关键词哈希分配场景。User-Agent 含 Mobile 时返回移动端样本
+
+用法：
+    python scripts/serp_stub_server.py --port 8765 --latency-ms 80 --jitter-ms 40
+    python scripts/baidu_ad_validator.py --base-url http://127.0.0.1:8765 --input bench.xlsx
+"""
+
+import json
+import time
+import random
+import hashlib
+import threading
+import logging
+from html import escape
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs, quote
+
+logger = logging.getLogger(__name__)
+
+
+# 样本目录
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "serp"
+
+# 场景 -> 预期的验证结果（Has_Ads 列）
+SCENARIOS = {
+    'ads': 'Yes',
+    'no_ads': 'No',
+    'platform_ads': 'No',      # 广告全部被平台过滤
+    'captcha': 'Error',
+    'slow': 'Yes',             # 有广告，但响应慢
+}
+
+# 场景使用的样本（slow 使用有广告的样本）
+SCENARIO_FIXTURES = {
+    'ads': 'ads',
+    'no_ads': 'no_ads',
+    'platform_ads': 'platform_ads',
+    'slow': 'ads',
+}
+
+
+def scenario_for(keyword: str) -> str:
+    """
+    根据关键词确定场景
+
+    Args:
+        keyword: 关键词
+
+    Returns:
+        场景名（SCENARIOS 的键）
+    """
+    head = keyword.strip().split(' ', 1)[0]
+    if head in SCENARIOS:
+        return head
+    # 真实关键词按哈希稳定分配（不产生验证码和慢响应，便于重复测量）
+    digest = int(hashlib.md5(keyword.encode('utf-8')).hexdigest(), 16)
+    return ('ads', 'no_ads', 'platform_ads')[digest % 3]
+
+
+def expected_label(keyword: str) -> str:
+    """
+    关键词在桩服务上的预期验证结果
+
+    Args:
+        keyword: 关键词
+
+    Returns:
+        'Yes' / 'No' / 'Error'
+    """
+    return SCENARIOS[scenario_for(keyword)]
+
+
+class SerpStubServer:
+    """SERP 桩服务（后台线程运行，可在基准测试中直接启动）"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 50.0,
+                 jitter_ms: float = 20.0, slow_ms: float = 3000.0, fixture_dir: Optional[Path] = None):
+        """
+        初始化桩服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口（0 表示自动分配）
+            latency_ms: 每个响应的基础延迟（毫秒）
+            jitter_ms: 延迟的随机抖动（毫秒）
+            slow_ms: slow 场景额外增加的延迟（毫秒）
+            fixture_dir: 样本目录（默认 scripts/fixtures/serp）
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_ms = slow_ms
+        self.fixtures: Dict[str, str] = {
+            path.stem: path.read_text(encoding='utf-8')
+            for path in (fixture_dir or FIXTURE_DIR).glob("*.html")
+        }
+        self.stats = {'home': 0, 'serp': 0, 'captcha': 0, 'not_found': 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _delay(self, extra_ms: float = 0.0):
+        delay_ms = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms) + extra_ms
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def render(self, name: str, keyword: str = "") -> bytes:
+        """
+        渲染样本（替换 {{keyword}} 占位符）
+
+        Args:
+            name: 样本名（不含扩展名）
+            keyword: 关键词
+
+        Returns:
+            UTF-8 编码的 HTML
+        """
+        return self.fixtures[name].replace('{{keyword}}', escape(keyword)).encode('utf-8')
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logger.debug("stub: " + format % args)
+
+            def _send(self, status: int, body: bytes = b'', content_type: str = 'text/html; charset=utf-8',
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                prefix = 'mobile' if 'Mobile' in (self.headers.get('User-Agent') or '') else 'pc'
+
+                if parts.path == '/__stats':
+                    with stub._lock:
+                        body = json.dumps(stub.stats).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                    return
+
+                if parts.path == '/':
+                    stub._count('home')
+                    stub._delay()
+                    self._send(200, stub.render(f"home_{prefix}"))
+                    return
+
+                if parts.path == '/captcha':
+                    self._send(200, stub.render("captcha"))
+                    return
+
+                if parts.path == '/s':
+                    keyword = (query.get('wd') or query.get('word') or [''])[0]
+                    scenario = scenario_for(keyword)
+                    if scenario == 'captcha':
+                        stub._count('captcha')
+                        stub._delay()
+                        location = f"/captcha?tpl=wappass&u={quote(self.path, safe='')}"
+                        self._send(302, headers={'Location': location})
+                        return
+                    stub._count('serp')
+                    stub._delay(stub.slow_ms if scenario == 'slow' else 0.0)
+                    self._send(200, stub.render(f"{prefix}_{SCENARIO_FIXTURES[scenario]}", keyword))
+                    return
+
+                stub._count('not_found')
+                self._send(404, b'not found', 'text/plain')
+
+        return Handler
+
+    def start(self) -> "SerpStubServer":
+        """在后台线程启动服务"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="serp-stub", daemon=True)
+        self._thread.start()
+        logger.info(f"SERP 桩服务已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def serve_forever(self):
+        """在当前线程运行服务（命令行模式）"""
+        logger.info(f"SERP 桩服务已启动: {self.base_url}（Ctrl+C 退出）")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='百度搜索结果页本地桩服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口 (默认: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=50, help='每个响应的基础延迟毫秒数 (默认: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='延迟的随机抖动毫秒数 (默认: 20)')
+    parser.add_argument('--slow-ms', type=float, default=3000, help='slow 场景额外增加的延迟毫秒数 (默认: 3000)')
+    args = parser.parse_args()
+
+    SerpStubServer(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   slow_ms=args.slow_ms).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
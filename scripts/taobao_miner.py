@@ -5,17 +5,28 @@
 
 import os
 import sys
+import copy
+import asyncio
 import json
+import queue
+import threading
 import time
 import random
 import re
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from network_policy import ResourcePolicy, SCREENSHOT_RESOURCE_TYPES
+from proxy_pool import ProxyPool, load_proxy_list
+from rate_controller import AdaptiveRateController, text_has_pushback
+from progress_events import ProgressReporter, add_progress_arguments, reporter_from_args
+from run_journal import JsonlJournal, read_journal
+from taobao_search_api import SearchApiCapture
+
 # 设置标准输出和错误输出为 UTF-8 编码（解决 Windows 乱码问题）
 if sys.platform == 'win32':
     try:
@@ -49,6 +60,321 @@ for handler in logging.root.handlers:
 logger = logging.getLogger(__name__)
 
 
+# 隐藏 webdriver 特征的初始化脚本（每个页面加载前注入）
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    window.chrome = { runtime: {} };
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+"""
+
+# 错误信息包含这些文字时可以重试（网络和页面加载类错误）
+RETRIABLE_ERROR_MARKERS = ('timeout', 'network', 'connection', 'navigation', 'page.goto', 'load state')
+
+# 进度事件中每个商品输出的字段（部分结果）
+PROGRESS_PRODUCT_FIELDS = ('title', 'price', 'sales', 'shop_name', 'shop_type', 'detail_url')
+
+# save_products 返回的统计字段
+SAVE_STAT_KEYS = ('total_crawled', 'after_sales_filter', 'after_price_filter', 'after_keyword_filter',
+                  'after_shop_type_filter', 'inserted')
+
+# 运行 ID 的格式（time.strftime('%Y%m%d-%H%M%S')），--resume 只接受这种格式，防止路径指向抓取日志目录之外
+RUN_ID_PATTERN = re.compile(r'\d{8}-\d{6}')
+
+# 每页最多提取的商品数量（淘宝每页通常 48 个商品）
+MAX_PRODUCTS_PER_PAGE = 48
+
+# 在页面内一次性提取所有商品的原始字段（标题、链接、价格/销量候选文本、店铺名、店铺标识和全文）
+# 选择器顺序与逐元素查询时一致，每页只需一次跨进程调用；数字和店铺类型的解析见 parse_product_item
+PRODUCT_EXTRACT_JS = """
+(limit) => {
+    const PRIORITY_SELECTORS = [
+        '.items .item',
+        '.items .item[data-category="auctions"]',
+        '.item[data-category="auctions"]',
+        '[data-category="auctions"]',
+        '.m-itemlist .items .item',
+    ];
+    const TITLE_SELECTORS = [
+        '.title a', '.title', 'a[title]', '.J_ClickStat', 'a.J_ClickStat', '.item-title',
+        '.item-title a', '[class*="title"] a', '[class*="Title"] a', 'a[href*="item"]',
+        '.pic-link', 'a.pic-link',
+    ];
+    const PRICE_SELECTORS = [
+        '.price strong', '.price', '.price .price-num', '.item-price',
+        '[class*="price"]', '[class*="Price"]', '.g-price', '.price-box',
+    ];
+    const SALES_SELECTORS = [
+        '.deal-cnt', '.sales', '[class*="deal"]', '[class*="Deal"]',
+        '.item-sales', '[class*="sales"]', '[class*="Sales"]',
+    ];
+    const SHOP_SELECTORS = ['.shop a', '.shop', '.nick'];
+    const BADGE_SELECTOR = '.shop-badge, .shop-type, [class*="tmall"]';
+    const LINK_SELECTOR = 'a[href*="item.taobao.com"], a[href*="detail.tmall.com"]';
+
+    const text = (el) => el ? (el.innerText || '').trim() : '';
+    const isProductHref = (href) =>
+        href.includes('item.taobao.com') || href.includes('detail.tmall.com') || href.includes('/item/');
+
+    // 1. 商品容器：优先选择器 -> 商品链接的父容器 -> 商品链接本身
+    let containers = [];
+    let selector = null;
+    for (const sel of PRIORITY_SELECTORS) {
+        const found = document.querySelectorAll(sel);
+        if (found.length > 0) {
+            containers = Array.from(found);
+            selector = sel;
+            break;
+        }
+    }
+    const links = Array.from(document.querySelectorAll(LINK_SELECTOR));
+    if (containers.length === 0 && links.length > 0) {
+        const seen = new Set();
+        for (const link of links) {
+            let parent = link.parentElement;
+            for (let depth = 0; parent && depth < 10; depth++, parent = parent.parentElement) {
+                const hasItemClass = /item|Item|ctx|goods|product/i.test(parent.className || '');
+                const hasFeature = parent.querySelector('.title, [class*="title"], a[title]')
+                    || parent.querySelector('.price, [class*="price"]');
+                if ((hasItemClass || parent.hasAttribute('data-category')) && (hasFeature || hasItemClass)) {
+                    if (!seen.has(parent)) {
+                        seen.add(parent);
+                        containers.push(parent);
+                    }
+                    break;
+                }
+            }
+            if (containers.length >= limit) break;
+        }
+        selector = containers.length > 0 ? '商品链接父容器' : '商品链接（直接提取）';
+        if (containers.length === 0) containers = links;
+    }
+
+    // 2. 每个商品的原始字段
+    const items = containers.slice(0, limit).map((item) => {
+        const fullText = text(item);
+        let title = null;
+        let link = null;
+        let source = null;
+
+        if (item.tagName === 'A') {
+            const linkTitle = (item.getAttribute('title') || '').trim();
+            title = linkTitle || (fullText.length > 5 ? fullText : null);
+            link = item.getAttribute('href');
+            source = linkTitle ? '链接title属性' : '链接文本';
+        }
+        for (const sel of TITLE_SELECTORS) {
+            const el = item.querySelector(sel);
+            if (!el) continue;
+            const candidate = el.getAttribute('title') || el.getAttribute('alt') || text(el);
+            if (candidate && candidate.length > 5) {
+                title = candidate;
+                link = el.getAttribute('href');
+                source = '选择器: ' + sel;
+                break;
+            }
+        }
+        if (!title) {
+            for (const a of item.querySelectorAll('a')) {
+                const href = a.getAttribute('href') || '';
+                const candidate = a.getAttribute('title') || text(a);
+                if (isProductHref(href) && candidate && candidate.length > 5) {
+                    title = candidate;
+                    link = href;
+                    source = '从商品链接提取';
+                    break;
+                }
+            }
+        }
+        if (!title && fullText) {
+            const longest = fullText.split('\\n').map((line) => line.trim())
+                .reduce((a, b) => (b.length > a.length ? b : a), '');
+            if (longest.length > 5) {
+                title = longest;
+                const a = item.querySelector('a[href*="item"]');
+                link = a ? a.getAttribute('href') : null;
+                source = '从元素文本提取';
+            }
+        }
+
+        const shopElem = SHOP_SELECTORS.map((sel) => item.querySelector(sel)).find((el) => text(el));
+        const badge = item.querySelector(BADGE_SELECTOR);
+        return {
+            title: title,
+            title_source: source,
+            link: link,
+            price_texts: PRICE_SELECTORS.map((sel) => text(item.querySelector(sel))).filter(Boolean),
+            sales_texts: SALES_SELECTORS.map((sel) => text(item.querySelector(sel))).filter(Boolean),
+            shop_name: shopElem ? text(shopElem) : null,
+            badge_text: badge ? text(badge) : null,
+            class_name: typeof item.className === 'string' ? item.className : '',
+            text: fullText,
+        };
+    });
+
+    return {
+        selector: selector,
+        items: items,
+        product_links: links.length,
+        item_like: document.querySelectorAll('[class*="item"]').length,
+    };
+}
+"""
+
+# 价格的合理范围（超出范围视为误匹配）
+PRICE_RANGE = (1, 100000)
+
+# 选择器未命中时，从商品全文中匹配价格 / 销量
+PRICE_TEXT_PATTERNS = [
+    r'[￥¥]\s*(\d+\.?\d*)',  # ￥123.45
+    r'(\d+\.?\d*)\s*元',  # 123.45元
+    r'价格[：:]\s*(\d+\.?\d*)',  # 价格：123.45
+]
+SALES_TEXT_PATTERNS = [
+    r'月销[：:]?\s*(\d+)',  # 月销1000
+    r'已售[：:]?\s*(\d+)',  # 已售1000
+    r'(\d+)\s*人付款',  # 1000人付款
+    r'销量[：:]?\s*(\d+)',  # 销量1000
+    r'成交[：:]?\s*(\d+)',  # 成交1000
+]
+
+
+def parse_price(price_texts: List[str], full_text: str = '') -> Optional[float]:
+    """
+    从价格候选文本中解析价格（取第一个在合理范围内的数字）
+    
+    Args:
+        price_texts: 各价格选择器命中元素的文本（按选择器顺序）
+        full_text: 商品全文（候选文本都无法解析时使用）
+        
+    Returns:
+        价格，无法解析时返回 None
+    """
+    for price_text in price_texts:
+        price_match = re.search(r'(\d+\.?\d*)', price_text.replace(',', '').replace('￥', '').replace('¥', ''))
+        if price_match:
+            price_val = float(price_match.group(1))
+            if PRICE_RANGE[0] <= price_val <= PRICE_RANGE[1]:
+                return price_val
+    
+    for pattern in PRICE_TEXT_PATTERNS:
+        match = re.search(pattern, full_text or '')
+        if match:
+            price_val = float(match.group(1))
+            if PRICE_RANGE[0] <= price_val <= PRICE_RANGE[1]:
+                return price_val
+    return None
+
+
+def parse_sales(sales_texts: List[str], full_text: str = '') -> Optional[int]:
+    """
+    从销量候选文本中解析销量（处理"月销100+"、"100+人付款"、"1.5万+"等格式）
+    
+    Args:
+        sales_texts: 各销量选择器命中元素的文本（按选择器顺序）
+        full_text: 商品全文（候选文本都无法解析时使用）
+        
+    Returns:
+        销量，无法解析时返回 None
+    """
+    sales = None
+    for sales_text in sales_texts:
+        sales_text = sales_text.replace('月销', '').replace('人付款', '').replace('+', '').strip()
+        
+        # 处理"万"单位
+        if '万' in sales_text:
+            num_match = re.search(r'(\d+\.?\d*)', sales_text)
+            if num_match:
+                sales = int(float(num_match.group(1)) * 10000)
+        else:
+            num_match = re.search(r'(\d+)', sales_text.replace(',', ''))
+            if num_match:
+                sales = int(num_match.group(1))
+        if sales:
+            return sales
+    if sales is not None:
+        return sales
+    
+    for pattern in SALES_TEXT_PATTERNS:
+        match = re.search(pattern, full_text or '')
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def parse_shop_type(detail_url: Optional[str], badge_text: Optional[str]) -> Optional[str]:
+    """
+    判断店铺类型（优先看商品链接，其次看店铺标识）
+    
+    Args:
+        detail_url: 商品详情链接
+        badge_text: 店铺标识元素的文本（页面上没有标识元素时为 None）
+        
+    Returns:
+        'tmall' / 'c_shop'，无法判断时返回 None
+    """
+    if detail_url:
+        if 'tmall.com' in detail_url:
+            return 'tmall'
+        if 'taobao.com' in detail_url:
+            return 'c_shop'
+    if badge_text is not None:
+        badge_text = badge_text.lower()
+        return 'tmall' if ('天猫' in badge_text or 'tmall' in badge_text) else 'c_shop'
+    return None
+
+
+def normalize_product_url(url: Optional[str]) -> Optional[str]:
+    """
+    补全商品链接（协议相对路径和站内相对路径）
+    
+    Args:
+        url: 页面上的 href
+        
+    Returns:
+        完整 URL，没有链接时返回 None
+    """
+    if not url:
+        return None
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/'):
+        return 'https://www.taobao.com' + url
+    return url
+
+
+def parse_product_item(raw: Dict[str, any]) -> Optional[Dict[str, any]]:
+    """
+    把 PRODUCT_EXTRACT_JS 返回的单个商品原始字段解析为商品信息
+    
+    Args:
+        raw: 单个商品的原始字段
+        
+    Returns:
+        商品信息字典（title / detail_url / price / sales / shop_name / shop_type），没有标题时返回 None
+    """
+    title = (raw.get('title') or '').strip()
+    if not title:
+        return None
+    
+    detail_url = normalize_product_url(raw.get('link'))
+    full_text = raw.get('text') or ''
+    return {
+        'title': title,
+        'detail_url': detail_url,
+        'price': parse_price(raw.get('price_texts') or [], full_text),
+        'sales': parse_sales(raw.get('sales_texts') or [], full_text),
+        'shop_name': raw.get('shop_name') or None,
+        'shop_type': parse_shop_type(detail_url, raw.get('badge_text')),
+    }
+
+
 class TaobaoMiner:
     """淘宝关键词挖掘器"""
     
@@ -61,8 +387,32 @@ class TaobaoMiner:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
     ]
     
+    # 验证码/滑块的多个可能选择器
+    CAPTCHA_SELECTORS = [
+        '.nc_iconfont',  # 滑块验证码
+        '.baxia-dialog',  # 验证码弹窗
+        '#nocaptcha',  # 无验证码标识（但可能是验证码容器）
+        '.nc-wrapper',  # 滑块验证码容器
+        '.slider',  # 滑块
+        '[class*="captcha"]',  # 包含captcha的类
+        '[class*="verify"]',  # 包含verify的类
+    ]
+    
+    # 登录后才会出现的页面元素（用户昵称、会员中心等）
+    LOGGED_IN_SELECTORS = [
+        '.site-nav-user a[href*="member"]',  # 会员中心链接
+        '.site-nav-user .username',  # 用户名
+        '.h-member-name',  # 会员名
+        '.site-nav-login .h',  # 登录后的用户名区域
+    ]
+    
     def __init__(self, headless: bool = False, auth_file: str = "auth_taobao.json", 
-                 supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+                 supabase_url: Optional[str] = None, supabase_key: Optional[str] = None,
+                 resource_policy: Optional[ResourcePolicy] = None, proxy_pool: Optional[ProxyPool] = None,
+                 rate_controller: Optional[AdaptiveRateController] = None,
+                 progress: Optional[ProgressReporter] = None,
+                 api_capture: Optional[SearchApiCapture] = None,
+                 journal: Optional[JsonlJournal] = None):
         """
         初始化挖掘器
         
@@ -71,8 +421,28 @@ class TaobaoMiner:
             auth_file: 认证文件路径（保存 Cookies）
             supabase_url: Supabase 项目 URL（从环境变量读取或手动指定）
             supabase_key: Supabase API Key（从环境变量读取或手动指定）
+            resource_policy: 请求拦截策略（可选，拦截图片/字体/埋点等非必要请求；登录流程不拦截）
+            proxy_pool: 代理池（可选，抓取时按健康度分配代理，熔断后在种子词之间更换）
+            rate_controller: 请求节奏控制器（可选，控制搜索、翻页和切换种子词的间隔）
+            progress: 结构化进度输出（可选，每个种子词、每页和每个阶段输出事件）
+            api_capture: 搜索接口捕获（可选，直接从搜索接口响应解析商品，未捕获到时回退到 DOM 提取）
+            journal: 抓取日志（可选，每抓完一页追加一条记录，用于断点续跑和从日志入库）
         """
         self.headless = headless
+        self.resource_policy = resource_policy
+        self.proxy_pool = proxy_pool
+        self.current_proxy: Optional[str] = None  # 当前浏览器使用的代理
+        self.captcha_seen = False  # 自上次重置以来是否遇到过验证码
+        # 默认初始间隔 8.5 秒（原翻页等待 5-12 秒的中值），响应正常时最快提速到 3 秒
+        self.rate_controller = rate_controller or AdaptiveRateController(
+            min_interval=3.0, initial_interval=8.5, max_interval=120.0
+        )
+        self.progress = progress or ProgressReporter()
+        self.api_capture = api_capture
+        self.last_page_source: Optional[str] = None  # 最近一页商品的来源（api / dom）
+        self.rate_scope: Optional[str] = None  # 节奏控制按账号区分时的账号标识（并行工作者使用）
+        self.journal = journal
+        self.crawl_state: Dict[str, Dict] = {}  # 抓取日志中已完成的进度（{种子词: {'pages': {页码: 商品列表}, 'done': bool}}）
         self.auth_file = Path(auth_file)
         self.user_agent = random.choice(self.PC_USER_AGENTS)  # 随机选择 User-Agent
         self.viewport = {'width': 1920, 'height': 1080}
@@ -184,16 +554,7 @@ class TaobaoMiner:
                 
                 # 检查是否是可重试的错误
                 error_str = str(e).lower()
-                retriable_errors = [
-                    'timeout',
-                    'network',
-                    'connection',
-                    'navigation',
-                    'page.goto',
-                    'load state',
-                ]
-                
-                is_retriable = any(keyword in error_str for keyword in retriable_errors)
+                is_retriable = any(keyword in error_str for keyword in RETRIABLE_ERROR_MARKERS)
                 
                 if not is_retriable:
                     # 不可重试的错误，直接抛出
@@ -385,12 +746,7 @@ class TaobaoMiner:
                 return True
             
             # 方法2: 检查是否存在登录后的元素（如用户昵称、购物车等）
-            logged_in_indicators = [
-                '.site-nav-user a[href*="member"]',  # 会员中心链接
-                '.site-nav-user .username',  # 用户名
-                '.h-member-name',  # 会员名
-                '.site-nav-login .h',  # 登录后的用户名区域
-            ]
+            logged_in_indicators = self.LOGGED_IN_SELECTORS
             
             for selector in logged_in_indicators:
                 try:
@@ -624,13 +980,20 @@ class TaobaoMiner:
         Returns:
             (browser, context, page) 元组
         """
+        # 从代理池分配代理（用完后调用 release_proxy 归还）
+        self.release_proxy()
+        if self.proxy_pool:
+            self.current_proxy = self.proxy_pool.acquire()
+            logger.info(f"使用代理: {self.current_proxy}")
+        
         browser = playwright.chromium.launch(
             headless=self.headless,
             args=[
                 '--disable-blink-features=AutomationControlled',
                 '--disable-dev-shm-usage',
                 '--no-sandbox',
-            ]
+            ],
+            proxy=ProxyPool.to_playwright(self.current_proxy)
         )
         
         context = browser.new_context(
@@ -642,19 +1005,16 @@ class TaobaoMiner:
         
         page = context.new_page()
         
+        # 拦截非必要资源（图片、字体、统计埋点等）
+        if self.resource_policy:
+            self.resource_policy.install(context, page)
+        
+        # 监听搜索接口响应
+        if self.api_capture:
+            self.api_capture.attach(page)
+        
         # 注入 JavaScript 隐藏 webdriver 特征
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            window.chrome = { runtime: {} };
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-        """)
+        page.add_init_script(STEALTH_INIT_SCRIPT)
         
         # 加载已保存的 Cookies（如果存在）
         if self.auth_file.exists():
@@ -662,6 +1022,38 @@ class TaobaoMiner:
         
         return browser, context, page
     
+    def rate_key(self) -> str:
+        """节奏控制的站点标识（并行时按账号区分，否则使用代理时按代理区分）"""
+        if self.rate_scope:
+            return f"s.taobao.com as {self.rate_scope}"
+        return f"s.taobao.com via {self.current_proxy}" if self.current_proxy else "s.taobao.com"
+    
+    def detect_pushback(self, page: Page) -> bool:
+        """
+        判断当前页面是否在限流（验证码、跳转登录页或访问异常提示）
+        
+        Args:
+            page: Playwright Page 对象
+            
+        Returns:
+            True 表示站点在限流
+        """
+        if self.captcha_seen:
+            return True
+        try:
+            url = page.url.lower()
+            if 'login.taobao.com' in url or 'login.tmall.com' in url or 'punish' in url:
+                return True
+            return text_has_pushback(page.title())
+        except Exception:
+            return False
+    
+    def release_proxy(self):
+        """归还当前浏览器使用的代理"""
+        if self.proxy_pool and self.current_proxy:
+            self.proxy_pool.release(self.current_proxy)
+        self.current_proxy = None
+    
     def check_and_handle_captcha(self, page: Page, timeout: int = 60) -> bool:
         """
         检查并处理验证码/滑块
@@ -674,15 +1066,7 @@ class TaobaoMiner:
             是否成功处理（False表示超时或失败）
         """
         # 验证码/滑块的多个可能选择器
-        captcha_selectors = [
-            '.nc_iconfont',  # 滑块验证码
-            '.baxia-dialog',  # 验证码弹窗
-            '#nocaptcha',  # 无验证码标识（但可能是验证码容器）
-            '.nc-wrapper',  # 滑块验证码容器
-            '.slider',  # 滑块
-            '[class*="captcha"]',  # 包含captcha的类
-            '[class*="verify"]',  # 包含verify的类
-        ]
+        captcha_selectors = self.CAPTCHA_SELECTORS
         
         try:
             # 等待一小段时间，让验证码元素有机会加载
@@ -707,6 +1091,7 @@ class TaobaoMiner:
                     captcha_element = True  # 标记为存在
             
             if captcha_element:
+                self.captcha_seen = True
                 logger.warning("=" * 60)
                 logger.warning("⚠️ 检测到验证码/滑块，需要人工处理")
                 logger.warning("请在浏览器中完成验证，脚本将等待验证完成...")
@@ -759,12 +1144,12 @@ class TaobaoMiner:
         搜索关键词的内部实现（用于重试）
         """
         logger.info(f"搜索关键词: {keyword}")
+        if self.api_capture:
+            self.api_capture.reset()
         
         # 访问淘宝搜索页（增加超时时间）
-        # 在访问前添加随机延迟，降低请求频率
-        pre_delay = random.uniform(2.0, 5.0)
-        logger.debug(f"访问前等待 {pre_delay:.1f} 秒...")
-        time.sleep(pre_delay)
+        # 访问前按节奏控制器的间隔等待，降低请求频率
+        self.rate_controller.wait(self.rate_key())
         
         search_url = f"https://s.taobao.com/search?q={keyword}"
         try:
@@ -793,6 +1178,11 @@ class TaobaoMiner:
         if not self.check_and_handle_captcha(page, timeout=60):
             logger.warning("验证码处理失败或超时，但继续尝试...")
         
+        # 已经从搜索接口拿到商品数据时，不需要滚动和等待商品元素渲染
+        if self.api_capture and self.api_capture.wait_for_products(page, timeout=10.0):
+            logger.info(f"✅ 搜索结果页面准备完成（已捕获搜索接口数据）: {keyword}")
+            return True
+        
         # 滚动页面以触发懒加载（淘宝搜索结果可能是懒加载的）
         # 使用更慢、更随机的滚动，模拟真实用户浏览
         logger.debug("滚动页面以触发商品懒加载（模拟真实用户浏览）...")
@@ -971,341 +1361,127 @@ class TaobaoMiner:
             logger.warning("⚠️ 出现错误但将继续尝试提取")
             return True
     
-    def extract_products_from_page(self, page: Page) -> List[Dict[str, any]]:
+    def _scroll_for_lazy_load(self, page: Page):
         """
-        从当前页面提取商品信息
+        分段滚动页面以触发商品懒加载（商品数量连续两轮不变或已足够多时提前结束）
         
         Args:
             page: Playwright Page 对象
-            
-        Returns:
-            商品信息列表
         """
-        products = []
-        
+        logger.info("🔄 滚动页面以触发商品懒加载...")
         try:
-            # 先滚动页面以触发懒加载 - 更积极的滚动策略
-            logger.info("🔄 滚动页面以触发商品懒加载...")
-            try:
-                # 更频繁的分段滚动，确保所有商品都加载
-                # 但使用更慢、更随机的滚动，模拟真实用户
-                max_scrolls = 4  # 减少滚动次数（降低频率）
-                last_count = 0
-                stable_count = 0
+            # 更频繁的分段滚动，确保所有商品都加载
+            # 但使用更慢、更随机的滚动，模拟真实用户
+            max_scrolls = 4  # 减少滚动次数（降低频率）
+            last_count = 0
+            stable_count = 0
+            
+            for scroll_round in range(max_scrolls):
+                # 滚动到不同位置（随机顺序）
+                scroll_positions = [0.2, 0.4, 0.6, 0.8, 1.0]
+                random.shuffle(scroll_positions)  # 随机顺序
                 
-                for scroll_round in range(max_scrolls):
-                    # 滚动到不同位置（随机顺序）
-                    scroll_positions = [0.2, 0.4, 0.6, 0.8, 1.0]
-                    random.shuffle(scroll_positions)  # 随机顺序
-                    
-                    for pos in scroll_positions:
-                        # 随机决定是否滚动（90%概率）
-                        if random.random() < 0.9:
-                            page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {pos})")
-                            # 增加等待时间（模拟用户查看）
-                            wait_time = random.uniform(1.2, 2.5)
-                            page.wait_for_timeout(int(wait_time * 1000))
-                            
-                            # 偶尔模拟人类行为
-                            if random.random() < 0.3:
-                                self.simulate_human_behavior(page)
-                    
-                    # 滚动回顶部
-                    page.evaluate("window.scrollTo(0, 0)")
-                    page.wait_for_timeout(500)
-                    
-                    # 检查当前有多少商品元素（快速检查）
-                    try:
-                        quick_check = page.evaluate("""
-                            () => {
-                                const items = document.querySelectorAll('.items .item, .item[data-category="auctions"], [data-category="auctions"]');
-                                return items.length;
-                            }
-                        """)
+                for pos in scroll_positions:
+                    # 随机决定是否滚动（90%概率）
+                    if random.random() < 0.9:
+                        page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {pos})")
+                        # 增加等待时间（模拟用户查看）
+                        wait_time = random.uniform(1.2, 2.5)
+                        page.wait_for_timeout(int(wait_time * 1000))
                         
-                        if quick_check > last_count:
-                            last_count = quick_check
-                            stable_count = 0
-                            logger.debug(f"第 {scroll_round + 1} 轮滚动后检测到 {quick_check} 个商品")
-                        elif quick_check == last_count and quick_check > 0:
-                            stable_count += 1
-                            if stable_count >= 2:  # 连续2次数量不变，认为已加载完成
-                                logger.info(f"✅ 商品加载稳定，共 {quick_check} 个商品")
-                                break
-                    except:
-                        pass
-                    
-                    if stable_count >= 2:
-                        break
-                    
-                    # 如果已经有足够多的商品，可以提前结束
-                    if last_count >= 40:
-                        logger.info(f"✅ 已检测到足够多的商品 ({last_count} 个)，继续提取")
-                        break
-            except Exception as e:
-                logger.debug(f"滚动操作失败: {str(e)}")
-            
-            # 直接查询商品元素，不等待选择器（滚动后应该已经加载）
-            logger.info("🔍 查询商品元素...")
-            
-            # 优先使用的选择器（按准确度排序）
-            priority_selectors = [
-                '.items .item',  # 最准确
-                '.items .item[data-category="auctions"]',
-                '.item[data-category="auctions"]',
-                '[data-category="auctions"]',
-                '.m-itemlist .items .item',
-            ]
-            
-            product_elements = None
-            used_selector = None
-            
-            # 快速尝试每个选择器
-            for selector in priority_selectors:
-                try:
-                    elements = page.query_selector_all(selector)
-                    if elements and len(elements) > 0:
-                        product_elements = elements
-                        used_selector = selector
-                        logger.info(f"✅ 使用选择器 '{selector}' 找到 {len(elements)} 个商品元素")
-                        break
-                except Exception as e:
-                    logger.debug(f"选择器 {selector} 查询失败: {str(e)}")
-                    continue
-            
-            # 如果都没找到，尝试更通用的方法和调试
-            if not product_elements or len(product_elements) == 0:
-                logger.warning("⚠️ 标准选择器未找到商品，尝试更通用的方法并分析页面结构...")
+                        # 偶尔模拟人类行为
+                        if random.random() < 0.3:
+                            self.simulate_human_behavior(page)
+                
+                # 滚动回顶部
+                page.evaluate("window.scrollTo(0, 0)")
+                page.wait_for_timeout(500)
+                
+                # 检查当前有多少商品元素（快速检查）
                 try:
-                    # 使用JavaScript分析页面结构，找出实际的商品容器
-                    analysis_result = page.evaluate("""
+                    quick_check = page.evaluate("""
                         () => {
-                            // 尝试多种选择器
-                            const selectors = [
-                                '.items .item',
-                                '.item[data-category="auctions"]',
-                                '[data-category="auctions"]',
-                                '.m-itemlist .items .item',
-                                '.item',
-                                '[class*="Item"]',
-                                '[class*="item"]',
-                                '.J_MouserOnverReq',
-                                '.ctx-box',
-                                '.itemWrapper',
-                            ];
-                            
-                            const results = {};
-                            for (const sel of selectors) {
-                                const items = document.querySelectorAll(sel);
-                                if (items.length > 0) {
-                                    results[sel] = items.length;
-                                    // 检查第一个元素的结构
-                                    if (items.length > 0 && !results.firstItemStructure) {
-                                        const firstItem = items[0];
-                                        results.firstItemStructure = {
-                                            className: firstItem.className,
-                                            tagName: firstItem.tagName,
-                                            hasTitle: !!firstItem.querySelector('.title, [class*="title"], a[title]'),
-                                            hasPrice: !!firstItem.querySelector('.price, [class*="price"]'),
-                                            hasLink: !!firstItem.querySelector('a[href*="item"]'),
-                                            innerHTML: firstItem.innerHTML.substring(0, 200)
-                                        };
-                                    }
-                                }
-                            }
-                            
-                            // 尝试查找所有包含商品链接的元素
-                            const allLinks = document.querySelectorAll('a[href*="item.taobao.com"], a[href*="detail.tmall.com"]');
-                            if (allLinks.length > 0) {
-                                results.productLinks = allLinks.length;
-                                // 找最近的父容器
-                                const firstLink = allLinks[0];
-                                let parent = firstLink.parentElement;
-                                let depth = 0;
-                                while (parent && depth < 5) {
-                                    if (parent.className) {
-                                        results.suggestedSelector = `.${parent.className.split(' ').join('.')} a[href*="item"]`;
-                                        break;
-                                    }
-                                    parent = parent.parentElement;
-                                    depth++;
-                                }
-                            }
-                            
-                            return results;
+                            const items = document.querySelectorAll('.items .item, .item[data-category="auctions"], [data-category="auctions"]');
+                            return items.length;
                         }
                     """)
                     
-                    logger.info(f"📊 页面结构分析结果: {analysis_result}")
-                    
-                    # 根据分析结果选择最佳选择器
-                    # 首先尝试分析结果中匹配的选择器
-                    best_selector = None
-                    best_count = 0
-                    for selector, count in analysis_result.items():
-                        if isinstance(count, int) and count > 0 and selector != 'productLinks':
-                            if count > best_count:
-                                best_count = count
-                                best_selector = selector
-                    
-                    if best_selector:
-                        try:
-                            test_elements = page.query_selector_all(best_selector)
-                            if test_elements and len(test_elements) > 0:
-                                product_elements = test_elements
-                                used_selector = best_selector
-                                logger.info(f"✅ 使用分析结果中的最佳选择器 '{best_selector}' 找到 {len(test_elements)} 个商品元素")
-                        except Exception as e:
-                            logger.debug(f"使用最佳选择器失败: {str(e)}")
-                    
-                    # 如果还是没找到，尝试通过商品链接来定位商品容器
-                    if (not product_elements or len(product_elements) == 0) and analysis_result.get('productLinks', 0) > 0:
-                        logger.info(f"✅ 找到 {analysis_result['productLinks']} 个商品链接，尝试通过链接定位商品容器")
-                        
-                        # 通过JavaScript找到每个商品链接的父容器
-                        product_containers = page.evaluate("""
-                            () => {
-                                const links = document.querySelectorAll('a[href*="item.taobao.com"], a[href*="detail.tmall.com"]');
-                                const containers = [];
-                                const seenIds = new Set();
-                                
-                                for (const link of links) {
-                                    // 向上查找商品容器
-                                    let parent = link.parentElement;
-                                    let depth = 0;
-                                    let container = null;
-                                    
-                                    while (parent && depth < 10) {
-                                        // 检查是否是商品容器
-                                        const classList = parent.className || '';
-                                        const hasItemClass = /item|Item|ctx|goods|product/i.test(classList);
-                                        const hasDataCategory = parent.hasAttribute('data-category');
-                                        
-                                        if (hasItemClass || hasDataCategory || parent.tagName === 'LI' || parent.tagName === 'DIV') {
-                                            // 检查是否包含商品特征（标题、价格等）
-                                            const hasTitle = parent.querySelector('.title, [class*="title"], a[title]');
-                                            const hasPrice = parent.querySelector('.price, [class*="price"]');
-                                            
-                                            if (hasTitle || hasPrice || hasItemClass) {
-                                                container = parent;
-                                                break;
-                                            }
-                                        }
-                                        parent = parent.parentElement;
-                                        depth++;
-                                    }
-                                    
-                                    if (container && !seenIds.has(container)) {
-                                        seenIds.add(container);
-                                        containers.push(container);
-                                    }
-                                    
-                                    if (containers.length >= 48) break;
-                                }
-                                
-                                return containers.length;
-                            }
-                        """)
-                        
-                        if product_containers > 0:
-                            logger.info(f"✅ 通过商品链接定位到 {product_containers} 个商品容器")
-                            # 使用更通用的选择器来获取这些容器
-                            # 由于JavaScript返回的元素无法直接使用，我们需要通过其他方式获取
-                            # 尝试使用更宽泛的选择器
-                            fallback_selectors = [
-                                'div[class*="item"]',
-                                'li[class*="item"]',
-                                'div[class*="Item"]',
-                                'li[class*="Item"]',
-                                '[data-category]',
-                            ]
-                            
-                            for fb_selector in fallback_selectors:
-                                try:
-                                    test_elements = page.query_selector_all(fb_selector)
-                                    # 过滤：只保留包含商品链接的元素
-                                    filtered = []
-                                    for el in test_elements:
-                                        try:
-                                            link = el.query_selector('a[href*="item.taobao.com"], a[href*="detail.tmall.com"]')
-                                            if link:
-                                                filtered.append(el)
-                                        except:
-                                            continue
-                                    
-                                    if len(filtered) > 0:
-                                        product_elements = filtered[:48]
-                                        used_selector = f'{fb_selector} (过滤后)'
-                                        logger.info(f"✅ 使用选择器 '{fb_selector}' 找到 {len(product_elements)} 个商品容器（包含商品链接）")
-                                        break
-                                except:
-                                    continue
-                    
-                    # 最后的备用方案：直接通过商品链接提取
-                    if (not product_elements or len(product_elements) == 0) and analysis_result.get('productLinks', 0) > 0:
-                        logger.info(f"💡 尝试通过商品链接直接提取（找到 {analysis_result['productLinks']} 个链接）")
-                        try:
-                            # 获取所有商品链接
-                            product_links = page.query_selector_all('a[href*="item.taobao.com"], a[href*="detail.tmall.com"]')
-                            if product_links:
-                                logger.info(f"✅ 找到 {len(product_links)} 个商品链接，将通过链接提取商品信息")
-                                # 使用链接本身作为起点，后续提取时会查找父容器
-                                product_elements = product_links[:48]
-                                used_selector = '商品链接（直接提取）'
-                        except Exception as e:
-                            logger.debug(f"通过链接提取失败: {str(e)}")
-                                
-                    if not product_elements or len(product_elements) == 0:
-                        logger.warning("⚠️ 所有方法都未找到商品元素")
-                        # 输出更详细的页面结构信息
-                        try:
-                            detailed_analysis = page.evaluate("""
-                                () => {
-                                    const result = {
-                                        totalLinks: document.querySelectorAll('a').length,
-                                        productLinks: document.querySelectorAll('a[href*="item"], a[href*="detail"]').length,
-                                        items: document.querySelectorAll('[class*="item"]').length,
-                                        divs: document.querySelectorAll('div').length,
-                                        bodyText: document.body.innerText.substring(0, 500),
-                                        bodyHTML: document.body.innerHTML.substring(0, 1000)
-                                    };
-                                    return result;
-                                }
-                            """)
-                            logger.info(f"📊 详细页面分析: 总链接={detailed_analysis.get('totalLinks', 0)}, 商品链接={detailed_analysis.get('productLinks', 0)}, 包含item的元素={detailed_analysis.get('items', 0)}, 总div数={detailed_analysis.get('divs', 0)}")
-                            logger.debug(f"页面文本预览: {detailed_analysis.get('bodyText', '')[:200]}")
-                        except:
-                            pass
-                except Exception as e:
-                    logger.error(f"❌ 页面结构分析失败: {str(e)}")
-                    import traceback
-                    logger.debug(traceback.format_exc())
+                    if quick_check > last_count:
+                        last_count = quick_check
+                        stable_count = 0
+                        logger.debug(f"第 {scroll_round + 1} 轮滚动后检测到 {quick_check} 个商品")
+                    elif quick_check == last_count and quick_check > 0:
+                        stable_count += 1
+                        if stable_count >= 2:  # 连续2次数量不变，认为已加载完成
+                            logger.info(f"✅ 商品加载稳定，共 {quick_check} 个商品")
+                            break
+                except:
+                    pass
+                
+                if stable_count >= 2:
+                    break
+                
+                # 如果已经有足够多的商品，可以提前结束
+                if last_count >= 40:
+                    logger.info(f"✅ 已检测到足够多的商品 ({last_count} 个)，继续提取")
+                    break
+        except Exception as e:
+            logger.debug(f"滚动操作失败: {str(e)}")
+    
+    def parse_products(self, extracted: Dict[str, any]) -> List[Dict[str, any]]:
+        """
+        解析 PRODUCT_EXTRACT_JS 返回的原始文本（价格、销量、店铺类型和链接的解析都在 Python 端完成）
+        
+        Args:
+            extracted: PRODUCT_EXTRACT_JS 的返回值
             
-            # 提取商品元素（淘宝搜索结果的商品项）
-            # product_elements 应该已经在上面获取到了
-            # 如果还没有，说明前面的逻辑有问题
+        Returns:
+            商品信息列表（只包含提取到标题的商品）
+        """
+        products = []
+        for idx, raw in enumerate(extracted.get('items') or [], 1):
+            product_info = parse_product_item(raw)
+            if product_info is None:
+                if idx <= 3:  # 只输出前3个失败的
+                    logger.debug(f"❌ 商品 {idx} 未提取到标题，跳过 (class: {(raw.get('class_name') or 'N/A')[:100]})")
+                continue
+            products.append(product_info)
+            # 只输出前5个和每10个，减少日志量
+            if idx <= 5 or (idx % 10 == 0):
+                logger.info(f"✅ [{idx}/{len(extracted['items'])}] {product_info['title'][:40]}... | "
+                            f"¥{product_info['price'] or 'N/A'} | 销量:{product_info['sales'] or 'N/A'}")
+        return products
+    
+    def extract_products_from_page(self, page: Page) -> List[Dict[str, any]]:
+        """
+        从当前页面提取商品信息
+        
+        滚动触发懒加载后，通过 PRODUCT_EXTRACT_JS 一次 page.evaluate 取回所有商品的原始字段，
+        Python 端只负责解析（逐元素查询每页需要上千次跨进程调用）。
+        
+        Args:
+            page: Playwright Page 对象
             
-            if not product_elements or len(product_elements) == 0:
+        Returns:
+            商品信息列表
+        """
+        products = []
+        
+        try:
+            # 先滚动页面以触发懒加载
+            self._scroll_for_lazy_load(page)
+            
+            logger.info("🔍 提取商品信息...")
+            extracted = page.evaluate(PRODUCT_EXTRACT_JS, MAX_PRODUCTS_PER_PAGE)
+            items = extracted.get('items') or []
+            
+            if not items:
                 logger.error("❌ 未找到商品元素，页面结构可能已变化或页面未完全加载")
+                logger.info(f"📊 页面结构: 商品链接={extracted.get('product_links', 0)}, "
+                            f"包含item的元素={extracted.get('item_like', 0)}")
                 logger.info(f"当前页面URL: {page.url}")
                 logger.info(f"当前页面标题: {page.title()}")
                 
-                # 尝试输出页面结构用于调试
-                try:
-                    structure_info = page.evaluate("""
-                        () => {
-                            const body = document.body;
-                            const itemContainers = body.querySelectorAll('[class*="item"], [data-category], [id*="item"]');
-                            return {
-                                total_items: itemContainers.length,
-                                classes: Array.from(itemContainers).slice(0, 5).map(el => el.className)
-                            };
-                        }
-                    """)
-                    logger.debug(f"页面结构信息: {structure_info}")
-                except:
-                    pass
-                
                 # 保存页面HTML和截图以便调试
                 try:
                     screenshot_dir = Path("scripts/screenshots")
@@ -1317,7 +1493,7 @@ class TaobaoMiner:
                     page.screenshot(path=str(screenshot_path), full_page=True)
                     logger.info(f"📸 已保存调试截图: {screenshot_path}")
                     
-                    # 保存页面HTML（前10000字符）
+                    # 保存页面HTML（前50KB）
                     try:
                         html_content = page.content()
                         html_path = screenshot_dir / f"debug_no_products_{timestamp}.html"
@@ -1330,378 +1506,40 @@ class TaobaoMiner:
                     logger.debug(f"保存调试信息失败: {str(e)}")
                 return products
             
-            logger.info(f"✅ 找到 {len(product_elements)} 个商品元素，开始提取详细信息...")
-            
-            # 限制提取数量，避免过多（每页通常48个商品）
-            max_extract = min(len(product_elements), 48)
-            if len(product_elements) > max_extract:
-                logger.info(f"📊 商品数量较多（{len(product_elements)}），将提取前 {max_extract} 个")
-            product_elements = product_elements[:max_extract]
-            
-            logger.info(f"📦 准备提取 {len(product_elements)} 个商品的详细信息...")
-            
-            extracted_count = 0
-            for idx, item in enumerate(product_elements, 1):
-                if idx % 10 == 0:
-                    logger.info(f"📊 提取进度: {idx}/{len(product_elements)} ({extracted_count} 个成功)")
-                try:
-                    product_info = {}
-                    
-                    # 如果item是链接，需要找到它的父容器来提取信息
-                    actual_item = item
-                    if item.tag_name().lower() == 'a':
-                        # 如果是链接，尝试找到父容器
-                        try:
-                            # 向上查找包含商品信息的父容器
-                            parent_container = item.evaluate("""
-                                el => {
-                                    let parent = el.parentElement;
-                                    let depth = 0;
-                                    while (parent && depth < 10) {
-                                        const hasTitle = parent.querySelector('.title, [class*="title"], a[title]');
-                                        const hasPrice = parent.querySelector('.price, [class*="price"]');
-                                        const classList = parent.className || '';
-                                        if ((hasTitle || hasPrice) && /item|Item|ctx|goods/i.test(classList)) {
-                                            return parent;
-                                        }
-                                        parent = parent.parentElement;
-                                        depth++;
-                                    }
-                                    return el.parentElement || el;
-                                }
-                            """)
-                            # 由于evaluate返回的是序列化的对象，我们需要重新查询
-                            # 简化：直接使用链接本身，在提取时查找父元素
-                            actual_item = item
-                        except:
-                            actual_item = item
-                    
-                    # 提取标题 - 扩展更多选择器
-                    title_selectors = [
-                        '.title a',  # 标题链接
-                        '.title',  # 标题容器
-                        'a[title]',  # 带title属性的链接
-                        '.J_ClickStat',  # 点击统计元素
-                        'a.J_ClickStat',  # 点击统计链接
-                        '.item-title',  # 商品标题类
-                        '.item-title a',  # 商品标题链接
-                        '[class*="title"] a',  # 包含title的类的链接
-                        '[class*="Title"] a',  # 包含Title的类的链接
-                        'a[href*="item"]',  # 商品链接
-                        '.pic-link',  # 图片链接（通常包含title）
-                        'a.pic-link',  # 图片链接
-                    ]
-                    
-                    title = None
-                    title_link = None
-                    title_extraction_method = None
-                    
-                    # 如果item是链接，先从链接本身提取
-                    if item.tag_name().lower() == 'a':
-                        try:
-                            link_title = item.get_attribute('title')
-                            link_text = item.inner_text()
-                            link_href = item.get_attribute('href')
-                            
-                            if link_title:
-                                title = link_title.strip()
-                                title_link = link_href
-                                title_extraction_method = '链接title属性'
-                            elif link_text and len(link_text.strip()) > 5:
-                                title = link_text.strip()
-                                title_link = link_href
-                                title_extraction_method = '链接文本'
-                            
-                            # 如果链接有href，直接使用
-                            if link_href and ('item.taobao.com' in link_href or 'detail.tmall.com' in link_href):
-                                product_info['url'] = link_href
-                        except:
-                            pass
-                    
-                    # 方法1: 使用标准选择器
-                    for title_sel in title_selectors:
-                        try:
-                            title_elem = item.query_selector(title_sel)
-                            if title_elem:
-                                # 尝试多种方式获取标题
-                                title = title_elem.get_attribute('title')
-                                if not title:
-                                    title = title_elem.get_attribute('alt')  # 图片alt属性
-                                if not title:
-                                    title = title_elem.inner_text().strip()
-                                
-                                if title and len(title) > 5:  # 标题应该有一定长度
-                                    title_link = title_elem.get_attribute('href')
-                                    title_extraction_method = f"选择器: {title_sel}"
-                                    break
-                        except Exception as e:
-                            logger.debug(f"标题选择器 {title_sel} 失败: {str(e)}")
-                            continue
-                    
-                    # 方法2: 如果标准选择器失败，尝试查找元素内的所有链接
-                    if not title:
-                        try:
-                            # 查找元素内所有链接
-                            all_links = item.query_selector_all('a')
-                            for link in all_links:
-                                try:
-                                    # 检查链接是否指向商品详情页
-                                    href = link.get_attribute('href') or ''
-                                    if 'item.taobao.com' in href or 'detail.tmall.com' in href or '/item/' in href:
-                                        # 尝试从链接获取标题
-                                        link_title = link.get_attribute('title')
-                                        if not link_title:
-                                            link_title = link.inner_text().strip()
-                                        if link_title and len(link_title) > 5:
-                                            title = link_title
-                                            title_link = href
-                                            title_extraction_method = "从商品链接提取"
-                                            break
-                                except:
-                                    continue
-                        except Exception as e:
-                            logger.debug(f"从链接提取标题失败: {str(e)}")
-                    
-                    # 方法3: 如果还是失败，尝试从元素本身提取文本
-                    if not title:
-                        try:
-                            # 获取元素的所有文本内容
-                            all_text = item.inner_text().strip()
-                            if all_text:
-                                # 尝试提取最长的文本行作为标题
-                                lines = [line.strip() for line in all_text.split('\n') if line.strip()]
-                                if lines:
-                                    # 找到最长的行（通常是标题）
-                                    longest_line = max(lines, key=len)
-                                    if len(longest_line) > 5:
-                                        title = longest_line
-                                        title_extraction_method = "从元素文本提取"
-                                        
-                                        # 尝试找到对应的链接
-                                        try:
-                                            link_in_item = item.query_selector('a[href*="item"]')
-                                            if link_in_item:
-                                                title_link = link_in_item.get_attribute('href')
-                                        except:
-                                            pass
-                        except Exception as e:
-                            logger.debug(f"从元素文本提取标题失败: {str(e)}")
-                    
-                    if not title:
-                        # 输出详细的调试信息（只在debug模式下）
-                        if logger.level <= 10:  # DEBUG level
-                            try:
-                                item_html = item.inner_html()[:200]  # 前200字符
-                                logger.debug(f"商品 {idx} 未找到标题，HTML预览: {item_html}...")
-                            except:
-                                pass
-                        continue
-                    
-                    if idx <= 3 or idx % 10 == 0:  # 前3个和每10个输出详细日志
-                        logger.debug(f"商品 {idx} 标题提取成功 ({title_extraction_method}): {title[:50]}...")
-                    
-                    product_info['title'] = title.strip()
-                    
-                    # 处理链接（如果是相对路径，补全为完整URL）
-                    if title_link:
-                        if title_link.startswith('//'):
-                            title_link = 'https:' + title_link
-                        elif title_link.startswith('/'):
-                            title_link = 'https://www.taobao.com' + title_link
-                        product_info['detail_url'] = title_link
-                    else:
-                        product_info['detail_url'] = None
-                    
-                    # 提取价格 - 扩展更多选择器
-                    price_selectors = [
-                        '.price strong',  # 价格强标签
-                        '.price',  # 价格容器
-                        '.price .price-num',  # 价格数字
-                        '.item-price',  # 商品价格类
-                        '[class*="price"]',  # 包含price的类
-                        '[class*="Price"]',  # 包含Price的类
-                        '.g-price',  # g-开头的价格类
-                        '.price-box',  # 价格盒子
-                    ]
-                    
-                    price = None
-                    for price_sel in price_selectors:
-                        try:
-                            price_elem = item.query_selector(price_sel)
-                            if price_elem:
-                                price_text = price_elem.inner_text().strip()
-                                # 提取数字部分（支持小数点）
-                                price_match = re.search(r'(\d+\.?\d*)', price_text.replace(',', '').replace('￥', '').replace('¥', ''))
-                                if price_match:
-                                    price_val = float(price_match.group(1))
-                                    # 价格应该合理（1-100000之间）
-                                    if 1 <= price_val <= 100000:
-                                        price = price_val
-                                        break
-                        except Exception as e:
-                            logger.debug(f"价格选择器 {price_sel} 失败: {str(e)}")
-                            continue
-                    
-                    # 如果标准选择器失败，尝试从元素文本中提取价格
-                    if price is None:
-                        try:
-                            all_text = item.inner_text()
-                            # 查找包含"￥"或"¥"的文本
-                            price_patterns = [
-                                r'[￥¥]\s*(\d+\.?\d*)',  # ￥123.45
-                                r'(\d+\.?\d*)\s*元',  # 123.45元
-                                r'价格[：:]\s*(\d+\.?\d*)',  # 价格：123.45
-                            ]
-                            for pattern in price_patterns:
-                                match = re.search(pattern, all_text)
-                                if match:
-                                    price_val = float(match.group(1))
-                                    if 1 <= price_val <= 100000:
-                                        price = price_val
-                                        break
-                        except:
-                            pass
-                    
-                    product_info['price'] = price
-                    
-                    # 提取销量 - 扩展更多选择器和模式
-                    sales_selectors = [
-                        '.deal-cnt',  # 成交数
-                        '.sales',  # 销量
-                        '[class*="deal"]',  # 包含deal的类
-                        '[class*="Deal"]',  # 包含Deal的类
-                        '.item-sales',  # 商品销量类
-                        '[class*="sales"]',  # 包含sales的类
-                        '[class*="Sales"]',  # 包含Sales的类
-                    ]
-                    
-                    sales = None
-                    for sales_sel in sales_selectors:
-                        try:
-                            sales_elem = item.query_selector(sales_sel)
-                            if sales_elem:
-                                sales_text = sales_elem.inner_text().strip()
-                                # 提取数字，处理"月销100+"、"100+"、"1.5万+"等格式
-                                sales_text = sales_text.replace('月销', '').replace('人付款', '').replace('+', '').strip()
-                                
-                                # 处理"万"单位
-                                if '万' in sales_text:
-                                    num_match = re.search(r'(\d+\.?\d*)', sales_text)
-                                    if num_match:
-                                        sales = int(float(num_match.group(1)) * 10000)
-                                else:
-                                    num_match = re.search(r'(\d+)', sales_text.replace(',', ''))
-                                    if num_match:
-                                        sales = int(num_match.group(1))
-                                if sales:
-                                    break
-                        except Exception as e:
-                            logger.debug(f"销量选择器 {sales_sel} 失败: {str(e)}")
-                            continue
-                    
-                    # 如果标准选择器失败，尝试从元素文本中提取销量
-                    if sales is None:
-                        try:
-                            all_text = item.inner_text()
-                            # 查找包含销量关键词的文本
-                            sales_patterns = [
-                                r'月销[：:]?\s*(\d+)',  # 月销1000
-                                r'已售[：:]?\s*(\d+)',  # 已售1000
-                                r'(\d+)\s*人付款',  # 1000人付款
-                                r'销量[：:]?\s*(\d+)',  # 销量1000
-                                r'成交[：:]?\s*(\d+)',  # 成交1000
-                            ]
-                            for pattern in sales_patterns:
-                                match = re.search(pattern, all_text)
-                                if match:
-                                    sales = int(match.group(1))
-                                    break
-                        except:
-                            pass
-                    
-                    product_info['sales'] = sales
-                    
-                    # 提取店铺名
-                    shop_selectors = [
-                        '.shop a',  # 店铺链接
-                        '.shop',  # 店铺容器
-                        '.nick',  # 店铺昵称
-                    ]
-                    
-                    shop_name = None
-                    for shop_sel in shop_selectors:
-                        try:
-                            shop_elem = item.query_selector(shop_sel)
-                            if shop_elem:
-                                shop_name = shop_elem.inner_text().strip()
-                                if shop_name:
-                                    break
-                        except:
-                            continue
-                    
-                    product_info['shop_name'] = shop_name
-                    
-                    # 提取店铺类型（C店/天猫）
-                    shop_type = None
-                    try:
-                        # 检查商品链接或店铺链接是否包含 tmall
-                        detail_url = product_info.get('detail_url', '')
-                        if detail_url:
-                            if 'tmall.com' in detail_url or 'detail.tmall' in detail_url:
-                                shop_type = 'tmall'
-                            elif 'taobao.com' in detail_url:
-                                shop_type = 'c_shop'
-                        
-                        # 也可以通过页面元素判断
-                        if not shop_type:
-                            shop_badge = item.query_selector('.shop-badge, .shop-type, [class*="tmall"]')
-                            if shop_badge:
-                                badge_text = shop_badge.inner_text().strip().lower()
-                                if '天猫' in badge_text or 'tmall' in badge_text:
-                                    shop_type = 'tmall'
-                                else:
-                                    shop_type = 'c_shop'
-                        
-                        product_info['shop_type'] = shop_type
-                    except:
-                        product_info['shop_type'] = None
-                    
-                    # 只添加有标题的商品（基本要求）
-                    if product_info.get('title'):
-                        products.append(product_info)
-                        extracted_count += 1
-                        # 只输出前5个和每10个，减少日志量
-                        if idx <= 5 or (idx % 10 == 0):
-                            logger.info(f"✅ [{idx}/{len(product_elements)}] {product_info['title'][:40]}... | ¥{price or 'N/A'} | 销量:{sales or 'N/A'}")
-                    else:
-                        if idx <= 3:  # 只输出前3个失败的
-                            logger.debug(f"❌ 商品 {idx} 未提取到标题，跳过")
-                    
-                except Exception as e:
-                    logger.warning(f"提取商品 {idx} 信息时出错: {str(e)}")
-                    # 输出元素的基本信息用于调试
-                    try:
-                        item_class = item.get_attribute('class') or 'N/A'
-                        logger.debug(f"失败元素的class: {item_class[:100]}")
-                    except:
-                        pass
-                    continue
+            logger.info(f"✅ 使用选择器 '{extracted.get('selector')}' 找到 {len(items)} 个商品元素")
+            products = self.parse_products(extracted)
             
-            logger.info(f"✅ 成功提取 {len(products)} 个商品信息 (从 {len(product_elements)} 个元素中)")
-            if len(products) == 0 and len(product_elements) > 0:
-                logger.warning(f"⚠️ 警告: 找到了 {len(product_elements)} 个商品元素，但提取失败。可能需要检查页面结构。")
-                # 输出第一个元素的HTML用于调试
-                try:
-                    first_elem_html = product_elements[0].inner_html()[:500]
-                    logger.debug(f"第一个元素的HTML预览: {first_elem_html}...")
-                except:
-                    pass
+            logger.info(f"✅ 成功提取 {len(products)} 个商品信息 (从 {len(items)} 个元素中)")
+            if len(products) == 0:
+                logger.warning(f"⚠️ 警告: 找到了 {len(items)} 个商品元素，但提取失败。可能需要检查页面结构。")
+                logger.debug(f"第一个元素的文本预览: {(items[0].get('text') or '')[:500]}...")
             
         except Exception as e:
             logger.error(f"提取商品信息时出错: {str(e)}")
         
         return products
     
+    def collect_page_products(self, page: Page) -> List[Dict[str, any]]:
+        """
+        获取当前页商品：启用接口捕获时优先使用搜索接口数据，未捕获到时回退到 DOM 提取
+        
+        Args:
+            page: Playwright Page 对象
+            
+        Returns:
+            商品信息列表
+        """
+        if self.api_capture:
+            products = self.api_capture.wait_for_products(page, timeout=10.0)
+            if products:
+                logger.info(f"📡 从搜索接口获取 {len(products)} 个商品")
+                self.last_page_source = 'api'
+                return products
+            logger.warning("⚠️ 未捕获到搜索接口数据，回退到页面提取")
+        
+        self.last_page_source = 'dom'
+        return self.extract_products_from_page(page)
+    
     def go_to_next_page(self, page: Page) -> bool:
         """
         翻到下一页
@@ -1742,7 +1580,9 @@ class TaobaoMiner:
             except:
                 pass
             
-            # 点击下一页
+            # 点击下一页（清空上一页捕获的接口数据）
+            if self.api_capture:
+                self.api_capture.reset()
             next_button.click()
             
             # 等待页面加载（增加等待时间）
@@ -1775,9 +1615,301 @@ class TaobaoMiner:
             logger.error(f"翻页失败: {str(e)}")
             return False
     
+    def load_crawl_state(self, seed_words: List[str], max_pages: int) -> List[Tuple[int, str]]:
+        """
+        读取抓取日志中已完成的进度，返回还需要抓取的种子词（没有抓取日志时返回全部种子词）
+        
+        Args:
+            seed_words: 种子词列表
+            max_pages: 每个种子词最多抓取页数
+            
+        Returns:
+            [(种子词序号, 种子词)] 列表（序号从1开始，与 seed_words 的顺序一致）
+        """
+        self.crawl_state = load_crawl_journal(self.journal.path)['seeds'] if self.journal else {}
+        pending = pending_seeds(self.crawl_state, seed_words, max_pages)
+        if len(pending) < len(seed_words):
+            logger.info(f"📒 从抓取日志恢复: 跳过 {len(seed_words) - len(pending)} 个已完成的种子词，"
+                        f"剩余 {len(pending)} 个")
+        return pending
+    
+    def _resume_point(self, seed_word: str) -> Tuple[int, List[Dict[str, any]]]:
+        """
+        种子词的续跑位置
+        
+        Args:
+            seed_word: 种子词
+            
+        Returns:
+            (下一个要抓取的页码, 抓取日志中已完成页面的商品)
+        """
+        pages = self.crawl_state.get(seed_word, {}).get('pages', {})
+        if not pages:
+            return 1, []
+        return max(pages) + 1, [product for page_num in sorted(pages) for product in pages[page_num]]
+    
+    def _remaining_pages(self, pending: List[Tuple[int, str]], max_pages: int) -> int:
+        """还需要抓取的页数（按最多页数估算，用于进度总数）"""
+        return sum(max_pages + 1 - self._resume_point(seed_word)[0] for _, seed_word in pending)
+    
+    def _record_page(self, seed_word: str, page_num: int, products: List[Dict[str, any]]):
+        """
+        把一页商品写入抓取日志（写入失败只记录警告，不影响抓取）
+        
+        Args:
+            seed_word: 种子词
+            page_num: 页码
+            products: 该页商品列表
+        """
+        if not self.journal:
+            return
+        try:
+            self.journal.append({
+                "type": "page",
+                "seed_word": seed_word,
+                "page": page_num,
+                "source": self.last_page_source,
+                "products": products,
+                "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+            })
+        except Exception as e:
+            logger.warning(f"写入抓取日志失败: {seed_word} 第 {page_num} 页 - {str(e)}")
+    
+    def _record_seed_done(self, seed_word: str, products: int):
+        """
+        在抓取日志中标记种子词已抓取完成（续跑时整个跳过）
+        
+        Args:
+            seed_word: 种子词
+            products: 该种子词的商品数量
+        """
+        if not self.journal:
+            return
+        try:
+            self.journal.append({
+                "type": "seed",
+                "seed_word": seed_word,
+                "products": products,
+                "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+            })
+        except Exception as e:
+            logger.warning(f"写入抓取日志失败: {seed_word} - {str(e)}")
+    
+    def crawled_products(self, seed_words: List[str], results: Dict[int, List[Dict[str, any]]]) -> List[Dict[str, any]]:
+        """
+        按种子词的输入顺序合并商品（有抓取日志时从日志读取，包含之前运行中已完成的页面）
+        
+        Args:
+            seed_words: 种子词列表
+            results: 本次运行抓取的商品 {种子词序号: 商品列表}
+            
+        Returns:
+            所有商品列表
+        """
+        if self.journal:
+            return journal_products(load_crawl_journal(self.journal.path)['seeds'], seed_words)
+        return [product for seed_idx in sorted(results) for product in results[seed_idx]]
+    
+    def _skip_to_page(self, page: Page, start_page: int) -> bool:
+        """
+        续跑时从第 1 页翻到 start_page（跳过的页面不提取，商品已在抓取日志中）
+        
+        Args:
+            page: Playwright Page 对象
+            start_page: 要开始抓取的页码
+            
+        Returns:
+            是否翻到了 start_page
+        """
+        logger.info(f"📒 从第 {start_page} 页继续（前 {start_page - 1} 页已在抓取日志中）")
+        for _ in range(start_page - 1):
+            self.rate_controller.wait(self.rate_key())
+            if not self.go_to_next_page(page):
+                return False
+        return True
+    
+    def _mine_seed(self, page: Page, seed_word: str, seed_idx: int, total_seeds: int, max_pages: int,
+                   min_sales: int, max_sales: int, apply_sales_filter: bool,
+                   total_so_far: Optional[List[int]] = None) -> Tuple[List[Dict[str, any]], bool, float]:
+        """
+        抓取一个种子词的所有页面（有抓取日志时每页写入一条记录，并从日志中最后完成的页面之后继续）
+        
+        Args:
+            page: Playwright Page 对象
+            seed_word: 种子词
+            seed_idx: 种子词序号（从1开始）
+            total_seeds: 种子词总数
+            max_pages: 最多抓取页数
+            min_sales: 最小销量过滤
+            max_sales: 最大销量过滤
+            apply_sales_filter: 是否在每页提取后立即按销量过滤
+            total_so_far: 累计商品数量（单元素列表，并行时各工作者共用，仅用于日志和进度）
+            
+        Returns:
+            (该种子词的商品列表, 搜索是否成功, 搜索耗时秒数)
+        """
+        total_so_far = total_so_far if total_so_far is not None else [0]
+        start_page, seed_products = self._resume_point(seed_word)
+        
+        logger.info("=" * 60)
+        logger.info(f"[{seed_idx}/{total_seeds}] 处理种子词: {seed_word}")
+        logger.info("=" * 60)
+        
+        # 搜索关键词
+        logger.info(f"🔍 开始搜索关键词: {seed_word}")
+        self.captcha_seen = False
+        search_started = time.time()
+        search_success = self.search_keyword(page, seed_word)
+        search_elapsed = time.time() - search_started
+        self.progress.emit('seed', status='start', seed_word=seed_word, index=seed_idx,
+                           seeds=total_seeds, search_ok=search_success,
+                           seconds=round(search_elapsed, 3))
+        
+        if not search_success:
+            logger.warning(f"⚠️ 搜索可能失败，但将继续尝试提取种子词: {seed_word}")
+            # 不直接跳过，尝试提取当前页面（可能部分加载成功；不写入抓取日志）
+        
+        # 只有确实翻到最后一页（或没有下一页）时才在抓取日志中标记种子词完成；
+        # 搜索失败或遇到限流时保留为未完成，续跑时重新抓取
+        completed = True
+        if start_page > 1 and not self._skip_to_page(page, start_page):
+            if not search_success or self.detect_pushback(page):
+                logger.warning(f"⚠️ 搜索失败或遇到限流，无法翻到第 {start_page} 页，种子词保留为未完成: {seed_word}")
+                completed = False
+            else:
+                logger.info(f"无法翻到第 {start_page} 页，种子词已抓取完毕: {seed_word}")
+            start_page = max_pages + 1
+        
+        # 遍历每一页
+        for page_num in range(start_page, max_pages + 1):
+            logger.info("")
+            logger.info(f"{'='*60}")
+            logger.info(f"--- 第 {page_num} 页 ---")
+            logger.info(f"{'='*60}")
+            
+            # 提取当前页商品
+            logger.info(f"📦 开始提取第 {page_num} 页商品...")
+            page_started = time.time()
+            try:
+                products = self.collect_page_products(page)
+                logger.info(f"✅ 第 {page_num} 页提取完成，获得 {len(products)} 个商品")
+            except Exception as e:
+                logger.error(f"❌ 提取第 {page_num} 页商品时出错: {str(e)[:200]}")
+                products = []  # 空列表，继续下一页
+            
+            # 上报页面状态：正常提速，限流降速
+            pushback = self.detect_pushback(page)
+            self.rate_controller.record(self.rate_key(), ok=len(products) > 0, pushback=pushback)
+            
+            # 添加种子词信息到商品数据
+            for product in products:
+                product['seed_word'] = seed_word
+                product['page_num'] = page_num
+            
+            # 如果启用销量过滤，在这里先过滤（但通常在外层统一过滤更好）
+            if apply_sales_filter:
+                products = self.filter_products_by_sales(products, min_sales, max_sales)
+            
+            seed_products.extend(products)
+            total_so_far[0] += len(products)
+            if search_success and not pushback:
+                self._record_page(seed_word, page_num, products)
+            else:
+                completed = False
+            logger.info(f"当前页提取 {len(products)} 个商品，累计 {total_so_far[0]} 个")
+            self.progress.advance(
+                'page', seed_word=seed_word, page=page_num, products=len(products),
+                total_products=total_so_far[0], seconds=round(time.time() - page_started, 3),
+                source=self.last_page_source,
+                items=[{key: product.get(key) for key in PROGRESS_PRODUCT_FIELDS} for product in products]
+            )
+            
+            if not completed:
+                logger.warning(f"⚠️ 搜索失败或遇到限流，停止抓取并保留为未完成（续跑时重新抓取）: {seed_word}")
+                break
+            
+            # 如果不是最后一页，尝试翻页
+            if page_num < max_pages:
+                # 按节奏控制器的间隔等待再翻页
+                logger.info("⏸️ 翻页前等待（降低被检测风险）...")
+                self.rate_controller.wait(self.rate_key())
+                # 模拟人类行为
+                self.simulate_human_behavior(page)
+                
+                if not self.go_to_next_page(page):
+                    if self.detect_pushback(page):
+                        logger.warning(f"⚠️ 翻页时遇到限流，种子词保留为未完成: {seed_word}")
+                        completed = False
+                    else:
+                        logger.info(f"无法翻页，停止抓取种子词: {seed_word}")
+                    break
+            else:
+                logger.info(f"已完成 {max_pages} 页抓取，继续下一个种子词")
+        
+        if completed:
+            self._record_seed_done(seed_word, len(seed_products))
+        self.progress.emit('seed', status='end', seed_word=seed_word, index=seed_idx,
+                           seeds=total_seeds, products=len(seed_products), completed=completed)
+        return seed_products, search_success, search_elapsed
+    
+    def _after_seed(self, playwright, browser, context, page, search_success: bool,
+                    search_elapsed: float, seed_products: int, has_next: bool):
+        """
+        种子词之间的处理：上报代理健康度（代理熔断时换代理重新打开浏览器），并按节奏等待
+        
+        Args:
+            playwright: Playwright 实例
+            browser / context / page: 当前使用的浏览器、上下文和页面
+            search_success: 搜索是否成功
+            search_elapsed: 搜索耗时秒数
+            seed_products: 该种子词抓取到的商品数量
+            has_next: 后面是否还有种子词
+            
+        Returns:
+            (browser, context, page) 元组（换代理时为新打开的浏览器）
+        """
+        # 上报代理健康度；代理熔断时换代理重新打开浏览器（Cookies 从认证文件重新加载）
+        if self.proxy_pool and self.current_proxy:
+            self.proxy_pool.report(self.current_proxy, success=search_success and seed_products > 0,
+                                   latency=search_elapsed, captcha=self.captcha_seen)
+            if has_next and not self.proxy_pool.is_available(self.current_proxy):
+                logger.info("🔄 当前代理已熔断，更换代理...")
+                browser.close()
+                browser, context, page = self.create_browser_context(playwright)
+        
+        # 每个种子词之间等待（增加延迟，降低被检测风险）
+        if has_next:
+            logger.info("⏸️ 等待后处理下一个种子词（降低被检测风险）...")
+            # 切换种子词的间隔为翻页间隔的 1.6 倍（原 8-20 秒与 5-12 秒的比例）
+            self.rate_controller.wait(self.rate_key(), multiplier=1.6)
+            # 偶尔添加额外的随机暂停（模拟用户休息，时长随当前间隔缩放）
+            if random.random() < 0.3:  # 30%概率额外休息
+                extra_rest = random.uniform(0.6, 1.8) * self.rate_controller.current_interval(self.rate_key())
+                logger.info(f"💤 额外休息 {extra_rest:.1f} 秒（模拟用户行为）...")
+                time.sleep(extra_rest)
+        return browser, context, page
+    
+    def _log_crawl_summary(self, products: int, crawl_started: float):
+        """输出抓取完成的汇总（代理、节奏控制、接口捕获）"""
+        logger.info("=" * 60)
+        logger.info(f"✅ 抓取完成！共获取 {products} 个商品")
+        self.progress.phase('crawl', 'end', products=products,
+                            seconds=round(time.time() - crawl_started, 3))
+        if self.resource_policy:
+            self.resource_policy.log_summary()
+        if self.proxy_pool:
+            self.proxy_pool.log_summary()
+        if self.api_capture:
+            stats = self.api_capture.stats
+            logger.info(f"📡 搜索接口: 捕获 {stats['responses']} 个响应，解析 {stats['products']} 个商品，"
+                        f"解析失败 {stats['parse_errors']} 次")
+        self.rate_controller.log_summary()
+        logger.info("=" * 60)
+    
     def mine_keywords(self, seed_words: List[str], max_pages: int = 5, 
                      min_sales: int = 50, max_sales: int = 5000, 
-                     apply_sales_filter: bool = False) -> List[Dict[str, any]]:
+                     apply_sales_filter: bool = False, parallel: int = 1,
+                     auth_files: Optional[List[str]] = None) -> List[Dict[str, any]]:
         """
         挖掘关键词（核心抓取逻辑）
         
@@ -1786,11 +1918,18 @@ class TaobaoMiner:
             max_pages: 每个种子词最多抓取页数（默认5页）
             min_sales: 最小销量过滤（默认50）
             max_sales: 最大销量过滤（默认5000）
+            parallel: 同时抓取的浏览器上下文数量（大于1时见 mine_keywords_parallel）
+            auth_files: 并行时各上下文使用的认证文件（默认都使用 auth_file）
             
         Returns:
-            所有抓取到的商品列表
+            所有抓取到的商品列表（有抓取日志时包含之前运行中已完成的页面）
         """
-        all_products = []
+        if parallel > 1 and len(seed_words) > 1:
+            return self.mine_keywords_parallel(seed_words, parallel, auth_files=auth_files, max_pages=max_pages,
+                                               min_sales=min_sales, max_sales=max_sales,
+                                               apply_sales_filter=apply_sales_filter)
+        
+        results: Dict[int, List[Dict[str, any]]] = {}
         
         logger.info("=" * 60)
         logger.info("开始淘宝关键词挖掘")
@@ -1799,6 +1938,16 @@ class TaobaoMiner:
         logger.info(f"销量过滤范围: {min_sales} - {max_sales}")
         logger.info("=" * 60)
         
+        pending = self.load_crawl_state(seed_words, max_pages)
+        if not pending:
+            logger.info("✅ 所有种子词均已在抓取日志中完成，无需抓取")
+            return self.crawled_products(seed_words, results)
+        
+        # 页数按最多页数估算（无法翻页时提前结束）
+        self.progress.total = self._remaining_pages(pending, max_pages)
+        self.progress.phase('crawl', 'start', seed_words=seed_words, max_pages=max_pages)
+        crawl_started = time.time()
+        
         with sync_playwright() as p:
             browser, context, page = self.create_browser_context(p)
             
@@ -1806,90 +1955,184 @@ class TaobaoMiner:
                 # 验证登录状态
                 if not self.is_logged_in(page):
                     logger.error("❌ 未登录，请先运行登录设置: python taobao_miner.py")
+                    self.progress.emit('login_status', logged_in=False)
+                    self.progress.emit('error', message="未登录")
                     browser.close()
-                    return all_products
+                    return []
                 
                 logger.info("✅ 登录状态验证通过")
+                self.progress.emit('login_status', logged_in=True)
                 
                 # 遍历每个种子词
-                for seed_idx, seed_word in enumerate(seed_words, 1):
-                    logger.info("=" * 60)
-                    logger.info(f"[{seed_idx}/{len(seed_words)}] 处理种子词: {seed_word}")
-                    logger.info("=" * 60)
-                    
-                    # 搜索关键词
-                    logger.info(f"🔍 开始搜索关键词: {seed_word}")
-                    search_success = self.search_keyword(page, seed_word)
-                    
-                    if not search_success:
-                        logger.warning(f"⚠️ 搜索可能失败，但将继续尝试提取种子词: {seed_word}")
-                        # 不直接跳过，尝试提取当前页面（可能部分加载成功）
-                    
-                    # 遍历每一页
-                    for page_num in range(1, max_pages + 1):
-                        logger.info("")
-                        logger.info(f"{'='*60}")
-                        logger.info(f"--- 第 {page_num} 页 ---")
-                        logger.info(f"{'='*60}")
-                        
-                        # 提取当前页商品
-                        logger.info(f"📦 开始提取第 {page_num} 页商品...")
-                        try:
-                            products = self.extract_products_from_page(page)
-                            logger.info(f"✅ 第 {page_num} 页提取完成，获得 {len(products)} 个商品")
-                        except Exception as e:
-                            logger.error(f"❌ 提取第 {page_num} 页商品时出错: {str(e)[:200]}")
-                            products = []  # 空列表，继续下一页
-                        
-                        # 添加种子词信息到商品数据
-                        for product in products:
-                            product['seed_word'] = seed_word
-                            product['page_num'] = page_num
-                        
-                        # 如果启用销量过滤，在这里先过滤（但通常在外层统一过滤更好）
-                        if apply_sales_filter:
-                            products = self.filter_products_by_sales(products, min_sales, max_sales)
-                        
-                        all_products.extend(products)
-                        logger.info(f"当前页提取 {len(products)} 个商品，累计 {len(all_products)} 个")
-                        
-                        # 如果不是最后一页，尝试翻页
-                        if page_num < max_pages:
-                            # 随机等待再翻页（增加延迟）
-                            logger.info("⏸️ 翻页前等待（降低被检测风险）...")
-                            self.wait_random(5.0, 12.0)  # 5-12秒随机等待
-                            # 模拟人类行为
-                            self.simulate_human_behavior(page)
-                            
-                            if not self.go_to_next_page(page):
-                                logger.info(f"无法翻页，停止抓取种子词: {seed_word}")
-                                break
-                        else:
-                            logger.info(f"已完成 {max_pages} 页抓取，继续下一个种子词")
-                    
-                    # 每个种子词之间等待（增加延迟，降低被检测风险）
-                    if seed_idx < len(seed_words):
-                        logger.info("⏸️ 等待后处理下一个种子词（降低被检测风险）...")
-                        # 使用更长的随机等待时间
-                        self.wait_long_random(8.0, 20.0)  # 8-20秒随机等待
-                        # 偶尔添加额外的随机暂停（模拟用户休息）
-                        if random.random() < 0.3:  # 30%概率额外休息
-                            extra_rest = random.uniform(5.0, 15.0)
-                            logger.info(f"💤 额外休息 {extra_rest:.1f} 秒（模拟用户行为）...")
-                            time.sleep(extra_rest)
+                total_so_far = [0]
+                for position, (seed_idx, seed_word) in enumerate(pending, 1):
+                    seed_products, search_success, search_elapsed = self._mine_seed(
+                        page, seed_word, seed_idx, len(seed_words), max_pages,
+                        min_sales, max_sales, apply_sales_filter, total_so_far
+                    )
+                    results[seed_idx] = seed_products
+                    browser, context, page = self._after_seed(
+                        p, browser, context, page, search_success, search_elapsed,
+                        len(seed_products), has_next=position < len(pending)
+                    )
                 
-                logger.info("=" * 60)
-                logger.info(f"✅ 抓取完成！共获取 {len(all_products)} 个商品")
-                logger.info("=" * 60)
+                self._log_crawl_summary(sum(len(products) for products in results.values()), crawl_started)
                 
             except KeyboardInterrupt:
                 logger.info("\n用户中断抓取")
+                self.progress.emit('error', message="用户中断抓取", interrupted=True)
             except Exception as e:
                 logger.error(f"抓取过程中出错: {str(e)}", exc_info=True)
+                self.progress.emit('error', message=f"抓取过程中出错: {str(e)}")
             finally:
                 browser.close()
+                self.release_proxy()
         
-        return all_products
+        return self.crawled_products(seed_words, results)
+    
+    def worker_copy(self, auth_file: Optional[str] = None) -> 'TaobaoMiner':
+        """
+        创建并行工作者使用的挖掘器副本
+        
+        副本共用节奏控制器、代理池、请求拦截策略、进度输出和数据库客户端，
+        浏览器相关的状态（代理、验证码标记、接口捕获、User-Agent）各自独立。
+        
+        Args:
+            auth_file: 副本使用的认证文件（默认与当前挖掘器相同）
+            
+        Returns:
+            TaobaoMiner 副本
+        """
+        worker = copy.copy(self)
+        worker.auth_file = Path(auth_file) if auth_file else self.auth_file
+        worker.current_proxy = None
+        worker.captcha_seen = False
+        worker.last_page_source = None
+        worker.user_agent = random.choice(self.PC_USER_AGENTS)
+        if self.api_capture:
+            worker.api_capture = SearchApiCapture([p.pattern for p in self.api_capture.patterns])
+        # 同一账号的所有上下文共用一个节奏（不论使用哪个代理）
+        worker.rate_scope = worker.auth_file.name
+        return worker
+    
+    def mine_keywords_parallel(self, seed_words: List[str], parallel: int,
+                               auth_files: Optional[List[str]] = None, max_pages: int = 5,
+                               min_sales: int = 50, max_sales: int = 5000,
+                               apply_sales_filter: bool = False) -> List[Dict[str, any]]:
+        """
+        并行挖掘关键词
+        
+        启动 parallel 个工作者线程，每个工作者运行自己的 Playwright 实例和浏览器上下文，
+        认证文件按工作者轮流分配（只有一个认证文件时所有上下文共用同一账号的 Cookies）。
+        种子词从共享队列中领取，商品按种子词的输入顺序合并。
+        节奏按账号控制：同一账号的所有上下文共用一个请求间隔，并行只是让滚动、停留等页面内的等待重叠，
+        不会提高单个账号的请求频率；多个账号时总请求频率随账号数增加。
+        
+        Args:
+            seed_words: 种子词列表
+            parallel: 工作者（浏览器上下文）数量
+            auth_files: 认证文件列表（默认只使用 auth_file）
+            max_pages: 每个种子词最多抓取页数
+            min_sales: 最小销量过滤
+            max_sales: 最大销量过滤
+            apply_sales_filter: 是否在每页提取后立即按销量过滤
+            
+        Returns:
+            所有抓取到的商品列表（有抓取日志时包含之前运行中已完成的页面）
+        """
+        auth_files = auth_files or [str(self.auth_file)]
+        workers = max(1, min(parallel, len(seed_words)))
+        
+        logger.info("=" * 60)
+        logger.info("开始淘宝关键词挖掘（并行）")
+        logger.info(f"种子词: {', '.join(seed_words)}")
+        logger.info(f"每个词抓取页数: {max_pages}")
+        logger.info(f"销量过滤范围: {min_sales} - {max_sales}")
+        logger.info(f"工作者: {workers} 个，账号: {', '.join(Path(f).name for f in auth_files)}")
+        logger.info("=" * 60)
+        
+        results: Dict[int, List[Dict[str, any]]] = {}
+        pending = self.load_crawl_state(seed_words, max_pages)
+        if not pending:
+            logger.info("✅ 所有种子词均已在抓取日志中完成，无需抓取")
+            return self.crawled_products(seed_words, results)
+        workers = min(workers, len(pending))
+        
+        self.progress.total = self._remaining_pages(pending, max_pages)
+        self.progress.phase('crawl', 'start', seed_words=seed_words, max_pages=max_pages, parallel=workers)
+        crawl_started = time.time()
+        
+        seed_queue = queue.Queue()
+        for seed_idx, seed_word in pending:
+            seed_queue.put((seed_idx, seed_word))
+        total_so_far = [0]
+        lock = threading.Lock()
+        stop_event = threading.Event()
+        logged_in_accounts = set()
+        
+        def worker(worker_id: int):
+            miner = self.worker_copy(auth_files[worker_id % len(auth_files)])
+            name = f"worker-{worker_id} ({miner.auth_file.name})"
+            try:
+                with sync_playwright() as p:
+                    browser, context, page = miner.create_browser_context(p)
+                    try:
+                        logged_in = miner.is_logged_in(page)
+                        self.progress.emit('login_status', logged_in=logged_in, account=miner.auth_file.name,
+                                           worker=worker_id)
+                        if not logged_in:
+                            logger.error(f"❌ [{name}] 未登录，该工作者退出: {miner.auth_file}")
+                            return
+                        with lock:
+                            logged_in_accounts.add(miner.auth_file.name)
+                        logger.info(f"✅ [{name}] 登录状态验证通过")
+                        
+                        while not stop_event.is_set():
+                            try:
+                                seed_idx, seed_word = seed_queue.get_nowait()
+                            except queue.Empty:
+                                break
+                            seed_products, search_success, search_elapsed = miner._mine_seed(
+                                page, seed_word, seed_idx, len(seed_words), max_pages,
+                                min_sales, max_sales, apply_sales_filter, total_so_far
+                            )
+                            with lock:
+                                results[seed_idx] = seed_products
+                            browser, context, page = miner._after_seed(
+                                p, browser, context, page, search_success, search_elapsed,
+                                len(seed_products), has_next=not seed_queue.empty() and not stop_event.is_set()
+                            )
+                    finally:
+                        browser.close()
+                        miner.release_proxy()
+            except Exception as e:
+                logger.error(f"[{name}] 工作者异常退出: {str(e)}", exc_info=True)
+        
+        threads = [threading.Thread(target=worker, args=(worker_id,), name=f"taobao-worker-{worker_id}", daemon=True)
+                   for worker_id in range(workers)]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            logger.info("\n用户中断抓取，等待工作者结束当前页...")
+            self.progress.emit('error', message="用户中断抓取", interrupted=True)
+            stop_event.set()
+            for thread in threads:
+                thread.join(timeout=60)
+        
+        if not logged_in_accounts:
+            logger.error("❌ 所有账号均未登录，请先运行登录设置: python taobao_miner.py")
+            self.progress.emit('error', message="未登录")
+        elif not seed_queue.empty() and not stop_event.is_set():
+            logger.error(f"❌ 所有工作者均已退出，剩余 {seed_queue.qsize()} 个种子词未抓取")
+            self.progress.emit('error', message=f"所有工作者均已退出，剩余 {seed_queue.qsize()} 个种子词未抓取")
+        
+        self._log_crawl_summary(sum(len(products) for products in results.values()), crawl_started)
+        return self.crawled_products(seed_words, results)
     
     def filter_products_by_sales(self, products: List[Dict[str, any]], 
                                   min_sales: int, max_sales: int) -> List[Dict[str, any]]:
@@ -2047,7 +2290,8 @@ class TaobaoMiner:
                      max_price: Optional[float] = None,
                      must_contain_keywords: Optional[List[str]] = None,
                      must_not_contain_keywords: Optional[List[str]] = None,
-                     shop_type: Optional[str] = None) -> Dict[str, int]:
+                     shop_type: Optional[str] = None, parallel: int = 1,
+                     auth_files: Optional[List[str]] = None) -> Dict[str, int]:
         """
         挖掘关键词并保存到数据库
         
@@ -2062,6 +2306,8 @@ class TaobaoMiner:
             must_contain_keywords: 必须包含的关键词列表（可选）
             must_not_contain_keywords: 不能包含的关键词列表（可选）
             shop_type: 店铺类型 ('tmall'/'c_shop'/None，None表示不限)
+            parallel: 同时抓取的浏览器上下文数量
+            auth_files: 并行时各上下文使用的认证文件（默认都使用 auth_file）
             
         Returns:
             统计信息字典
@@ -2077,9 +2323,75 @@ class TaobaoMiner:
             max_pages=max_pages,
             min_sales=min_sales,
             max_sales=max_sales,
-            apply_sales_filter=False  # 统一在外层过滤
+            apply_sales_filter=False,  # 统一在外层过滤
+            parallel=parallel,
+            auth_files=auth_files
         )
         
+        return self.save_crawl(all_products, seed_words, max_pages, project_id, min_sales=min_sales,
+                               max_sales=max_sales, min_price=min_price, max_price=max_price,
+                               must_contain_keywords=must_contain_keywords,
+                               must_not_contain_keywords=must_not_contain_keywords, shop_type=shop_type)
+    
+    def save_crawl(self, all_products: List[Dict[str, any]], seed_words: List[str], max_pages: int,
+                   project_id: str, **filters) -> Dict[str, int]:
+        """
+        入库抓取结果
+        
+        有抓取日志时从日志读取商品（包含之前运行中已完成的页面），只在所有种子词都抓取完成后入库，
+        入库后在日志中记录统计，同一次运行不会重复插入；抓取未完成时不入库，可以用 --resume 继续。
+        
+        Args:
+            all_products: 本次抓取返回的商品列表（没有抓取日志时直接入库）
+            seed_words: 种子词列表
+            max_pages: 每个种子词最多抓取页数
+            project_id: 项目ID
+            filters: 过滤参数，同 save_products
+            
+        Returns:
+            统计信息字典（抓取未完成时 pending_seeds 为未完成的种子词数量）
+        """
+        if not self.journal:
+            return self.save_products(all_products, project_id, **filters)
+        
+        crawl = load_crawl_journal(self.journal.path)
+        if crawl['saved']:
+            logger.warning(f"⚠️ 该次运行已于 {crawl['saved'].get('recorded_at')} 入库，不再重复插入")
+            return crawl['saved']['stats']
+        pending = pending_seeds(crawl['seeds'], seed_words, max_pages)
+        if pending:
+            logger.warning(f"⚠️ 还有 {len(pending)} 个种子词未抓取完成，暂不入库；"
+                           f"使用 --resume {self.journal.path.stem} 继续")
+            return {**dict.fromkeys(SAVE_STAT_KEYS, 0), 'total_crawled': len(all_products),
+                    'pending_seeds': len(pending)}
+        
+        result = self.save_products(journal_products(crawl['seeds'], seed_words), project_id, **filters)
+        self.journal.append({
+            "type": "saved",
+            "project_id": project_id,
+            "stats": result,
+            "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+        return result
+    
+    def save_products(self, all_products: List[Dict[str, any]], project_id: str,
+                      min_sales: int = 50, max_sales: int = 5000,
+                      min_price: Optional[float] = None,
+                      max_price: Optional[float] = None,
+                      must_contain_keywords: Optional[List[str]] = None,
+                      must_not_contain_keywords: Optional[List[str]] = None,
+                      shop_type: Optional[str] = None) -> Dict[str, int]:
+        """
+        过滤抓取到的商品，清洗标题后保存到数据库
+        
+        Args:
+            all_products: 抓取到的商品列表
+            project_id: 项目ID
+            其余参数同 mine_and_save
+            
+        Returns:
+            统计信息字典
+        """
         total_crawled = len(all_products)
         logger.info(f"📊 抓取完成，共 {total_crawled} 个商品")
         
@@ -2116,6 +2428,9 @@ class TaobaoMiner:
         after_shop_type_filter = len(filtered_products)
         if shop_type:
             logger.info(f"📊 店铺类型过滤后: {after_shop_type_filter} 个商品")
+        self.progress.phase('filter', 'end', total_crawled=total_crawled, after_sales_filter=after_sales_filter,
+                            after_price_filter=after_price_filter, after_keyword_filter=after_keyword_filter,
+                            after_shop_type_filter=after_shop_type_filter)
         
         # 清洗并准备入库数据
         keywords_to_insert = []
@@ -2150,10 +2465,12 @@ class TaobaoMiner:
                     result = self.supabase.table('keywords').insert(batch).execute()
                     inserted += len(batch)
                     logger.info(f"已插入 {inserted}/{len(keywords_to_insert)} 条关键词")
+                    self.progress.emit('insert', inserted=inserted, total=len(keywords_to_insert))
                 
                 logger.info(f"✅ 成功插入 {inserted} 条关键词到数据库")
             except Exception as e:
                 logger.error(f"❌ 插入数据库失败: {str(e)}")
+                self.progress.emit('error', message=f"插入数据库失败: {str(e)}")
                 raise
         
         return {
@@ -2166,6 +2483,73 @@ class TaobaoMiner:
         }
 
 
+def load_crawl_journal(journal_path) -> Dict[str, any]:
+    """
+    读取抓取日志
+    
+    Args:
+        journal_path: 抓取日志文件路径
+        
+    Returns:
+        {"run": 第一条运行记录, "seeds": {种子词: {"pages": {页码: 商品列表}, "done": 是否抓取完成}},
+         "saved": 入库记录（未入库时为 None）}（同一页以最后一条记录为准）
+    """
+    crawl = {"run": {}, "seeds": {}, "saved": None}
+    for record in read_journal(journal_path):
+        record_type = record.get("type")
+        if record_type == "run":
+            crawl["run"] = crawl["run"] or record
+        elif record_type == "saved":
+            crawl["saved"] = record
+        elif record_type in ("page", "seed") and record.get("seed_word"):
+            state = crawl["seeds"].setdefault(record["seed_word"], {"pages": {}, "done": False})
+            if record_type == "page":
+                state["pages"][record.get("page", 1)] = record.get("products", [])
+            else:
+                state["done"] = True
+    return crawl
+
+
+def pending_seeds(seeds: Dict[str, Dict], seed_words: List[str], max_pages: int) -> List[Tuple[int, str]]:
+    """
+    还需要抓取的种子词（未标记完成且未抓满 max_pages 页）
+    
+    Args:
+        seeds: load_crawl_journal 返回的 seeds
+        seed_words: 种子词列表
+        max_pages: 每个种子词最多抓取页数
+        
+    Returns:
+        [(种子词序号, 种子词)] 列表（序号从1开始）
+    """
+    pending = []
+    for seed_idx, seed_word in enumerate(seed_words, 1):
+        state = seeds.get(seed_word)
+        if state and (state["done"] or max(state["pages"], default=0) >= max_pages):
+            continue
+        pending.append((seed_idx, seed_word))
+    return pending
+
+
+def journal_products(seeds: Dict[str, Dict], seed_words: List[str]) -> List[Dict[str, any]]:
+    """
+    按种子词顺序和页码合并抓取日志中的商品
+    
+    Args:
+        seeds: load_crawl_journal 返回的 seeds
+        seed_words: 种子词列表
+        
+    Returns:
+        商品列表
+    """
+    products = []
+    for seed_word in seed_words:
+        pages = seeds.get(seed_word, {}).get("pages", {})
+        for page_num in sorted(pages):
+            products.extend(pages[page_num])
+    return products
+
+
 def main():
     """主函数"""
     import argparse
@@ -2173,6 +2557,11 @@ def main():
     parser = argparse.ArgumentParser(description='淘宝关键词挖掘工具')
     parser.add_argument('--headless', action='store_true', help='无头模式运行（登录时不建议使用）')
     parser.add_argument('--auth-file', default='auth_taobao.json', help='认证文件路径 (默认: auth_taobao.json)')
+    parser.add_argument('--parallel', type=int, default=1, help='同时抓取的浏览器上下文数量，种子词从共享队列领取 (默认: 1)')
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync',
+                        help='抓取引擎：sync 为每个上下文一个线程；async 在一个浏览器内交替驱动 --parallel 个页面 (默认: sync)')
+    parser.add_argument('--auth-files', type=str,
+                        help='并行时使用的认证文件列表，用逗号分隔，按工作者轮流分配（默认所有上下文共用 --auth-file）')
     
     # 登录相关参数
     parser.add_argument('--setup-login', action='store_true', help='设置登录（扫码登录并保存Cookies）')
@@ -2195,18 +2584,84 @@ def main():
     parser.add_argument('--shop-type', type=str, choices=['tmall', 'c_shop', 'all'], 
                        help='店铺类型过滤: tmall(天猫), c_shop(C店), all(不限，默认)')
     
+    # 网络参数
+    parser.add_argument('--no-block-resources', action='store_true', help='不拦截图片/字体/视频/统计埋点等非必要请求')
+    parser.add_argument('--screenshot-resources', action='store_true', help='放行截图需要的图片和字体（其余资源仍拦截）')
+    parser.add_argument('--block-baseline-every', type=int, default=20,
+                        help='每多少次页面加载做一次不拦截的对照采样，用于实测拦截节省的加载时间和流量，0 表示不采样 (默认: 20)')
+    parser.add_argument('--proxy-list', help='代理列表文件路径（每行一个代理地址，按健康度分配，失败的代理自动冷却）')
+    parser.add_argument('--proxy-cooldown', type=float, default=300, help='代理熔断后的首次冷却秒数，之后每次翻倍 (默认: 300)')
+    parser.add_argument('--pace-min', type=float, default=3.0, help='搜索/翻页的最小间隔秒数（响应正常时逐步提速到该值）(默认: 3)')
+    parser.add_argument('--pace-initial', type=float, default=8.5, help='搜索/翻页的初始间隔秒数 (默认: 8.5)')
+    parser.add_argument('--pace-ceiling', type=float, default=120.0, help='遇到验证码或访问异常后降速的间隔上限秒数 (默认: 120)')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='断点续跑：从抓取日志 <run-dir>/<RUN_ID>.jsonl 中最后完成的页面继续（未指定种子词时沿用日志中的种子词）')
+    parser.add_argument('--run-dir', default='taobao_runs', help='抓取日志目录，每次运行一个 <运行ID>.jsonl (默认: taobao_runs)')
+    parser.add_argument('--capture-api', action='store_true', help='从搜索接口响应直接解析商品（精确销量，省去滚动等待；未捕获到时回退到页面提取）')
+    
     # Supabase 配置（可选，优先使用环境变量）
     parser.add_argument('--supabase-url', type=str, help='Supabase 项目 URL')
     parser.add_argument('--supabase-key', type=str, help='Supabase API Key')
     
+    # 进度输出（供 API 调用方解析）
+    add_progress_arguments(parser)
+    
     args = parser.parse_args()
+    progress = reporter_from_args(args)
+    
+    # 请求拦截策略（默认开启，节省代理带宽）
+    resource_policy = None
+    if not args.no_block_resources:
+        resource_policy = ResourcePolicy(
+            allow_types=SCREENSHOT_RESOURCE_TYPES if args.screenshot_resources else None,
+            baseline_every=args.block_baseline_every
+        )
+    
+    # 代理池（仅用于抓取；登录流程始终直连）
+    proxy_pool = None
+    if args.proxy_list and args.mine:
+        proxy_list = load_proxy_list(args.proxy_list)
+        if proxy_list:
+            proxy_pool = ProxyPool(proxy_list, cooldown_seconds=args.proxy_cooldown)
+        else:
+            logger.warning("代理列表为空，将不使用代理")
+    
+    # 抓取日志（每抓完一页追加一条记录；--resume 时继续追加到已有日志）
+    journal = None
+    if args.mine:
+        if args.resume and not RUN_ID_PATTERN.fullmatch(args.resume):
+            logger.error(f"❌ 运行 ID 格式不正确（应为 YYYYMMDD-HHMMSS）: {args.resume}")
+            progress.emit('error', message=f"运行 ID 格式不正确: {args.resume}")
+            return
+        run_id = args.resume or time.strftime('%Y%m%d-%H%M%S')
+        journal_path = Path(args.run_dir) / f"{run_id}.jsonl"
+        if args.resume and not journal_path.exists():
+            logger.error(f"❌ 未找到抓取日志: {journal_path}")
+            progress.emit('error', message=f"未找到抓取日志: {journal_path}")
+            return
+        journal = JsonlJournal(journal_path, resume=bool(args.resume))
     
-    # 创建挖掘器实例
-    miner = TaobaoMiner(
+    # 创建挖掘器实例（异步引擎只用于抓取，登录流程始终使用同步实现）
+    miner_class, engine_options = TaobaoMiner, {}
+    if args.engine == 'async' and args.mine:
+        from taobao_miner_async import AsyncTaobaoMiner
+        miner_class, engine_options = AsyncTaobaoMiner, {'concurrency': args.parallel}
+    miner = miner_class(
         headless=args.headless,
         auth_file=args.auth_file,
         supabase_url=args.supabase_url,
-        supabase_key=args.supabase_key
+        supabase_key=args.supabase_key,
+        resource_policy=resource_policy,
+        proxy_pool=proxy_pool,
+        rate_controller=AdaptiveRateController(
+            min_interval=args.pace_min,
+            initial_interval=max(args.pace_min, args.pace_initial),
+            max_interval=max(args.pace_min, args.pace_initial, args.pace_ceiling)
+        ),
+        progress=progress,
+        api_capture=SearchApiCapture() if args.capture_api else None,
+        journal=journal,
+        **engine_options
     )
     
     # 检查登录状态
@@ -2221,9 +2676,9 @@ def main():
                 # 加载 Cookies
                 if not miner.load_cookies(page):
                     logger.info("未找到认证文件或加载失败")
-                    import sys
                     sys.stderr.write("LOGIN_STATUS:false\n")
                     sys.stderr.flush()
+                    progress.emit('login_status', logged_in=False, reason="no_auth_file")
                     return
                 
                 # 检查登录状态
@@ -2236,15 +2691,15 @@ def main():
                 
                 # 输出状态标志（用于 API 解析）
                 # 使用 sys.stderr 避免与日志混淆
-                import sys
                 sys.stderr.write(f"LOGIN_STATUS:{'true' if is_logged_in else 'false'}\n")
                 sys.stderr.flush()
+                progress.emit('login_status', logged_in=is_logged_in)
                     
             except Exception as e:
                 logger.error(f"检查登录状态时出错: {str(e)}")
-                import sys
                 sys.stderr.write("LOGIN_STATUS:false\n")
                 sys.stderr.flush()
+                progress.emit('login_status', logged_in=False, reason="error", message=str(e))
             finally:
                 browser.close()
         
@@ -2272,16 +2727,39 @@ def main():
     
     # 执行挖掘
     elif args.mine:
-        if not args.seed_words:
+        if not args.seed_words and not args.resume:
             logger.error("❌ 请指定种子词: --seed-words '野生,自制'")
             return
         
-        # 解析种子词列表
-        seed_words = [w.strip() for w in args.seed_words.split(',') if w.strip()]
+        # 解析种子词列表（续跑时未指定则沿用抓取日志中的种子词）
+        seed_words = [w.strip() for w in (args.seed_words or '').split(',') if w.strip()]
+        if not seed_words and args.resume:
+            seed_words = load_crawl_journal(journal.path)['run'].get('seed_words', [])
         if not seed_words:
             logger.error("❌ 种子词列表为空")
             return
         
+        journal.append({
+            "type": "run",
+            "run_id": run_id,
+            "seed_words": seed_words,
+            "max_pages": args.max_pages,
+            "resumed": bool(args.resume),
+            "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+        logger.info(f"📒 运行 ID: {run_id}（抓取日志: {journal.path}，中断后使用 --resume {run_id} 继续）")
+        progress.emit('run', run_id=run_id, journal=str(journal.path), resumed=bool(args.resume))
+        
+        # 并行抓取使用的认证文件（默认所有上下文共用 --auth-file）
+        auth_files = None
+        if args.auth_files:
+            auth_files = [f.strip() for f in args.auth_files.split(',') if f.strip()]
+            missing = [f for f in auth_files if not Path(f).exists()]
+            if missing:
+                logger.error(f"❌ 认证文件不存在: {', '.join(missing)}")
+                progress.emit('error', message=f"认证文件不存在: {', '.join(missing)}")
+                return
+        
         # 如果指定了项目 ID，执行完整流程（抓取+过滤+入库）
         if args.project_id:
             # 解析关键词筛选参数
@@ -2293,10 +2771,7 @@ def main():
             if args.must_not_contain:
                 must_not_contain = [w.strip() for w in args.must_not_contain.split(',') if w.strip()]
             
-            result = miner.mine_and_save(
-                seed_words=seed_words,
-                project_id=args.project_id,
-                max_pages=args.max_pages,
+            save_options = dict(
                 min_sales=args.min_sales,
                 max_sales=args.max_sales,
                 min_price=args.min_price,
@@ -2305,6 +2780,29 @@ def main():
                 must_not_contain_keywords=must_not_contain,
                 shop_type=args.shop_type if args.shop_type != 'all' else None
             )
+            result = miner.mine_and_save(
+                seed_words=seed_words,
+                project_id=args.project_id,
+                max_pages=args.max_pages,
+                parallel=args.parallel,
+                auth_files=auth_files,
+                **save_options
+            )
+            if asyncio.iscoroutine(result):
+                try:
+                    result = asyncio.run(result)
+                except KeyboardInterrupt:
+                    # 异步引擎被中断时 asyncio.run 会抛出 KeyboardInterrupt，已抓取的页面在抓取日志中
+                    result = miner.save_crawl([], seed_words, args.max_pages, args.project_id, **save_options)
+            journal.close()
+            
+            if result.get('pending_seeds'):
+                logger.warning(f"⚠️ 抓取未完成（剩余 {result['pending_seeds']} 个种子词），未入库")
+                logger.info(f"💡 提示: 使用 --resume {run_id} 从最后完成的页面继续")
+                progress.emit('error', message=f"抓取未完成，剩余 {result['pending_seeds']} 个种子词",
+                              run_id=run_id, interrupted=True)
+                # 退出码 2：抓取未完成、未入库（调用方据此提示用 run_id 续跑）
+                sys.exit(2)
             
             logger.info("=" * 60)
             logger.info("✅ 挖掘和入库完成！")
@@ -2317,6 +2815,7 @@ def main():
             if args.shop_type and args.shop_type != 'all':
                 logger.info(f"   店铺类型过滤后: {result['after_shop_type_filter']} 个商品")
             logger.info(f"   最终入库: {result['inserted']} 条关键词")
+            progress.emit('done', project_id=args.project_id, run_id=run_id, **result)
             logger.info("=" * 60)
             logger.info("💡 提示: 可以到 Dashboard 查看新导入的数据 (source=taobao)")
         else:
@@ -2328,8 +2827,16 @@ def main():
                 seed_words=seed_words,
                 max_pages=args.max_pages,
                 min_sales=args.min_sales,
-                max_sales=args.max_sales
+                max_sales=args.max_sales,
+                parallel=args.parallel,
+                auth_files=auth_files
             )
+            if asyncio.iscoroutine(products):
+                try:
+                    products = asyncio.run(products)
+                except KeyboardInterrupt:
+                    products = miner.crawled_products(seed_words, {})
+            journal.close()
             
             # 打印结果摘要
             logger.info("=" * 60)
@@ -2345,6 +2852,7 @@ def main():
             
             logger.info("=" * 60)
             logger.info(f"总计: {len(products)} 个商品")
+            progress.emit('done', total_crawled=len(products), run_id=run_id)
             logger.info("=" * 60)
         
     else:
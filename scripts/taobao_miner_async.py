@@ -0,0 +1,826 @@
+"""
+淘宝关键词挖掘工具（asyncio 版本）
+基于 playwright.async_api，在单个进程内交替驱动多个页面：
+滚动、停留、模拟人类行为等等待都是 asyncio.sleep，一个页面等待时其他页面继续抓取
+"""
+
+import json
+import time
+import random
+import asyncio
+import logging
+from typing import List, Dict, Optional, Tuple
+
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+
+from taobao_miner import (
+    TaobaoMiner, STEALTH_INIT_SCRIPT, PRODUCT_EXTRACT_JS, MAX_PRODUCTS_PER_PAGE,
+    PROGRESS_PRODUCT_FIELDS, RETRIABLE_ERROR_MARKERS,
+)
+from proxy_pool import ProxyPool
+from rate_controller import text_has_pushback
+
+logger = logging.getLogger(__name__)
+
+
+# 搜索结果页的商品容器（任意一个出现即认为已渲染）
+RESULT_ITEM_SELECTOR = '.items .item, .m-itemlist .items .item, [data-category="auctions"], .item'
+
+# 登录页 URL 特征
+LOGIN_URL_PATTERNS = ('login.taobao.com', 'passport.taobao.com', '/member/login')
+
+
+class AsyncTaobaoMiner(TaobaoMiner):
+    """淘宝关键词挖掘器（异步版本，多个页面在同一进程内交替运行）"""
+
+    def __init__(self, *args, concurrency: int = 4, **kwargs):
+        """
+        初始化挖掘器
+
+        Args:
+            concurrency: 同时抓取的页面数量（每个页面一个上下文，从共享队列领取种子词）
+            其余参数同 TaobaoMiner
+        """
+        super().__init__(*args, **kwargs)
+        self.concurrency = max(1, concurrency)
+
+    async def wait_random(self, min_seconds: float = 3.0, max_seconds: float = 8.0):
+        """
+        随机等待（异步，不阻塞其他页面）
+
+        Args:
+            min_seconds: 最小等待时间（秒）
+            max_seconds: 最大等待时间（秒）
+        """
+        await asyncio.sleep(random.uniform(min_seconds, max_seconds))
+
+    async def simulate_human_behavior(self, page: Page):
+        """
+        模拟人类行为：随机鼠标移动、偶尔滚动（行为同 TaobaoMiner.simulate_human_behavior）
+
+        Args:
+            page: Playwright Page 对象
+        """
+        try:
+            if random.random() < 0.7:
+                await page.mouse.move(random.randint(100, 800), random.randint(100, 600))
+                await asyncio.sleep(random.uniform(0.5, 1.5))
+            if random.random() < 0.3:
+                await page.evaluate(f"window.scrollBy(0, {random.randint(100, 500)})")
+                await asyncio.sleep(random.uniform(0.5, 1.0))
+            if random.random() < 0.2:
+                await asyncio.sleep(random.uniform(1.0, 3.0))
+        except Exception as e:
+            logger.debug(f"模拟人类行为时出错: {str(e)}")
+
+    async def retry_with_backoff(self, func, max_retries: int = 3, base_delay: float = 1.0,
+                                 backoff_factor: float = 2.0, *args, **kwargs):
+        """
+        带指数退避的重试机制（异步，行为同 TaobaoMiner.retry_with_backoff）
+
+        Args:
+            func: 要重试的协程函数
+            max_retries: 最大重试次数
+            base_delay: 基础延迟时间（秒）
+            backoff_factor: 退避因子
+            *args, **kwargs: 传递给函数的参数
+
+        Returns:
+            函数执行结果
+        """
+        last_exception = None
+        for attempt in range(max_retries):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                last_exception = e
+                if not any(marker in str(e).lower() for marker in RETRIABLE_ERROR_MARKERS):
+                    logger.error(f"遇到不可重试的错误: {str(e)}")
+                    raise
+                if attempt < max_retries - 1:
+                    delay = base_delay * (backoff_factor ** attempt)
+                    logger.warning(f"⚠️ 网络错误（尝试 {attempt + 1}/{max_retries}）: {str(e)[:100]}")
+                    logger.info(f"等待 {delay:.1f} 秒后重试...")
+                    await asyncio.sleep(delay)
+                else:
+                    logger.error(f"❌ 重试 {max_retries} 次后仍然失败: {str(e)}")
+        raise last_exception
+
+    async def _launch_browser(self, playwright):
+        """
+        启动共享浏览器（代理池模式下使用占位代理，实际代理由 new_page 按上下文分配）
+
+        Args:
+            playwright: Playwright 实例
+
+        Returns:
+            Browser 对象
+        """
+        return await playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+            ],
+            proxy={'server': 'http://per-context'} if self.proxy_pool else None
+        )
+
+    async def new_page(self, browser) -> Page:
+        """
+        创建上下文和页面（从代理池分配代理，注入反检测脚本，加载 Cookies）
+
+        Args:
+            browser: 共享的 Browser 对象
+
+        Returns:
+            Page 对象
+        """
+        self.release_proxy()
+        if self.proxy_pool:
+            self.current_proxy = self.proxy_pool.acquire()
+            logger.info(f"使用代理: {self.current_proxy}")
+
+        context_options = {
+            'viewport': self.viewport,
+            'user_agent': self.user_agent,
+            'locale': 'zh-CN',
+            'timezone_id': 'Asia/Shanghai',
+        }
+        if self.current_proxy:
+            context_options['proxy'] = ProxyPool.to_playwright(self.current_proxy)
+        try:
+            context = await browser.new_context(**context_options)
+        except Exception:
+            self.release_proxy()
+            raise
+        page = await context.new_page()
+        if self.resource_policy:
+            await self.resource_policy.install_async(context, page)
+        if self.api_capture:
+            self.api_capture.attach_async(page)
+        await page.add_init_script(STEALTH_INIT_SCRIPT)
+        if self.auth_file.exists():
+            await self.load_cookies(page)
+        return page
+
+    async def close_page(self, page: Page):
+        """关闭页面所在的上下文并归还代理"""
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+        self.release_proxy()
+
+    async def load_cookies(self, page: Page) -> bool:
+        """
+        从认证文件加载 Cookies（行为同 TaobaoMiner.load_cookies）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            是否加载成功
+        """
+        try:
+            auth_data = await asyncio.to_thread(self._read_auth_file)
+            cookies = auth_data.get('cookies', [])
+            if not cookies:
+                logger.warning("认证文件中没有 Cookies 数据")
+                return False
+            await page.goto('https://www.taobao.com', timeout=30000, wait_until='domcontentloaded')
+            await page.wait_for_timeout(1000)
+            await page.context.add_cookies(cookies)
+            if auth_data.get('user_agent'):
+                self.user_agent = auth_data['user_agent']
+                await page.set_extra_http_headers({'User-Agent': self.user_agent})
+            logger.info(f"✅ Cookies 已加载 ({self.auth_file.name}，保存时间: {auth_data.get('saved_at', '未知')})")
+            return True
+        except Exception as e:
+            logger.error(f"加载 Cookies 失败: {str(e)}")
+            return False
+
+    def _read_auth_file(self) -> Dict:
+        """读取认证文件"""
+        with open(self.auth_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    async def is_cookies_expired(self, page: Page) -> bool:
+        """
+        检查 Cookies 是否失效（行为同 TaobaoMiner.is_cookies_expired）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            True 表示 Cookies 已失效
+        """
+        try:
+            if any(pattern in page.url for pattern in LOGIN_URL_PATTERNS):
+                logger.warning(f"检测到登录页URL，Cookies可能已失效: {page.url}")
+                return True
+            content = (await page.content())[:5000]
+            if any(indicator in content for indicator in ('请登录', '登录后', '扫码登录', '账号登录')):
+                if await page.query_selector('form[action*="login"], .login-form, #login-form'):
+                    logger.warning("检测到登录表单，Cookies可能已失效")
+                    return True
+            return False
+        except Exception as e:
+            logger.debug(f"检查Cookies失效状态时出错: {str(e)}")
+            return False
+
+    async def is_logged_in(self, page: Page) -> bool:
+        """
+        检查是否已登录（行为同 TaobaoMiner.is_logged_in：无法明确判断时假设已登录）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            是否已登录
+        """
+        try:
+            if await self.is_cookies_expired(page):
+                logger.warning("⚠️ Cookies 已失效，需要重新登录")
+                return False
+            try:
+                await page.goto('https://www.taobao.com', timeout=60000, wait_until='domcontentloaded')
+                try:
+                    await page.wait_for_load_state('networkidle', timeout=10000)
+                except PlaywrightTimeoutError:
+                    logger.debug("网络未完全空闲，但页面已加载，继续检查")
+            except Exception as nav_error:
+                # 导航超时或中断（登录后可能自动跳转到"我的淘宝"），等待后继续检查
+                logger.debug(f"首页导航未完成，继续检查登录状态: {str(nav_error)[:100]}")
+                await page.wait_for_timeout(3000)
+
+            if await self.is_cookies_expired(page):
+                logger.warning("⚠️ Cookies 已失效（导航后检测），需要重新登录")
+                return False
+            await page.wait_for_timeout(2000)
+
+            if 'i.taobao.com' in page.url:
+                return True
+            for selector in self.LOGGED_IN_SELECTORS:
+                element = await page.query_selector(selector)
+                if element:
+                    text = (await element.inner_text()).strip()
+                    if text and '登录' not in text and '免费注册' not in text:
+                        logger.debug(f"检测到登录元素: {selector} = {text}")
+                        return True
+            login_button = await page.query_selector('.site-nav-login a[href*="login"]:visible')
+            if login_button:
+                text = (await login_button.inner_text()).strip()
+                if '登录' in text or '免费注册' in text:
+                    logger.debug("检测到登录按钮，未登录状态")
+                    return False
+
+            cookies = await page.context.cookies()
+            if any('t' in c.get('name', '').lower() or 'lgc' in c.get('name', '').lower()
+                   or 'cna' in c.get('name', '').lower() for c in cookies):
+                return True
+            logger.warning("无法明确判断登录状态，假设已登录（保守策略）")
+            return True
+        except Exception as e:
+            logger.warning(f"检查登录状态时出错: {str(e)}，假设已登录")
+            return True
+
+    async def _captcha_visible(self, page: Page) -> bool:
+        """页面上是否有可见的验证码元素或处于验证页面"""
+        for selector in self.CAPTCHA_SELECTORS:
+            try:
+                element = await page.query_selector(selector)
+                if element and await element.is_visible():
+                    return True
+            except Exception:
+                continue
+        url = page.url.lower()
+        return 'verify' in url or 'captcha' in url
+
+    async def check_and_handle_captcha(self, page: Page, timeout: int = 60) -> bool:
+        """
+        检查验证码/滑块，出现时等待人工处理（行为同 TaobaoMiner.check_and_handle_captcha）
+
+        Args:
+            page: Playwright Page 对象
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            是否成功处理（False表示超时）
+        """
+        try:
+            await page.wait_for_timeout(2000)
+            if not await self._captcha_visible(page):
+                return True
+
+            self.captcha_seen = True
+            logger.warning(f"⚠️ 检测到验证码/滑块，请在浏览器中完成验证（最多等待 {timeout} 秒）: {page.url}")
+            start_time = time.time()
+            while time.time() - start_time < timeout:
+                if not await self._captcha_visible(page):
+                    logger.info("✅ 验证码已处理完成，继续执行...")
+                    await page.wait_for_timeout(1000)
+                    return True
+                await page.wait_for_timeout(2000)
+            logger.error(f"❌ 验证码处理超时（{timeout} 秒），跳过当前页面")
+            return False
+        except Exception as e:
+            logger.error(f"检查验证码时出错: {str(e)}")
+            return True
+
+    async def detect_pushback(self, page: Page) -> bool:
+        """
+        判断当前页面是否在限流（行为同 TaobaoMiner.detect_pushback）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            True 表示站点在限流
+        """
+        if self.captcha_seen:
+            return True
+        try:
+            url = page.url.lower()
+            if 'login.taobao.com' in url or 'login.tmall.com' in url or 'punish' in url:
+                return True
+            return text_has_pushback(await page.title())
+        except Exception:
+            return False
+
+    async def _search_keyword_internal(self, page: Page, keyword: str) -> bool:
+        """
+        搜索关键词的内部实现（用于重试，行为同 TaobaoMiner._search_keyword_internal）
+        """
+        logger.info(f"搜索关键词: {keyword}")
+        if self.api_capture:
+            self.api_capture.reset()
+
+        await self.rate_controller.wait_async(self.rate_key())
+        try:
+            await page.goto(f"https://s.taobao.com/search?q={keyword}", timeout=60000, wait_until='domcontentloaded')
+            await page.wait_for_load_state('networkidle', timeout=30000)
+            await asyncio.sleep(random.uniform(2.0, 4.0))
+        except PlaywrightTimeoutError as e:
+            logger.warning(f"页面加载可能未完全完成，继续尝试: {str(e)[:100]}")
+
+        await self.wait_random(3.0, 6.0)
+        await self.simulate_human_behavior(page)
+
+        if 'login.taobao.com' in page.url or 'passport.taobao.com' in page.url:
+            logger.error(f"被重定向到登录页: {page.url}")
+            raise Exception("需要重新登录")
+
+        if not await self.check_and_handle_captcha(page, timeout=60):
+            logger.warning("验证码处理失败或超时，但继续尝试...")
+
+        # 已经从搜索接口拿到商品数据时，不需要滚动和等待商品元素渲染
+        if self.api_capture and await self.api_capture.wait_for_products_async(timeout=10.0):
+            logger.info(f"✅ 搜索结果页面准备完成（已捕获搜索接口数据）: {keyword}")
+            return True
+
+        # 模拟真实用户浏览：慢速、随机滚动
+        try:
+            for pos in [0.2, 0.4, 0.6, 0.8, 1.0]:
+                if random.random() < 0.8:
+                    await page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {pos})")
+                    await asyncio.sleep(random.uniform(1.5, 3.5))
+                    if random.random() < 0.4:
+                        await self.simulate_human_behavior(page)
+            if random.random() < 0.6:
+                await page.evaluate("window.scrollTo(0, 0)")
+                await asyncio.sleep(random.uniform(1.5, 3.0))
+        except Exception as e:
+            logger.debug(f"滚动操作失败: {str(e)}")
+
+        try:
+            await page.wait_for_selector(RESULT_ITEM_SELECTOR, timeout=15000, state='attached')
+            logger.info(f"✅ 搜索结果页面准备完成: {keyword}")
+            return True
+        except PlaywrightTimeoutError:
+            pass
+
+        # 未找到商品元素：区分反爬拦截和搜索结果为空，其余情况在提取阶段继续尝试
+        try:
+            page_content = await page.content()
+            if '访问异常' in page_content or '安全验证' in page_content:
+                logger.error("❌ 页面显示访问异常或安全验证")
+                raise Exception("被反爬虫机制拦截")
+            page_text = await page.inner_text('body')
+            if any(text in page_text for text in ('没有找到', '暂无商品', '搜索结果为空', '未找到相关')):
+                logger.warning("⚠️ 页面提示没有找到商品")
+                raise Exception("搜索结果为空")
+        except Exception as e:
+            if "被反爬虫" in str(e) or "搜索结果为空" in str(e):
+                raise
+            logger.debug(f"页面内容检查失败: {str(e)}")
+        logger.warning("⚠️ 未找到标准商品容器，将在提取阶段继续尝试")
+        return True
+
+    async def search_keyword(self, page: Page, keyword: str) -> bool:
+        """
+        搜索关键词（带重试机制，行为同 TaobaoMiner.search_keyword）
+
+        Args:
+            page: Playwright Page 对象
+            keyword: 搜索关键词
+
+        Returns:
+            是否搜索成功
+        """
+        try:
+            await self.retry_with_backoff(self._search_keyword_internal, max_retries=5, base_delay=2.0,
+                                          backoff_factor=1.5, page=page, keyword=keyword)
+            if await self.is_cookies_expired(page):
+                logger.error("❌ Cookies 已失效，需要重新登录")
+                return False
+            return True
+        except PlaywrightTimeoutError as e:
+            logger.warning(f"⚠️ 等待搜索结果超时: {keyword} - {str(e)[:200]}")
+            if 'login.taobao.com' in page.url or 'passport.taobao.com' in page.url:
+                logger.error(f"❌ 被重定向到登录页: {page.url}")
+                return False
+            return True
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"❌ 搜索关键词失败: {keyword} - {error_msg[:200]}")
+            if "被反爬虫" in error_msg or "登录" in error_msg or "搜索结果为空" in error_msg:
+                return False
+            logger.warning("⚠️ 出现错误但将继续尝试提取")
+            return True
+
+    async def _scroll_for_lazy_load(self, page: Page):
+        """
+        分段滚动页面以触发商品懒加载（行为同 TaobaoMiner._scroll_for_lazy_load）
+
+        Args:
+            page: Playwright Page 对象
+        """
+        try:
+            last_count = 0
+            stable_count = 0
+            for scroll_round in range(4):
+                positions = [0.2, 0.4, 0.6, 0.8, 1.0]
+                random.shuffle(positions)
+                for pos in positions:
+                    if random.random() < 0.9:
+                        await page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {pos})")
+                        await asyncio.sleep(random.uniform(1.2, 2.5))
+                        if random.random() < 0.3:
+                            await self.simulate_human_behavior(page)
+                await page.evaluate("window.scrollTo(0, 0)")
+                await asyncio.sleep(0.5)
+
+                count = await page.evaluate(
+                    "() => document.querySelectorAll('.items .item, .item[data-category=\"auctions\"], "
+                    "[data-category=\"auctions\"]').length"
+                )
+                if count > last_count:
+                    last_count = count
+                    stable_count = 0
+                elif count == last_count and count > 0:
+                    stable_count += 1
+                    if stable_count >= 2:
+                        break
+                if last_count >= 40:
+                    break
+        except Exception as e:
+            logger.debug(f"滚动操作失败: {str(e)}")
+
+    async def extract_products_from_page(self, page: Page) -> List[Dict[str, any]]:
+        """
+        从当前页面提取商品信息（一次 page.evaluate，解析见 TaobaoMiner.parse_products）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            商品信息列表
+        """
+        try:
+            await self._scroll_for_lazy_load(page)
+            extracted = await page.evaluate(PRODUCT_EXTRACT_JS, MAX_PRODUCTS_PER_PAGE)
+            if not extracted.get('items'):
+                logger.error(f"❌ 未找到商品元素（商品链接={extracted.get('product_links', 0)}）: {page.url}")
+                return []
+            products = self.parse_products(extracted)
+            logger.info(f"✅ 成功提取 {len(products)} 个商品信息 (从 {len(extracted['items'])} 个元素中)")
+            return products
+        except Exception as e:
+            logger.error(f"提取商品信息时出错: {str(e)}")
+            return []
+
+    async def collect_page_products(self, page: Page) -> List[Dict[str, any]]:
+        """
+        获取当前页商品：优先使用搜索接口数据，未捕获到时回退到 DOM 提取
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            商品信息列表
+        """
+        if self.api_capture:
+            products = await self.api_capture.wait_for_products_async(timeout=10.0)
+            if products:
+                logger.info(f"📡 从搜索接口获取 {len(products)} 个商品")
+                self.last_page_source = 'api'
+                return products
+            logger.warning("⚠️ 未捕获到搜索接口数据，回退到页面提取")
+        self.last_page_source = 'dom'
+        return await self.extract_products_from_page(page)
+
+    async def go_to_next_page(self, page: Page) -> bool:
+        """
+        翻到下一页（行为同 TaobaoMiner.go_to_next_page）
+
+        Args:
+            page: Playwright Page 对象
+
+        Returns:
+            是否成功翻页
+        """
+        try:
+            next_button = None
+            for selector in ('.next:not(.disabled)', 'a[aria-label="下一页"]', '.pagination .next',
+                             '.page-next:not(.disabled)'):
+                candidate = await page.query_selector(selector)
+                if candidate and await candidate.is_visible():
+                    next_button = candidate
+                    break
+            if not next_button:
+                logger.debug("未找到下一页按钮，可能已到最后一页")
+                return False
+            class_name = await next_button.get_attribute('class') or ''
+            if 'disabled' in class_name or await next_button.get_attribute('aria-disabled') == 'true':
+                logger.debug("下一页按钮已禁用，已到最后一页")
+                return False
+
+            if self.api_capture:
+                self.api_capture.reset()
+            await next_button.click()
+            await self.wait_random(2.0, 3.0)
+            try:
+                await page.wait_for_load_state('networkidle', timeout=20000)
+            except PlaywrightTimeoutError:
+                logger.warning("翻页后网络未完全空闲，继续等待...")
+                await page.wait_for_timeout(3000)
+            try:
+                await page.wait_for_selector('.items .item, [data-category="auctions"]', timeout=15000, state='visible')
+            except PlaywrightTimeoutError:
+                logger.warning("翻页后等待商品加载超时，但继续尝试提取")
+            return True
+        except Exception as e:
+            logger.error(f"翻页失败: {str(e)}")
+            return False
+
+    async def _skip_to_page(self, page: Page, start_page: int) -> bool:
+        """续跑时从第 1 页翻到 start_page（行为同 TaobaoMiner._skip_to_page）"""
+        logger.info(f"📒 从第 {start_page} 页继续（前 {start_page - 1} 页已在抓取日志中）")
+        for _ in range(start_page - 1):
+            await self.rate_controller.wait_async(self.rate_key())
+            if not await self.go_to_next_page(page):
+                return False
+        return True
+    
+    async def _mine_seed(self, page: Page, seed_word: str, seed_idx: int, total_seeds: int, max_pages: int,
+                         min_sales: int, max_sales: int, apply_sales_filter: bool,
+                         total_so_far: List[int]) -> Tuple[List[Dict[str, any]], bool, float]:
+        """
+        抓取一个种子词的所有页面（行为同 TaobaoMiner._mine_seed）
+
+        Returns:
+            (该种子词的商品列表, 搜索是否成功, 搜索耗时秒数)
+        """
+        start_page, seed_products = self._resume_point(seed_word)
+        logger.info(f"[{seed_idx}/{total_seeds}] 处理种子词: {seed_word}（{self.auth_file.name}）")
+        self.captcha_seen = False
+        search_started = time.time()
+        search_success = await self.search_keyword(page, seed_word)
+        search_elapsed = time.time() - search_started
+        self.progress.emit('seed', status='start', seed_word=seed_word, index=seed_idx,
+                           seeds=total_seeds, search_ok=search_success, seconds=round(search_elapsed, 3))
+        if not search_success:
+            logger.warning(f"⚠️ 搜索可能失败，但将继续尝试提取种子词: {seed_word}")
+        completed = True
+        if start_page > 1 and not await self._skip_to_page(page, start_page):
+            if not search_success or await self.detect_pushback(page):
+                logger.warning(f"⚠️ 搜索失败或遇到限流，无法翻到第 {start_page} 页，种子词保留为未完成: {seed_word}")
+                completed = False
+            else:
+                logger.info(f"无法翻到第 {start_page} 页，种子词已抓取完毕: {seed_word}")
+            start_page = max_pages + 1
+
+        for page_num in range(start_page, max_pages + 1):
+            page_started = time.time()
+            try:
+                products = await self.collect_page_products(page)
+            except Exception as e:
+                logger.error(f"❌ [{seed_word}] 提取第 {page_num} 页商品时出错: {str(e)[:200]}")
+                products = []
+
+            pushback = await self.detect_pushback(page)
+            self.rate_controller.record(self.rate_key(), ok=len(products) > 0, pushback=pushback)
+            for product in products:
+                product['seed_word'] = seed_word
+                product['page_num'] = page_num
+            if apply_sales_filter:
+                products = self.filter_products_by_sales(products, min_sales, max_sales)
+
+            seed_products.extend(products)
+            total_so_far[0] += len(products)
+            if search_success and not pushback:
+                self._record_page(seed_word, page_num, products)
+            else:
+                completed = False
+            logger.info(f"[{seed_word}] 第 {page_num} 页提取 {len(products)} 个商品，累计 {total_so_far[0]} 个")
+            self.progress.advance(
+                'page', seed_word=seed_word, page=page_num, products=len(products),
+                total_products=total_so_far[0], seconds=round(time.time() - page_started, 3),
+                source=self.last_page_source,
+                items=[{key: product.get(key) for key in PROGRESS_PRODUCT_FIELDS} for product in products]
+            )
+
+            if not completed:
+                logger.warning(f"⚠️ 搜索失败或遇到限流，停止抓取并保留为未完成（续跑时重新抓取）: {seed_word}")
+                break
+            if page_num < max_pages:
+                await self.rate_controller.wait_async(self.rate_key())
+                await self.simulate_human_behavior(page)
+                if not await self.go_to_next_page(page):
+                    if await self.detect_pushback(page):
+                        logger.warning(f"⚠️ 翻页时遇到限流，种子词保留为未完成: {seed_word}")
+                        completed = False
+                    else:
+                        logger.info(f"无法翻页，停止抓取种子词: {seed_word}")
+                    break
+
+        if completed:
+            self._record_seed_done(seed_word, len(seed_products))
+        self.progress.emit('seed', status='end', seed_word=seed_word, index=seed_idx,
+                           seeds=total_seeds, products=len(seed_products), completed=completed)
+        return seed_products, search_success, search_elapsed
+
+    async def _after_seed(self, browser, page: Page, search_success: bool, search_elapsed: float,
+                          seed_products: int, has_next: bool) -> Page:
+        """
+        种子词之间的处理（行为同 TaobaoMiner._after_seed；代理熔断时只重建该页面的上下文）
+
+        Returns:
+            之后使用的页面
+        """
+        if self.proxy_pool and self.current_proxy:
+            self.proxy_pool.report(self.current_proxy, success=search_success and seed_products > 0,
+                                   latency=search_elapsed, captcha=self.captcha_seen)
+            if has_next and not self.proxy_pool.is_available(self.current_proxy):
+                logger.info("🔄 当前代理已熔断，更换代理...")
+                await self.close_page(page)
+                page = await self.new_page(browser)
+
+        if has_next:
+            await self.rate_controller.wait_async(self.rate_key(), multiplier=1.6)
+            if random.random() < 0.3:
+                extra_rest = random.uniform(0.6, 1.8) * self.rate_controller.current_interval(self.rate_key())
+                logger.info(f"💤 额外休息 {extra_rest:.1f} 秒（模拟用户行为）...")
+                await asyncio.sleep(extra_rest)
+        return page
+
+    async def mine_keywords(self, seed_words: List[str], max_pages: int = 5,
+                            min_sales: int = 50, max_sales: int = 5000,
+                            apply_sales_filter: bool = False, parallel: Optional[int] = None,
+                            auth_files: Optional[List[str]] = None) -> List[Dict[str, any]]:
+        """
+        挖掘关键词（异步）
+
+        一个浏览器内开 concurrency 个页面（各自独立上下文，认证文件按页面轮流分配），
+        种子词从共享队列领取，商品按种子词的输入顺序合并。节奏按账号控制（同 mine_keywords_parallel），
+        页面内的滚动和停留在各页面之间交替进行。
+
+        Args:
+            seed_words: 种子词列表
+            max_pages: 每个种子词最多抓取页数
+            min_sales: 最小销量过滤
+            max_sales: 最大销量过滤
+            apply_sales_filter: 是否在每页提取后立即按销量过滤
+            parallel: 同时抓取的页面数量（默认使用 concurrency）
+            auth_files: 认证文件列表（默认只使用 auth_file）
+
+        Returns:
+            所有抓取到的商品列表（有抓取日志时包含之前运行中已完成的页面）
+        """
+        auth_files = auth_files or [str(self.auth_file)]
+        results: Dict[int, List[Dict[str, any]]] = {}
+        pending = self.load_crawl_state(seed_words, max_pages)
+        if not pending:
+            logger.info("✅ 所有种子词均已在抓取日志中完成，无需抓取")
+            return self.crawled_products(seed_words, results)
+        lanes = max(1, min(parallel or self.concurrency, len(pending)))
+
+        logger.info("=" * 60)
+        logger.info("开始淘宝关键词挖掘（异步）")
+        logger.info(f"种子词: {', '.join(seed_words)}")
+        logger.info(f"每个词抓取页数: {max_pages}，同时抓取页面: {lanes} 个")
+        logger.info(f"销量过滤范围: {min_sales} - {max_sales}")
+        logger.info("=" * 60)
+
+        self.progress.total = self._remaining_pages(pending, max_pages)
+        self.progress.phase('crawl', 'start', seed_words=seed_words, max_pages=max_pages, parallel=lanes)
+        crawl_started = time.time()
+
+        seed_queue: asyncio.Queue = asyncio.Queue()
+        for seed_idx, seed_word in pending:
+            seed_queue.put_nowait((seed_idx, seed_word))
+        total_so_far = [0]
+        logged_in_accounts = set()
+
+        async def lane(lane_id: int, browser):
+            # 单个页面失败（创建上下文、代理、抓取出错）只结束该页面，未完成的种子词留在队列中由其他页面继续
+            miner = self.worker_copy(auth_files[lane_id % len(auth_files)])
+            page = None
+            current = None
+            try:
+                page = await miner.new_page(browser)
+                logged_in = await miner.is_logged_in(page)
+                self.progress.emit('login_status', logged_in=logged_in, account=miner.auth_file.name, worker=lane_id)
+                if not logged_in:
+                    logger.error(f"❌ [page-{lane_id}] 未登录，该页面退出: {miner.auth_file}")
+                    return
+                logged_in_accounts.add(miner.auth_file.name)
+
+                while not seed_queue.empty():
+                    current = seed_queue.get_nowait()
+                    seed_idx, seed_word = current
+                    seed_products, search_success, search_elapsed = await miner._mine_seed(
+                        page, seed_word, seed_idx, len(seed_words), max_pages,
+                        min_sales, max_sales, apply_sales_filter, total_so_far
+                    )
+                    results[seed_idx] = seed_products
+                    current = None
+                    page = await miner._after_seed(browser, page, search_success, search_elapsed,
+                                                   len(seed_products), has_next=not seed_queue.empty())
+            except Exception as e:
+                logger.error(f"[page-{lane_id}] 页面异常退出: {str(e)}", exc_info=True)
+                if current:
+                    seed_queue.put_nowait(current)
+            finally:
+                if page:
+                    await miner.close_page(page)
+                else:
+                    miner.release_proxy()
+
+        async with async_playwright() as p:
+            browser = await self._launch_browser(p)
+            tasks = []
+            try:
+                tasks = [asyncio.ensure_future(lane(lane_id, browser)) for lane_id in range(lanes)]
+                await asyncio.gather(*tasks)
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                logger.info("\n用户中断抓取")
+                self.progress.emit('error', message="用户中断抓取", interrupted=True)
+                raise
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # 等待各页面关闭上下文、归还代理
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await browser.close()
+
+        if not logged_in_accounts:
+            logger.error("❌ 所有账号均未登录，请先运行登录设置: python taobao_miner.py")
+            self.progress.emit('error', message="未登录")
+        elif not seed_queue.empty():
+            logger.error(f"❌ 所有页面均已退出，剩余 {seed_queue.qsize()} 个种子词未抓取")
+            self.progress.emit('error', message=f"所有页面均已退出，剩余 {seed_queue.qsize()} 个种子词未抓取")
+
+        self._log_crawl_summary(sum(len(products) for products in results.values()), crawl_started)
+        return self.crawled_products(seed_words, results)
+
+    async def mine_and_save(self, seed_words: List[str], project_id: str,
+                            max_pages: int = 5, min_sales: int = 50, max_sales: int = 5000,
+                            parallel: Optional[int] = None, auth_files: Optional[List[str]] = None,
+                            **filters) -> Dict[str, int]:
+        """
+        挖掘关键词并保存到数据库（异步抓取，入库同 TaobaoMiner.save_crawl）
+
+        Args:
+            seed_words: 种子词列表
+            project_id: 项目ID
+            max_pages: 每个种子词最多抓取页数
+            min_sales: 最小销量
+            max_sales: 最大销量
+            parallel: 同时抓取的页面数量（默认使用 concurrency）
+            auth_files: 认证文件列表
+            filters: min_price / max_price / must_contain_keywords / must_not_contain_keywords / shop_type
+
+        Returns:
+            统计信息字典
+        """
+        if not self.supabase:
+            logger.error("❌ Supabase 客户端未初始化，无法保存数据")
+            return {'total_crawled': 0, 'after_sales_filter': 0, 'after_price_filter': 0,
+                    'after_keyword_filter': 0, 'after_shop_type_filter': 0, 'inserted': 0}
+
+        all_products = await self.mine_keywords(seed_words, max_pages=max_pages, min_sales=min_sales,
+                                                max_sales=max_sales, parallel=parallel, auth_files=auth_files)
+        return await asyncio.to_thread(self.save_crawl, all_products, seed_words, max_pages, project_id,
+                                       min_sales=min_sales, max_sales=max_sales, **filters)
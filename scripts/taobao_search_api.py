@@ -0,0 +1,419 @@
+"""
+淘宝搜索接口数据捕获
+淘宝搜索页的商品列表由 mtop 搜索接口（JSON / JSONP）返回的数据渲染，
+通过 page.on("response") 监听这些响应并直接从数据中解析商品（标题、商品 ID、价格、销量、店铺、是否天猫），
+不需要多轮滚动等待 DOM 渲染，销量也尽量取接口中的精确数值而不是 "1.5万+" 这样的文本
+"""
+
+import re
+import json
+import time
+import asyncio
+import threading
+import logging
+from urllib.parse import unquote
+from typing import List, Dict, Optional, Iterable, Any
+
+logger = logging.getLogger(__name__)
+
+
+# 搜索数据接口的 URL 特征（新版搜索页走 mtop，旧版搜索页走 s.taobao.com 的 ajax 请求）
+SEARCH_API_PATTERNS = [
+    r'mtop\.relationrecommend\.wirelessrecommend\.recommend',
+    r'mtop\.taobao\.wsearch\.',
+    r's\.taobao\.com/search\?.*ajax=true',
+]
+
+# 搜索结果列表在响应数据中的路径（只解析这些位置，推荐、侧栏等区块里的商品列表不计入）
+SEARCH_RESULT_PATHS = (
+    'data.itemsArray',                   # 新版搜索页（mtop）
+    'itemsArray',
+    'data.itemList',
+    'mods.itemlist.data.auctions',       # 旧版搜索页（ajax）
+    'data.mods.itemlist.data.auctions',
+)
+
+# mtop.relationrecommend 接口同时承载搜索和推荐，按请求中的 appId 区分，只有这些 appId 是搜索结果
+SEARCH_APP_IDS = ('34385',)
+APP_ID_PATTERN = re.compile(r'appId"?\s*[:=]\s*"?(\d+)')
+
+# 各字段可能的路径（按优先级，"a.b" 表示嵌套字段）
+ITEM_ID_KEYS = ('item_id', 'itemId', 'nid', 'auctionId', 'id')
+TITLE_KEYS = ('raw_title', 'title', 'name')
+PRICE_KEYS = ('priceShow.price', 'price', 'view_price', 'reservePrice', 'priceWap')
+# 精确销量优先，文本销量（如 "1.5万+人付款"）兜底
+SALES_NUMBER_KEYS = ('sold', 'soldCount', 'sellCount', 'totalSoldQuantity', 'realSalesCount')
+SALES_TEXT_KEYS = ('realSales', 'view_sales', 'sales', 'monthSales')
+SHOP_KEYS = ('shopInfo.title', 'shopName', 'nick', 'shopTitle')
+URL_KEYS = ('auctionURL', 'detail_url', 'detailUrl', 'url')
+TMALL_FLAG_KEYS = ('isTmall', 'shopcard.isTmall', 'shopInfo.isTmall')
+SHOP_TAG_KEYS = ('shopTag', 'userType', 'user_type', 'shopInfo.shopTag')
+
+# JSONP 包装：mtopjsonp3({...})
+JSONP_PATTERN = re.compile(r'^\s*[\w$.]+\s*\(\s*(.*)\s*\)\s*;?\s*$', re.S)
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def parse_jsonp(text: str) -> Optional[Any]:
+    """
+    解析 JSON 或 JSONP 响应体
+
+    Args:
+        text: 响应体文本
+
+    Returns:
+        解析后的对象，无法解析时返回 None
+    """
+    if not text:
+        return None
+    match = JSONP_PATTERN.match(text)
+    body = match.group(1) if match and not text.lstrip().startswith(('{', '[')) else text
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _lookup(item: Dict, keys: Iterable[str]) -> Any:
+    """按优先级取第一个非空字段（支持 "a.b" 形式的嵌套路径）"""
+    for key in keys:
+        value: Any = item
+        for part in key.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+            if value is None:
+                break
+        if value not in (None, '', []):
+            return value
+    return None
+
+
+def parse_sales_value(value: Any) -> Optional[int]:
+    """
+    把接口中的销量转为整数（数值直接使用；文本处理 "1.5万+人付款"、"月销100+" 等格式）
+
+    Args:
+        value: 销量字段的值
+
+    Returns:
+        销量，无法解析时返回 None
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    text = value.replace(',', '')
+    match = re.search(r'(\d+\.?\d*)\s*(万)?', text)
+    if not match:
+        return None
+    number = float(match.group(1))
+    return int(number * 10000) if match.group(2) else int(number)
+
+
+def parse_price_value(value: Any) -> Optional[float]:
+    """
+    把接口中的价格转为浮点数
+
+    Args:
+        value: 价格字段的值（数值或 "¥39.90" 这样的文本）
+
+    Returns:
+        价格，无法解析时返回 None
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r'(\d+\.?\d*)', value.replace(',', ''))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def _is_tmall(item: Dict, detail_url: Optional[str]) -> Optional[bool]:
+    """判断是否天猫商品（接口标记 -> 店铺标签 -> 商品链接），无法判断时返回 None"""
+    flag = _lookup(item, TMALL_FLAG_KEYS)
+    if flag is not None:
+        return flag in (True, 1, '1', 'true', 'True')
+    tag = _lookup(item, SHOP_TAG_KEYS)
+    if tag is not None:
+        tag = str(tag).lower()
+        # 旧版接口 user_type: 1 为天猫，0 为淘宝
+        return 'tmall' in tag or '天猫' in tag or tag == '1'
+    if detail_url:
+        return 'tmall.com' in detail_url
+    return None
+
+
+def parse_search_item(item: Dict) -> Optional[Dict[str, Any]]:
+    """
+    把搜索接口中的单个商品转为与 DOM 提取相同格式的商品信息
+
+    Args:
+        item: 接口返回的商品对象
+
+    Returns:
+        商品信息字典（title / item_id / detail_url / price / sales / shop_name / shop_type），没有标题时返回 None
+    """
+    if not isinstance(item, dict):
+        return None
+    # 新版接口的商品字段可能包在 item / data 中
+    for wrapper in ('item', 'data'):
+        if isinstance(item.get(wrapper), dict) and _lookup(item, TITLE_KEYS) is None:
+            item = item[wrapper]
+
+    title = _lookup(item, TITLE_KEYS)
+    if not isinstance(title, str):
+        return None
+    title = HTML_TAG_PATTERN.sub('', title).strip()
+    if not title:
+        return None
+
+    item_id = _lookup(item, ITEM_ID_KEYS)
+    item_id = str(item_id) if item_id is not None else None
+    detail_url = _lookup(item, URL_KEYS)
+    if isinstance(detail_url, str) and detail_url.startswith('//'):
+        detail_url = 'https:' + detail_url
+    tmall = _is_tmall(item, detail_url if isinstance(detail_url, str) else None)
+    if not isinstance(detail_url, str) or not detail_url:
+        detail_url = None
+        if item_id:
+            host = 'detail.tmall.com' if tmall else 'item.taobao.com'
+            detail_url = f"https://{host}/item.htm?id={item_id}"
+
+    sales = parse_sales_value(_lookup(item, SALES_NUMBER_KEYS))
+    if sales is None:
+        sales = parse_sales_value(_lookup(item, SALES_TEXT_KEYS))
+
+    shop_name = _lookup(item, SHOP_KEYS)
+    return {
+        'title': title,
+        'item_id': item_id,
+        'detail_url': detail_url,
+        'price': parse_price_value(_lookup(item, PRICE_KEYS)),
+        'sales': sales,
+        'shop_name': shop_name if isinstance(shop_name, str) else None,
+        'shop_type': None if tmall is None else ('tmall' if tmall else 'c_shop'),
+    }
+
+
+def find_item_lists(payload: Any) -> List[List[Dict]]:
+    """
+    在响应数据中查找搜索结果列表（只看 SEARCH_RESULT_PATHS，不递归查找，避免混入推荐商品）
+
+    Args:
+        payload: 解析后的响应数据
+
+    Returns:
+        商品列表的列表（没有搜索结果列表时为空）
+    """
+    if not isinstance(payload, dict):
+        return []
+    for path in SEARCH_RESULT_PATHS:
+        items = _lookup(payload, [path])
+        if isinstance(items, list) and isinstance(items[0], dict):
+            return [items]
+    return []
+
+
+def request_app_id(url: str) -> Optional[str]:
+    """
+    请求中的 mtop appId（在 URL 编码的 data 参数或查询参数中）
+
+    Args:
+        url: 请求 URL
+
+    Returns:
+        appId，没有时返回 None
+    """
+    match = APP_ID_PATTERN.search(unquote(url))
+    return match.group(1) if match else None
+
+
+def parse_search_payload(payload: Any) -> List[Dict[str, Any]]:
+    """
+    从一个搜索接口响应中解析全部商品
+
+    Args:
+        payload: 解析后的响应数据
+
+    Returns:
+        商品信息列表
+    """
+    products = []
+    for items in find_item_lists(payload):
+        for item in items:
+            product = parse_search_item(item)
+            if product:
+                products.append(product)
+    return products
+
+
+class SearchApiCapture:
+    """搜索接口响应捕获（每次搜索 / 翻页前 reset，加载后 wait_for_products 取回当前页的商品）"""
+
+    def __init__(self, patterns: Optional[List[str]] = None):
+        """
+        初始化捕获器
+
+        Args:
+            patterns: 搜索数据接口的 URL 正则（默认 SEARCH_API_PATTERNS）
+        """
+        self.patterns = [re.compile(p) for p in (patterns or SEARCH_API_PATTERNS)]
+        self._lock = threading.Lock()
+        self._products: List[Dict[str, Any]] = []
+        self._seen_ids = set()
+        self._waited = False  # 本次页面加载是否已经等待过（同一次加载只等待一次）
+        self.stats = {'responses': 0, 'products': 0, 'parse_errors': 0}
+
+    def matches(self, url: str) -> bool:
+        """URL 是否为搜索数据接口（带 appId 的请求只接受 SEARCH_APP_IDS，推荐区块的请求不匹配）"""
+        if not any(p.search(url) for p in self.patterns):
+            return False
+        app_id = request_app_id(url)
+        return app_id is None or app_id in SEARCH_APP_IDS
+
+    def attach(self, page):
+        """
+        在页面上注册响应监听
+
+        Args:
+            page: Playwright Page 对象
+        """
+        page.on("response", self._on_response)
+
+    def attach_async(self, page):
+        """
+        在页面上注册响应监听（异步 API）
+
+        Args:
+            page: playwright.async_api 的 Page 对象
+        """
+        page.on("response", self._on_response_async)
+
+    def reset(self):
+        """清空已捕获的商品（开始新的搜索或翻页前调用）"""
+        with self._lock:
+            self._products = []
+            self._seen_ids = set()
+            self._waited = False
+
+    def _on_response(self, response):
+        """响应回调：匹配搜索接口时解析商品（任何异常都不影响页面加载）"""
+        try:
+            if not self.matches(response.url) or response.status != 200:
+                return
+            payload = parse_jsonp(response.text())
+        except Exception as e:
+            logger.debug(f"读取搜索接口响应失败: {str(e)[:100]}")
+            self.stats['parse_errors'] += 1
+            return
+        if payload is None:
+            self.stats['parse_errors'] += 1
+            return
+        self.add_payload(payload)
+
+    async def _on_response_async(self, response):
+        """响应回调（异步 API）"""
+        try:
+            if not self.matches(response.url) or response.status != 200:
+                return
+            payload = parse_jsonp(await response.text())
+        except Exception as e:
+            logger.debug(f"读取搜索接口响应失败: {str(e)[:100]}")
+            self.stats['parse_errors'] += 1
+            return
+        if payload is None:
+            self.stats['parse_errors'] += 1
+            return
+        self.add_payload(payload)
+
+    def add_payload(self, payload: Any) -> int:
+        """
+        加入一个响应的数据（按商品 ID 去重）
+
+        Args:
+            payload: 解析后的响应数据
+
+        Returns:
+            新增的商品数量
+        """
+        products = parse_search_payload(payload)
+        added = 0
+        with self._lock:
+            self.stats['responses'] += 1
+            for product in products:
+                key = product.get('item_id') or product.get('detail_url') or product['title']
+                if key in self._seen_ids:
+                    continue
+                self._seen_ids.add(key)
+                self._products.append(product)
+                added += 1
+            self.stats['products'] += added
+        if added:
+            logger.debug(f"搜索接口返回 {added} 个商品")
+        return added
+
+    def products(self) -> List[Dict[str, Any]]:
+        """当前已捕获的商品（副本）"""
+        with self._lock:
+            return [dict(product) for product in self._products]
+
+    def wait_for_products(self, page, timeout: float = 10.0, settle_ms: int = 800) -> List[Dict[str, Any]]:
+        """
+        等待搜索接口数据（捕获到商品后再等待 settle_ms，收齐同一页的分批响应）
+
+        Args:
+            page: Playwright Page 对象（通过 page.wait_for_timeout 让出事件循环，响应回调才能执行）
+            timeout: 最长等待秒数
+            settle_ms: 商品数量稳定多久后认为已收齐（毫秒）
+
+        Returns:
+            商品信息列表，超时仍未捕获到时返回空列表（reset 之后再次调用时不再等待，直接返回已捕获的商品）
+        """
+        if self._waited:
+            return self.products()
+        deadline = time.monotonic() + timeout
+        last_count = -1
+        stable_since = None
+        while time.monotonic() < deadline:
+            count = len(self._products)
+            if count and count == last_count:
+                if stable_since is not None and (time.monotonic() - stable_since) * 1000 >= settle_ms:
+                    break
+            else:
+                last_count = count
+                stable_since = time.monotonic()
+            page.wait_for_timeout(200)
+        self._waited = True
+        return self.products()
+
+    async def wait_for_products_async(self, timeout: float = 10.0, settle_ms: int = 800) -> List[Dict[str, Any]]:
+        """
+        等待搜索接口数据（异步 API，行为同 wait_for_products）
+
+        Args:
+            timeout: 最长等待秒数
+            settle_ms: 商品数量稳定多久后认为已收齐（毫秒）
+
+        Returns:
+            商品信息列表，超时仍未捕获到时返回空列表（reset 之后再次调用时不再等待，直接返回已捕获的商品）
+        """
+        if self._waited:
+            return self.products()
+        deadline = time.monotonic() + timeout
+        last_count = -1
+        stable_since = None
+        while time.monotonic() < deadline:
+            count = len(self._products)
+            if count and count == last_count:
+                if stable_since is not None and (time.monotonic() - stable_since) * 1000 >= settle_ms:
+                    break
+            else:
+                last_count = count
+                stable_since = time.monotonic()
+            await asyncio.sleep(0.2)
+        self._waited = True
+        return self.products()
@@ -0,0 +1,788 @@
+"""
+百度广告验证常驻服务
+启动时加载依赖并打开浏览器，为 PC 和移动端预先创建上下文（注入反检测脚本、打开首页），
+之后通过本地 HTTP 接口（TCP 端口或 Unix 套接字）接收验证作业，省去每次运行的
+Python 导入、浏览器启动和上下文初始化，少量关键词的交互式查询几秒内即可返回
+
+接口：
+    GET    /health                 服务状态（浏览器、空闲页面、作业数量）
+    GET    /metrics                运行指标（Prometheus 文本格式）
+    POST   /jobs[?wait=秒]          提交作业，JSON: {"keywords": [...]} 或 {"input": 文件路径, "column": "Keyword"}，
+                                   可选 "modes": ["pc", "mobile"]（或 "mode": "mobile"）、"output": 结果文件路径；
+                                   指定 wait 时等待作业完成（最多 wait 秒）后连同结果一起返回
+    GET    /jobs                   作业列表
+    GET    /jobs/<id>[?results=0]  作业状态和结果
+    GET    /jobs/<id>/events[?since=序号]  作业事件流（每行一个 JSON，作业结束后断开）
+    DELETE /jobs/<id>              取消作业（POST /jobs/<id>/cancel 同）
+
+用法：
+    python scripts/validator_service.py --port 8766 --headless --warm-pages 2
+    python scripts/validator_service.py --socket /tmp/niche-miner-validator.sock --headless --proxy-list proxies.txt
+    curl -s -X POST 'http://127.0.0.1:8766/jobs?wait=60' -d '{"keywords": ["英语培训", "雅思"], "mode": "mobile"}'
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+import socketserver
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from playwright.async_api import async_playwright
+
+from baidu_ad_validator import DEFAULT_FILTERED_DOMAINS
+from baidu_ad_validator_dual import DualModeValidator, DUAL_MODES
+from domain_filter import load_domain_list
+from keyword_source import KeywordSource, keyword_key
+from network_policy import ResourcePolicy, SCREENSHOT_RESOURCE_TYPES
+from proxy_pool import ProxyPool, load_proxy_list
+from rate_controller import AdaptiveRateController
+from result_cache import KeywordResultCache
+from result_writer import write_results
+from run_metrics import RunMetrics
+from process_stats import marked_tree_rss, format_mb, warn_if_unavailable
+from browser_watchdog import marker_arg
+
+logger = logging.getLogger(__name__)
+
+
+# 作业状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_CANCELLED = 'cancelled'
+JOB_FAILED = 'failed'
+FINISHED_STATES = (JOB_DONE, JOB_CANCELLED, JOB_FAILED)
+
+
+class ValidationJob:
+    """一个验证作业（状态由服务的事件循环线程更新，HTTP 线程只读）"""
+
+    def __init__(self, keywords: List[str], modes: List[str], output: Optional[str] = None,
+                 input_file: Optional[str] = None, column_name: str = "Keyword", canonicalize: bool = True):
+        """
+        初始化作业
+
+        Args:
+            keywords: 去重后的关键词列表
+            modes: 验证模式列表（'pc' / 'mobile'）
+            output: 结果文件路径（为空时只通过接口返回结果）
+            input_file: 原始输入文件（写结果文件时按关键词拼接原表格）
+            column_name: 关键词列名
+            canonicalize: 关键词是否已规范化
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.keywords = keywords
+        self.modes = modes
+        self.output = output
+        self.input_file = input_file
+        self.column_name = column_name
+        self.canonicalize = canonicalize
+        self.status = JOB_QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.results: List[Optional[Dict]] = [None] * len(keywords)
+        self.completed = 0
+        self.events: List[Dict] = []
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """各模式的 Yes / No / Error 数量"""
+        counts = {mode: {'Yes': 0, 'No': 0, 'Error': 0} for mode in self.modes}
+        for result in self.results:
+            if result is None:
+                continue
+            for mode, mode_result in self.mode_results(result).items():
+                label = mode_result.get('has_ads', 'Error')
+                counts[mode][label] = counts[mode].get(label, 0) + 1
+        return counts
+
+    def mode_results(self, result: Dict) -> Dict[str, Dict]:
+        """把单模式 / 多模式结果统一为 {模式: 结果}"""
+        return result['modes'] if 'modes' in result else {self.modes[0]: result}
+
+    def to_dict(self, include_results: bool = True) -> Dict:
+        """
+        作业状态（接口返回格式）
+
+        Args:
+            include_results: 是否包含已完成的结果
+
+        Returns:
+            状态字典
+        """
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'modes': self.modes,
+            'total': len(self.keywords),
+            'completed': self.completed,
+            'summary': self.summary(),
+            'output': self.output,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if include_results:
+            data['results'] = [result for result in self.results if result is not None]
+        return data
+
+
+class ValidatorService:
+    """常驻验证服务（后台线程运行事件循环和浏览器，所有作业共享浏览器和空闲页面）"""
+
+    def __init__(self, validator: DualModeValidator, warm_pages: int = 1, max_jobs: int = 100,
+                 startup_timeout: float = 120.0):
+        """
+        初始化服务
+
+        Args:
+            validator: 双模式验证器（提供两种模式的上下文配置、缓存、代理池、节奏控制和运行指标）
+            warm_pages: 启动时每种模式预先创建的页面数量
+            max_jobs: 保留的作业数量上限（超过时丢弃最早结束的作业）
+            startup_timeout: 等待浏览器启动的超时（秒）
+        """
+        self.validator = validator
+        self.metrics = validator.metrics
+        self.warm_pages = max(0, warm_pages)
+        self.max_jobs = max(1, max_jobs)
+        self.startup_timeout = startup_timeout
+        self.started_at = time.time()
+        self.browser_launches = 0
+
+        self.jobs: Dict[str, ValidationJob] = {}
+        self._cond = threading.Condition()
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # 以下只在事件循环线程中访问
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._playwright = None
+        self._browser = None
+        self._marker: Optional[str] = None
+        self._idle_pages: Dict[str, List[Tuple]] = {mode: [] for mode in DUAL_MODES}
+        self._running_jobs = 0
+
+    # ---------- 生命周期 ----------
+
+    def start(self) -> "ValidatorService":
+        """启动事件循环线程并等待浏览器就绪"""
+        self._thread = threading.Thread(target=self._thread_main, name="validator-service", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(self.startup_timeout):
+            raise RuntimeError(f"浏览器启动超过 {self.startup_timeout:g} 秒")
+        if self._startup_error is not None:
+            raise RuntimeError(f"服务启动失败: {self._startup_error}")
+        return self
+
+    def stop(self):
+        """取消所有作业，关闭浏览器并停止事件循环"""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._main())
+        except BaseException as e:
+            self._startup_error = e
+            logger.error(f"验证服务异常退出: {str(e)}", exc_info=True)
+        finally:
+            self._ready.set()
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.validator.concurrency)
+        self._browser_lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+        try:
+            await self._ensure_browser()
+            self._ready.set()
+            logger.info(f"验证服务就绪（每种模式预热 {self.warm_pages} 个页面，"
+                        f"最多 {self.validator.concurrency} 个关键词同时进行）")
+            await self._stopping.wait()
+        finally:
+            jobs = [job.task for job in list(self.jobs.values()) if job.task and not job.task.done()]
+            for task in jobs:
+                task.cancel()
+            if jobs:
+                await asyncio.gather(*jobs, return_exceptions=True)
+            await self._close_browser()
+            await self._playwright.stop()
+
+    # ---------- 浏览器 ----------
+
+    async def _close_browser(self):
+        """关闭空闲页面和浏览器（归还代理）"""
+        for mode, pages in self._idle_pages.items():
+            for page, server, _ in pages:
+                await self.validator.validators[mode]._close_page(page, server)
+            pages.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    async def _ensure_browser(self):
+        """浏览器未启动或已断开时（重新）启动浏览器并预热页面"""
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._browser is not None:
+                logger.warning("浏览器已断开，重新启动")
+                self.metrics.increment("browser_restart")
+            await self._close_browser()
+
+            primary = self.validator.validators[DUAL_MODES[0]]
+            self._marker = uuid.uuid4().hex[:12]
+            with self.metrics.timer("browser_launch"):
+                self._browser = await primary._launch_browser(self._playwright, primary.get_current_proxy(),
+                                                              marker=self._marker)
+            self.browser_launches += 1
+            if self.warm_pages:
+                await asyncio.gather(*(
+                    self._warm_page(mode) for mode in DUAL_MODES for _ in range(self.warm_pages)
+                ))
+
+    async def _warm_page(self, mode: str):
+        """创建一个页面并打开首页（建立连接、加载 Cookie），放入空闲页面"""
+        validator = self.validator.validators[mode]
+        try:
+            page, server = await validator._open_page(self._browser)
+        except Exception as e:
+            logger.warning(f"[{mode}] 预热页面失败: {str(e)}")
+            return
+        try:
+            await page.goto(validator.home_url, timeout=30000, wait_until="domcontentloaded")
+        except Exception as e:
+            logger.debug(f"[{mode}] 预热页面打开首页失败: {str(e)}")
+        self._idle_pages[mode].append((page, server, 0))
+
+    async def _restart_if_bloated(self):
+        """空闲时检查浏览器内存，超过 recycle_rss_mb 时重启浏览器"""
+        recycle_rss_mb = self.validator.validators[DUAL_MODES[0]].recycle_rss_mb
+        if not recycle_rss_mb or self._running_jobs or self._browser is None:
+            return
+        rss = await asyncio.to_thread(marked_tree_rss, marker_arg(self._marker))
+        if rss is not None and rss > recycle_rss_mb * 1024 * 1024:
+            logger.info(f"浏览器内存 {format_mb(rss)} 超过 {recycle_rss_mb:g} MB，重启浏览器")
+            self.metrics.increment("browser_recycle_memory")
+            async with self._browser_lock:
+                await self._close_browser()
+            await self._ensure_browser()
+
+    # ---------- 作业（事件循环线程） ----------
+
+    def _emit(self, job: ValidationJob, event: Dict):
+        """追加作业事件并唤醒等待的 HTTP 线程"""
+        with self._cond:
+            event = dict(event, seq=len(job.events), job_id=job.id, time=time.time())
+            job.events.append(event)
+            self._cond.notify_all()
+
+    def _set_status(self, job: ValidationJob, status: str, error: Optional[str] = None):
+        with self._cond:
+            job.status = status
+            job.error = error
+            if status == JOB_RUNNING:
+                job.started_at = time.time()
+            elif status in FINISHED_STATES:
+                job.finished_at = time.time()
+            self._cond.notify_all()
+
+    async def _run_keyword(self, job: ValidationJob, index: int, keyword: str) -> Dict:
+        """在作业要求的每种模式下验证一个关键词（多种模式并发）"""
+        if self._browser is None or not self._browser.is_connected():
+            await self._ensure_browser()
+        # 浏览器重启前仍在使用的页面会在结束后放回空闲列表，取用前丢弃已关闭的页面
+        for mode in job.modes:
+            pages = self._idle_pages[mode]
+            for entry in [entry for entry in pages if entry[0].is_closed()]:
+                pages.remove(entry)
+                await self.validator.validators[mode]._close_page(entry[0], entry[1])
+        total = len(job.keywords)
+        mode_results = await asyncio.gather(*(
+            self.validator._run_mode(mode, self._browser, self._idle_pages[mode], keyword, index, total)
+            for mode in job.modes
+        ))
+        if len(job.modes) == 1:
+            return mode_results[0]
+        return {"keyword": keyword, "modes": dict(zip(job.modes, mode_results))}
+
+    async def _run_job(self, job: ValidationJob):
+        self._running_jobs += 1
+        self._set_status(job, JOB_RUNNING)
+        self._emit(job, {"type": "started", "total": len(job.keywords), "modes": job.modes})
+        started = time.perf_counter()
+
+        async def run_one(index: int, keyword: str):
+            try:
+                result = await self._run_keyword(job, index, keyword)
+            finally:
+                self._semaphore.release()
+            with self._cond:
+                job.results[index - 1] = result
+                job.completed += 1
+            self._emit(job, {
+                "type": "progress",
+                "current": job.completed,
+                "total": len(job.keywords),
+                "keyword": keyword,
+                "has_ads": {mode: r.get("has_ads") for mode, r in job.mode_results(result).items()},
+            })
+
+        tasks = []
+        try:
+            for index, keyword in enumerate(job.keywords, 1):
+                await self._semaphore.acquire()
+                tasks.append(asyncio.ensure_future(run_one(index, keyword)))
+            await asyncio.gather(*tasks)
+
+            if job.output:
+                results = [r for r in job.results if r is not None]
+                modes = job.modes if len(job.modes) > 1 else None
+                await asyncio.to_thread(write_results, job.input_file, results, job.output,
+                                        job.column_name, job.canonicalize, modes)
+            self._set_status(job, JOB_DONE)
+            self.metrics.observe_since("job", started)
+            self._emit(job, {"type": "done", "status": JOB_DONE, "summary": job.summary(), "output": job.output})
+            logger.info(f"作业 {job.id} 完成: {len(job.keywords)} 个关键词，"
+                        f"耗时 {time.perf_counter() - started:.1f} 秒")
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._set_status(job, JOB_CANCELLED)
+            self.metrics.increment("job_cancelled")
+            self._emit(job, {"type": "done", "status": JOB_CANCELLED, "summary": job.summary()})
+            logger.info(f"作业 {job.id} 已取消（完成 {job.completed}/{len(job.keywords)}）")
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._set_status(job, JOB_FAILED, str(e))
+            self.metrics.increment("job_failed")
+            self._emit(job, {"type": "done", "status": JOB_FAILED, "error": str(e), "summary": job.summary()})
+            logger.error(f"作业 {job.id} 失败: {str(e)}", exc_info=True)
+        finally:
+            self._running_jobs -= 1
+            if not self._running_jobs:
+                try:
+                    await self._restart_if_bloated()
+                except Exception as e:
+                    logger.warning(f"检查浏览器内存失败: {str(e)}")
+
+    def _schedule(self, job: ValidationJob):
+        job.task = asyncio.ensure_future(self._run_job(job))
+
+    # ---------- 对外接口（HTTP 线程调用） ----------
+
+    def submit(self, keywords: List[str], modes: List[str], **options) -> ValidationJob:
+        """
+        提交作业
+
+        Args:
+            keywords: 关键词列表（已去重）
+            modes: 验证模式列表
+            options: ValidationJob 的其余参数
+
+        Returns:
+            作业对象
+        """
+        job = ValidationJob(keywords, modes, **options)
+        with self._cond:
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.finished]
+            for old in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(self.jobs) - self.max_jobs)]:
+                del self.jobs[old.id]
+        self._emit(job, {"type": "queued", "total": len(keywords), "modes": modes})
+        self.metrics.increment("job_submitted")
+        self._loop.call_soon_threadsafe(self._schedule, job)
+        logger.info(f"收到作业 {job.id}: {len(keywords)} 个关键词，模式 {','.join(modes)}")
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        取消作业
+
+        Args:
+            job_id: 作业 ID
+
+        Returns:
+            作业存在且尚未结束时返回 True
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        def cancel_task():
+            if job.task is not None:
+                job.task.cancel()
+
+        self._loop.call_soon_threadsafe(cancel_task)
+        return True
+
+    def wait(self, job: ValidationJob, timeout: float) -> bool:
+        """
+        等待作业结束
+
+        Args:
+            job: 作业
+            timeout: 最多等待的秒数
+
+        Returns:
+            作业是否已结束
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: job.finished, timeout)
+
+    def events_since(self, job: ValidationJob, since: int, timeout: float) -> Tuple[List[Dict], bool]:
+        """
+        读取序号不小于 since 的事件（没有新事件时最多等待 timeout 秒）
+
+        Returns:
+            (事件列表, 作业是否已结束)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(job.events) > since or job.finished, timeout)
+            return list(job.events[since:]), job.finished
+
+    def health(self) -> Dict:
+        """服务状态"""
+        with self._cond:
+            states = {}
+            for job in self.jobs.values():
+                states[job.status] = states.get(job.status, 0) + 1
+        browser = self._browser
+        return {
+            'status': 'ok' if browser is not None and browser.is_connected() else 'degraded',
+            'uptime_seconds': time.time() - self.started_at,
+            'browser_launches': self.browser_launches,
+            'idle_pages': {mode: len(pages) for mode, pages in self._idle_pages.items()},
+            'concurrency': self.validator.concurrency,
+            'jobs': states,
+        }
+
+
+def parse_modes(spec: Dict) -> List[str]:
+    """
+    解析作业请求中的验证模式（"modes": ["pc", "mobile"] / "pc,mobile"，或 "mode": "mobile"）
+
+    Raises:
+        ValueError: 包含不支持的模式
+    """
+    raw = spec.get('modes') or spec.get('mode') or 'pc'
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    modes = list(dict.fromkeys(str(m).strip().lower() for m in raw if str(m).strip()))
+    unknown = [m for m in modes if m not in DUAL_MODES]
+    if unknown or not modes:
+        raise ValueError(f"modes 只支持 pc 和 mobile: {raw}")
+    # 按固定顺序输出结果列
+    return [m for m in DUAL_MODES if m in modes]
+
+
+def load_job_keywords(spec: Dict, canonicalize: bool = True) -> Tuple[List[str], Dict]:
+    """
+    从作业请求读取关键词
+
+    Args:
+        spec: 请求 JSON（keywords 列表，或 input 文件路径 + column 列名）
+        canonicalize: 是否规范化关键词
+
+    Returns:
+        (去重后的关键词列表, ValidationJob 的其余参数)
+
+    Raises:
+        ValueError: 请求中没有关键词或输入文件不可用
+    """
+    column_name = spec.get('column') or 'Keyword'
+    if spec.get('input'):
+        source = KeywordSource(spec['input'], column_name, canonicalize=canonicalize)
+        try:
+            keywords = [keyword for chunk in source.iter_chunks() for keyword in chunk]
+        except FileNotFoundError:
+            raise ValueError(f"文件未找到: {spec['input']}")
+        options = {'input_file': spec['input'], 'column_name': column_name}
+    else:
+        raw = spec.get('keywords')
+        if not isinstance(raw, list):
+            raise ValueError("请求需要 keywords 列表或 input 文件路径")
+        keys = (keyword_key(str(k).strip(), canonicalize) for k in raw if k is not None)
+        keywords = list(dict.fromkeys(k for k in keys if k))
+        options = {'column_name': column_name}
+    if not keywords:
+        raise ValueError("未找到有效关键词")
+    options.update(output=spec.get('output'), canonicalize=canonicalize)
+    return keywords, options
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix 套接字上的 HTTP 服务"""
+    daemon_threads = True
+
+
+def make_handler(service: ValidatorService, canonicalize: bool = True):
+    """
+    创建请求处理类
+
+    Args:
+        service: 验证服务
+        canonicalize: 是否规范化作业中的关键词
+
+    Returns:
+        BaseHTTPRequestHandler 子类
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug("service: " + format % args)
+
+        def _send_json(self, status: int, data: Dict):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+            parts = urlsplit(self.path)
+            return [p for p in parts.path.split('/') if p], parse_qs(parts.query)
+
+        def _job(self, job_id: str) -> Optional[ValidationJob]:
+            job = service.jobs.get(job_id)
+            if job is None:
+                self._send_json(404, {'error': f'作业不存在: {job_id}'})
+            return job
+
+        def do_GET(self):
+            path, query = self._route()
+            if path == ['health']:
+                self._send_json(200, service.health())
+            elif path == ['metrics']:
+                body = service.metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif path == ['jobs']:
+                jobs = [job.to_dict(include_results=False) for job in list(service.jobs.values())]
+                self._send_json(200, {'jobs': jobs})
+            elif len(path) == 2 and path[0] == 'jobs':
+                job = self._job(path[1])
+                if job is not None:
+                    include_results = query.get('results', ['1'])[0] not in ('0', 'false')
+                    self._send_json(200, job.to_dict(include_results))
+            elif len(path) == 3 and path[0] == 'jobs' and path[2] == 'events':
+                job = self._job(path[1])
+                if job is not None:
+                    self._stream_events(job, int(query.get('since', ['0'])[0] or 0))
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def _stream_events(self, job: ValidationJob, since: int):
+            """逐行输出作业事件（JSON Lines），作业结束后关闭连接；空闲时每 15 秒输出一次心跳"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+            try:
+                while True:
+                    events, finished = service.events_since(job, since, timeout=15)
+                    if not events and not finished:
+                        events = [{'type': 'heartbeat', 'job_id': job.id, 'time': time.time()}]
+                    for event in events:
+                        self.wfile.write((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+                        since = max(since, event.get('seq', since - 1) + 1)
+                    self.wfile.flush()
+                    if finished and since >= len(job.events):
+                        break
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_POST(self):
+            path, query = self._route()
+            if len(path) == 3 and path[0] == 'jobs' and path[2] == 'cancel':
+                self._cancel(path[1])
+                return
+            if path != ['jobs']:
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                spec = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+                if not isinstance(spec, dict):
+                    raise ValueError("请求体需要是 JSON 对象")
+                wait = float(query.get('wait', ['0'])[0] or 0)
+                modes = parse_modes(spec)
+                keywords, options = load_job_keywords(spec, canonicalize)
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            except Exception as e:
+                logger.error(f"读取作业关键词失败: {str(e)}", exc_info=True)
+                self._send_json(500, {'error': str(e)})
+                return
+
+            job = service.submit(keywords, modes, **options)
+            if wait > 0 and service.wait(job, wait):
+                self._send_json(200, job.to_dict())
+            else:
+                self._send_json(202, job.to_dict(include_results=False))
+
+        def do_DELETE(self):
+            path, _ = self._route()
+            if len(path) == 2 and path[0] == 'jobs':
+                self._cancel(path[1])
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def _cancel(self, job_id: str):
+            job = self._job(job_id)
+            if job is not None:
+                cancelled = service.cancel(job_id)
+                self._send_json(200, {'job_id': job_id, 'cancelled': cancelled, 'status': job.status})
+
+    return Handler
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='百度广告验证常驻服务（浏览器保持预热，通过本地 HTTP 接口接收作业）')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8766, help='监听端口 (默认: 8766)')
+    parser.add_argument('--socket', help='改为监听 Unix 套接字路径')
+    parser.add_argument('--concurrency', type=int, default=4, help='所有作业合计同时在途的关键词数量 (默认: 4)')
+    parser.add_argument('--warm-pages', type=int, default=1, help='启动时每种模式预先创建的页面数量 (默认: 1)')
+    parser.add_argument('--max-jobs', type=int, default=100, help='保留的作业数量上限 (默认: 100)')
+    parser.add_argument('--no-canonicalize', action='store_true', help='不规范化关键词，只按原文去重')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行（不显示浏览器窗口）')
+    parser.add_argument('--screenshots', '-s', default='scripts/screenshots', help='截图保存目录 (默认: scripts/screenshots)')
+    parser.add_argument('--proxy', help='代理服务器地址（格式：http://host:port 或 socks5://host:port）')
+    parser.add_argument('--proxy-list', help='代理列表文件路径（每行一个代理地址，每个上下文单独分配）')
+    parser.add_argument('--proxy-cooldown', type=float, default=300, help='代理熔断后的首次冷却秒数 (默认: 300)')
+    parser.add_argument('--proxy-rotate-every', type=int, default=0, help='每个代理最多连续验证多少个关键词 (默认: 0)')
+    parser.add_argument('--cache-file', default='temp/baidu_ad_cache.sqlite3', help='结果缓存文件路径 (默认: temp/baidu_ad_cache.sqlite3)')
+    parser.add_argument('--cache-ttl', type=float, default=0, help='缓存有效期（小时），0 表示不使用缓存 (默认: 0)')
+    parser.add_argument('--no-block-resources', action='store_true', help='不拦截图片/字体/视频/统计埋点等非必要请求')
+    parser.add_argument('--screenshot-resources', action='store_true', help='放行截图需要的图片和字体')
+    parser.add_argument('--block-baseline-every', type=int, default=20,
+                        help='每多少次页面加载做一次不拦截的对照采样，用于实测拦截节省的加载时间和流量，0 表示不采样 (默认: 20)')
+    parser.add_argument('--pace-min', type=float, default=2.0, help='两次搜索之间的最小间隔秒数 (默认: 2)')
+    parser.add_argument('--pace-max', type=float, default=5.0, help='两次搜索之间的初始间隔秒数 (默认: 5)')
+    parser.add_argument('--pace-ceiling', type=float, default=60.0, help='遇到验证码后降速的间隔上限秒数 (默认: 60)')
+    parser.add_argument('--ready-timeout', type=float, default=20.0, help='等待搜索结果页就绪的超时上限（秒）(默认: 20)')
+    parser.add_argument('--quiet-ms', type=int, default=500, help='结果页 DOM 保持不变多少毫秒视为渲染完成 (默认: 500)')
+    parser.add_argument('--filtered-domains-file', help='追加过滤的平台域名文件（每行一个域名）')
+    parser.add_argument('--http-first', action='store_true', help='先用 HTTP 快速通道解析结果页，失败时回退到浏览器')
+    parser.add_argument('--recycle-every', type=int, default=100, help='每个上下文验证多少个关键词后重建 (默认: 100)')
+    parser.add_argument('--recycle-rss-mb', type=float, default=1500,
+                        help='空闲时浏览器内存超过该值（MB）则重启浏览器，0 表示不检查 (默认: 1500)')
+    parser.add_argument('--hang-timeout', type=float, default=180, help='单个关键词超过该秒数视为挂起 (默认: 180)')
+    parser.add_argument('--base-url', help='替代百度首页的站点地址（如 serp_stub_server.py 启动的本地桩服务）')
+    args = parser.parse_args()
+    warn_if_unavailable(args.recycle_rss_mb, args.hang_timeout)
+
+    proxy_list = load_proxy_list(args.proxy_list) if args.proxy_list else None
+    filtered_domains = list(DEFAULT_FILTERED_DOMAINS)
+    if args.filtered_domains_file:
+        filtered_domains.extend(load_domain_list(args.filtered_domains_file))
+
+    cache = None
+    if args.cache_ttl > 0:
+        cache = KeywordResultCache(args.cache_file, ttl_seconds=args.cache_ttl * 3600)
+        logger.info(f"使用结果缓存: {args.cache_file}（有效期 {args.cache_ttl:g} 小时）")
+
+    validator = DualModeValidator(
+        concurrency=args.concurrency,
+        headless=args.headless,
+        screenshot_dir=args.screenshots,
+        proxy=args.proxy,
+        proxy_list=proxy_list,
+        cache=cache,
+        resource_policy=None if args.no_block_resources else ResourcePolicy(
+            allow_types=SCREENSHOT_RESOURCE_TYPES if args.screenshot_resources else None,
+            baseline_every=args.block_baseline_every
+        ),
+        pace_range=(args.pace_min, max(args.pace_min, args.pace_max)),
+        ready_timeout_ms=int(args.ready_timeout * 1000),
+        quiet_ms=args.quiet_ms,
+        http_first=args.http_first,
+        filtered_domains=filtered_domains,
+        proxy_pool=ProxyPool(proxy_list, cooldown_seconds=args.proxy_cooldown) if proxy_list else None,
+        proxy_rotate_every=args.proxy_rotate_every,
+        rate_controller=AdaptiveRateController(
+            min_interval=args.pace_min,
+            initial_interval=max(args.pace_min, args.pace_max),
+            max_interval=max(args.pace_min, args.pace_max, args.pace_ceiling)
+        ),
+        metrics=RunMetrics(),
+        base_url=args.base_url,
+        recycle_every=args.recycle_every,
+        recycle_rss_mb=args.recycle_rss_mb,
+        hang_timeout=args.hang_timeout,
+    )
+
+    service = ValidatorService(validator, warm_pages=args.warm_pages, max_jobs=args.max_jobs)
+    logger.info("正在启动浏览器...")
+    service.start()
+
+    handler = make_handler(service, canonicalize=not args.no_canonicalize)
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, handler)
+        logger.info(f"验证服务监听: unix:{args.socket}")
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        server.daemon_threads = True
+        logger.info(f"验证服务监听: http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("收到中断信号，正在停止服务")
+    finally:
+        server.server_close()
+        service.stop()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        validator.metrics.log_summary()
+        if cache:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import { writeFile, mkdir, readdir, unlink } from 'fs/promises'
 import { join } from 'path'
 import { spawn, ChildProcess } from 'child_process'
 import { EventEmitter } from 'events'
+import { onProgressEvents, PROGRESS_ARGS, PROGRESS_STDIO } from '@/lib/progressEvents'
 
 // 注意：xlsx需要单独安装
 let XLSX: any = null
@@ -116,6 +117,22 @@ async function startValidation(
         const scriptPath = join(process.cwd(), 'scripts', 'baidu_ad_validator.py')
   const tempDir = join(process.cwd(), 'temp')
   
+  // 配置了常驻验证服务时直接提交作业（浏览器已预热，代理由服务的代理池分配）
+  const serviceUrl = process.env.BAIDU_VALIDATOR_SERVICE_URL
+  if (serviceUrl) {
+    if (proxyList.length > 0) {
+      emitter.emit('data', JSON.stringify({
+        type: 'log',
+        level: 'warning',
+        message: `已配置验证服务，提交的 ${proxyList.length} 个代理不会使用，代理由验证服务启动时的 --proxy-list 分配`
+      }))
+    }
+    const allResults = new Map<string, AdResult>()
+    await runViaService(serviceUrl.replace(/\/+$/, ''), taskId, filePath, mode, allResults, emitter)
+    finishValidation(taskId, mode, allResults, emitter)
+    return
+  }
+
   // 使用5个IP轮换（如果配置了代理），否则使用5次无代理运行
   const proxiesToUse = proxyList.length > 0 ? proxyList : [null, null, null, null, null]
   const allResults = new Map<string, AdResult>() // 用于去重，key是关键词+链接组合
@@ -153,7 +170,8 @@ async function startValidation(
       '--input', filePath,
       '--output', outputPath,
       mode === 'mobile' ? '--mobile' : '',
-      '--headless'
+      '--headless',
+      ...PROGRESS_ARGS
     ].filter(Boolean)
 
     // 如果使用代理，创建临时代理文件
@@ -167,13 +185,34 @@ async function startValidation(
     await new Promise<void>((resolve, reject) => {
       const pythonProcess = spawn('python', args, {
         cwd: process.cwd(),
-        stdio: ['pipe', 'pipe', 'pipe']
+        stdio: PROGRESS_STDIO
       })
 
       task.process = pythonProcess
 
+      // 结构化进度事件（文件描述符 3，每个关键词一个 keyword 事件）
+      onProgressEvents(pythonProcess, (event) => {
+        if (event.type === 'keyword') {
+          emitter.emit('data', JSON.stringify({
+            type: 'progress',
+            current: event.current,
+            total: event.total,
+            keyword: event.keyword,
+            hasAds: event.has_ads,
+            engine: event.engine,
+            proxyIndex: i
+          }))
+        } else if (event.type === 'error') {
+          emitter.emit('data', JSON.stringify({
+            type: 'log',
+            level: 'error',
+            message: event.message
+          }))
+        }
+      })
+
       // 处理标准输出
-      pythonProcess.stdout.on('data', (data) => {
+      pythonProcess.stdout!.on('data', (data) => {
         const output = data.toString()
         task.logs.push(output)
         
@@ -189,27 +228,12 @@ async function startValidation(
               level,
               message: line.trim()
             }))
-
-            // 解析进度信息
-            const progressMatch = line.match(/\[(\d+)\/(\d+)\]/)
-            if (progressMatch) {
-              const keywordMatch = line.match(/搜索: (.+?)(?:\s|$)/)
-              if (keywordMatch) {
-                emitter.emit('data', JSON.stringify({
-                  type: 'progress',
-                  current: parseInt(progressMatch[1]),
-                  total: parseInt(progressMatch[2]),
-                  keyword: keywordMatch[1],
-                  proxyIndex: i
-                }))
-              }
-            }
           }
         })
       })
 
       // 处理错误输出
-      pythonProcess.stderr.on('data', (data) => {
+      pythonProcess.stderr!.on('data', (data) => {
         const error = data.toString()
         task.logs.push(error)
         emitter.emit('data', JSON.stringify({
@@ -222,53 +246,7 @@ async function startValidation(
       pythonProcess.on('close', async (code) => {
         if (code === 0) {
           try {
-            // 读取结果Excel文件
-            let data: any[] = []
-            
-            if (XLSX) {
-              const workbook = XLSX.readFile(outputPath)
-              const sheetName = workbook.SheetNames[0]
-              const worksheet = workbook.Sheets[sheetName]
-              data = XLSX.utils.sheet_to_json(worksheet)
-            } else {
-              // 如果没有xlsx库，尝试简单的CSV解析或跳过
-              emitter.emit('data', JSON.stringify({
-                type: 'log',
-                level: 'warning',
-                message: 'xlsx库未安装，跳过结果解析（请安装: npm install xlsx）'
-              }))
-            }
-
-            // 处理结果，合并到allResults（去重）
-            data.forEach((row: any) => {
-              const keyword = row['Keyword'] || row['关键词'] || ''
-              if (!keyword || row['Has_Ads'] !== 'Yes') return
-
-              // 获取广告链接（最多3个）
-              const adLinks: string[] = []
-              const adTitles: string[] = []
-              
-              for (let j = 1; j <= 3; j++) {
-                const link = row[`Ad_Link_${j}`] || ''
-                const title = row[`Ad_Title_${j}`] || ''
-                if (link) {
-                  adLinks.push(link)
-                  adTitles.push(title || link)
-                }
-              }
-
-              // 使用关键词+链接组合作为唯一键
-              adLinks.forEach((link, idx) => {
-                const uniqueKey = `${keyword}|||${link}`
-                if (!allResults.has(uniqueKey)) {
-                  allResults.set(uniqueKey, {
-                    keyword,
-                    ad_titles: [adTitles[idx]],
-                    ad_links: [link]
-                  })
-                }
-              })
-            })
+            mergeResultFile(outputPath, allResults, emitter)
 
             emitter.emit('data', JSON.stringify({
               type: 'log',
@@ -302,6 +280,16 @@ async function startValidation(
   }
 
   // 所有代理运行完成，整理结果
+  finishValidation(taskId, mode, allResults, emitter)
+}
+
+// 按关键词分组输出最终结果并清理任务
+function finishValidation(
+  taskId: string,
+  mode: 'pc' | 'mobile',
+  allResults: Map<string, AdResult>,
+  emitter: EventEmitter
+) {
   // 按关键词分组
   const groupedResults = new Map<string, GroupedAdResult>()
   
@@ -355,6 +343,137 @@ async function startValidation(
   eventEmitters.delete(taskId)
 }
 
+// 读取结果Excel文件，把有广告的关键词合并到allResults（按关键词+链接去重）
+function mergeResultFile(outputPath: string, allResults: Map<string, AdResult>, emitter: EventEmitter) {
+  let data: any[] = []
+
+  if (XLSX) {
+    const workbook = XLSX.readFile(outputPath)
+    const sheetName = workbook.SheetNames[0]
+    const worksheet = workbook.Sheets[sheetName]
+    data = XLSX.utils.sheet_to_json(worksheet)
+  } else {
+    // 如果没有xlsx库，尝试简单的CSV解析或跳过
+    emitter.emit('data', JSON.stringify({
+      type: 'log',
+      level: 'warning',
+      message: 'xlsx库未安装，跳过结果解析（请安装: npm install xlsx）'
+    }))
+  }
+
+  data.forEach((row: any) => {
+    const keyword = row['Keyword'] || row['关键词'] || ''
+    if (!keyword || row['Has_Ads'] !== 'Yes') return
+
+    // 获取广告链接（最多3个）
+    const adLinks: string[] = []
+    const adTitles: string[] = []
+
+    for (let j = 1; j <= 3; j++) {
+      const link = row[`Ad_Link_${j}`] || ''
+      const title = row[`Ad_Title_${j}`] || ''
+      if (link) {
+        adLinks.push(link)
+        adTitles.push(title || link)
+      }
+    }
+
+    // 使用关键词+链接组合作为唯一键
+    adLinks.forEach((link, idx) => {
+      const uniqueKey = `${keyword}|||${link}`
+      if (!allResults.has(uniqueKey)) {
+        allResults.set(uniqueKey, {
+          keyword,
+          ad_titles: [adTitles[idx]],
+          ad_links: [link]
+        })
+      }
+    })
+  })
+}
+
+// 通过常驻验证服务（scripts/validator_service.py）执行验证：提交作业后读取事件流转发进度
+async function runViaService(
+  serviceUrl: string,
+  taskId: string,
+  filePath: string,
+  mode: 'pc' | 'mobile',
+  allResults: Map<string, AdResult>,
+  emitter: EventEmitter
+) {
+  const outputPath = join(process.cwd(), 'temp', `results_${taskId}.xlsx`)
+
+  const submitResponse = await fetch(`${serviceUrl}/jobs`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ input: filePath, output: outputPath, mode, column: 'Keyword' })
+  })
+  const submitted = await submitResponse.json()
+  if (!submitResponse.ok) {
+    throw new Error(submitted.error || `验证服务返回 ${submitResponse.status}`)
+  }
+
+  emitter.emit('data', JSON.stringify({
+    type: 'log',
+    level: 'info',
+    message: `已提交到验证服务（作业 ${submitted.job_id}，${submitted.total} 个关键词）`
+  }))
+
+  // 事件流：每行一个JSON，作业结束后服务端断开
+  const eventsResponse = await fetch(`${serviceUrl}/jobs/${submitted.job_id}/events`)
+  if (!eventsResponse.ok || !eventsResponse.body) {
+    throw new Error(`读取验证服务事件失败: ${eventsResponse.status}`)
+  }
+  const reader = eventsResponse.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let finalStatus = ''
+  let finalError = ''
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop() || ''
+
+    for (const line of lines) {
+      if (!line.trim()) continue
+      let event: any
+      try {
+        event = JSON.parse(line)
+      } catch (err) {
+        // 单行损坏不影响后续事件，作业仍在服务端继续
+        console.error('解析验证服务事件失败:', line, err)
+        continue
+      }
+      if (event.type === 'progress') {
+        emitter.emit('data', JSON.stringify({
+          type: 'progress',
+          current: event.current,
+          total: event.total,
+          keyword: event.keyword,
+          proxyIndex: 0
+        }))
+        const hasAds = event.has_ads?.[mode]
+        emitter.emit('data', JSON.stringify({
+          type: 'log',
+          level: hasAds === 'Yes' ? 'success' : hasAds === 'Error' ? 'warning' : 'info',
+          message: `[${event.current}/${event.total}] ${event.keyword}: ${hasAds}`
+        }))
+      } else if (event.type === 'done') {
+        finalStatus = event.status
+        finalError = event.error || ''
+      }
+    }
+  }
+
+  if (finalStatus !== 'done') {
+    throw new Error(finalError || `验证服务作业${finalStatus === 'cancelled' ? '已取消' : '未完成'}`)
+  }
+  mergeResultFile(outputPath, allResults, emitter)
+}
+
 // SSE流端点
 export async function GET(request: NextRequest) {
   const searchParams = request.nextUrl.searchParams
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server'
 import { spawn } from 'child_process'
 import { existsSync } from 'fs'
 import path from 'path'
+import { onProgressEvents, PROGRESS_ARGS, PROGRESS_STDIO } from '@/lib/progressEvents'
 
 export async function GET(request: NextRequest) {
   try {
@@ -20,23 +21,32 @@ export async function GET(request: NextRequest) {
     // 调用 Python 脚本真正验证登录状态
     return new Promise((resolve) => {
       const scriptPath = path.join(process.cwd(), 'scripts', 'taobao_miner.py')
-      const pythonProcess = spawn('python', [scriptPath, '--check-login'], {
+      const pythonProcess = spawn('python', [scriptPath, '--check-login', ...PROGRESS_ARGS], {
         cwd: process.cwd(),
         env: {
           ...process.env,
           PYTHONIOENCODING: 'utf-8',
           PYTHONUTF8: '1',
         },
+        stdio: PROGRESS_STDIO,
       })
 
       let stdout = ''
       let stderr = ''
+      // 进度事件中的登录状态（null 表示脚本未输出该事件）
+      let loginStatus: boolean | null = null
 
-      pythonProcess.stdout.on('data', (data) => {
+      onProgressEvents(pythonProcess, (event) => {
+        if (event.type === 'login_status') {
+          loginStatus = Boolean(event.logged_in)
+        }
+      })
+
+      pythonProcess.stdout!.on('data', (data) => {
         stdout += data.toString('utf-8')
       })
 
-      pythonProcess.stderr.on('data', (data) => {
+      pythonProcess.stderr!.on('data', (data) => {
         stderr += data.toString('utf-8')
       })
 
@@ -45,9 +55,12 @@ export async function GET(request: NextRequest) {
         let isLoggedIn = false
         let message = '登录状态检查完成'
         
-        // 优先从 stderr 中查找 LOGIN_STATUS 标志（更可靠）
+        // 优先使用进度事件中的登录状态，其次从 stderr 中查找 LOGIN_STATUS 标志
         const statusMatch = stderr.match(/LOGIN_STATUS:(true|false)/)
-        if (statusMatch) {
+        if (loginStatus !== null) {
+          isLoggedIn = loginStatus
+          message = isLoggedIn ? '已登录，Cookies 有效' : '未登录或 Cookies 已失效'
+        } else if (statusMatch) {
           isLoggedIn = statusMatch[1] === 'true'
           message = isLoggedIn ? '已登录，Cookies 有效' : '未登录或 Cookies 已失效'
         } else {
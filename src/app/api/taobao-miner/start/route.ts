@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server'
 import { spawn } from 'child_process'
 import path from 'path'
 import { supabase } from '@/lib/supabaseClient'
+import { onProgressEvents, PROGRESS_ARGS, PROGRESS_STDIO } from '@/lib/progressEvents'
 
 export async function POST(request: NextRequest) {
   const encoder = new TextEncoder()
@@ -27,7 +28,11 @@ export async function POST(request: NextRequest) {
           max_price,
           must_contain,
           must_not_contain,
-          shop_type
+          shop_type,
+          capture_api,
+          parallel,
+          engine,
+          resume
         } = body
 
         // 验证参数
@@ -39,6 +44,15 @@ export async function POST(request: NextRequest) {
           return
         }
 
+        // 运行 ID 只能是脚本生成的 YYYYMMDD-HHMMSS 格式（拼接成抓取日志路径，不能包含目录）
+        if (resume && !/^\d{8}-\d{6}$/.test(String(resume))) {
+          sendEvent('error', {
+            message: '运行 ID 格式不正确（应为 YYYYMMDD-HHMMSS）'
+          })
+          controller.close()
+          return
+        }
+
         // 如果没有提供 project_id，自动创建项目
         let finalProjectId = project_id
         if (!finalProjectId || finalProjectId.trim() === '') {
@@ -127,6 +141,7 @@ export async function POST(request: NextRequest) {
           '--min-sales', String(min_sales || 50),
           '--max-sales', String(max_sales || 5000),
           '--max-pages', String(max_pages || 5),
+          ...PROGRESS_ARGS
         ]
 
         // 添加筛选参数（如果有值）
@@ -145,6 +160,22 @@ export async function POST(request: NextRequest) {
         if (shop_type && shop_type !== 'all') {
           args.push('--shop-type', shop_type)
         }
+        // 从搜索接口响应直接解析商品（未捕获到时脚本回退到页面提取）
+        if (capture_api) {
+          args.push('--capture-api')
+        }
+        // 同时抓取的浏览器上下文数量（共用 auth_taobao.json 的登录状态）
+        if (parallel && Number(parallel) > 1) {
+          args.push('--parallel', String(parallel))
+        }
+        // 异步引擎：一个浏览器内交替驱动 parallel 个页面
+        if (engine === 'async') {
+          args.push('--engine', 'async')
+        }
+        // 断点续跑：从上次运行的抓取日志继续（run_id 见上次结果）
+        if (resume) {
+          args.push('--resume', String(resume))
+        }
 
         // 如果有环境变量，传递给 Python（通过环境变量传递）
         const env = {
@@ -160,15 +191,43 @@ export async function POST(request: NextRequest) {
             PYTHONIOENCODING: 'utf-8',
             PYTHONUTF8: '1'
           },
-          stdio: ['pipe', 'pipe', 'pipe']
+          stdio: PROGRESS_STDIO
         })
         
         // 设置 UTF-8 编码
-        pythonProcess.stdout.setEncoding('utf8')
-        pythonProcess.stderr.setEncoding('utf8')
+        pythonProcess.stdout!.setEncoding('utf8')
+        pythonProcess.stderr!.setEncoding('utf8')
+
+        // 结构化进度事件（文件描述符 3）：每页一个 page 事件，结束时 done 事件带入库统计
+        let stats: Record<string, any> | null = null
+        let runId: string | null = null
+        onProgressEvents(pythonProcess, (event) => {
+          if (event.type === 'run') {
+            runId = event.run_id
+          } else if (event.type === 'page') {
+            sendEvent('progress', {
+              current: event.current,
+              total: event.total,
+              keyword: `${event.seed_word} 第${event.page}页`,
+              seed_word: event.seed_word,
+              page: event.page,
+              products: event.products,
+              total_products: event.total_products
+            })
+          } else if (event.type === 'login_status' && !event.logged_in) {
+            sendEvent('log', {
+              level: 'error',
+              message: event.account
+                ? `${event.account} 未登录或 Cookies 已失效，请先完成淘宝登录`
+                : '未登录或 Cookies 已失效，请先完成淘宝登录'
+            })
+          } else if (event.type === 'done') {
+            stats = event
+          }
+        })
 
         // 处理 stdout（标准输出）
-        pythonProcess.stdout.on('data', (data) => {
+        pythonProcess.stdout!.on('data', (data) => {
           const output = data.toString()
           // 解析日志输出
           const lines = output.split('\n').filter((line: string) => line.trim())
@@ -206,7 +265,7 @@ export async function POST(request: NextRequest) {
         })
 
         // 处理 stderr（错误输出）
-        pythonProcess.stderr.on('data', (data) => {
+        pythonProcess.stderr!.on('data', (data) => {
           const output = data.toString()
           sendEvent('log', {
             level: 'error',
@@ -216,17 +275,32 @@ export async function POST(request: NextRequest) {
 
         // 进程退出
         pythonProcess.on('close', (code) => {
-          if (code === 0) {
+          if (code === 2) {
+            // 抓取未完成（中断或有种子词未抓完），脚本未入库
+            sendEvent('result', {
+              success: false,
+              interrupted: true,
+              message: runId
+                ? `抓取未完成，未入库。可以使用运行 ID ${runId} 续跑`
+                : '抓取未完成，未入库',
+              project_id: finalProjectId,
+              run_id: runId
+            })
+          } else if (code === 0 && stats) {
             sendEvent('result', { 
               success: true,
               message: '挖掘完成！',
-              project_id: finalProjectId
+              project_id: finalProjectId,
+              total_keywords: stats?.inserted,
+              run_id: runId,
+              stats
             })
           } else {
             sendEvent('result', { 
               success: false, 
-              message: `进程退出，代码: ${code}`,
-              project_id: finalProjectId
+              message: code === 0 ? '挖掘未完成（未收到完成统计）' : `进程退出，代码: ${code}`,
+              project_id: finalProjectId,
+              run_id: runId
             })
           }
           controller.close()
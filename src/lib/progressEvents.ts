@@ -0,0 +1,55 @@
+import type { ChildProcess } from 'child_process'
+import type { Readable } from 'stream'
+
+/**
+ * Python 脚本 --progress-format jsonl 输出的进度事件
+ * 公共字段见 scripts/progress_events.py
+ */
+export interface ProgressEvent {
+  type: string
+  seq: number
+  ts: number
+  elapsed: number
+  [key: string]: any
+}
+
+/** 进度事件使用的文件描述符（spawn 的 stdio 第 4 项） */
+export const PROGRESS_FD = 3
+
+/** 传给 Python 脚本的进度参数 */
+export const PROGRESS_ARGS = ['--progress-format', 'jsonl', '--progress-fd', String(PROGRESS_FD)]
+
+/** spawn 的 stdio 配置（stdin / stdout / stderr / 进度事件） */
+export const PROGRESS_STDIO: ['pipe', 'pipe', 'pipe', 'pipe'] = ['pipe', 'pipe', 'pipe', 'pipe']
+
+/**
+ * 按行解析子进程的进度事件流，每个事件调用一次 handler
+ * （子进程需要以 PROGRESS_STDIO 启动）
+ */
+export function onProgressEvents(
+  child: ChildProcess,
+  handler: (event: ProgressEvent) => void
+) {
+  const stream = child.stdio[PROGRESS_FD] as Readable | null | undefined
+  if (!stream) return
+
+  let buffer = ''
+  stream.setEncoding('utf8')
+  stream.on('data', (chunk: string) => {
+    buffer += chunk
+    const lines = buffer.split('\n')
+    buffer = lines.pop() || ''
+
+    for (const line of lines) {
+      if (!line.trim()) continue
+      let event: ProgressEvent
+      try {
+        event = JSON.parse(line)
+      } catch (err) {
+        console.error('解析进度事件失败:', line, err)
+        continue
+      }
+      handler(event)
+    }
+  })
+}